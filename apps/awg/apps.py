@@ -4,3 +4,21 @@ from django.apps import AppConfig
 class AwgConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.awg"
+
+    def ready(self):  # pragma: no cover - signal wiring
+        from django.db.models.signals import post_delete, post_save
+
+        from .models import CableSize, ConduitFill
+        from .solver import invalidate_tables
+
+        for model in (CableSize, ConduitFill):
+            post_save.connect(
+                invalidate_tables,
+                sender=model,
+                dispatch_uid=f"awg-invalidate-tables-save-{model._meta.model_name}",
+            )
+            post_delete.connect(
+                invalidate_tables,
+                sender=model,
+                dispatch_uid=f"awg-invalidate-tables-delete-{model._meta.model_name}",
+            )
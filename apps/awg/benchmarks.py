@@ -0,0 +1,118 @@
+"""Benchmark AWG cable solver throughput on seeded calculator inputs."""
+
+from __future__ import annotations
+
+import json
+import random
+import time
+from dataclasses import dataclass
+
+from django.core.management.base import CommandError
+
+from apps.awg.models import CableSize
+from apps.awg.solver import find_awg, get_tables, invalidate_tables
+from apps.core.benchmarks import BenchmarkScenario
+
+DEFAULT_REQUESTS = 2000
+DEFAULT_SEED = 7
+MAX_AWG_CHOICES = (None, None, "14", "10", "6", "2", "1/0", "4/0")
+
+
+@dataclass
+class BenchmarkRun:
+    phase: str
+    requests: int
+    duration_seconds: float
+    calculations_per_second: float
+
+    def to_dict(self) -> dict:
+        return {
+            "phase": self.phase,
+            "requests": self.requests,
+            "duration_seconds": self.duration_seconds,
+            "calculations_per_second": self.calculations_per_second,
+        }
+
+
+def _requests(count: int, seed: int) -> list[dict[str, object]]:
+    rng = random.Random(seed)
+    requests = []
+    for _index in range(count):
+        material = rng.choice(("cu", "al"))
+        requests.append(
+            {
+                "meters": rng.randint(1, 400),
+                "amps": rng.randint(1, 546 if material == "cu" else 430),
+                "volts": rng.choice((12, 24, 48, 120, 208, 220, 240, 277, 400, 460)),
+                "material": material,
+                "max_awg": rng.choice(MAX_AWG_CHOICES),
+                "max_lines": rng.randint(1, 4),
+                "phases": rng.choice((1, 2, 3)),
+                "temperature": rng.choice((None, 60, 75, 90)),
+                "conduit": rng.choice((None, "emt", "imc", "rmc", "fmc")),
+                "ground": rng.choice(("0", "1", "[1]")),
+            }
+        )
+    return requests
+
+
+class AwgSolverBenchmark(BenchmarkScenario):
+    help = (
+        "Benchmark the AWG cable solver on seeded random calculator inputs: the "
+        "first pass after a table reload and a second pass on cached tables."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=DEFAULT_REQUESTS,
+            help=f"Calculator requests to solve (default: {DEFAULT_REQUESTS}).",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=DEFAULT_SEED,
+            help=f"Random seed for the generated inputs (default: {DEFAULT_SEED}).",
+        )
+        parser.add_argument("--json", action="store_true", help="Emit JSON summary output.")
+
+    def handle(self, **options):
+        count = options["requests"]
+        if count <= 0:
+            raise CommandError("--requests must be greater than zero.")
+        if not CableSize.objects.exists():
+            raise CommandError("No cable sizes found; load the awg fixtures first.")
+
+        requests = _requests(count, options["seed"])
+        invalidate_tables()
+        started = time.perf_counter()
+        get_tables()
+        load_seconds = time.perf_counter() - started
+
+        runs = []
+        for phase in ("cold", "warm"):
+            if phase == "cold":
+                invalidate_tables()
+            started = time.perf_counter()
+            for params in requests:
+                find_awg(**params)
+            duration = time.perf_counter() - started
+            runs.append(BenchmarkRun(phase, count, duration, count / max(duration, 1e-9)))
+
+        payload = {
+            "seed": options["seed"],
+            "table_load_seconds": load_seconds,
+            "runs": [run.to_dict() for run in runs],
+        }
+        if options["json"]:
+            self.stdout.write(json.dumps(payload, indent=2))
+            return
+
+        self.stdout.write(f"AWG solver benchmark ({count} requests, seed {options['seed']}):")
+        for run in runs:
+            self.stdout.write(
+                f"  {run.phase}: {run.calculations_per_second:,.0f} calculations/s "
+                f"({run.duration_seconds:.3f}s)"
+            )
+        self.stdout.write(f"  table load: {load_seconds * 1000:.1f} ms")
@@ -117,7 +117,7 @@ class CalculatorTemplate(Entity):
         verbose_name_plural = _("Calculator Templates")
 
     def run(self):
-        from .views import find_awg
+        from .solver import find_awg
 
         return find_awg(
             meters=self.meters,
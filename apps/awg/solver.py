@@ -0,0 +1,621 @@
+"""AWG cable solver over precomputed, process-cached cable and conduit tables.
+
+The cable and conduit tables are small and rarely edited, so they are
+loaded once per process and indexed by material, gauge and line count.
+Saving or deleting a :class:`~apps.awg.models.CableSize` or
+:class:`~apps.awg.models.ConduitFill` row drops the cached tables in the
+process that made the change; other processes reload them after
+``AWG_TABLE_CACHE_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Literal
+
+from django.conf import settings
+from django.utils.translation import gettext as _
+from django.utils.translation import gettext_lazy as _lazy
+
+from .constants import CONDUIT_LABELS
+from .models import CableSize, ConduitFill
+
+DEFAULT_TABLE_CACHE_SECONDS = 300
+MAX_VOLTAGE_DROP = 0.03
+CONDUIT_FILL_FIELDS: frozenset[str] = frozenset(
+    field.name for field in ConduitFill._meta.get_fields() if field.name.startswith("awg_")
+)
+
+
+class AWG(int):
+    """Represents an AWG gauge as an integer.
+    Positive numbers are thin wires (e.g., 14),
+    while zero and negative numbers use zero notation ("1/0", "2/0", ...).
+    """
+
+    def __new__(cls, value):  # pragma: no cover - simple parsing
+        if isinstance(value, str) and "/" in value:
+            value = -int(value.split("/")[0])
+        return super().__new__(cls, int(value))
+
+    def __str__(self):  # pragma: no cover - trivial
+        return f"{abs(self)}/0" if self < 0 else str(int(self))
+
+
+def _fill_field(size: str | int) -> str:
+    """Return the ConduitFill field name for an AWG size."""
+
+    n = int(AWG(size))
+    return "awg_" + ("0" * (-n) if n < 0 else str(n))
+
+
+def _display_awg(size: str | int) -> str:
+    """Return an AWG display string preferring even numbers when possible."""
+
+    n = int(AWG(size))
+    if n > 0 and n % 2:
+        return f"{n - 1}-{n}"
+    return str(AWG(n))
+
+
+def _trade_size_inches(value: str) -> float:
+    """Return a conduit trade size such as ``"1 1/4"`` in inches."""
+
+    total = 0.0
+    for part in value.split():
+        if "/" in part:
+            num, den = part.split("/")
+            total += float(num) / float(den)
+        else:
+            total += float(part)
+    return total
+
+
+@dataclass(frozen=True)
+class CableEntry:
+    """One gauge of one material with capacities precomputed per line count.
+
+    ``capacities[n - 1]`` holds the 60/75/90 °C ampacity for ``n`` parallel
+    lines, taken from the table row when one exists and otherwise scaled
+    from the single-line rating. ``vdrop_factors[n - 1]`` is the per-km
+    resistance divided by ``n``.
+    """
+
+    awg: int
+    k_ohm_km: float
+    capacities: tuple[tuple[float, float, float], ...]
+    vdrop_factors: tuple[float, ...]
+
+    def capacity(self, lines: int) -> tuple[float, float, float]:
+        if lines <= len(self.capacities):
+            return self.capacities[lines - 1]
+        a60, a75, a90 = self.capacities[0]
+        return a60 * lines, a75 * lines, a90 * lines
+
+    def vdrop_factor(self, lines: int) -> float:
+        if lines <= len(self.vdrop_factors):
+            return self.vdrop_factors[lines - 1]
+        return self.k_ohm_km / lines
+
+
+@dataclass(frozen=True)
+class ConduitEntry:
+    trade_size: str
+    capacity: int
+
+
+@dataclass(frozen=True)
+class AwgTables:
+    """Indexed cable and conduit tables used by the solver."""
+
+    cables: dict[str, tuple[CableEntry, ...]]
+    cables_by_size: dict[str, dict[int, CableEntry]]
+    conduits: dict[tuple[str, str], tuple[ConduitEntry, ...]]
+
+    @classmethod
+    def build(cls, cable_rows: Iterable[tuple], conduit_rows: Iterable[dict]) -> AwgTables:
+        """Index raw table rows.
+
+        ``cable_rows`` yields ``(awg_size, material, line_num, k_ohm_km,
+        amps_60c, amps_75c, amps_90c)`` tuples and ``conduit_rows`` yields
+        dictionaries with ``trade_size``, ``conduit`` and the fill fields.
+        """
+
+        grouped: dict[str, dict[int, dict[int, tuple]]] = {}
+        for awg_size, material, line_num, k_ohm, a60, a75, a90 in cable_rows:
+            grouped.setdefault(material, {}).setdefault(int(AWG(awg_size)), {})[
+                int(line_num)
+            ] = (k_ohm, a60, a75, a90)
+
+        cables: dict[str, tuple[CableEntry, ...]] = {}
+        cables_by_size: dict[str, dict[int, CableEntry]] = {}
+        for material, sizes in grouped.items():
+            entries = []
+            for awg, rows in sizes.items():
+                base = rows.get(1)
+                if base is None:
+                    continue
+                k_ohm, b60, b75, b90 = base
+                line_count = max(rows)
+                capacities = tuple(
+                    rows[lines][1:] if lines in rows else (b60 * lines, b75 * lines, b90 * lines)
+                    for lines in range(1, line_count + 1)
+                )
+                vdrop_factors = tuple(k_ohm / lines for lines in range(1, line_count + 1))
+                entries.append(CableEntry(awg, k_ohm, capacities, vdrop_factors))
+            entries.sort(key=lambda entry: entry.awg, reverse=True)
+            cables[material] = tuple(entries)
+            cables_by_size[material] = {entry.awg: entry for entry in entries}
+
+        conduit_lists: dict[tuple[str, str], list[tuple[float, ConduitEntry]]] = {}
+        for row in conduit_rows:
+            conduit = str(row["conduit"]).lower()
+            for field in CONDUIT_FILL_FIELDS:
+                capacity = row.get(field)
+                if capacity is None:
+                    continue
+                conduit_lists.setdefault((conduit, field), []).append(
+                    (_trade_size_inches(row["trade_size"]), ConduitEntry(row["trade_size"], capacity))
+                )
+        conduits = {
+            key: tuple(entry for _inches, entry in sorted(values, key=lambda item: item[0]))
+            for key, values in conduit_lists.items()
+        }
+        return cls(cables=cables, cables_by_size=cables_by_size, conduits=conduits)
+
+
+def load_tables() -> AwgTables:
+    """Read the cable and conduit tables from the database."""
+
+    cable_rows = CableSize.objects.order_by("pk").values_list(
+        "awg_size", "material", "line_num", "k_ohm_km", "amps_60c", "amps_75c", "amps_90c"
+    )
+    conduit_rows = ConduitFill.objects.order_by("pk").values(
+        "trade_size", "conduit", *sorted(CONDUIT_FILL_FIELDS)
+    )
+    return AwgTables.build(cable_rows, conduit_rows)
+
+
+_tables: AwgTables | None = None
+_tables_loaded_at = 0.0
+_tables_lock = threading.Lock()
+
+
+def _table_cache_seconds() -> float:
+    return float(getattr(settings, "AWG_TABLE_CACHE_SECONDS", DEFAULT_TABLE_CACHE_SECONDS))
+
+
+def get_tables() -> AwgTables:
+    """Return the process-cached tables, loading them when missing or expired."""
+
+    global _tables, _tables_loaded_at
+
+    tables = _tables
+    if tables is not None and time.monotonic() - _tables_loaded_at < _table_cache_seconds():
+        return tables
+    with _tables_lock:
+        if _tables is None or time.monotonic() - _tables_loaded_at >= _table_cache_seconds():
+            _tables = load_tables()
+            _tables_loaded_at = time.monotonic()
+        return _tables
+
+
+def invalidate_tables(**_kwargs) -> None:
+    """Drop the cached tables; connected to model save and delete signals."""
+
+    global _tables
+    with _tables_lock:
+        _tables = None
+
+
+def _parse_ground(value: str | int | None) -> tuple[int, str]:
+    """Return the numeric ground count and any special label."""
+
+    if value in (None, "", "None"):
+        return 0, ""
+    if isinstance(value, str):
+        stripped = value.strip()
+        if stripped == "[1]":
+            return 1, "[1]"
+        value = stripped
+    try:
+        return int(value), ""
+    except (TypeError, ValueError) as exc:
+        raise ValueError(_("Ground must be 0, 1, or [1].")) from exc
+
+
+def _format_ground_output(amount: int, label: str) -> str:
+    """Return a formatted ground string including any special label."""
+
+    return f"{amount} ({label})" if label else str(amount)
+
+
+def _build_result(
+    *,
+    awg_size: int,
+    lines: int,
+    vdrop: float,
+    perc: float,
+    meters: int,
+    amps: int,
+    volts: int,
+    temperature: int | None,
+    phases: int,
+    ground_count: int,
+    ground_label: str,
+):
+    """Assemble the response payload for a candidate AWG size."""
+
+    ground_total = lines * ground_count
+    return {
+        "awg": str(AWG(awg_size)),
+        "awg_display": _display_awg(awg_size),
+        "meters": meters,
+        "amps": amps,
+        "volts": volts,
+        "temperature": temperature if temperature is not None else (60 if amps <= 100 else 75),
+        "lines": lines,
+        "vdrop": vdrop,
+        "vend": volts - vdrop,
+        "vdperc": perc * 100,
+        "cables": f"{lines * phases}+{_format_ground_output(ground_total, ground_label)}",
+        "total_meters": f"{lines * phases * meters}+{_format_ground_output(meters * ground_total, ground_label)}",
+    }
+
+
+def find_conduit(
+    awg: str | int,
+    cables: int,
+    *,
+    conduit: str = "emt",
+    tables: AwgTables | None = None,
+):
+    """Return the conduit trade size capable of holding *cables* wires."""
+
+    field = _fill_field(awg)
+    if field not in CONDUIT_FILL_FIELDS:
+        return {"size_inch": "n/a"}
+    tables = tables or get_tables()
+    rows = [
+        entry
+        for entry in tables.conduits.get((str(conduit).lower(), field), ())
+        if entry.capacity >= cables
+    ]
+    if not rows:
+        return {"size_inch": "n/a"}
+    size = rows[0].trade_size
+    if rows[0].capacity == cables and len(rows) > 1:
+        size = rows[1].trade_size
+    return {"size_inch": size}
+
+
+def _attach_conduit(
+    result: dict[str, object],
+    *,
+    conduit: str | bool | None,
+    phases: int,
+    ground_count: int,
+    tables: AwgTables,
+):
+    """Add conduit information to ``result`` when requested."""
+
+    if not conduit or result.get("awg") == "n/a":
+        return
+
+    conduit_value = "emt" if conduit is True else conduit
+    cables = result["lines"] * (phases + ground_count)
+    fill = find_conduit(AWG(result["awg"]), cables, conduit=conduit_value, tables=tables)
+    result["conduit"] = conduit_value
+    result["conduit_label"] = CONDUIT_LABELS.get(
+        str(conduit_value).lower(), str(conduit_value).upper()
+    )
+    result["pipe_inch"] = fill["size_inch"]
+
+
+@dataclass(frozen=True)
+class _AwgParameters:
+    """Container for validated AWG calculator inputs."""
+
+    amps: int
+    meters: int
+    volts: int
+    material: str
+    max_lines: int
+    phases: int
+    temperature: int | None
+    max_awg: AWG | None
+    conduit: str | bool | None
+    ground_label: str
+    ground_options: tuple[int, ...]
+
+
+def _coerce_int(value, label, *, required=True, default=None) -> int:
+    """Return ``value`` as an ``int`` or raise a translated ``ValueError``."""
+
+    if value in (None, "", "None"):
+        if not required:
+            return default
+        raise ValueError(_("%(field)s is required.") % {"field": label})
+    try:
+        return int(value)
+    except (TypeError, ValueError) as exc:  # pragma: no cover - defensive
+        raise ValueError(_("%(field)s must be a whole number.") % {"field": label}) from exc
+
+
+def _parse_awg_parameters(
+    *,
+    meters: int | str | None,
+    amps: int | str,
+    volts: int | str,
+    material: Literal["cu", "al", "?"] = "cu",
+    max_awg: int | str | None = None,
+    max_lines: int | str = "1",
+    phases: str | int = "2",
+    temperature: int | str | None = None,
+    conduit: str | bool | None = None,
+    ground: int | str = "1",
+) -> _AwgParameters:
+    """Normalise and validate user-provided inputs for ``find_awg``."""
+
+    amps_int = _coerce_int(amps, _lazy("Amps"))
+    meters_int = _coerce_int(meters, _lazy("Meters"))
+    volts_int = _coerce_int(volts, _lazy("Volts"))
+    max_lines_int = _coerce_int(
+        max_lines, _lazy("Max Lines"), required=False, default=1
+    )
+
+    max_awg_value: AWG | None
+    if max_awg in (None, ""):
+        max_awg_value = None
+    else:
+        try:
+            max_awg_value = AWG(max_awg)
+        except (TypeError, ValueError) as exc:  # pragma: no cover - defensive
+            raise ValueError(_("Max AWG must be a valid gauge value.")) from exc
+
+    phases_int = _coerce_int(phases, _lazy("Phases"))
+    if temperature in (None, "", "auto"):
+        temperature_int = None
+    else:
+        temperature_int = _coerce_int(temperature, _lazy("Temperature"))
+
+    ground_value, ground_label = _parse_ground(ground)
+    ground_options = (1, 0) if ground_label == "[1]" else (ground_value,)
+
+    params = _AwgParameters(
+        amps=amps_int,
+        meters=meters_int,
+        volts=volts_int,
+        material=material,
+        max_lines=max_lines_int,
+        phases=phases_int,
+        temperature=temperature_int,
+        max_awg=max_awg_value,
+        conduit=conduit,
+        ground_label=ground_label,
+        ground_options=ground_options,
+    )
+
+    _validate_awg_parameters(params)
+    return params
+
+
+def _validate_awg_parameters(params: _AwgParameters) -> None:
+    """Ensure ``params`` satisfies business constraints for the calculator."""
+
+    assert params.amps >= 1, _(
+        "Minimum load for this calculator is 1 Amp. Yours: amps=%(amps)s."
+    ) % {"amps": params.amps}
+    assert (
+        (params.amps <= 546) if params.material == "cu" else (params.amps <= 430)
+    ), _(
+        "Max. load allowed is 546 A (cu) or 430 A (al). Yours: amps=%(amps)s material=%(material)s"
+    ) % {"amps": params.amps, "material": params.material}
+    assert params.meters >= 1, _("Consider at least 1 meter of cable.")
+    assert 12 <= params.volts <= 460, _(
+        "Volt range supported must be between 12-460. Yours: volts=%(volts)s"
+    ) % {"volts": params.volts}
+    assert params.material in ("cu", "al"), _(
+        "Material must be 'cu' (copper) or 'al' (aluminum)."
+    )
+    assert params.phases in (1, 2, 3), _(
+        "AC phases 1, 2 or 3 to calculate for. DC not supported."
+    )
+    if params.temperature is not None:
+        assert params.temperature in (60, 75, 90), _(
+            "Temperature must be 60, 75 or 90"
+        )
+
+
+def _base_vdrop(params: _AwgParameters) -> float:
+    """Return the voltage drop baseline used in the AWG iteration."""
+
+    multiplier = math.sqrt(3) if params.phases == 3 else 2
+    return multiplier * params.meters * params.amps / 1000
+
+
+def _capacity_column(params: _AwgParameters) -> int | None:
+    """Return the ampacity column checked against the load, if any."""
+
+    if params.temperature is None:
+        return 1 if params.amps > 100 else 0
+    return {60: 0, 75: 1, 90: 2}.get(params.temperature)
+
+
+def _calculate_awg_for_ground(
+    params: _AwgParameters,
+    ground_count: int,
+    tables: AwgTables,
+    *,
+    force_awg: int | str | None = None,
+    limit_awg: int | str | None = None,
+) -> dict[str, object]:
+    """Return the best AWG match for ``ground_count`` wires.
+
+    Candidates are visited from the thinnest gauge and fewest lines up; the
+    first one that carries the load within 3% voltage drop wins. Forced or
+    limited searches fall back to the lowest voltage drop seen.
+    """
+
+    if force_awg is not None:
+        forced = tables.cables_by_size.get(params.material, {}).get(int(AWG(force_awg)))
+        entries: Iterable[CableEntry] = (forced,) if forced else ()
+    else:
+        entries = tables.cables.get(params.material, ())
+        if limit_awg is not None:
+            limit = int(AWG(limit_awg))
+            entries = [entry for entry in entries if entry.awg <= limit]
+
+    base_vdrop = _base_vdrop(params)
+    column = _capacity_column(params)
+    amps = params.amps
+    volts = params.volts
+
+    best: tuple[CableEntry, int, float, float] | None = None
+    best_perc = 1e9
+    for entry in entries:
+        for lines in range(1, params.max_lines + 1):
+            allowed = column is not None and entry.capacity(lines)[column] >= amps
+            if not allowed and force_awg is None:
+                continue
+            vdrop = base_vdrop * entry.k_ohm_km / lines
+            perc = vdrop / volts
+            if allowed and perc <= MAX_VOLTAGE_DROP:
+                return _finish_result(params, ground_count, tables, entry, lines, vdrop, perc)
+            if perc < best_perc:
+                best = (entry, lines, vdrop, perc)
+                best_perc = perc
+
+    if best and (force_awg is not None or limit_awg is not None):
+        result = _finish_result(params, ground_count, tables, *best)
+        if force_awg is not None:
+            result["warning"] = _(
+                "Voltage drop may exceed 3% with chosen parameters"
+            )
+        else:
+            result["warning"] = _("Voltage drop exceeds 3% with given max_awg")
+        return result
+
+    return {"awg": "n/a", "awg_display": "n/a"}
+
+
+def _finish_result(
+    params: _AwgParameters,
+    ground_count: int,
+    tables: AwgTables,
+    entry: CableEntry,
+    lines: int,
+    vdrop: float,
+    perc: float,
+) -> dict[str, object]:
+    result = _build_result(
+        awg_size=entry.awg,
+        lines=lines,
+        vdrop=vdrop,
+        perc=perc,
+        meters=params.meters,
+        amps=params.amps,
+        volts=params.volts,
+        temperature=params.temperature,
+        phases=params.phases,
+        ground_count=ground_count,
+        ground_label=params.ground_label,
+    )
+    _attach_conduit(
+        result,
+        conduit=params.conduit,
+        phases=params.phases,
+        ground_count=ground_count,
+        tables=tables,
+    )
+    return result
+
+
+def _solve_for_ground(
+    params: _AwgParameters, ground_count: int, tables: AwgTables
+) -> dict[str, object]:
+    """Solve the AWG calculation for a specific ground configuration."""
+
+    baseline = _calculate_awg_for_ground(params, ground_count, tables)
+    if params.max_awg is None:
+        return baseline
+
+    if baseline.get("awg") == "n/a":
+        return _calculate_awg_for_ground(
+            params, ground_count, tables, limit_awg=params.max_awg
+        )
+
+    if int(AWG(baseline["awg"])) < int(params.max_awg):
+        return _calculate_awg_for_ground(
+            params, ground_count, tables, force_awg=params.max_awg
+        )
+    return _calculate_awg_for_ground(
+        params, ground_count, tables, limit_awg=params.max_awg
+    )
+
+
+def find_awg(
+    *,
+    meters: int | str | None = None,  # Required
+    amps: int | str = "40",
+    volts: int | str = "220",
+    material: Literal["cu", "al", "?"] = "cu",
+    max_awg: int | str | None = None,
+    max_lines: int | str = "1",
+    phases: str | int = "2",
+    temperature: int | str | None = None,
+    conduit: str | bool | None = None,
+    ground: int | str = "1",
+    tables: AwgTables | None = None,
+):
+    """Calculate the cable size required for given parameters."""
+
+    params = _parse_awg_parameters(
+        meters=meters,
+        amps=amps,
+        volts=volts,
+        material=material,
+        max_awg=max_awg,
+        max_lines=max_lines,
+        phases=phases,
+        temperature=temperature,
+        conduit=conduit,
+        ground=ground,
+    )
+    tables = tables or get_tables()
+
+    results = [
+        (count, _solve_for_ground(params, count, tables)) for count in params.ground_options
+    ]
+    if len(results) == 1:
+        return results[0][1]
+
+    vd_results = [item for item in results if "vdperc" in item[1]]
+    if vd_results:
+        worst = max(vd_results, key=lambda item: item[1]["vdperc"])
+        return worst[1]
+
+    return results[0][1]
+
+
+def find_awg_batch(
+    circuits: Iterable[Mapping[str, object]], *, tables: AwgTables | None = None
+) -> list[dict[str, object]]:
+    """Solve many circuits against one table snapshot.
+
+    Each item is ``{"result": ...}`` or ``{"error": ...}`` so one invalid
+    circuit does not fail a whole panel schedule.
+    """
+
+    tables = tables or get_tables()
+    outcomes: list[dict[str, object]] = []
+    for circuit in circuits:
+        try:
+            outcomes.append({"result": find_awg(**circuit, tables=tables)})
+        except (AssertionError, TypeError, ValueError) as exc:
+            outcomes.append({"error": str(exc)})
+    return outcomes
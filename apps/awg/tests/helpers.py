@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import random
+
+from django.utils.translation import gettext as _
+
+from apps.awg.models import CableSize, ConduitFill
+from apps.awg.solver import (
+    AWG,
+    CONDUIT_FILL_FIELDS,
+    MAX_VOLTAGE_DROP,
+    _AwgParameters,
+    _base_vdrop,
+    _build_result,
+    _fill_field,
+    _parse_awg_parameters,
+    _trade_size_inches,
+)
+
+MAX_AWG_CHOICES = (None, None, "14", "10", "6", "2", "1/0", "4/0")
+
+
+def _legacy_find_conduit(awg: str | int, cables: int, conduit: str) -> str:
+    field = _fill_field(awg)
+    if field not in CONDUIT_FILL_FIELDS:
+        return "n/a"
+    rows = list(
+        ConduitFill.objects.filter(conduit__iexact=conduit)
+        .exclude(**{field: None})
+        .filter(**{f"{field}__gte": cables})
+        .values_list("trade_size", field)
+    )
+    if not rows:
+        return "n/a"
+    rows.sort(key=lambda row: _trade_size_inches(row[0]))
+    size, capacity = rows[0]
+    if capacity == cables and len(rows) > 1:
+        size = rows[1][0]
+    return size
+
+
+def _legacy_ampacity_data(
+    params: _AwgParameters,
+    force_awg: int | str | None,
+    limit_awg: int | str | None,
+) -> dict[int, dict[int, dict[str, float]]]:
+    target_force = int(AWG(force_awg)) if force_awg is not None else None
+    target_limit = int(AWG(limit_awg)) if limit_awg is not None else None
+    data: dict[int, dict[int, dict[str, float]]] = {}
+    rows = CableSize.objects.filter(
+        material=params.material, line_num__lte=params.max_lines
+    ).values_list("awg_size", "line_num", "k_ohm_km", "amps_60c", "amps_75c", "amps_90c")
+    for awg_size, line_num, k_ohm, a60, a75, a90 in rows:
+        awg_int = int(AWG(awg_size))
+        if target_force is not None and awg_int != target_force:
+            continue
+        if target_limit is not None and awg_int > target_limit:
+            continue
+        data.setdefault(awg_int, {})[int(line_num)] = {
+            "k": k_ohm,
+            "a60": a60,
+            "a75": a75,
+            "a90": a90,
+        }
+    return data
+
+
+def _legacy_for_ground(
+    params: _AwgParameters,
+    ground_count: int,
+    *,
+    force_awg: int | str | None = None,
+    limit_awg: int | str | None = None,
+) -> dict[str, object]:
+    data = _legacy_ampacity_data(params, force_awg, limit_awg)
+    if force_awg is not None:
+        forced = int(AWG(force_awg))
+        sizes = [forced] if forced in data else []
+    else:
+        sizes = sorted(data, reverse=True)
+    base_vdrop = _base_vdrop(params)
+
+    def finish(result: dict[str, object]) -> dict[str, object]:
+        if params.conduit and result.get("awg") != "n/a":
+            conduit = "emt" if params.conduit is True else params.conduit
+            cables = result["lines"] * (params.phases + ground_count)
+            result["conduit"] = conduit
+            result["pipe_inch"] = _legacy_find_conduit(result["awg"], cables, conduit)
+        return result
+
+    best: dict[str, object] | None = None
+    best_perc = 1e9
+    for awg_size in sizes:
+        base = data[awg_size][1]
+        for lines in range(1, params.max_lines + 1):
+            info = data[awg_size].get(lines)
+            if info:
+                a60, a75, a90 = info["a60"], info["a75"], info["a90"]
+            else:
+                a60, a75, a90 = base["a60"] * lines, base["a75"] * lines, base["a90"] * lines
+            if params.temperature is None:
+                allowed = (params.amps > 100 and a75 >= params.amps) or (
+                    params.amps <= 100 and a60 >= params.amps
+                )
+            else:
+                allowed = {60: a60, 75: a75, 90: a90}.get(params.temperature, 0) >= params.amps
+            if not allowed and force_awg is None:
+                continue
+            vdrop = base_vdrop * base["k"] / lines
+            perc = vdrop / params.volts
+            result = _build_result(
+                awg_size=awg_size,
+                lines=lines,
+                vdrop=vdrop,
+                perc=perc,
+                meters=params.meters,
+                amps=params.amps,
+                volts=params.volts,
+                temperature=params.temperature,
+                phases=params.phases,
+                ground_count=ground_count,
+                ground_label=params.ground_label,
+            )
+            if allowed and perc <= MAX_VOLTAGE_DROP:
+                return finish(result)
+            if perc < best_perc:
+                best = result
+                best_perc = perc
+
+    if best and (force_awg is not None or limit_awg is not None):
+        if force_awg is not None:
+            best["warning"] = _("Voltage drop may exceed 3% with chosen parameters")
+        else:
+            best["warning"] = _("Voltage drop exceeds 3% with given max_awg")
+        return finish(best)
+    return {"awg": "n/a", "awg_display": "n/a"}
+
+
+def legacy_find_awg(**kwargs) -> dict[str, object]:
+    """Reproduce the previous solver that queried the tables on every call.
+
+    Conduit labels are omitted; the comparison covers the sizing itself.
+    """
+
+    params = _parse_awg_parameters(**kwargs)
+    results = []
+    for count in params.ground_options:
+        baseline = _legacy_for_ground(params, count)
+        if params.max_awg is not None:
+            if baseline.get("awg") != "n/a" and int(AWG(baseline["awg"])) < int(params.max_awg):
+                baseline = _legacy_for_ground(params, count, force_awg=params.max_awg)
+            else:
+                baseline = _legacy_for_ground(params, count, limit_awg=params.max_awg)
+        results.append(baseline)
+    if len(results) == 1:
+        return results[0]
+    vd_results = [result for result in results if "vdperc" in result]
+    if vd_results:
+        return max(vd_results, key=lambda result: result["vdperc"])
+    return results[0]
+
+
+def random_requests(count: int, seed: int) -> list[dict[str, object]]:
+    """Return reproducible calculator inputs spanning the supported ranges."""
+
+    rng = random.Random(seed)
+    requests = []
+    for _index in range(count):
+        material = rng.choice(("cu", "al"))
+        requests.append(
+            {
+                "meters": rng.randint(1, 400),
+                "amps": rng.randint(1, 546 if material == "cu" else 430),
+                "volts": rng.choice((12, 24, 48, 120, 208, 220, 240, 277, 400, 460)),
+                "material": material,
+                "max_awg": rng.choice(MAX_AWG_CHOICES),
+                "max_lines": rng.randint(1, 4),
+                "phases": rng.choice((1, 2, 3)),
+                "temperature": rng.choice((None, 60, 75, 90)),
+                "conduit": rng.choice((None, "emt", "imc", "rmc", "fmc")),
+                "ground": rng.choice(("0", "1", "[1]")),
+            }
+        )
+    return requests
+
+
+def comparable(result: dict[str, object]) -> dict[str, object]:
+    """Drop presentation-only keys that the legacy reproduction does not build."""
+
+    return {key: value for key, value in result.items() if key != "conduit_label"}
@@ -0,0 +1,155 @@
+import itertools
+import json
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+from django.urls import reverse
+
+from apps.awg.models import CableSize
+from apps.awg.solver import find_awg, get_tables, invalidate_tables
+from apps.awg.tests.helpers import comparable, legacy_find_awg, random_requests
+from apps.awg.views.requests import BATCH_RATE_LIMIT
+
+FIXTURES_DIR = Path(__file__).resolve().parents[1] / "fixtures"
+
+
+@pytest.fixture
+def awg_tables(db):
+    fixtures = sorted(
+        str(path)
+        for path in FIXTURES_DIR.glob("*.json")
+        if path.name.startswith(("cable_sizes__", "conduit_fills__"))
+    )
+    call_command("loaddata", *fixtures, verbosity=0)
+    invalidate_tables()
+    yield
+    invalidate_tables()
+
+
+@pytest.fixture
+def batch_client(client, django_user_model, settings, request):
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": f"awg-batch-{request.node.nodeid}",
+        }
+    }
+    user = django_user_model.objects.create_user("awg-batch", password="x")
+    client.force_login(user)
+    return client
+
+
+def post_batch(client, payload):
+    return client.post(
+        reverse("awg:awg_calculate_batch"),
+        data=json.dumps(payload),
+        content_type="application/json",
+    )
+
+
+def test_solver_matches_legacy_across_parameter_grid(awg_tables):
+    grid = itertools.product(
+        (5, 60, 250),
+        (15, 95, 180, 400),
+        (120, 240),
+        ("cu", "al"),
+        (None, "8", "2/0"),
+        (1, 3),
+        (2, 3),
+        (None, 90),
+        ("[1]",),
+    )
+    for meters, amps, volts, material, max_awg, max_lines, phases, temperature, ground in grid:
+        params = {
+            "meters": meters,
+            "amps": amps,
+            "volts": volts,
+            "material": material,
+            "max_awg": max_awg,
+            "max_lines": max_lines,
+            "phases": phases,
+            "temperature": temperature,
+            "conduit": "emt",
+            "ground": ground,
+        }
+        assert comparable(find_awg(**params)) == legacy_find_awg(**params), params
+
+
+def test_solver_matches_legacy_for_random_requests(awg_tables):
+    for params in random_requests(300, seed=11):
+        assert comparable(find_awg(**params)) == legacy_find_awg(**params), params
+
+
+def test_tables_reload_after_cable_size_changes(awg_tables):
+    params = {"meters": 10, "amps": 40, "volts": 220}
+    assert find_awg(**params)["awg"] == "8"
+    tables = get_tables()
+
+    CableSize.objects.filter(material="cu", awg_size="8").update(amps_60c=1)
+    CableSize.objects.get(material="cu", awg_size="8", line_num=1).save()
+
+    assert get_tables() is not tables
+    assert find_awg(**params)["awg"] == "6"
+
+
+def test_batch_endpoint_returns_result_per_circuit(batch_client, awg_tables):
+    response = post_batch(
+        batch_client,
+        {
+            "defaults": {"volts": "220", "material": "cu"},
+            "circuits": [
+                {"meters": "10", "amps": "40"},
+                {"meters": "30", "amps": "80", "conduit": "emt"},
+                {"amps": "40"},
+            ],
+        },
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[0]["result"] == find_awg(meters=10, amps=40, volts=220)
+    assert results[1]["result"]["pipe_inch"]
+    assert "error" in results[2]
+
+
+def test_batch_endpoint_rejects_oversized_payload(batch_client, awg_tables):
+    response = post_batch(batch_client, {"circuits": [{"meters": 1}] * 201})
+
+    assert response.status_code == 400
+
+
+def test_batch_endpoint_requires_login(client, awg_tables):
+    response = post_batch(client, {"circuits": [{"meters": "10", "amps": "40"}]})
+
+    assert response.status_code == 302
+    assert reverse("pages:login") in response["Location"]
+
+
+def test_batch_endpoint_enforces_csrf(batch_client, awg_tables):
+    csrf_client = Client(enforce_csrf_checks=True)
+    csrf_client.cookies = batch_client.cookies
+
+    response = post_batch(csrf_client, {"circuits": [{"meters": "10", "amps": "40"}]})
+
+    assert response.status_code == 403
+
+
+def test_batch_endpoint_is_rate_limited_per_user(batch_client, awg_tables):
+    payload = {"circuits": [{"meters": "10", "amps": "40", "volts": "220"}]}
+    statuses = [
+        post_batch(batch_client, payload).status_code
+        for _ in range(BATCH_RATE_LIMIT + 1)
+    ]
+
+    assert statuses[:BATCH_RATE_LIMIT] == [200] * BATCH_RATE_LIMIT
+    assert statuses[-1] == 429
+
+
+def test_benchmark_reports_cold_and_warm_passes(awg_tables, capsys):
+    call_command("benchmark", "awg-solver", "--requests", "50", "--json")
+
+    payload = json.loads(capsys.readouterr().out)
+    assert [run["phase"] for run in payload["runs"]] == ["cold", "warm"]
+    assert all(run["requests"] == 50 for run in payload["runs"])
@@ -6,6 +6,9 @@ app_name = "awg"
 
 urlpatterns = [
     path("calculate/", requests.awg_calculate, name="awg_calculate"),
+    path(
+        "calculate/batch/", requests.awg_calculate_batch, name="awg_calculate_batch"
+    ),
     path("", requests.calculator, name="calculator"),
     path("zapped/", requests.zapped_result, name="zapped"),
     path("energy-tariff/", reports.energy_tariff_calculator, name="energy_tariff"),
@@ -6,3 +6,4 @@ class AwsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.aws"
     verbose_name = _("AWS")
+    deferred_imports = ("boto3", "botocore")
@@ -6,19 +6,23 @@ from typing import Any, Optional
 from .models import AWSCredentials, LightsailDatabase, LightsailInstance
 
 
-try:
-    import boto3
-    from botocore.exceptions import BotoCoreError, ClientError
-except ModuleNotFoundError:
-    boto3 = None
-    BotoCoreError = ClientError = Exception
+# boto3 is imported on first use; it adds over half a second to every startup.
+boto3 = None
+BotoCoreError = ClientError = Exception
 
 
 def _require_boto3():
+    global boto3, BotoCoreError, ClientError
     if boto3 is None:
-        raise ImportError(
-            "boto3 is required for AWS Lightsail operations. Install the optional AWS dependencies."
-        )
+        try:
+            import boto3 as boto3_module
+            from botocore.exceptions import BotoCoreError as boto_core_error
+            from botocore.exceptions import ClientError as client_error
+        except ModuleNotFoundError as exc:
+            raise ImportError(
+                "boto3 is required for AWS Lightsail operations. Install the optional AWS dependencies."
+            ) from exc
+        boto3, BotoCoreError, ClientError = boto3_module, boto_core_error, client_error
     return boto3
 
 class LightsailFetchError(Exception):
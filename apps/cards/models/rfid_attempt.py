@@ -86,7 +86,7 @@ class RFIDAttempt(Entity):
         return f"{tag} ({status})"
 
     @classmethod
-    def record_attempt(
+    def build_attempt(
         cls,
         payload: dict[str, Any],
         *,
@@ -97,6 +97,8 @@ class RFIDAttempt(Entity):
         account_id: int | None = None,
         transaction_id: int | None = None,
     ) -> "RFIDAttempt | None":
+        """Return an unsaved attempt for ``payload`` without checking its label."""
+
         rfid_value = str(payload.get("rfid", "") or "").strip().upper()
         if not rfid_value:
             return None
@@ -115,12 +117,8 @@ class RFIDAttempt(Entity):
             )
         except (TypeError, ValueError):
             label_id = None
-        if label_id is not None:
-            label_model = cls._meta.get_field("label").remote_field.model
-            if not label_model.objects.filter(pk=label_id).exists():
-                label_id = None
         allowed_value = payload.get("allowed") if "allowed" in payload else None
-        return cls.objects.create(
+        return cls(
             rfid=rfid_value,
             label_id=label_id,
             status=normalized_status,
@@ -132,3 +130,48 @@ class RFIDAttempt(Entity):
             account_id=account_id,
             transaction_id=transaction_id,
         )
+
+    @classmethod
+    def record_attempt(
+        cls,
+        payload: dict[str, Any],
+        *,
+        source: str,
+        status: str | None = None,
+        authenticated: bool | None = None,
+        charger_id: int | None = None,
+        account_id: int | None = None,
+        transaction_id: int | None = None,
+    ) -> "RFIDAttempt | None":
+        attempt = cls.build_attempt(
+            payload,
+            source=source,
+            status=status,
+            authenticated=authenticated,
+            charger_id=charger_id,
+            account_id=account_id,
+            transaction_id=transaction_id,
+        )
+        if attempt is None:
+            return None
+        if attempt.label_id is not None:
+            label_model = cls._meta.get_field("label").remote_field.model
+            if not label_model.objects.filter(pk=attempt.label_id).exists():
+                attempt.label_id = None
+        attempt.save(force_insert=True)
+        return attempt
+
+    @classmethod
+    def bulk_record(cls, attempts: list["RFIDAttempt"]) -> list["RFIDAttempt"]:
+        """Insert unsaved ``attempts`` at once, dropping labels that no longer exist."""
+
+        label_ids = {attempt.label_id for attempt in attempts if attempt.label_id is not None}
+        if label_ids:
+            label_model = cls._meta.get_field("label").remote_field.model
+            existing = set(
+                label_model.objects.filter(pk__in=label_ids).values_list("pk", flat=True)
+            )
+            for attempt in attempts:
+                if attempt.label_id not in existing:
+                    attempt.label_id = None
+        return cls.objects.bulk_create(attempts)
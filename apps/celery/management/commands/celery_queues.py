@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from apps.celery.topology import (
+    DEFAULT_TASK_CLASS,
+    LEGACY_QUEUE,
+    TASK_CLASSES,
+    oldest_wait_seconds,
+    queue_depths,
+    worker_command,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Report each Celery task class with its queue, time limits and worker "
+        "profile, plus the queue depth and the age of its oldest waiting message."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--json", action="store_true", help="Emit JSON output.")
+
+    def handle(self, *args, **options):
+        from config.celery import app
+
+        try:
+            depths = queue_depths(app)
+            waits = oldest_wait_seconds(app)
+        except Exception as exc:
+            self.stderr.write(f"Broker unavailable: {exc}")
+            depths, waits = {}, {}
+
+        classes = [
+            {
+                "name": task_class.name,
+                "queue": task_class.queue,
+                "default": task_class is DEFAULT_TASK_CLASS,
+                "soft_time_limit": task_class.soft_time_limit,
+                "time_limit": task_class.time_limit,
+                "periodic_expires": task_class.periodic_expires,
+                "concurrency": task_class.concurrency,
+                "depth": depths.get(task_class.queue),
+                "oldest_wait_seconds": waits.get(task_class.queue),
+                "worker_command": worker_command(task_class),
+            }
+            for task_class in TASK_CLASSES
+        ]
+        payload = {"classes": classes, "legacy_queue_depth": depths.get(LEGACY_QUEUE)}
+
+        if options["json"]:
+            self.stdout.write(json.dumps(payload, indent=2))
+            return
+
+        for entry in classes:
+            depth = "unknown" if entry["depth"] is None else entry["depth"]
+            oldest = entry["oldest_wait_seconds"]
+            wait = "n/a" if oldest is None else f"{oldest:.1f} s"
+            default = " (default)" if entry["default"] else ""
+            self.stdout.write(
+                f"{entry['name']}{default}: queue={entry['queue']} depth={depth} "
+                f"oldest_wait={wait} limits={entry['soft_time_limit']}/"
+                f"{entry['time_limit']} s expires={entry['periodic_expires']} s"
+            )
+            self.stdout.write(f"  worker: {entry['worker_command']}")
+        legacy = payload["legacy_queue_depth"]
+        if legacy:
+            self.stdout.write(f"{LEGACY_QUEUE}: {legacy} messages waiting from before the split")
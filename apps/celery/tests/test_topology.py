@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+
+import pytest
+from celery import Celery
+from celery.contrib.testing.worker import start_worker
+from django.conf import settings
+
+from apps.celery import topology
+from apps.core import instrumentation
+from config.celery import app as project_app
+
+
+@pytest.fixture
+def harness_app(monkeypatch) -> Celery:
+    # Celery prefers these variables over app configuration.
+    monkeypatch.delenv("CELERY_BROKER_URL", raising=False)
+    monkeypatch.delenv("CELERY_RESULT_BACKEND", raising=False)
+    app = Celery("topology-harness")
+    app.conf.update(
+        broker_url="memory://",
+        result_backend="cache+memory://",
+        task_queues=topology.task_queues(),
+        task_default_queue=topology.DEFAULT_TASK_CLASS.queue,
+        task_routes=("apps.celery.topology.route_task",),
+        task_annotations=(topology.TaskClassAnnotations(),),
+        worker_prefetch_multiplier=1,
+    )
+    return app
+
+
+@pytest.mark.parametrize(
+    ("task_name", "queue"),
+    [
+        ("apps.sensors.tasks.refresh_usb_lcd_status", "realtime"),
+        ("apps.sensors.tasks.sample_thermometers", "realtime"),
+        ("apps.ocpp.tasks.setup_forwarders", "ocpp"),
+        ("apps.ocpp.tasks.check_charge_point_configuration", "maintenance"),
+        ("apps.ocpp.tasks.schedule_daily_firmware_snapshot_requests", "maintenance"),
+        ("apps.ocpp.tasks.send_offline_charge_point_notifications", "maintenance"),
+        ("apps.summary.tasks.generate_lcd_log_summary", "heavy"),
+        ("apps.repos.tasks.monitor_github_readiness", "heavy"),
+        ("apps.unlisted.tasks.anything", "maintenance"),
+    ],
+)
+def test_tasks_route_to_their_class_queue(task_name, queue):
+    route = project_app.amqp.router.route({}, task_name)
+
+    assert route["queue"].name == queue
+
+
+def test_registered_tasks_get_class_time_limits():
+    project_app.loader.import_default_modules()
+
+    lcd = project_app.tasks["apps.sensors.tasks.refresh_usb_lcd_status"]
+    summary = project_app.tasks["apps.summary.tasks.generate_lcd_log_summary"]
+
+    assert (lcd.soft_time_limit, lcd.time_limit) == (20, 30)
+    assert (summary.soft_time_limit, summary.time_limit) == (3600, 7200)
+
+
+def test_unlisted_tasks_keep_running_without_limits():
+    class UnlistedTask:
+        name = "apps.unlisted.tasks.anything"
+        soft_time_limit = None
+        time_limit = None
+
+    assert topology.TaskClassAnnotations().annotate(UnlistedTask()) is None
+
+
+def test_every_beat_entry_expires_within_its_interval():
+    schedule = settings.CELERY_BEAT_SCHEDULE
+
+    assert all("expires" in entry["options"] for entry in schedule.values())
+    assert schedule["usb_lcd_status"]["options"]["expires"] == 30
+    assert schedule["thermometer_sampling"]["options"]["expires"] == 30
+    assert schedule["llm_summary_lcd"]["options"]["expires"] == 300
+    assert schedule["ocpp_configuration_check"]["options"]["expires"] == 3600
+    assert schedule["ocpp_fleet_maintenance_pump"]["options"]["expires"] == 10
+
+
+def test_periodic_expiry_keeps_explicit_options():
+    schedule = topology.with_periodic_expiry(
+        {
+            "fast": {"task": "apps.ocpp.tasks.setup_forwarders", "schedule": timedelta(seconds=10)},
+            "pinned": {
+                "task": "apps.ocpp.tasks.setup_forwarders",
+                "schedule": timedelta(minutes=5),
+                "options": {"expires": 5, "priority": 3},
+            },
+        }
+    )
+
+    assert schedule["fast"]["options"] == {"expires": 10}
+    assert schedule["pinned"]["options"] == {"expires": 5, "priority": 3}
+
+
+def test_realtime_worker_is_not_blocked_by_a_heavy_flood(harness_app):
+    app = harness_app
+    ran: list[str] = []
+
+    @app.task(name="apps.summary.tasks.flood")
+    def flood():
+        time.sleep(0.05)
+        ran.append("heavy")
+
+    @app.task(name="apps.sensors.tasks.sample_thermometers")
+    def sample():
+        ran.append("realtime")
+        return "sampled"
+
+    for _ in range(500):
+        flood.delay()
+    published = time.monotonic()
+    result = sample.delay()
+
+    depths = topology.queue_depths(app)
+    assert depths["heavy"] == 500
+    assert depths["realtime"] == 1
+
+    with start_worker(
+        app, pool="solo", concurrency=1, queues=["realtime"], perform_ping_check=False
+    ):
+        assert result.get(timeout=10) == "sampled"
+        waited = time.monotonic() - published
+
+    assert waited < 5
+    assert ran == ["realtime"]
+    assert topology.queue_depths(app)["heavy"] == 500
+
+
+def test_queue_wait_is_recorded_per_task_class(harness_app):
+    app = harness_app
+    instrumentation.install()
+
+    @app.task(name="apps.ocpp.tasks.setup_forwarders")
+    def forwarders():
+        return True
+
+    wait = instrumentation.celery_task_queue_wait.labels("ocpp")
+    observed = wait.count()
+    published = instrumentation.celery_tasks_published.labels("ocpp").value()
+
+    result = forwarders.delay()
+    with start_worker(app, pool="solo", concurrency=1, perform_ping_check=False):
+        assert result.get(timeout=10) is True
+
+    assert instrumentation.celery_tasks_published.labels("ocpp").value() == published + 1
+    assert wait.count() == observed + 1
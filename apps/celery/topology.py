@@ -0,0 +1,250 @@
+"""Declarative Celery task classes: queue routing, time limits and worker profiles.
+
+Every task belongs to one task class. The class decides which queue the task
+is published to, the soft and hard runtime limits applied by the worker, how
+long a periodic run may wait in the queue before it is dropped, and the
+concurrency suggested for a worker dedicated to that queue. Tasks that are not
+listed are published to the queue of :data:`DEFAULT_TASK_CLASS` but keep
+Celery's default of no runtime limit.
+
+This module is imported by the settings, so it must not touch Django models.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from fnmatch import fnmatchcase
+
+from kombu.entity import Queue
+
+# Messages published before queues were split still sit in Celery's default
+# queue, so workers keep consuming it until it drains.
+LEGACY_QUEUE = "celery"
+# Message header stamped at publish time and read back to measure queue wait.
+PUBLISHED_AT_HEADER = "published_at"
+
+
+@dataclass(frozen=True)
+class TaskClass:
+    name: str
+    queue: str
+    soft_time_limit: int
+    time_limit: int
+    periodic_expires: int
+    concurrency: int
+    tasks: tuple[str, ...] = ()
+
+    def matches(self, task_name: str) -> bool:
+        return any(fnmatchcase(task_name, pattern) for pattern in self.tasks)
+
+
+REALTIME = TaskClass(
+    name="realtime",
+    queue="realtime",
+    soft_time_limit=20,
+    time_limit=30,
+    periodic_expires=30,
+    concurrency=2,
+    tasks=(
+        "apps.core.tasks.heartbeat",
+        "apps.sensors.tasks.refresh_usb_lcd_status",
+        "apps.sensors.tasks.sample_thermometers",
+        "apps.sensors.tasks.scan_usb_trackers",
+    ),
+)
+OCPP = TaskClass(
+    name="ocpp",
+    queue="ocpp",
+    soft_time_limit=60,
+    time_limit=120,
+    periodic_expires=300,
+    concurrency=2,
+    tasks=(
+        "apps.ocpp.tasks.push_forwarded_charge_points",
+        "apps.ocpp.tasks.request_charge_point_log",
+        "apps.ocpp.tasks.reset_cached_statuses",
+        "apps.ocpp.tasks.setup_forwarders",
+        "apps.ocpp.tasks.sync_remote_chargers",
+    ),
+)
+MAINTENANCE = TaskClass(
+    name="maintenance",
+    queue="maintenance",
+    soft_time_limit=300,
+    time_limit=600,
+    periodic_expires=3600,
+    concurrency=2,
+    tasks=(
+        # Nightly per-charger fan-outs stay out of the ocpp lane.
+        "apps.ocpp.tasks.check_charge_point_configuration",
+        "apps.ocpp.tasks.pump_fleet_maintenance",
+        "apps.ocpp.tasks.request_charge_point_firmware",
+        "apps.ocpp.tasks.request_power_projection",
+        "apps.ocpp.tasks.run_fleet_maintenance_job",
+        "apps.ocpp.tasks.schedule_*",
+        "apps.ocpp.tasks.purge_meter_values",
+        "apps.ocpp.tasks.rollup_meter_values",
+        "apps.ocpp.tasks.send_daily_session_report",
+        "apps.ocpp.tasks.send_offline_charge_point_notifications",
+    ),
+)
+HEAVY = TaskClass(
+    name="heavy",
+    queue="heavy",
+    soft_time_limit=3600,
+    time_limit=7200,
+    periodic_expires=3600,
+    concurrency=1,
+    tasks=(
+        "apps.classification.tasks.*",
+        "apps.core.tasks.auto_upgrade.tasks.*",
+        "apps.core.tasks.maintenance._run_client_report_schedule",
+        "apps.core.tasks.maintenance._run_release_data_transform",
+        "apps.core.tasks.maintenance._run_scheduled_release",
+        "apps.nodes.tasks.apply_upgrade_policies",
+        "apps.nodes.tasks.capture_node_screenshot",
+        "apps.reports.tasks.run_scheduled_sql_reports",
+        "apps.repos.tasks.*",
+        "apps.sites.tasks.create_user_story_github_issue",
+        "apps.summary.tasks.*",
+        "apps.tasks.tasks.create_manual_task_github_issue",
+        "apps.users.tasks.analyze_uploaded_error_report",
+        "apps.video.tasks.*",
+    ),
+)
+
+TASK_CLASSES: tuple[TaskClass, ...] = (REALTIME, OCPP, MAINTENANCE, HEAVY)
+DEFAULT_TASK_CLASS = MAINTENANCE
+
+_TASK_CLASS_CACHE: dict[str, TaskClass | None] = {}
+
+
+def listed_task_class(task_name: str | None) -> TaskClass | None:
+    """Return the task class that lists *task_name*, or ``None``."""
+
+    if not task_name:
+        return None
+    if task_name not in _TASK_CLASS_CACHE:
+        _TASK_CLASS_CACHE[task_name] = next(
+            (task_class for task_class in TASK_CLASSES if task_class.matches(task_name)),
+            None,
+        )
+    return _TASK_CLASS_CACHE[task_name]
+
+
+def task_class_for(task_name: str | None) -> TaskClass:
+    """Return the task class for *task_name*, falling back to the default class."""
+
+    return listed_task_class(task_name) or DEFAULT_TASK_CLASS
+
+
+def task_queues() -> tuple[Queue, ...]:
+    """Return every queue a worker started without ``-Q`` should consume."""
+
+    names = [task_class.queue for task_class in TASK_CLASSES]
+    names.append(LEGACY_QUEUE)
+    return tuple(Queue(name, routing_key=name) for name in dict.fromkeys(names))
+
+
+def route_task(name, args, kwargs, options, task=None, **kw):
+    """Celery router that publishes each task to its class queue."""
+
+    return {"queue": task_class_for(name).queue}
+
+
+class TaskClassAnnotations:
+    """Celery annotation object that applies class time limits to each task.
+
+    Limits set explicitly on a task's decorator are left alone, and tasks no
+    class lists keep running without limits.
+    """
+
+    def annotate(self, task):
+        task_class = listed_task_class(getattr(task, "name", None))
+        if task_class is None:
+            return None
+        limits = {}
+        if getattr(task, "soft_time_limit", None) is None:
+            limits["soft_time_limit"] = task_class.soft_time_limit
+        if getattr(task, "time_limit", None) is None:
+            limits["time_limit"] = task_class.time_limit
+        return limits or None
+
+
+def with_periodic_expiry(schedule: dict[str, dict]) -> dict[str, dict]:
+    """Give every beat entry an ``expires`` so stale runs are dropped.
+
+    Interval schedules expire after one interval, because the next run
+    supersedes them. Crontab entries use their task class's expiry.
+    """
+
+    resolved: dict[str, dict] = {}
+    for key, entry in schedule.items():
+        options = dict(entry.get("options") or {})
+        if "expires" not in options:
+            task_class = task_class_for(entry.get("task"))
+            expires = task_class.periodic_expires
+            interval = entry.get("schedule")
+            if isinstance(interval, timedelta):
+                expires = min(expires, max(1, int(interval.total_seconds())))
+            options["expires"] = expires
+        resolved[key] = {**entry, "options": options}
+    return resolved
+
+
+def worker_command(task_class: TaskClass, *, node_name: str = "%h") -> str:
+    """Return the worker command line for a worker dedicated to *task_class*."""
+
+    queues = [task_class.queue]
+    if task_class is DEFAULT_TASK_CLASS:
+        queues.append(LEGACY_QUEUE)
+    return (
+        "python -m celery -A config worker -l info "
+        f"-Q {','.join(queues)} --concurrency={task_class.concurrency} "
+        f"-n worker.{task_class.name}@{node_name}"
+    )
+
+
+def queue_depths(app) -> dict[str, int | None]:
+    """Return the number of waiting messages per queue, ``None`` when unknown."""
+
+    depths: dict[str, int | None] = {}
+    with app.connection_for_read() as connection:
+        channel = connection.default_channel
+        for queue in task_queues():
+            try:
+                declared = channel.queue_declare(queue=queue.name, passive=True)
+            except Exception:
+                depths[queue.name] = None
+                continue
+            depths[queue.name] = declared.message_count
+    return depths
+
+
+def oldest_wait_seconds(app, *, now: float | None = None) -> dict[str, float | None]:
+    """Return how long the oldest waiting message of each queue has waited.
+
+    Only Redis brokers can be inspected without consuming messages; other
+    transports report ``None`` for every queue.
+    """
+
+    now = time.time() if now is None else now
+    ages: dict[str, float | None] = {queue.name: None for queue in task_queues()}
+    with app.connection_for_read() as connection:
+        client = getattr(connection.default_channel, "client", None)
+        if client is None or not hasattr(client, "lindex"):
+            return ages
+        for name in ages:
+            # Kombu pushes on the left and pops on the right.
+            raw = client.lindex(name, -1)
+            if raw is None:
+                continue
+            try:
+                published_at = json.loads(raw)["headers"][PUBLISHED_AT_HEADER]
+            except (KeyError, TypeError, ValueError):
+                continue
+            ages[name] = max(0.0, now - float(published_at))
+    return ages
@@ -3,13 +3,20 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 import json
 import math
 from pathlib import Path
-from typing import Iterable
+import threading
+from typing import Iterable, Sequence
 
 from django.conf import settings
-from PIL import Image
+from PIL import Image, ImageChops
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
 
 from .models import ImageClassifierModel, TrainingSample
 
@@ -32,16 +39,70 @@ class TrainingArtifact:
     metrics: dict[str, object]
 
 
+@dataclass(frozen=True)
+class ReferenceMatrix:
+    """Normalized tag centroids loaded once from a classifier artifact.
+
+    ``rows`` holds one unit-length centroid per tag, as a NumPy matrix when
+    NumPy is installed and as a tuple of tuples otherwise. ``signature``
+    identifies the artifact revision the matrix was built from.
+    """
+
+    signature: tuple[str, int, int]
+    tags: tuple[str, ...]
+    sample_counts: tuple[int, ...]
+    rows: object
+
+    def __len__(self) -> int:
+        return len(self.tags)
+
+
+@lru_cache(maxsize=None)
+def _bin_lookup_table(bins: int, scale: int = 1) -> tuple[int, ...]:
+    """Return a Pillow ``point`` table mapping channel values to scaled bins."""
+
+    return tuple(min(bins - 1, value * bins // 256) * scale for value in range(256))
+
+
+@lru_cache(maxsize=None)
+def _bin_mask_table(bin_index: int) -> tuple[int, ...]:
+    """Return a ``point`` table selecting pixels whose bin equals ``bin_index``."""
+
+    return tuple(255 if value == bin_index else 0 for value in range(256))
+
+
+def _normalize(vector: Sequence[float]) -> tuple[float, ...]:
+    norm = math.sqrt(sum(value * value for value in vector))
+    if not norm:
+        return tuple(0.0 for _ in vector)
+    return tuple(value / norm for value in vector)
+
+
 class ColorHistogramBackend:
     """Small histogram-based baseline for image-tag classification.
 
     This backend is intentionally simple. It is not a production-quality model,
     but it gives the suite a real vertical slice for: training from examples,
     persisting an artifact, loading it later, and scoring new camera frames.
+
+    Histograms are computed with NumPy when it is installed and with Pillow's
+    native ``histogram()`` otherwise. Tag centroids are kept as a normalized
+    reference matrix per artifact so scoring a batch of frames is a single
+    matrix product.
     """
 
     slug = "color_histogram"
     bins = (8, 8, 8)
+    sample_size = (128, 128)
+
+    def __init__(self) -> None:
+        self._references: dict[str, ReferenceMatrix] = {}
+        self._references_lock = threading.Lock()
+
+    @property
+    def vector_size(self) -> int:
+        red_bins, green_bins, blue_bins = self.bins
+        return red_bins * green_bins * blue_bins
 
     def _artifact_dir(self, classifier: ImageClassifierModel) -> Path:
         base_dir = Path(getattr(settings, "MEDIA_ROOT", Path.cwd() / "media"))
@@ -53,33 +114,64 @@ class ColorHistogramBackend:
         safe_version = Path(str(classifier.version)).name or "artifact"
         return self._artifact_dir(classifier) / f"{safe_version}.json"
 
-    def _compute_histogram(self, image_path: Path) -> list[float]:
+    def _load_image(self, image_path: Path) -> Image.Image:
         try:
             with Image.open(image_path) as opened_image:
                 image = opened_image.convert("RGB")
         except (OSError, ValueError) as exc:
             raise ValueError(f"Unable to read image at {image_path}") from exc
 
-        image = image.resize((128, 128), Image.Resampling.NEAREST)
-
-        red_bins, green_bins, blue_bins = self.bins
-        histogram = [0.0] * (red_bins * green_bins * blue_bins)
+        image = image.resize(self.sample_size, Image.Resampling.NEAREST)
         width, height = image.size
         if width <= 0 or height <= 0:
             raise ValueError(f"Image at {image_path} did not contain readable pixels.")
+        return image
 
-        pixels = image.load()
-        for x in range(width):
-            for y in range(height):
-                red, green, blue = pixels[x, y]
-                red_index = min(red_bins - 1, red * red_bins // 256)
-                green_index = min(green_bins - 1, green * green_bins // 256)
-                blue_index = min(blue_bins - 1, blue * blue_bins // 256)
-                flat_index = (red_index * green_bins + green_index) * blue_bins + blue_index
-                histogram[flat_index] += 1.0
-
+    def _histogram_counts_numpy(self, image: Image.Image):
+        red_bins, green_bins, blue_bins = self.bins
+        pixels = np.asarray(image, dtype=np.uint8).reshape(-1, 3)
+        red_index = np.asarray(_bin_lookup_table(red_bins), dtype=np.intp)[pixels[:, 0]]
+        green_index = np.asarray(_bin_lookup_table(green_bins), dtype=np.intp)[pixels[:, 1]]
+        blue_index = np.asarray(_bin_lookup_table(blue_bins), dtype=np.intp)[pixels[:, 2]]
+        flat_index = (red_index * green_bins + green_index) * blue_bins + blue_index
+        return np.bincount(flat_index, minlength=self.vector_size).astype(np.float64)
+
+    def _histogram_counts_pillow(self, image: Image.Image) -> list[float]:
+        red_bins, green_bins, blue_bins = self.bins
+        red_green_bins = red_bins * green_bins
+        if red_green_bins > 256:
+            raise ValueError("Pillow histograms support at most 256 red/green bin pairs.")
+
+        red, green, blue = image.split()
+        red_green_index = ImageChops.add(
+            red.point(_bin_lookup_table(red_bins, green_bins)),
+            green.point(_bin_lookup_table(green_bins)),
+        )
+        blue_index = blue.point(_bin_lookup_table(blue_bins))
+
+        counts = [0.0] * self.vector_size
+        for blue_bin in range(blue_bins):
+            mask = blue_index.point(_bin_mask_table(blue_bin))
+            channel_counts = red_green_index.histogram(mask)
+            for red_green_bin in range(red_green_bins):
+                counts[red_green_bin * blue_bins + blue_bin] = float(
+                    channel_counts[red_green_bin]
+                )
+        return counts
+
+    def _histogram_vector(self, image_path: Path):
+        image = self._load_image(image_path)
+        width, height = image.size
         total = float(width * height)
-        return [value / total for value in histogram]
+        if np is not None:
+            return self._histogram_counts_numpy(image) / total
+        return [value / total for value in self._histogram_counts_pillow(image)]
+
+    def _compute_histogram(self, image_path: Path) -> list[float]:
+        vector = self._histogram_vector(image_path)
+        if np is not None:
+            return vector.tolist()
+        return vector
 
     def _average_vectors(self, vectors: list[list[float]]) -> list[float]:
         if not vectors:
@@ -91,14 +183,6 @@ class ColorHistogramBackend:
                 totals[index] += value
         return [value / len(vectors) for value in totals]
 
-    def _cosine_similarity(self, left: list[float], right: list[float]) -> float:
-        dot_product = sum(left_value * right_value for left_value, right_value in zip(left, right))
-        left_norm = math.sqrt(sum(value * value for value in left))
-        right_norm = math.sqrt(sum(value * value for value in right))
-        if not left_norm or not right_norm:
-            return 0.0
-        return dot_product / (left_norm * right_norm)
-
     def train(
         self,
         *,
@@ -129,6 +213,7 @@ class ColorHistogramBackend:
 
         artifact_path = self._artifact_path(classifier)
         artifact_path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+        self.clear_references(artifact_path.as_posix())
         metrics = {
             "backend": self.slug,
             "sample_count": int(sum(len(vectors) for vectors in vectors_by_tag.values())),
@@ -153,23 +238,109 @@ class ColorHistogramBackend:
             )
         return payload
 
-    def predict(
+    def _artifact_signature(self, classifier: ImageClassifierModel) -> tuple[str, int, int]:
+        if not classifier.storage_uri:
+            raise ValueError("Classifier does not have a stored artifact yet.")
+        stat = Path(classifier.storage_uri).stat()
+        return (str(classifier.storage_uri), stat.st_mtime_ns, stat.st_size)
+
+    def build_references(
         self,
+        tags: Iterable[tuple[str, Sequence[float], int]],
         *,
-        classifier: ImageClassifierModel,
-        media_file,
-        top_k: int = 3,
-    ) -> list[dict[str, object]]:
-        """Score ``media_file`` against the persisted tag centroids."""
+        signature: tuple[str, int, int] = ("", 0, 0),
+    ) -> ReferenceMatrix:
+        """Return a normalized reference matrix for ``(tag, centroid, samples)`` rows."""
+
+        tag_slugs: list[str] = []
+        sample_counts: list[int] = []
+        centroids: list[Sequence[float]] = []
+        for tag_slug, centroid, sample_count in tags:
+            if len(centroid) != self.vector_size:
+                continue
+            tag_slugs.append(tag_slug)
+            sample_counts.append(int(sample_count or 0))
+            centroids.append(centroid)
+
+        if np is not None:
+            matrix = np.asarray(centroids, dtype=np.float64).reshape(-1, self.vector_size)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            rows = matrix / np.where(norms == 0.0, 1.0, norms)
+        else:
+            rows = tuple(_normalize(centroid) for centroid in centroids)
+        return ReferenceMatrix(
+            signature=signature,
+            tags=tuple(tag_slugs),
+            sample_counts=tuple(sample_counts),
+            rows=rows,
+        )
+
+    def load_references(self, classifier: ImageClassifierModel) -> ReferenceMatrix:
+        """Return cached references for ``classifier``, reloading changed artifacts."""
+
+        signature = self._artifact_signature(classifier)
+        with self._references_lock:
+            cached = self._references.get(signature[0])
+        if cached is not None and cached.signature == signature:
+            return cached
 
         payload = self._load_payload(classifier)
-        vector = self._compute_histogram(resolve_media_file_path(media_file))
+        references = self.build_references(
+            (
+                (
+                    tag_slug,
+                    list(tag_payload.get("vector") or []),
+                    int(tag_payload.get("sample_count") or 0),
+                )
+                for tag_slug, tag_payload in dict(payload.get("tags") or {}).items()
+            ),
+            signature=signature,
+        )
+        with self._references_lock:
+            self._references[signature[0]] = references
+        return references
+
+    def clear_references(self, storage_uri: str | None = None) -> None:
+        """Drop cached reference matrices for ``storage_uri`` or for every artifact."""
+
+        with self._references_lock:
+            if storage_uri is None:
+                self._references.clear()
+            else:
+                self._references.pop(storage_uri, None)
+
+    def score_vectors(self, vectors: Sequence, references: ReferenceMatrix) -> list[list[float]]:
+        """Return cosine scores for each histogram in ``vectors`` against ``references``."""
+
+        if not vectors or not len(references):
+            return [[] for _ in vectors]
+        if np is not None:
+            queries = np.asarray(vectors, dtype=np.float64).reshape(-1, self.vector_size)
+            norms = np.linalg.norm(queries, axis=1, keepdims=True)
+            queries = queries / np.where(norms == 0.0, 1.0, norms)
+            return (queries @ references.rows.T).tolist()
+        scores: list[list[float]] = []
+        for vector in vectors:
+            query = _normalize(vector)
+            scores.append(
+                [
+                    sum(left * right for left, right in zip(query, row))
+                    for row in references.rows
+                ]
+            )
+        return scores
+
+    def _format_predictions(
+        self,
+        scores: Sequence[float],
+        references: ReferenceMatrix,
+        *,
+        top_k: int,
+    ) -> list[dict[str, object]]:
         predictions: list[dict[str, object]] = []
-        for tag_slug, tag_payload in dict(payload.get("tags") or {}).items():
-            centroid = list(tag_payload.get("vector") or [])
-            if not centroid:
-                continue
-            score = self._cosine_similarity(vector, centroid)
+        for tag_slug, sample_count, score in zip(
+            references.tags, references.sample_counts, scores
+        ):
             confidence = max(0.0, min(1.0, score))
             predictions.append(
                 {
@@ -178,13 +349,47 @@ class ColorHistogramBackend:
                     "metadata": {
                         "backend": self.slug,
                         "score": round(score, 6),
-                        "sample_count": int(tag_payload.get("sample_count") or 0),
+                        "sample_count": sample_count,
                     },
                 }
             )
         predictions.sort(key=lambda item: float(item.get("confidence") or 0.0), reverse=True)
         return predictions[: max(int(top_k), 1)]
 
+    def predict_many(
+        self,
+        *,
+        classifier: ImageClassifierModel,
+        media_files: Iterable,
+        top_k: int = 3,
+    ) -> list[list[dict[str, object]]]:
+        """Score every media file against the persisted tag centroids at once."""
+
+        references = self.load_references(classifier)
+        vectors = [
+            self._histogram_vector(resolve_media_file_path(media_file))
+            for media_file in media_files
+        ]
+        return [
+            self._format_predictions(scores, references, top_k=top_k)
+            for scores in self.score_vectors(vectors, references)
+        ]
+
+    def predict(
+        self,
+        *,
+        classifier: ImageClassifierModel,
+        media_file,
+        top_k: int = 3,
+    ) -> list[dict[str, object]]:
+        """Score ``media_file`` against the persisted tag centroids."""
+
+        return self.predict_many(
+            classifier=classifier,
+            media_files=[media_file],
+            top_k=top_k,
+        )[0]
+
 
 BACKENDS = {
     ColorHistogramBackend.slug: ColorHistogramBackend(),
@@ -0,0 +1,154 @@
+"""Benchmark per-image latency and throughput of the histogram classifier."""
+
+from __future__ import annotations
+
+import json
+import random
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.core.management.base import CommandError
+from PIL import Image
+
+from apps.classification import backends
+from apps.classification.backends import ColorHistogramBackend
+from apps.core.benchmarks import BenchmarkScenario
+
+DEFAULT_IMAGE_SIZES = (64, 256, 1024)
+DEFAULT_IMAGE_COUNT = 16
+DEFAULT_TAG_COUNT = 32
+
+
+@dataclass
+class BenchmarkRun:
+    image_size: int
+    image_count: int
+    engine: str
+    duration_seconds: float
+
+    @property
+    def per_image_ms(self) -> float:
+        if self.image_count <= 0:
+            return 0.0
+        return self.duration_seconds * 1000.0 / self.image_count
+
+    @property
+    def images_per_second(self) -> float:
+        if self.duration_seconds <= 0:
+            return 0.0
+        return self.image_count / self.duration_seconds
+
+    def to_dict(self) -> dict:
+        return {
+            "image_size": self.image_size,
+            "image_count": self.image_count,
+            "engine": self.engine,
+            "duration_seconds": self.duration_seconds,
+            "per_image_ms": self.per_image_ms,
+            "images_per_second": self.images_per_second,
+        }
+
+
+class ClassifierBenchmark(BenchmarkScenario):
+    help = (
+        "Measure per-image latency and throughput of the color histogram "
+        "classifier on synthetic images, histogram extraction plus scoring."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=list(DEFAULT_IMAGE_SIZES),
+            help="Square image edge lengths in pixels (default: 64 256 1024).",
+        )
+        parser.add_argument(
+            "--images",
+            type=int,
+            default=DEFAULT_IMAGE_COUNT,
+            help=f"Images scored per size (default: {DEFAULT_IMAGE_COUNT}).",
+        )
+        parser.add_argument(
+            "--tags",
+            type=int,
+            default=DEFAULT_TAG_COUNT,
+            help=f"Reference tags to score against (default: {DEFAULT_TAG_COUNT}).",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Random seed for the synthetic images.",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Emit JSON summary output.",
+        )
+
+    def handle(self, **options):
+        sizes = sorted(set(options["sizes"]))
+        if any(value <= 0 for value in sizes):
+            raise CommandError("--sizes values must be greater than zero.")
+        image_count = options["images"]
+        tag_count = options["tags"]
+        if image_count <= 0 or tag_count <= 0:
+            raise CommandError("--images and --tags must be greater than zero.")
+
+        backend = ColorHistogramBackend()
+        engine = "numpy" if backends.np is not None else "pillow"
+        rng = random.Random(options["seed"])
+        references = backend.build_references(
+            (f"tag-{index}", [rng.random() for _ in range(backend.vector_size)], 1)
+            for index in range(tag_count)
+        )
+
+        results: list[BenchmarkRun] = []
+        with tempfile.TemporaryDirectory() as work_dir:
+            for size in sizes:
+                paths = self._write_images(Path(work_dir), size=size, count=image_count, rng=rng)
+                start = time.perf_counter()
+                vectors = [backend._histogram_vector(path) for path in paths]
+                backend.score_vectors(vectors, references)
+                results.append(
+                    BenchmarkRun(
+                        image_size=size,
+                        image_count=len(paths),
+                        engine=engine,
+                        duration_seconds=time.perf_counter() - start,
+                    )
+                )
+
+        payload = {
+            "engine": engine,
+            "tags": tag_count,
+            "runs": [result.to_dict() for result in results],
+        }
+        if options["json"]:
+            self.stdout.write(json.dumps(payload, indent=2))
+            return
+
+        self.stdout.write(f"Classifier benchmark summary ({engine}, {tag_count} tags):")
+        for result in results:
+            self.stdout.write(
+                "  "
+                f"{result.image_size}px: "
+                f"{result.per_image_ms:.2f} ms/image, "
+                f"{result.images_per_second:.1f} images/s"
+            )
+
+    def _write_images(
+        self, work_dir: Path, *, size: int, count: int, rng: random.Random
+    ) -> list[Path]:
+        paths = []
+        for index in range(count):
+            image = Image.frombytes(
+                "RGB", (size, size), rng.randbytes(size * size * 3)
+            )
+            path = work_dir / f"{size}-{index}.png"
+            image.save(path)
+            paths.append(path)
+        return paths
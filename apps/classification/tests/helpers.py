@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import math
+from pathlib import Path
+
+from apps.classification.backends import ColorHistogramBackend
+
+
+def baseline_histogram(backend: ColorHistogramBackend, image_path: Path) -> list[float]:
+    """Return the histogram computed with the original per-pixel Python loop."""
+
+    image = backend._load_image(image_path)
+    red_bins, green_bins, blue_bins = backend.bins
+    histogram = [0.0] * (red_bins * green_bins * blue_bins)
+    width, height = image.size
+    pixels = image.load()
+    for x in range(width):
+        for y in range(height):
+            red, green, blue = pixels[x, y]
+            red_index = min(red_bins - 1, red * red_bins // 256)
+            green_index = min(green_bins - 1, green * green_bins // 256)
+            blue_index = min(blue_bins - 1, blue * blue_bins // 256)
+            flat_index = (red_index * green_bins + green_index) * blue_bins + blue_index
+            histogram[flat_index] += 1.0
+    total = float(width * height)
+    return [value / total for value in histogram]
+
+
+def baseline_cosine_similarity(left: list[float], right: list[float]) -> float:
+    """Return cosine similarity computed the way the original backend did."""
+
+    dot_product = sum(left_value * right_value for left_value, right_value in zip(left, right))
+    left_norm = math.sqrt(sum(value * value for value in left))
+    right_norm = math.sqrt(sum(value * value for value in right))
+    if not left_norm or not right_norm:
+        return 0.0
+    return dot_product / (left_norm * right_norm)
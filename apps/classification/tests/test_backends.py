@@ -0,0 +1,154 @@
+"""Tests for the vectorized color histogram classifier backend."""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import random
+from types import SimpleNamespace
+
+import pytest
+from django.core.management import call_command
+from PIL import Image
+
+from apps.classification import backends
+from apps.classification.backends import ColorHistogramBackend
+from apps.classification.tests.helpers import (
+    baseline_cosine_similarity,
+    baseline_histogram,
+)
+
+
+@pytest.fixture(params=["numpy", "pillow"])
+def histogram_engine(request, monkeypatch):
+    """Run a test once with NumPy and once with the Pillow fallback."""
+
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(backends, "np", None)
+    return request.param
+
+
+def _write_noise_image(path, *, size=(48, 40), seed=0):
+    rng = random.Random(seed)
+    Image.frombytes("RGB", size, rng.randbytes(size[0] * size[1] * 3)).save(path)
+    return path
+
+
+def _media(path):
+    return SimpleNamespace(file=SimpleNamespace(path=str(path)))
+
+
+def _classifier(storage_uri):
+    return SimpleNamespace(storage_uri=str(storage_uri))
+
+
+def _write_artifact(path, tags):
+    path.write_text(
+        json.dumps({"backend": "color_histogram", "bins": [8, 8, 8], "tags": tags}),
+        encoding="utf-8",
+    )
+
+
+def test_histogram_matches_per_pixel_baseline(histogram_engine, tmp_path):
+    """Vectorized histograms should equal the original per-pixel computation."""
+
+    backend = ColorHistogramBackend()
+    image_path = _write_noise_image(tmp_path / "noise.png", seed=7)
+
+    assert backend._compute_histogram(image_path) == pytest.approx(
+        baseline_histogram(backend, image_path)
+    )
+
+
+def test_predict_many_matches_baseline_scores(histogram_engine, tmp_path):
+    """Batch scores should match pairwise cosine similarity for every image."""
+
+    backend = ColorHistogramBackend()
+    rng = random.Random(3)
+    tags = {
+        f"tag-{index}": {
+            "sample_count": index + 1,
+            "vector": [rng.random() for _ in range(backend.vector_size)],
+        }
+        for index in range(4)
+    }
+    tags["empty"] = {"sample_count": 0, "vector": []}
+    artifact = tmp_path / "artifact.json"
+    _write_artifact(artifact, tags)
+    images = [_write_noise_image(tmp_path / f"{seed}.png", seed=seed) for seed in range(3)]
+
+    batches = backend.predict_many(
+        classifier=_classifier(artifact),
+        media_files=[_media(path) for path in images],
+        top_k=10,
+    )
+
+    assert len(batches) == len(images)
+    for image_path, predictions in zip(images, batches):
+        vector = baseline_histogram(backend, image_path)
+        expected = {
+            slug: round(baseline_cosine_similarity(vector, payload["vector"]), 6)
+            for slug, payload in tags.items()
+            if payload["vector"]
+        }
+        assert {item["tag"]: item["metadata"]["score"] for item in predictions} == expected
+        assert predictions == backend.predict(
+            classifier=_classifier(artifact),
+            media_file=_media(image_path),
+            top_k=10,
+        )
+
+
+def test_load_references_reuses_matrix_until_artifact_changes(tmp_path):
+    """Reference matrices should be cached per artifact revision."""
+
+    backend = ColorHistogramBackend()
+    artifact = tmp_path / "artifact.json"
+    _write_artifact(artifact, {"red": {"sample_count": 1, "vector": [1.0] * backend.vector_size}})
+    classifier = _classifier(artifact)
+
+    first = backend.load_references(classifier)
+    assert backend.load_references(classifier) is first
+
+    _write_artifact(
+        artifact,
+        {
+            "red": {"sample_count": 1, "vector": [1.0] * backend.vector_size},
+            "blue": {"sample_count": 2, "vector": [0.5] * backend.vector_size},
+        },
+    )
+    stat = artifact.stat()
+    os.utime(artifact, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    reloaded = backend.load_references(classifier)
+    assert reloaded is not first
+    assert reloaded.tags == ("red", "blue")
+    assert reloaded.sample_counts == (1, 2)
+
+
+def test_benchmark_classifier_json_output():
+    """The classifier benchmark should report one run per image size."""
+
+    stdout = io.StringIO()
+    call_command(
+        "benchmark",
+        "classifier",
+        "--sizes",
+        "16",
+        "32",
+        "--images",
+        "2",
+        "--tags",
+        "3",
+        "--json",
+        stdout=stdout,
+    )
+
+    payload = json.loads(stdout.getvalue())
+    engine = "numpy" if backends.np is not None else "pillow"
+    assert payload["engine"] == engine
+    assert [run["image_size"] for run in payload["runs"]] == [16, 32]
+    assert all(run["image_count"] == 2 for run in payload["runs"])
@@ -20,16 +20,6 @@ from django.utils.translation import gettext_lazy as _, ngettext
 from import_export import fields, resources
 from import_export.admin import ImportExportModelAdmin
 from import_export.widgets import ForeignKeyWidget
-from reportlab.graphics import renderPDF
-from reportlab.graphics.barcode import qr
-from reportlab.graphics.shapes import Drawing
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import landscape, letter
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import mm
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfgen import canvas
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
 
 from apps.cards.models import RFID, RFIDAttempt
 from apps.cards.reader import write_current_card_lcd_label
@@ -45,6 +35,7 @@ from apps.locals.user_data import EntityModelAdmin
 from apps.nodes.utils import ensure_feature_enabled
 from apps.nodes.models import NodeFeature
 from apps.ocpp.models import Transaction
+from apps.users.rfid_auth import invalidate_rfid_resolutions
 from apps.core.widgets import RFIDDataWidget
 
 from .forms import RFIDConfirmImportForm, RFIDExportForm, RFIDImportForm
@@ -395,6 +386,7 @@ class RFIDAdmin(EntityModelAdmin, ImportExportModelAdmin):
             toggled += 1
 
         if toggled:
+            invalidate_rfid_resolutions()
             self.message_user(
                 request,
                 ngettext(
@@ -678,6 +670,15 @@ class RFIDAdmin(EntityModelAdmin, ImportExportModelAdmin):
             )
             return HttpResponseRedirect(redirect_url)
 
+        from reportlab.graphics import renderPDF
+        from reportlab.graphics.barcode import qr
+        from reportlab.graphics.shapes import Drawing
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import landscape, letter
+        from reportlab.lib.units import mm
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfgen import canvas
+
         buffer = BytesIO()
         base_card_width = 85.6 * mm
         base_card_height = 54 * mm
@@ -836,6 +837,11 @@ class RFIDAdmin(EntityModelAdmin, ImportExportModelAdmin):
             self.message_user(request, empty_message, level=messages.WARNING)
             return HttpResponseRedirect(redirect_url)
 
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
         language = getattr(request, "LANGUAGE_CODE", translation.get_language())
         if not language:
             language = settings.LANGUAGE_CODE
@@ -6,11 +6,18 @@ from django.apps import AppConfig
 
 logger = logging.getLogger(__name__)
 
+# 16 MiB page cache (negative values are KiB), 128 MiB memory map and a
+# 64 MiB cap on the WAL file left behind after checkpoints.
+SQLITE_DEFAULT_CACHE_SIZE = -16384
+SQLITE_DEFAULT_MMAP_SIZE = 128 * 1024 * 1024
+SQLITE_JOURNAL_SIZE_LIMIT = 64 * 1024 * 1024
+
 
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.core"
     label = "core"
+    deferred_imports = ("reportlab",)
 
     def ready(self):  # pragma: no cover - called by Django
         _load_core_checks()
@@ -21,6 +28,7 @@ class CoreConfig(AppConfig):
         _configure_urlfield_assume_scheme()
         _connect_sqlite_wal()
         _enable_usage_analytics()
+        _enable_runtime_metrics()
 
 
 def _load_core_checks():
@@ -529,6 +537,7 @@ def _connect_sqlite_wal():
         cache_size = _sqlite_integer_pragma(
             env_name="ARTHEXIS_SQLITE_CACHE_SIZE",
             pragma_name="cache_size",
+            default=SQLITE_DEFAULT_CACHE_SIZE,
         )
         if cache_size is not None:
             pragma_statements.append(f"PRAGMA cache_size={cache_size};")
@@ -537,10 +546,13 @@ def _connect_sqlite_wal():
             env_name="ARTHEXIS_SQLITE_MMAP_SIZE",
             pragma_name="mmap_size",
             minimum=0,
+            default=SQLITE_DEFAULT_MMAP_SIZE,
         )
         if mmap_size is not None:
             pragma_statements.append(f"PRAGMA mmap_size={mmap_size};")
 
+        pragma_statements.append("PRAGMA temp_store=MEMORY;")
+        pragma_statements.append(f"PRAGMA journal_size_limit={SQLITE_JOURNAL_SIZE_LIMIT};")
         return pragma_statements
 
     def _sqlite_synchronous_level() -> str:
@@ -564,18 +576,19 @@ def _connect_sqlite_wal():
         env_name: str,
         pragma_name: str,
         minimum: int | None = None,
+        default: int | None = None,
     ) -> int | None:
         """Parse and validate integer-backed SQLite PRAGMA environment values."""
 
         raw_value = os.environ.get(env_name)
         if raw_value is None:
-            return None
+            return default
 
         try:
             parsed_value = int(raw_value.strip())
         except ValueError:
             logger.warning("Invalid %s value %r; ignoring %s.", env_name, raw_value, pragma_name)
-            return None
+            return default
 
         if minimum is not None and parsed_value < minimum:
             logger.warning(
@@ -585,7 +598,7 @@ def _connect_sqlite_wal():
                 pragma_name,
                 minimum,
             )
-            return None
+            return default
 
         return parsed_value
 
@@ -596,6 +609,13 @@ def _connect_sqlite_wal():
         if connection and connection.vendor == "sqlite":
             from django.db import DatabaseError
 
+            if connection.settings_dict.get("READ_ONLY"):
+                try:
+                    with connection.cursor() as cursor:
+                        cursor.execute("PRAGMA query_only=ON;")
+                except DatabaseError as exc:
+                    logger.warning("SQLite read-only connection setup failed: %s", exc)
+
             if _should_skip_sqlite_wal():
                 try:
                     with connection.cursor() as cursor:
@@ -650,4 +670,10 @@ def _enable_usage_analytics():
     from . import analytics  # noqa: F401 - ensure signal registration
 
 
+def _enable_runtime_metrics():
+    from . import instrumentation
+
+    instrumentation.install()
+
+
 _configure_urlfield_assume_scheme()
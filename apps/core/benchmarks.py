@@ -0,0 +1,488 @@
+"""Workload scenarios measured by ``manage.py benchmark <scenario>``."""
+
+from __future__ import annotations
+
+import json
+import random
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.apps import (
+    SQLITE_DEFAULT_CACHE_SIZE,
+    SQLITE_DEFAULT_MMAP_SIZE,
+    SQLITE_JOURNAL_SIZE_LIMIT,
+)
+from apps.core.metrics import MetricsRegistry
+
+
+class BenchmarkScenario:
+    """Base class for a named workload run through the ``benchmark`` command.
+
+    Subclasses set ``help``, register their options in :meth:`add_arguments`
+    and report from :meth:`handle` through the invoking command's output
+    streams, the same way a management command would.
+    """
+
+    help = ""
+
+    def __init__(self, command: BaseCommand) -> None:
+        self.stdout = command.stdout
+        self.stderr = command.stderr
+        self.style = command.style
+
+    def add_arguments(self, parser) -> None:
+        """Register scenario-specific options on ``parser``."""
+
+    def handle(self, **options) -> None:
+        raise NotImplementedError
+
+
+DEFAULT_WRITERS = 4
+DEFAULT_READERS = 4
+DEFAULT_DURATION = 5.0
+DEFAULT_BUSY_TIMEOUT = 5.0
+SEED_CHARGERS = 50
+SEED_READINGS = 50_000
+
+SCHEMA = """
+CREATE TABLE charger (
+    id INTEGER PRIMARY KEY,
+    charger_id TEXT NOT NULL UNIQUE,
+    last_heartbeat REAL NULL,
+    last_status TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE meter_value (
+    id INTEGER PRIMARY KEY,
+    charger_id INTEGER NOT NULL REFERENCES charger (id),
+    timestamp REAL NOT NULL,
+    energy REAL NULL
+);
+CREATE INDEX meter_value_charger_ts ON meter_value (charger_id, timestamp);
+"""
+
+PROFILES = {
+    "legacy": {
+        "pragmas": ("PRAGMA journal_mode=DELETE;",),
+        "begin": "BEGIN",
+        "reader_pragmas": (),
+    },
+    "tuned": {
+        "pragmas": (
+            "PRAGMA journal_mode=WAL;",
+            "PRAGMA synchronous=FULL;",
+            f"PRAGMA cache_size={SQLITE_DEFAULT_CACHE_SIZE};",
+            f"PRAGMA mmap_size={SQLITE_DEFAULT_MMAP_SIZE};",
+            "PRAGMA temp_store=MEMORY;",
+            f"PRAGMA journal_size_limit={SQLITE_JOURNAL_SIZE_LIMIT};",
+        ),
+        "begin": "BEGIN IMMEDIATE",
+        "reader_pragmas": ("PRAGMA query_only=ON;",),
+    },
+}
+
+
+@dataclass
+class ConcurrencyRun:
+    profile: str
+    operation: str
+    operations: int
+    busy_errors: int
+    p50_ms: float
+    p99_ms: float
+    throughput_per_second: float
+
+    def to_dict(self) -> dict:
+        return {
+            "profile": self.profile,
+            "operation": self.operation,
+            "operations": self.operations,
+            "busy_errors": self.busy_errors,
+            "p50_ms": self.p50_ms,
+            "p99_ms": self.p99_ms,
+            "throughput_per_second": self.throughput_per_second,
+        }
+
+
+@dataclass
+class _Samples:
+    latencies: list[float] = field(default_factory=list)
+    busy_errors: int = 0
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def _connect(path: Path, profile: dict, *, reader: bool, timeout: float) -> sqlite3.Connection:
+    connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+    for pragma in profile["pragmas"]:
+        connection.execute(pragma)
+    if reader:
+        for pragma in profile["reader_pragmas"]:
+            connection.execute(pragma)
+    return connection
+
+
+def _seed(path: Path) -> None:
+    connection = sqlite3.connect(path)
+    try:
+        connection.executescript(SCHEMA)
+        with connection:
+            connection.executemany(
+                "INSERT INTO charger (id, charger_id) VALUES (?, ?)",
+                ((index, f"CP-{index}") for index in range(1, SEED_CHARGERS + 1)),
+            )
+            connection.executemany(
+                "INSERT INTO meter_value (charger_id, timestamp, energy) VALUES (?, ?, ?)",
+                (
+                    (index % SEED_CHARGERS + 1, float(index), index * 0.01)
+                    for index in range(SEED_READINGS)
+                ),
+            )
+    finally:
+        connection.close()
+
+
+def websocket_write(connection: sqlite3.Connection, begin: str, rng: random.Random) -> None:
+    """Mimic a MeterValues/Heartbeat handler: read the charger, then write."""
+
+    charger = rng.randrange(1, SEED_CHARGERS + 1)
+    now = time.time()
+    connection.execute(begin)
+    try:
+        connection.execute(
+            "SELECT id, last_status FROM charger WHERE id = ?", (charger,)
+        ).fetchone()
+        connection.execute(
+            "INSERT INTO meter_value (charger_id, timestamp, energy) VALUES (?, ?, ?)",
+            (charger, now, rng.random() * 100),
+        )
+        connection.execute(
+            "UPDATE charger SET last_heartbeat = ?, last_status = 'Charging' WHERE id = ?",
+            (now, charger),
+        )
+        connection.execute("COMMIT")
+    except sqlite3.OperationalError:
+        connection.execute("ROLLBACK")
+        raise
+
+
+def admin_read(connection: sqlite3.Connection, _begin: str, rng: random.Random) -> None:
+    """Mimic an admin changelist: a count plus a page of recent readings."""
+
+    charger = rng.randrange(1, SEED_CHARGERS + 1)
+    connection.execute("SELECT COUNT(*) FROM meter_value WHERE charger_id = ?", (charger,)).fetchone()
+    connection.execute(
+        "SELECT mv.id, c.charger_id, mv.timestamp, mv.energy FROM meter_value mv "
+        "JOIN charger c ON c.id = mv.charger_id WHERE mv.charger_id = ? "
+        "ORDER BY mv.timestamp DESC LIMIT 50",
+        (charger,),
+    ).fetchall()
+
+
+def _worker(
+    path: Path,
+    profile: dict,
+    operation,
+    *,
+    reader: bool,
+    timeout: float,
+    deadline: float,
+    seed: int,
+    samples: _Samples,
+) -> None:
+    rng = random.Random(seed)
+    connection = _connect(path, profile, reader=reader, timeout=timeout)
+    try:
+        while time.perf_counter() < deadline:
+            began = time.perf_counter()
+            try:
+                operation(connection, profile["begin"], rng)
+            except sqlite3.OperationalError as exc:
+                if "locked" not in str(exc) and "busy" not in str(exc):
+                    raise
+                samples.busy_errors += 1
+                continue
+            samples.latencies.append(time.perf_counter() - began)
+    finally:
+        connection.close()
+
+
+class SqliteConcurrencyBenchmark(BenchmarkScenario):
+    help = (
+        "Benchmark SQLite under mixed websocket-style writes and admin-style reads, "
+        "comparing the legacy rollback journal with the WAL + BEGIN IMMEDIATE "
+        "profile. Reports busy errors and p50/p99 latency per operation."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--writers",
+            type=int,
+            default=DEFAULT_WRITERS,
+            help=f"Concurrent writer threads (default: {DEFAULT_WRITERS}).",
+        )
+        parser.add_argument(
+            "--readers",
+            type=int,
+            default=DEFAULT_READERS,
+            help=f"Concurrent reader threads (default: {DEFAULT_READERS}).",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=DEFAULT_DURATION,
+            help=f"Seconds to run each profile (default: {DEFAULT_DURATION}).",
+        )
+        parser.add_argument(
+            "--busy-timeout",
+            type=float,
+            default=DEFAULT_BUSY_TIMEOUT,
+            help=f"SQLite busy timeout in seconds (default: {DEFAULT_BUSY_TIMEOUT}).",
+        )
+        parser.add_argument(
+            "--profiles",
+            nargs="+",
+            choices=sorted(PROFILES),
+            default=sorted(PROFILES),
+            help="Profiles to benchmark (default: all).",
+        )
+        parser.add_argument(
+            "--workdir",
+            default="",
+            help="Directory for the SQLite files; defaults to a temporary directory.",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for workloads.")
+        parser.add_argument("--json", action="store_true", help="Emit JSON summary output.")
+
+    def handle(self, **options):
+        if options["writers"] < 0 or options["readers"] < 0:
+            raise CommandError("--writers and --readers must not be negative.")
+        if options["writers"] + options["readers"] == 0:
+            raise CommandError("At least one writer or reader is required.")
+        if options["duration"] <= 0:
+            raise CommandError("--duration must be greater than zero.")
+
+        results: list[ConcurrencyRun] = []
+        with TemporaryDirectory(dir=options["workdir"] or None) as workdir:
+            for name in options["profiles"]:
+                path = Path(workdir) / f"{name}.sqlite3"
+                _seed(path)
+                results.extend(self._run_profile(path, name, options))
+
+        payload = {
+            "writers": options["writers"],
+            "readers": options["readers"],
+            "duration_seconds": options["duration"],
+            "runs": [run.to_dict() for run in results],
+        }
+        if options["json"]:
+            self.stdout.write(json.dumps(payload, indent=2))
+            return
+
+        self.stdout.write("SQLite concurrency benchmark summary:")
+        for run in results:
+            self.stdout.write(
+                f"  {run.profile} {run.operation}: {run.operations} ops "
+                f"({run.throughput_per_second:.0f}/s), {run.busy_errors} busy errors, "
+                f"p50 {run.p50_ms:.2f} ms, p99 {run.p99_ms:.2f} ms"
+            )
+
+    def _run_profile(self, path: Path, name: str, options) -> list[ConcurrencyRun]:
+        profile = PROFILES[name]
+        _connect(path, profile, reader=False, timeout=options["busy_timeout"]).close()
+        deadline = time.perf_counter() + options["duration"]
+        plan = [("websocket-write", websocket_write, False)] * options["writers"] + [
+            ("admin-read", admin_read, True)
+        ] * options["readers"]
+        samples = {operation: _Samples() for operation, _fn, _reader in plan}
+        per_thread = []
+        threads = []
+        for index, (operation, fn, reader) in enumerate(plan):
+            thread_samples = _Samples()
+            per_thread.append((operation, thread_samples))
+            threads.append(
+                threading.Thread(
+                    target=_worker,
+                    args=(path, profile, fn),
+                    kwargs={
+                        "reader": reader,
+                        "timeout": options["busy_timeout"],
+                        "deadline": deadline,
+                        "seed": options["seed"] + index,
+                        "samples": thread_samples,
+                    },
+                    daemon=True,
+                )
+            )
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for operation, thread_samples in per_thread:
+            samples[operation].latencies.extend(thread_samples.latencies)
+            samples[operation].busy_errors += thread_samples.busy_errors
+
+        return [
+            ConcurrencyRun(
+                profile=name,
+                operation=operation,
+                operations=len(collected.latencies),
+                busy_errors=collected.busy_errors,
+                p50_ms=_percentile(collected.latencies, 0.50) * 1000,
+                p99_ms=_percentile(collected.latencies, 0.99) * 1000,
+                throughput_per_second=len(collected.latencies) / options["duration"],
+            )
+            for operation, collected in samples.items()
+        ]
+
+
+DEFAULT_SAMPLES = 200_000
+DEFAULT_THREADS = 4
+# Per-sample overhead budget for a labelled histogram observation.
+DEFAULT_BUDGET_NS = 3000.0
+ACTIONS = ("BootNotification", "Heartbeat", "MeterValues", "StatusNotification")
+
+
+@dataclass
+class MetricsRun:
+    operation: str
+    threads: int
+    samples: int
+    ns_per_sample: float
+
+    def to_dict(self) -> dict:
+        return {
+            "operation": self.operation,
+            "threads": self.threads,
+            "samples": self.samples,
+            "ns_per_sample": self.ns_per_sample,
+        }
+
+
+def _operations(registry: MetricsRegistry) -> dict[str, Callable[[int], None]]:
+    counter = registry.counter("benchmark_total", "Benchmark counter.", ("action",))
+    histogram = registry.histogram("benchmark_seconds", "Benchmark histogram.", ("action",))
+    bound = histogram.labels("Heartbeat")
+
+    def counter_inc(index: int) -> None:
+        counter.labels(ACTIONS[index & 3]).inc()
+
+    def histogram_observe(index: int) -> None:
+        histogram.labels(ACTIONS[index & 3]).observe(0.004)
+
+    def bound_histogram_observe(index: int) -> None:
+        bound.observe(0.004)
+
+    return {
+        "counter-inc": counter_inc,
+        "histogram-observe": histogram_observe,
+        "bound-histogram-observe": bound_histogram_observe,
+    }
+
+
+def _empty(index: int) -> None:
+    return None
+
+
+def _time_loop(record, samples: int, threads: int) -> float:
+    per_thread = max(samples // threads, 1)
+
+    def run() -> None:
+        for index in range(per_thread):
+            record(index)
+
+    workers = [threading.Thread(target=run) for _ in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - started
+
+
+class MetricsBenchmark(BenchmarkScenario):
+    help = (
+        "Measure the per-sample overhead of the runtime metrics registry. Fails "
+        "when a labelled histogram observation exceeds the budget."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--samples",
+            type=int,
+            default=DEFAULT_SAMPLES,
+            help=f"Samples recorded per operation (default: {DEFAULT_SAMPLES}).",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=DEFAULT_THREADS,
+            help=f"Threads for the contended runs (default: {DEFAULT_THREADS}).",
+        )
+        parser.add_argument(
+            "--budget-ns",
+            type=float,
+            default=DEFAULT_BUDGET_NS,
+            help=(
+                "Maximum overhead per labelled histogram observation in nanoseconds "
+                f"(default: {DEFAULT_BUDGET_NS:.0f})."
+            ),
+        )
+        parser.add_argument("--json", action="store_true", help="Emit JSON summary output.")
+
+    def handle(self, **options):
+        samples = options["samples"]
+        if samples <= 0:
+            raise CommandError("--samples must be greater than zero.")
+        if options["threads"] <= 0:
+            raise CommandError("--threads must be greater than zero.")
+
+        operations = _operations(MetricsRegistry())
+        results: list[MetricsRun] = []
+        for threads in sorted({1, options["threads"]}):
+            loop_seconds = _time_loop(_empty, samples, threads)
+            for name, record in operations.items():
+                elapsed = max(_time_loop(record, samples, threads) - loop_seconds, 0.0)
+                results.append(
+                    MetricsRun(
+                        operation=name,
+                        threads=threads,
+                        samples=samples,
+                        ns_per_sample=elapsed / samples * 1e9,
+                    )
+                )
+
+        worst = max(
+            run.ns_per_sample for run in results if run.operation == "histogram-observe"
+        )
+        payload = {
+            "budget_ns": options["budget_ns"],
+            "within_budget": worst <= options["budget_ns"],
+            "runs": [run.to_dict() for run in results],
+        }
+        if options["json"]:
+            self.stdout.write(json.dumps(payload, indent=2))
+        else:
+            self.stdout.write("Runtime metrics overhead per sample:")
+            for run in results:
+                self.stdout.write(
+                    f"  {run.operation} ({run.threads} thread(s)): {run.ns_per_sample:.0f} ns"
+                )
+        if not payload["within_budget"]:
+            raise CommandError(
+                f"Histogram observation costs {worst:.0f} ns, above the "
+                f"{options['budget_ns']:.0f} ns budget."
+            )
@@ -1,6 +1,7 @@
-"""Database router for external app SQLite databases."""
+"""Database routers for external app databases and SQLite read splitting."""
 
 from django.conf import settings
+from django.db import connections
 
 from config.settings.external_dbs import external_app_database_alias_mapping
 
@@ -72,3 +73,62 @@ class ExternalAppDatabaseRouter:
             return False
 
         return None
+
+
+class SQLiteReadReplicaRouter:
+    """Send reads outside transactions to the read-only SQLite connection.
+
+    The read-only alias opens the primary database file with ``query_only``
+    enabled, so admin listings and reports never queue behind websocket
+    writes for the write lock. Reads inside an atomic block on ``default``
+    stay on ``default`` to see their own uncommitted rows. The router is
+    inert unless the alias from ``SQLITE_READ_ALIAS`` is configured.
+    """
+
+    primary_alias = "default"
+
+    @property
+    def replica_alias(self) -> str | None:
+        alias = getattr(settings, "SQLITE_READ_ALIAS", "")
+        if alias and alias in settings.DATABASES:
+            return alias
+        return None
+
+    def db_for_read(self, model, **hints):
+        """Route autocommit reads to the read-only alias when configured."""
+
+        del model, hints
+        replica = self.replica_alias
+        if replica is None:
+            return None
+        if connections[self.primary_alias].in_atomic_block:
+            return self.primary_alias
+        return replica
+
+    def db_for_write(self, model, **hints):
+        """Keep writes on ``default`` even for rows loaded from the replica."""
+
+        del model, hints
+        if self.replica_alias is None:
+            return None
+        return self.primary_alias
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Allow relations between rows read from either SQLite connection."""
+
+        del hints
+        replica = self.replica_alias
+        if replica is None:
+            return None
+        aliases = {self.primary_alias, replica}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """Never migrate through the read-only alias."""
+
+        del app_label, model_name, hints
+        if db == self.replica_alias:
+            return False
+        return None
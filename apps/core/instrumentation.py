@@ -0,0 +1,128 @@
+"""Automatic runtime metrics for HTTP views, Celery tasks and DB queries."""
+
+from __future__ import annotations
+
+import time
+
+from django.conf import settings
+
+from apps.celery.topology import PUBLISHED_AT_HEADER, task_class_for
+
+from .metrics import counter, histogram, install_query_counter
+
+http_request_duration = histogram(
+    "http_request_duration_seconds",
+    "Time spent producing an HTTP response, by view, method and status class.",
+    ("view", "method", "status"),
+)
+celery_task_duration = histogram(
+    "celery_task_duration_seconds",
+    "Celery task runtime in the worker, by task name and final state.",
+    ("task", "state"),
+)
+celery_task_failures = counter(
+    "celery_task_failures_total",
+    "Celery tasks that raised an exception.",
+    ("task",),
+)
+celery_tasks_published = counter(
+    "celery_tasks_published_total",
+    "Celery tasks published by this process, by task class.",
+    ("task_class",),
+)
+celery_task_queue_wait = histogram(
+    "celery_task_queue_wait_seconds",
+    "Time between publishing a Celery task and a worker starting it, by task class.",
+    ("task_class",),
+)
+
+_task_started: dict[str, float] = {}
+
+
+def runtime_metrics_enabled() -> bool:
+    """Return whether automatic instrumentation should be installed."""
+
+    return bool(getattr(settings, "RUNTIME_METRICS_ENABLED", True))
+
+
+def request_view_label(request) -> str:
+    """Return a bounded label for the view that served ``request``."""
+
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.view_name or match._func_path
+
+
+def _task_class_name(task_name: str | None) -> str:
+    return task_class_for(task_name).name
+
+
+def _on_before_task_publish(sender=None, headers=None, **kwargs) -> None:
+    if headers is None:
+        return
+    headers.setdefault(PUBLISHED_AT_HEADER, time.time())
+    celery_tasks_published.labels(_task_class_name(sender)).inc()
+
+
+def _on_task_prerun(task_id=None, task=None, **kwargs) -> None:
+    if task_id:
+        _task_started[task_id] = time.perf_counter()
+    request = getattr(task, "request", None)
+    published_at = getattr(request, PUBLISHED_AT_HEADER, None)
+    if published_at is not None:
+        celery_task_queue_wait.labels(_task_class_name(getattr(task, "name", None))).observe(
+            max(0.0, time.time() - float(published_at))
+        )
+
+
+def _on_task_postrun(task_id=None, task=None, state=None, **kwargs) -> None:
+    started = _task_started.pop(task_id, None) if task_id else None
+    if started is None:
+        return
+    name = getattr(task, "name", None) or "unknown"
+    celery_task_duration.labels(name, state or "UNKNOWN").observe(time.perf_counter() - started)
+
+
+def _on_task_failure(sender=None, **kwargs) -> None:
+    celery_task_failures.labels(getattr(sender, "name", None) or "unknown").inc()
+
+
+def _on_connection_created(sender, connection, **kwargs) -> None:
+    install_query_counter(connection)
+
+
+def install() -> None:
+    """Connect the Celery and database signal handlers when metrics are enabled."""
+
+    if not runtime_metrics_enabled():
+        return
+
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    connection_created.connect(
+        _on_connection_created, dispatch_uid="core-runtime-metrics-query-counter"
+    )
+    for connection in connections.all(initialized_only=True):
+        install_query_counter(connection)
+
+    try:
+        from celery.signals import (
+            before_task_publish,
+            task_failure,
+            task_postrun,
+            task_prerun,
+        )
+    except ImportError:  # pragma: no cover - celery is a core dependency
+        return
+    before_task_publish.connect(
+        _on_before_task_publish, weak=False, dispatch_uid="core-runtime-metrics-publish"
+    )
+    task_prerun.connect(_on_task_prerun, weak=False, dispatch_uid="core-runtime-metrics-prerun")
+    task_postrun.connect(
+        _on_task_postrun, weak=False, dispatch_uid="core-runtime-metrics-postrun"
+    )
+    task_failure.connect(
+        _on_task_failure, weak=False, dispatch_uid="core-runtime-metrics-failure"
+    )
@@ -8,8 +8,10 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, Iterable, Tuple
 
+from django.apps import apps as django_apps
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
 
 try:
     import psutil
@@ -17,6 +19,36 @@ except ImportError:  # pragma: no cover - handled via CommandError in handle
     psutil = None  # type: ignore[assignment]
 
 
+# Workload scenarios run as ``benchmark <name>``; each path names a
+# :class:`apps.core.benchmarks.BenchmarkScenario` subclass in its app.
+SCENARIOS = {
+    "awg-solver": "apps.awg.benchmarks.AwgSolverBenchmark",
+    "chart-payload": "apps.ocpp.benchmarks.ChartPayloadBenchmark",
+    "classifier": "apps.classification.benchmarks.ClassifierBenchmark",
+    "client-report": "apps.energy.benchmarks.ClientReportBenchmark",
+    "email-sync": "apps.emails.benchmarks.EmailSyncBenchmark",
+    "evergo-sync": "apps.evergo.benchmarks.EvergoSyncBenchmark",
+    "image-delivery": "apps.imager.benchmarks.ImageDeliveryBenchmark",
+    "image-write": "apps.imager.benchmarks.ImageWriteBenchmark",
+    "meter-retention": "apps.ocpp.benchmarks.MeterRetentionBenchmark",
+    "metrics": "apps.core.benchmarks.MetricsBenchmark",
+    "odoo-rpc": "apps.odoo.benchmarks.OdooRpcBenchmark",
+    "peer-polling": "apps.nodes.benchmarks.PeerPollingBenchmark",
+    "share-links": "apps.links.benchmarks.ShareLinksBenchmark",
+    "skill-search": "apps.souls.benchmarks.SkillSearchBenchmark",
+    "sqlite-concurrency": "apps.core.benchmarks.SqliteConcurrencyBenchmark",
+    "static-assets": "apps.nginx.benchmarks.StaticAssetsBenchmark",
+}
+
+
+def _installed_scenarios() -> dict[str, type]:
+    scenarios = {}
+    for name, path in SCENARIOS.items():
+        if django_apps.is_installed(path.rsplit(".", 2)[0]):
+            scenarios[name] = import_string(path)
+    return scenarios
+
+
 def _format_bytes(value: float) -> str:
     """Return ``value`` formatted using a human friendly unit."""
 
@@ -165,9 +197,12 @@ def _collect_processes(base_dir: Path) -> Dict[int, Tuple[psutil.Process, dict]]
 
 
 class Command(BaseCommand):
-    """Measure the estimated system resources consumed by the suite."""
+    """Measure the suite's resource usage or run a named workload scenario."""
 
-    help = "Measure the estimated CPU, memory, and disk usage of the running Arthexis suite."
+    help = (
+        "Measure the estimated CPU, memory, and disk usage of the running Arthexis "
+        "suite, or run a workload scenario with `benchmark <scenario>`."
+    )
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -188,7 +223,20 @@ class Command(BaseCommand):
             help="Emit the collected measurements as JSON instead of formatted text.",
         )
 
+        subparsers = parser.add_subparsers(dest="scenario", metavar="scenario")
+        for name, scenario_class in _installed_scenarios().items():
+            scenario = scenario_class(self)
+            scenario_parser = subparsers.add_parser(
+                name, help=scenario.help, description=scenario.help
+            )
+            scenario.add_arguments(scenario_parser)
+
     def handle(self, *args, **options):
+        if options.get("scenario"):
+            scenario_class = _installed_scenarios()[options["scenario"]]
+            scenario_class(self).handle(**options)
+            return
+
         if psutil is None:
             raise CommandError("The 'psutil' package is required to run this command.")
 
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.startup_profiler import (
+    DEFAULT_MIN_REGRESSION_SECONDS,
+    DEFAULT_REGRESSION_THRESHOLD,
+    StartupProfile,
+    compare_profiles,
+    profile_startup,
+)
+
+
+class Command(BaseCommand):
+    """Profile Django cold start in a fresh interpreter."""
+
+    help = (
+        "Report per-app import, models and ready() time, total setup time and time "
+        "to the first request. Compare against a saved JSON baseline to flag "
+        "regressions and fail when declared deferred imports load at startup."
+    )
+
+    def add_arguments(self, parser) -> None:
+        """Register command options."""
+
+        parser.add_argument(
+            "--path",
+            default="/",
+            help="URL requested after setup to time the first request (default: /).",
+        )
+        parser.add_argument(
+            "--no-request",
+            action="store_true",
+            help="Skip the first-request measurement.",
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=1,
+            help="Cold starts to measure; the fastest run is reported (default: 1).",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=15,
+            help="Slowest apps listed in the text summary (default: 15).",
+        )
+        parser.add_argument(
+            "--baseline",
+            type=Path,
+            help="JSON report from a previous run to compare against.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=DEFAULT_REGRESSION_THRESHOLD,
+            help=(
+                "Relative growth treated as a regression "
+                f"(default: {DEFAULT_REGRESSION_THRESHOLD})."
+            ),
+        )
+        parser.add_argument(
+            "--min-seconds",
+            type=float,
+            default=DEFAULT_MIN_REGRESSION_SECONDS,
+            help=(
+                "Absolute growth required before a metric is flagged "
+                f"(default: {DEFAULT_MIN_REGRESSION_SECONDS})."
+            ),
+        )
+        parser.add_argument(
+            "--output",
+            type=Path,
+            help="Write the JSON report to this file, e.g. to refresh the baseline.",
+        )
+        parser.add_argument("--json", action="store_true", help="Emit JSON output.")
+
+    def handle(self, *args, **options) -> None:
+        """Profile startup and report, compare or fail as requested."""
+
+        if options["runs"] < 1:
+            raise CommandError("--runs must be at least 1.")
+        baseline = None
+        if options["baseline"]:
+            try:
+                baseline = StartupProfile.from_dict(
+                    json.loads(options["baseline"].read_text(encoding="utf-8"))["profile"]
+                )
+            except (OSError, ValueError, KeyError) as exc:
+                raise CommandError(f"Unable to read baseline {options['baseline']}: {exc}") from exc
+
+        path = None if options["no_request"] else options["path"]
+        try:
+            profile = min(
+                (profile_startup(path=path) for _run in range(options["runs"])),
+                key=lambda candidate: candidate.total_seconds,
+            )
+        except RuntimeError as exc:
+            raise CommandError(str(exc)) from exc
+
+        regressions = (
+            compare_profiles(
+                baseline,
+                profile,
+                threshold=options["threshold"],
+                min_seconds=options["min_seconds"],
+            )
+            if baseline
+            else []
+        )
+        payload = {
+            "profile": profile.to_dict(),
+            "regressions": [
+                {
+                    "metric": regression.metric,
+                    "baseline_seconds": regression.baseline_seconds,
+                    "current_seconds": regression.current_seconds,
+                }
+                for regression in regressions
+            ],
+        }
+        if options["output"]:
+            options["output"].write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+        if options["json"]:
+            self.stdout.write(json.dumps(payload, indent=2))
+        else:
+            self._write_summary(profile, regressions, options["top"])
+
+        failures = []
+        if regressions:
+            failures.append(f"{len(regressions)} startup regression(s)")
+        if profile.deferred_violations:
+            failures.append(
+                "deferred imports loaded at startup: "
+                + ", ".join(
+                    f"{label} ({', '.join(modules)})"
+                    for label, modules in sorted(profile.deferred_violations.items())
+                )
+            )
+        if failures:
+            raise CommandError("; ".join(failures))
+
+    def _write_summary(self, profile: StartupProfile, regressions, top: int) -> None:
+        self.stdout.write(
+            f"Settings: {profile.settings_seconds:.3f}s, setup: {profile.setup_seconds:.3f}s, "
+            f"total: {profile.total_seconds:.3f}s, modules: {profile.module_count}"
+        )
+        if profile.first_request_seconds is not None:
+            self.stdout.write(
+                f"First request: {profile.first_request_seconds:.3f}s "
+                f"(status {profile.first_request_status})"
+            )
+        self.stdout.write("Slowest apps (import / models / ready):")
+        for app in profile.slowest(top):
+            self.stdout.write(
+                f"  {app.label:<24} {app.total_seconds:.3f}s "
+                f"({app.import_seconds:.3f} / {app.models_seconds:.3f} / {app.ready_seconds:.3f})"
+            )
+        for regression in regressions:
+            self.stdout.write(
+                f"Regression {regression.metric}: {regression.baseline_seconds:.3f}s -> "
+                f"{regression.current_seconds:.3f}s"
+            )
@@ -0,0 +1,468 @@
+"""In-process runtime metrics with Prometheus text exposition.
+
+Counters and histograms keep one cell per thread, so recording a sample
+never takes a lock; the cells are summed when the registry is rendered.
+Gauges hold a single value because they are set rather than accumulated.
+Each process owns its registry: the web process serves it from
+``/core/metrics/`` and tests or commands can render it directly.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Sequence
+
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+QUERY_COUNT_BUCKETS: tuple[float, ...] = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_NAME_RE = re.compile(r"^[a-zA-Z_:][a-zA-Z0-9_:]*$")
+_LABEL_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+_QUERY_COUNTER: ContextVar[list[int] | None] = ContextVar("metrics_query_counter", default=None)
+
+
+class _ThreadCells:
+    """Per-thread mutable cells that are only ever written by their owner.
+
+    Children read ``local.cell`` inline on the hot path and only call
+    :meth:`new_cell` the first time a thread records a sample.
+    """
+
+    __slots__ = ("local", "_cells", "_lock", "_width")
+
+    def __init__(self, width: int) -> None:
+        self.local = threading.local()
+        self._cells: list[list[float]] = []
+        self._lock = threading.Lock()
+        self._width = width
+
+    def new_cell(self) -> list[float]:
+        cell = [0] * self._width
+        self.local.cell = cell
+        with self._lock:
+            self._cells.append(cell)
+        return cell
+
+    def totals(self) -> list[float]:
+        with self._lock:
+            cells = list(self._cells)
+        totals = [0] * self._width
+        for cell in cells:
+            for index, value in enumerate(cell):
+                totals[index] += value
+        return totals
+
+    def reset(self) -> None:
+        with self._lock:
+            for cell in self._cells:
+                cell[:] = [0] * self._width
+
+
+class CounterChild:
+    """A monotonically increasing value for one label combination."""
+
+    __slots__ = ("_cells", "_local")
+
+    def __init__(self) -> None:
+        self._cells = _ThreadCells(1)
+        self._local = self._cells.local
+
+    def inc(self, amount: float = 1) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase.")
+        try:
+            cell = self._local.cell
+        except AttributeError:
+            cell = self._cells.new_cell()
+        cell[0] += amount
+
+    def value(self) -> float:
+        return self._cells.totals()[0]
+
+    def _reset(self) -> None:
+        self._cells.reset()
+
+
+class GaugeChild:
+    """A value that can go up and down for one label combination."""
+
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.inc(-amount)
+
+    def value(self) -> float:
+        return self._value
+
+    def _reset(self) -> None:
+        self._value = 0.0
+
+
+class HistogramChild:
+    """Fixed-bucket distribution for one label combination.
+
+    Each thread cell holds one count per bucket (the last one is ``+Inf``)
+    followed by the running sum.
+    """
+
+    __slots__ = ("_bounds", "_cells", "_local")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self._bounds = bounds
+        self._cells = _ThreadCells(len(bounds) + 2)
+        self._local = self._cells.local
+
+    def observe(self, value: float) -> None:
+        try:
+            cell = self._local.cell
+        except AttributeError:
+            cell = self._cells.new_cell()
+        cell[bisect_left(self._bounds, value)] += 1
+        cell[-1] += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the wall-clock duration of the wrapped block."""
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def snapshot(self) -> tuple[list[int], int, float]:
+        """Return cumulative bucket counts, the sample count and the sum."""
+
+        totals = self._cells.totals()
+        cumulative = []
+        running = 0
+        for count in totals[:-1]:
+            running += count
+            cumulative.append(running)
+        return cumulative, running, totals[-1]
+
+    def count(self) -> int:
+        return self.snapshot()[1]
+
+    def _reset(self) -> None:
+        self._cells.reset()
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        if not _NAME_RE.match(name):
+            raise ValueError(f"Invalid metric name: {name!r}")
+        for label in labelnames:
+            if not _LABEL_RE.match(label) or label.startswith("__") or label == "le":
+                raise ValueError(f"Invalid label name for {name}: {label!r}")
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lookup: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """Return the child for ``values``, creating it on first use."""
+
+        child = self._lookup.get(values)
+        if child is None:
+            child = self._create_child(values)
+        return child
+
+    def _create_child(self, values: tuple):
+        if len(values) != len(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects {len(self.labelnames)} label value(s), got {len(values)}."
+            )
+        key = tuple("" if value is None else str(value) for value in values)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._new_child()
+                self._children[key] = child
+            self._lookup[values] = child
+        return child
+
+    def _default(self):
+        return self.labels()
+
+    def _new_child(self):  # pragma: no cover - abstract
+        raise NotImplementedError
+
+    def children(self) -> list[tuple[tuple[str, ...], object]]:
+        with self._lock:
+            return sorted(self._children.items())
+
+    def clear(self) -> None:
+        """Reset all recorded values while keeping children bound by callers."""
+
+        with self._lock:
+            children = list(self._children.values())
+        for child in children:
+            child._reset()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        self._default().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+    def inc(self, amount: float = 1) -> None:
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self._default().dec(amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        bounds = tuple(sorted(float(bound) for bound in buckets if not math.isinf(bound)))
+        if not bounds:
+            raise ValueError(f"{name} needs at least one finite bucket.")
+        self.buckets = bounds
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+    def time(self):
+        return self._default().time()
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def _register(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            existing = self._metrics.get(name)
+            if existing is not None:
+                if type(existing) is not cls or existing.labelnames != tuple(labelnames):
+                    raise ValueError(f"Metric {name} is already registered differently.")
+                return existing
+            metric = cls(name, documentation, labelnames, **kwargs)
+            self._metrics[name] = metric
+            return metric
+
+    def get(self, name: str) -> _Metric | None:
+        return self._metrics.get(name)
+
+    def metrics(self) -> list[_Metric]:
+        with self._lock:
+            return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def clear(self) -> None:
+        """Reset every recorded value; registered metrics stay in place."""
+
+        for metric in self.metrics():
+            metric.clear()
+
+    def render(self) -> str:
+        """Return the registry in the Prometheus text exposition format."""
+
+        lines: list[str] = []
+        for metric in self.metrics():
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for values, child in metric.children():
+                labels = list(zip(metric.labelnames, values))
+                if isinstance(child, HistogramChild):
+                    cumulative, count, total = child.snapshot()
+                    bounds = [*metric.buckets, math.inf]
+                    for bound, bucket_count in zip(bounds, cumulative):
+                        bucket_labels = _format_labels([*labels, ("le", _format_value(bound))])
+                        lines.append(f"{metric.name}_bucket{bucket_labels} {bucket_count}")
+                    lines.append(f"{metric.name}_sum{_format_labels(labels)} {_format_value(total)}")
+                    lines.append(f"{metric.name}_count{_format_labels(labels)} {count}")
+                else:
+                    lines.append(
+                        f"{metric.name}{_format_labels(labels)} {_format_value(child.value())}"
+                    )
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: list[tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+REGISTRY = MetricsRegistry()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    """Register or return a counter on the process registry."""
+
+    return REGISTRY.counter(name, documentation, labelnames)
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    """Register or return a gauge on the process registry."""
+
+    return REGISTRY.gauge(name, documentation, labelnames)
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    *,
+    buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+) -> Histogram:
+    """Register or return a histogram on the process registry."""
+
+    return REGISTRY.histogram(name, documentation, labelnames, buckets=buckets)
+
+
+def render_prometheus(registry: MetricsRegistry | None = None) -> str:
+    """Render ``registry`` (the process registry by default) as Prometheus text."""
+
+    return (registry or REGISTRY).render()
+
+
+@contextmanager
+def count_queries() -> Iterator[list[int]]:
+    """Count database queries executed in the current context.
+
+    The yielded one-item list holds the running count. Work handed to
+    ``sync_to_async`` threads inherits the context, so queries issued by
+    async consumers are counted too once :func:`install_query_counter` has
+    been attached to the connection.
+    """
+
+    cell = [0]
+    token = _QUERY_COUNTER.set(cell)
+    try:
+        yield cell
+    finally:
+        _QUERY_COUNTER.reset(token)
+
+
+def _count_query(execute, sql, params, many, context):
+    cell = _QUERY_COUNTER.get()
+    if cell is not None:
+        cell[0] += 1
+    return execute(sql, params, many, context)
+
+
+def install_query_counter(connection) -> None:
+    """Attach the query-counting execute wrapper to ``connection`` once."""
+
+    if _count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_query)
+
+
+__all__ = [
+    "Counter",
+    "DEFAULT_LATENCY_BUCKETS",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "PROMETHEUS_CONTENT_TYPE",
+    "QUERY_COUNT_BUCKETS",
+    "REGISTRY",
+    "count_queries",
+    "counter",
+    "gauge",
+    "histogram",
+    "install_query_counter",
+    "render_prometheus",
+]
@@ -0,0 +1,277 @@
+"""Measure Django cold start: per-app import, models and ``ready()`` time.
+
+Profiling runs in a fresh interpreter so nothing imported by the calling
+process skews the numbers. The child process executes this module with
+``--child``, boots Django with instrumented :class:`~django.apps.AppConfig`
+hooks and prints a JSON report on stdout.
+
+App configs may declare ``deferred_imports``: top-level module names that
+must not be imported during startup because the app only needs them on
+first use (PDF rendering, OpenCV, ...). The report lists every declared
+module that was imported anyway.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+DEFERRED_IMPORTS_ATTR = "deferred_imports"
+CHILD_FLAG = "--child"
+DEFAULT_REGRESSION_THRESHOLD = 0.25
+DEFAULT_MIN_REGRESSION_SECONDS = 0.05
+
+
+@dataclass
+class AppTiming:
+    label: str
+    name: str
+    import_seconds: float = 0.0
+    models_seconds: float = 0.0
+    ready_seconds: float = 0.0
+
+    @property
+    def total_seconds(self) -> float:
+        return self.import_seconds + self.models_seconds + self.ready_seconds
+
+
+@dataclass
+class StartupProfile:
+    settings_seconds: float
+    setup_seconds: float
+    first_request_seconds: float | None
+    first_request_status: int | None
+    total_seconds: float
+    module_count: int
+    apps: list[AppTiming] = field(default_factory=list)
+    deferred_violations: dict[str, list[str]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        payload = asdict(self)
+        payload["apps"] = [
+            {**asdict(app), "total_seconds": app.total_seconds} for app in self.apps
+        ]
+        return payload
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> "StartupProfile":
+        apps = [
+            AppTiming(
+                label=entry["label"],
+                name=entry["name"],
+                import_seconds=entry.get("import_seconds", 0.0),
+                models_seconds=entry.get("models_seconds", 0.0),
+                ready_seconds=entry.get("ready_seconds", 0.0),
+            )
+            for entry in payload.get("apps", [])
+        ]
+        return cls(
+            settings_seconds=payload.get("settings_seconds", 0.0),
+            setup_seconds=payload.get("setup_seconds", 0.0),
+            first_request_seconds=payload.get("first_request_seconds"),
+            first_request_status=payload.get("first_request_status"),
+            total_seconds=payload.get("total_seconds", 0.0),
+            module_count=payload.get("module_count", 0),
+            apps=apps,
+            deferred_violations=payload.get("deferred_violations", {}),
+        )
+
+    def slowest(self, limit: int) -> list[AppTiming]:
+        return sorted(self.apps, key=lambda app: app.total_seconds, reverse=True)[:limit]
+
+
+@dataclass
+class Regression:
+    metric: str
+    baseline_seconds: float
+    current_seconds: float
+
+    @property
+    def ratio(self) -> float:
+        if self.baseline_seconds <= 0:
+            return float("inf")
+        return self.current_seconds / self.baseline_seconds
+
+
+def deferred_import_violations(app_configs, loaded_modules) -> dict[str, list[str]]:
+    """Return declared deferred imports that were loaded anyway, by app label."""
+
+    loaded_roots = {name.partition(".")[0] for name in loaded_modules}
+    violations: dict[str, list[str]] = {}
+    for config in app_configs:
+        declared = getattr(config, DEFERRED_IMPORTS_ATTR, ()) or ()
+        loaded = sorted(module for module in declared if module in loaded_roots)
+        if loaded:
+            violations[config.label] = loaded
+    return violations
+
+
+def compare_profiles(
+    baseline: StartupProfile,
+    current: StartupProfile,
+    *,
+    threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+    min_seconds: float = DEFAULT_MIN_REGRESSION_SECONDS,
+) -> list[Regression]:
+    """Return metrics that grew by more than ``threshold`` and ``min_seconds``.
+
+    The absolute floor keeps noisy, near-zero app timings from being flagged.
+    """
+
+    pairs: list[tuple[str, float, float]] = [
+        ("setup", baseline.setup_seconds, current.setup_seconds),
+        ("total", baseline.total_seconds, current.total_seconds),
+    ]
+    if baseline.first_request_seconds is not None and current.first_request_seconds is not None:
+        pairs.append(
+            ("first_request", baseline.first_request_seconds, current.first_request_seconds)
+        )
+    previous = {app.label: app for app in baseline.apps}
+    for app in current.apps:
+        before = previous.get(app.label)
+        pairs.append((f"app:{app.label}", before.total_seconds if before else 0.0, app.total_seconds))
+
+    regressions = []
+    for metric, before, after in pairs:
+        if after - before < min_seconds:
+            continue
+        if before > 0 and after <= before * (1 + threshold):
+            continue
+        regressions.append(Regression(metric, before, after))
+    return regressions
+
+
+def profile_startup(
+    *,
+    path: str | None = "/",
+    settings_module: str | None = None,
+    python: str | None = None,
+    timeout: float = 600.0,
+) -> StartupProfile:
+    """Boot Django in a fresh interpreter and return its startup profile.
+
+    Parameters:
+        path: URL requested after setup to time the first request; ``None``
+            skips the request.
+        settings_module: Django settings module; defaults to the current one.
+        python: Interpreter to run; defaults to ``sys.executable``.
+        timeout: Seconds to wait for the child process.
+    """
+
+    env = dict(os.environ)
+    env["DJANGO_SETTINGS_MODULE"] = (
+        settings_module or env.get("DJANGO_SETTINGS_MODULE") or "config.settings"
+    )
+    base_dir = Path(__file__).resolve().parents[2]
+    command = [python or sys.executable, "-m", __name__, CHILD_FLAG]
+    if path is not None:
+        command.append(path)
+    completed = subprocess.run(
+        command,
+        cwd=base_dir,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(
+            f"Startup profile child failed ({completed.returncode}): {completed.stderr[-2000:]}"
+        )
+    report_line = completed.stdout.strip().splitlines()[-1]
+    return StartupProfile.from_dict(json.loads(report_line))
+
+
+def _run_child(path: str | None) -> dict[str, Any]:
+    began = time.perf_counter()
+
+    from django.apps import AppConfig
+
+    timings: dict[str, dict[str, float]] = defaultdict(dict)
+    original_create = AppConfig.create.__func__
+
+    def timed_create(cls, entry):
+        started = time.perf_counter()
+        config = original_create(cls, entry)
+        timings[config.label]["import_seconds"] = time.perf_counter() - started
+
+        original_import_models = config.import_models
+        original_ready = config.ready
+
+        def import_models():
+            started = time.perf_counter()
+            original_import_models()
+            timings[config.label]["models_seconds"] = time.perf_counter() - started
+
+        def ready():
+            started = time.perf_counter()
+            original_ready()
+            timings[config.label]["ready_seconds"] = time.perf_counter() - started
+
+        config.import_models = import_models
+        config.ready = ready
+        return config
+
+    AppConfig.create = classmethod(timed_create)
+
+    from django.conf import settings
+
+    settings.INSTALLED_APPS  # noqa: B018 - force settings import
+    settings_done = time.perf_counter()
+
+    import django
+
+    django.setup()
+    setup_done = time.perf_counter()
+
+    from django.apps import apps
+
+    violations = deferred_import_violations(apps.get_app_configs(), list(sys.modules))
+    module_count = len(sys.modules)
+
+    first_request_seconds = None
+    first_request_status = None
+    if path:
+        from django.test import Client
+
+        started = time.perf_counter()
+        response = Client(raise_request_exception=False).get(path)
+        first_request_seconds = time.perf_counter() - started
+        first_request_status = response.status_code
+
+    finished = time.perf_counter()
+    profile = StartupProfile(
+        settings_seconds=settings_done - began,
+        setup_seconds=setup_done - settings_done,
+        first_request_seconds=first_request_seconds,
+        first_request_status=first_request_status,
+        total_seconds=finished - began,
+        module_count=module_count,
+        apps=[
+            AppTiming(
+                label=config.label,
+                name=config.name,
+                import_seconds=timings[config.label].get("import_seconds", 0.0),
+                models_seconds=timings[config.label].get("models_seconds", 0.0),
+                ready_seconds=timings[config.label].get("ready_seconds", 0.0),
+            )
+            for config in apps.get_app_configs()
+        ],
+        deferred_violations=violations,
+    )
+    return profile.to_dict()
+
+
+if __name__ == "__main__":  # pragma: no cover - exercised through profile_startup
+    if len(sys.argv) < 2 or sys.argv[1] != CHILD_FLAG:
+        raise SystemExit(f"usage: python -m {__spec__.name} {CHILD_FLAG} [path]")
+    report = _run_child(sys.argv[2] if len(sys.argv) > 2 else None)
+    sys.stdout.write("\n" + json.dumps(report) + "\n")
@@ -15,12 +15,11 @@ logger = logging.getLogger(__name__)
 def _poll_emails() -> None:
     """Poll all configured email collectors for new messages."""
     try:
-        from apps.emails.models import EmailCollector
+        from apps.emails.sync import collect_all
     except Exception:  # pragma: no cover - app not ready
         return
 
-    for collector in EmailCollector.objects.filter(is_enabled=True):
-        collector.collect()
+    collect_all()
 
 
 poll_emails = shared_task(_poll_emails)
@@ -0,0 +1,17 @@
+"""Tests for the workload scenarios exposed by the ``benchmark`` command."""
+
+from apps.core.management.commands.benchmark import (
+    SCENARIOS,
+    Command,
+    _installed_scenarios,
+)
+
+
+def test_help_lists_every_installed_scenario():
+    parser = Command().create_parser("manage.py", "benchmark")
+
+    text = parser.format_help()
+
+    assert set(_installed_scenarios()) == set(SCENARIOS)
+    for name in SCENARIOS:
+        assert name in text
@@ -0,0 +1,141 @@
+"""Tests for the runtime metrics registry, exposition and instrumentation."""
+
+import json
+import threading
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+
+from apps.core import instrumentation
+from apps.core.metrics import MetricsRegistry, count_queries
+from config.middleware import RuntimeMetricsMiddleware
+
+
+def test_histogram_renders_cumulative_buckets_sum_and_count():
+    registry = MetricsRegistry()
+    latency = registry.histogram("demo_seconds", "Demo latency.", ("action",), buckets=(0.1, 1))
+    child = latency.labels("Heart\"beat")
+    for value in (0.05, 0.1, 0.5, 3):
+        child.observe(value)
+
+    text = registry.render()
+
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'demo_seconds_bucket{action="Heart\\"beat",le="0.1"} 2' in text
+    assert 'demo_seconds_bucket{action="Heart\\"beat",le="1"} 3' in text
+    assert 'demo_seconds_bucket{action="Heart\\"beat",le="+Inf"} 4' in text
+    assert 'demo_seconds_sum{action="Heart\\"beat"} 3.65' in text
+    assert 'demo_seconds_count{action="Heart\\"beat"} 4' in text
+
+
+def test_counter_cells_are_summed_across_threads():
+    registry = MetricsRegistry()
+    total = registry.counter("demo_total", "Demo counter.", ("kind",))
+
+    def work():
+        for _ in range(1000):
+            total.labels("a").inc()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert total.labels("a").value() == 4000
+    assert 'demo_total{kind="a"} 4000' in registry.render()
+    with pytest.raises(ValueError):
+        total.labels("a").inc(-1)
+
+
+def test_registry_rejects_conflicting_registrations():
+    registry = MetricsRegistry()
+    registry.counter("demo_total", "Demo counter.", ("kind",))
+
+    assert registry.counter("demo_total", "Demo counter.", ("kind",)) is registry.get("demo_total")
+    with pytest.raises(ValueError):
+        registry.gauge("demo_total", "Demo gauge.")
+    with pytest.raises(ValueError):
+        registry.counter("demo total", "Bad name.")
+
+
+@pytest.mark.django_db
+def test_count_queries_counts_orm_queries():
+    with count_queries() as queries:
+        get_user_model().objects.count()
+        get_user_model().objects.exists()
+
+    assert queries[0] == 2
+
+
+def test_runtime_metrics_middleware_records_view_latency():
+    request = RequestFactory().get("/core/metrics/")
+    request.resolver_match = None
+    child = instrumentation.http_request_duration.labels("unmatched", "GET", "4xx")
+    before = child.count()
+
+    response = RuntimeMetricsMiddleware(lambda _request: HttpResponse(status=404))(request)
+
+    assert response.status_code == 404
+    assert child.count() == before + 1
+
+
+def test_celery_signal_handlers_record_task_runtime():
+    task = type("Task", (), {"name": "apps.demo.tasks.sample"})()
+    child = instrumentation.celery_task_duration.labels("apps.demo.tasks.sample", "SUCCESS")
+    before = child.count()
+
+    instrumentation._on_task_prerun(task_id="task-1", task=task)
+    instrumentation._on_task_postrun(task_id="task-1", task=task, state="SUCCESS")
+
+    assert child.count() == before + 1
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_requires_staff_or_token(client, settings):
+    settings.RUNTIME_METRICS_TOKEN = "scrape-secret"
+    url = reverse("runtime-metrics")
+
+    assert client.get(url).status_code == 302
+    assert client.get(url, HTTP_AUTHORIZATION="Bearer wrong").status_code == 302
+
+    response = client.get(url, HTTP_AUTHORIZATION="Bearer scrape-secret")
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert b"# TYPE http_request_duration_seconds histogram" in response.content
+
+    staff = get_user_model().objects.create_user(
+        username="metrics-staff", password="pw", is_staff=True
+    )
+    client.force_login(staff)
+    assert client.get(url).status_code == 200
+
+
+def test_benchmark_metrics_reports_json():
+    stdout = StringIO()
+
+    call_command(
+        "benchmark",
+        "metrics",
+        "--samples",
+        "2000",
+        "--threads",
+        "2",
+        "--budget-ns",
+        "1000000",
+        "--json",
+        stdout=stdout,
+    )
+
+    payload = json.loads(stdout.getvalue())
+    assert payload["within_budget"] is True
+    assert {run["operation"] for run in payload["runs"]} == {
+        "counter-inc",
+        "histogram-observe",
+        "bound-histogram-observe",
+    }
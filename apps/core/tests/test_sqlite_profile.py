@@ -0,0 +1,151 @@
+"""Tests for the SQLite connection profile and read/write routing."""
+
+import json
+from io import StringIO
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connections, transaction
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+from apps.core import dbrouters
+from apps.core.dbrouters import SQLiteReadReplicaRouter
+from config.settings.database import SQLITE_READ_ALIAS, build_sqlite_databases
+
+
+def test_sqlite_databases_use_immediate_transactions_and_persistent_connections(tmp_path):
+    configs = build_sqlite_databases(
+        tmp_path / "db.sqlite3", tmp_path / "test.sqlite3", read_split=True
+    )
+
+    default = configs["default"]
+    replica = configs[SQLITE_READ_ALIAS]
+    assert default["OPTIONS"]["transaction_mode"] == "IMMEDIATE"
+    assert default["CONN_MAX_AGE"] == 60
+    assert default["CONN_HEALTH_CHECKS"] is True
+    assert replica["NAME"] == default["NAME"]
+    assert replica["READ_ONLY"] is True
+    assert replica["TEST"] == {"MIRROR": "default"}
+    assert "transaction_mode" not in replica["OPTIONS"]
+
+
+def test_sqlite_database_options_are_validated(tmp_path, monkeypatch):
+    monkeypatch.setenv("ARTHEXIS_SQLITE_TRANSACTION_MODE", "eventually")
+
+    with pytest.raises(ImproperlyConfigured):
+        build_sqlite_databases(tmp_path / "db.sqlite3", tmp_path / "test.sqlite3")
+
+    monkeypatch.setenv("ARTHEXIS_SQLITE_TRANSACTION_MODE", "deferred")
+    monkeypatch.setenv("ARTHEXIS_DB_CONN_MAX_AGE", "0")
+    configs = build_sqlite_databases(tmp_path / "db.sqlite3", tmp_path / "test.sqlite3")
+
+    assert configs["default"]["OPTIONS"]["transaction_mode"] == "DEFERRED"
+    assert configs["default"]["CONN_HEALTH_CHECKS"] is False
+    assert SQLITE_READ_ALIAS not in configs
+
+
+@pytest.mark.filterwarnings("ignore:Overriding setting DATABASES")
+def test_read_replica_router_splits_reads_outside_transactions(settings, monkeypatch):
+    settings.DATABASES = {**settings.DATABASES, SQLITE_READ_ALIAS: {}}
+    primary = SimpleNamespace(in_atomic_block=False)
+    monkeypatch.setattr(dbrouters, "connections", {"default": primary})
+    router = SQLiteReadReplicaRouter()
+    replica_row = SimpleNamespace(_state=SimpleNamespace(db=SQLITE_READ_ALIAS))
+    primary_row = SimpleNamespace(_state=SimpleNamespace(db="default"))
+
+    assert router.db_for_read(object) == SQLITE_READ_ALIAS
+    primary.in_atomic_block = True
+    assert router.db_for_read(object) == "default"
+    assert router.db_for_write(object, instance=replica_row) == "default"
+    assert router.allow_relation(replica_row, primary_row) is True
+    assert router.allow_migrate(SQLITE_READ_ALIAS, "core") is False
+
+
+@pytest.mark.filterwarnings("ignore:Overriding setting DATABASES")
+def test_reads_outside_transactions_are_served_by_the_replica_alias(
+    settings, django_db_setup, django_db_blocker
+):
+    replica_settings = {**connections["default"].settings_dict, "READ_ONLY": True}
+    settings.DATABASES = {**settings.DATABASES, SQLITE_READ_ALIAS: replica_settings}
+    connections.settings[SQLITE_READ_ALIAS] = replica_settings
+    try:
+        with django_db_blocker.unblock():
+            routed = ContentType.objects.order_by("pk").first()
+            with transaction.atomic():
+                pinned = ContentType.objects.order_by("pk").first()
+            with connections[SQLITE_READ_ALIAS].cursor() as cursor:
+                cursor.execute("PRAGMA query_only;")
+                query_only = cursor.fetchone()[0]
+
+        assert routed._state.db == SQLITE_READ_ALIAS
+        assert pinned._state.db == "default"
+        assert query_only == 1
+    finally:
+        connections[SQLITE_READ_ALIAS].close()
+        del connections[SQLITE_READ_ALIAS]
+        del connections.settings[SQLITE_READ_ALIAS]
+
+
+@pytest.mark.filterwarnings("ignore:Overriding setting DATABASES")
+def test_read_replica_router_is_inert_without_alias(settings):
+    settings.DATABASES = {
+        alias: config
+        for alias, config in settings.DATABASES.items()
+        if alias != SQLITE_READ_ALIAS
+    }
+    router = SQLiteReadReplicaRouter()
+
+    assert router.db_for_read(object) is None
+    assert router.db_for_write(object) is None
+    assert router.allow_migrate("default", "core") is None
+
+
+def test_read_only_connections_enable_query_only(tmp_path: Path, django_db_blocker):
+    settings_dict = {
+        **connections["default"].settings_dict,
+        "NAME": tmp_path / "replica.sqlite3",
+        "READ_ONLY": True,
+    }
+    wrapper = DatabaseWrapper(settings_dict, alias="test_read_only")
+    try:
+        with django_db_blocker.unblock(), wrapper.cursor() as cursor:
+            cursor.execute("PRAGMA query_only;")
+            assert cursor.fetchone()[0] == 1
+    finally:
+        wrapper.close()
+
+
+def test_benchmark_sqlite_concurrency_reports_json(tmp_path):
+    stdout = StringIO()
+
+    call_command(
+        "benchmark",
+        "sqlite-concurrency",
+        "--writers",
+        "2",
+        "--readers",
+        "2",
+        "--duration",
+        "0.3",
+        "--workdir",
+        str(tmp_path),
+        "--json",
+        stdout=stdout,
+    )
+
+    runs = {
+        (run["profile"], run["operation"]): run
+        for run in json.loads(stdout.getvalue())["runs"]
+    }
+    assert set(runs) == {
+        ("legacy", "websocket-write"),
+        ("legacy", "admin-read"),
+        ("tuned", "websocket-write"),
+        ("tuned", "admin-read"),
+    }
+    assert runs[("tuned", "websocket-write")]["busy_errors"] == 0
+    assert runs[("tuned", "admin-read")]["operations"] > 0
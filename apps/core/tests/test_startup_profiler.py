@@ -0,0 +1,93 @@
+"""Tests for the startup profiler and its regression checks."""
+
+import json
+from io import StringIO
+from types import SimpleNamespace
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from apps.core.management.commands import profile_startup as command_module
+from apps.core.startup_profiler import (
+    AppTiming,
+    StartupProfile,
+    compare_profiles,
+    deferred_import_violations,
+)
+
+
+def _profile(*, setup: float = 2.0, core_ready: float = 0.1, violations=None) -> StartupProfile:
+    return StartupProfile(
+        settings_seconds=0.2,
+        setup_seconds=setup,
+        first_request_seconds=0.5,
+        first_request_status=200,
+        total_seconds=setup + 0.7,
+        module_count=1000,
+        apps=[
+            AppTiming(label="core", name="apps.core", import_seconds=0.01, ready_seconds=core_ready),
+            AppTiming(label="ocpp", name="apps.ocpp", models_seconds=0.3),
+        ],
+        deferred_violations=violations or {},
+    )
+
+
+def test_deferred_import_violations_match_top_level_modules():
+    configs = [
+        SimpleNamespace(label="reports", deferred_imports=("reportlab", "weasyprint")),
+        SimpleNamespace(label="video", deferred_imports=("cv2",)),
+        SimpleNamespace(label="core"),
+    ]
+
+    violations = deferred_import_violations(
+        configs, ["django", "reportlab.pdfgen.canvas", "reportlab", "cv2x"]
+    )
+
+    assert violations == {"reports": ["reportlab"]}
+
+
+def test_compare_profiles_flags_relative_and_absolute_growth():
+    baseline = _profile()
+
+    regressions = compare_profiles(baseline, _profile(setup=3.0, core_ready=0.12))
+
+    assert {regression.metric for regression in regressions} == {"setup", "total"}
+    assert compare_profiles(baseline, _profile(setup=2.2)) == []
+
+
+def test_profile_round_trips_through_json():
+    profile = _profile(violations={"aws": ["boto3"]})
+
+    restored = StartupProfile.from_dict(json.loads(json.dumps(profile.to_dict())))
+
+    assert restored == profile
+    assert restored.slowest(1)[0].label == "ocpp"
+
+
+def test_profile_startup_command_compares_against_baseline(tmp_path, monkeypatch):
+    baseline_path = tmp_path / "baseline.json"
+    baseline_path.write_text(json.dumps({"profile": _profile().to_dict()}), encoding="utf-8")
+    monkeypatch.setattr(
+        command_module, "profile_startup", lambda **kwargs: _profile(core_ready=0.6)
+    )
+    stdout = StringIO()
+
+    with pytest.raises(CommandError, match="startup regression"):
+        call_command(
+            "profile_startup", "--baseline", str(baseline_path), "--json", stdout=stdout
+        )
+
+    payload = json.loads(stdout.getvalue())
+    assert [entry["metric"] for entry in payload["regressions"]] == ["app:core"]
+
+
+def test_profile_startup_command_fails_on_deferred_imports(monkeypatch):
+    monkeypatch.setattr(
+        command_module,
+        "profile_startup",
+        lambda **kwargs: _profile(violations={"aws": ["boto3"]}),
+    )
+
+    with pytest.raises(CommandError, match=r"aws \(boto3\)"):
+        call_command("profile_startup", "--no-request", stdout=StringIO())
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from .admin_tools import request_temp_password, stop_impersonation, version_info
 from .auth import rfid_login
+from .metrics import metrics_exposition
 from .odoo import (
     add_live_subscription,
     live_subscription_list,
@@ -30,6 +31,7 @@ __all__ = [
     "_resolve_release_log_dir",
     "add_live_subscription",
     "live_subscription_list",
+    "metrics_exposition",
     "odoo_products",
     "odoo_quote_report",
     "product_list",
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import hmac
+
+from django.conf import settings
+from django.contrib.auth.views import redirect_to_login
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+
+from apps.core.metrics import PROMETHEUS_CONTENT_TYPE, render_prometheus
+
+
+def _has_metrics_token(request) -> bool:
+    token = getattr(settings, "RUNTIME_METRICS_TOKEN", "")
+    if not token:
+        return False
+    scheme, _, supplied = request.META.get("HTTP_AUTHORIZATION", "").partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(supplied.strip(), token)
+
+
+@require_GET
+def metrics_exposition(request):
+    """Return this process's runtime metrics in the Prometheus text format.
+
+    Staff sessions can always read the metrics; scrapers authenticate with
+    ``Authorization: Bearer <RUNTIME_METRICS_TOKEN>`` when a token is set.
+    """
+
+    user = getattr(request, "user", None)
+    if not (_has_metrics_token(request) or (user and user.is_active and user.is_staff)):
+        if user and user.is_authenticated:
+            return HttpResponse(status=403)
+        return redirect_to_login(request.get_full_path())
+    return HttpResponse(render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -5,7 +5,7 @@ from pathlib import Path
 
 from django.core.management.base import BaseCommand, CommandError
 
-from apps.docs import kindle_postbox
+from apps.docs import kindle_postbox, prebuild
 from apps.nodes.models import Node
 from apps.nodes.roles import node_is_control
 
@@ -13,12 +13,55 @@ from apps.nodes.roles import node_is_control
 class Command(BaseCommand):
     """Build and distribute suite documentation artifacts."""
 
-    help = "Documentation operations, including Kindle postbox export and sync."
+    help = (
+        "Documentation operations, including the prebuilt render/search store "
+        "and Kindle postbox export and sync."
+    )
 
     def add_arguments(self, parser) -> None:
         subparsers = parser.add_subparsers(dest="action")
         subparsers.required = True
 
+        prebuild_parser = subparsers.add_parser(
+            "build",
+            help="Prerender changed documents and rebuild the documentation search index.",
+        )
+        prebuild_parser.add_argument(
+            "--output-dir",
+            help="Directory for the artifact store (defaults to work/docs/prebuilt).",
+        )
+        prebuild_parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-render every document even when its content hash is unchanged.",
+        )
+        prebuild_parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Emit machine-readable JSON output.",
+        )
+
+        search_parser = subparsers.add_parser(
+            "search",
+            help="Query the prebuilt documentation search index.",
+        )
+        search_parser.add_argument("query", help="Words to match in titles and bodies.")
+        search_parser.add_argument(
+            "--limit",
+            type=int,
+            default=prebuild.SEARCH_RESULT_LIMIT,
+            help="Maximum number of matches to report.",
+        )
+        search_parser.add_argument(
+            "--output-dir",
+            help="Directory holding the artifact store (defaults to work/docs/prebuilt).",
+        )
+        search_parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Emit machine-readable JSON output.",
+        )
+
         postbox_parser = subparsers.add_parser(
             "kindle-postbox",
             help="Build or sync the Kindle postbox suite documentation bundle.",
@@ -98,10 +141,47 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options) -> None:
+        if options["action"] == "build":
+            return self._handle_build(**options)
+        if options["action"] == "search":
+            return self._handle_search(**options)
         if options["action"] == "kindle-postbox":
             return self._handle_kindle_postbox(**options)
         raise CommandError(f"Unsupported docs action: {options['action']}")
 
+    def _handle_build(self, **options) -> None:
+        output_dir = Path(options["output_dir"]) if options.get("output_dir") else None
+        try:
+            result = prebuild.build(output_dir=output_dir, force=options["force"])
+        except OSError as exc:
+            raise CommandError(f"Documentation prebuild failed: {exc}") from exc
+        if options["json"]:
+            self.stdout.write(json.dumps(result.as_dict(), sort_keys=True))
+            return
+        self.stdout.write(
+            f"Documentation prebuilt: documents={result.documents} "
+            f"rendered={result.rendered} reused={result.reused} dynamic={result.dynamic} "
+            f"removed_objects={result.removed_objects} search={result.search_backend} "
+            f"seconds={result.seconds:.2f} dir={result.output_dir}"
+        )
+
+    def _handle_search(self, **options) -> None:
+        output_dir = Path(options["output_dir"]) if options.get("output_dir") else None
+        results = prebuild.search(
+            options["query"], limit=options["limit"], output_dir=output_dir
+        )
+        if results is None:
+            raise CommandError(
+                "Documentation search index is not built; run `manage.py docs build`."
+            )
+        if options["json"]:
+            self.stdout.write(json.dumps(results, sort_keys=True))
+            return
+        if not results:
+            self.stdout.write("No matching documents.")
+        for result in results:
+            self.stdout.write(f"{result['doc_path']}: {result['title']}")
+
     def _handle_kindle_postbox(self, **options) -> None:
         output_dir = (
             Path(options["output_dir"]) if options.get("output_dir") else None
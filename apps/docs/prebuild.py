@@ -0,0 +1,549 @@
+"""Prebuilt documentation artifacts, library manifest and full-text search index.
+
+``manage.py docs build`` renders every document under ``docs/`` and
+``apps/docs/`` plus the root and locale README files. Each rendering is stored
+in a content-addressed artifact store keyed by the hash of the source bytes,
+so only files whose hashes changed are rendered again. A manifest records the
+library listing, blurbs and artifact of every document, and a SQLite search
+index (FTS5 when the SQLite build supports it) backs the docs search endpoint.
+
+Views look documents up in the manifest and fall back to rendering on demand
+when a file changed after the last build. Documents whose text contains sigils
+are never stored as artifacts because their content depends on runtime data.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import html as html_lib
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+
+from apps.docs import rendering
+
+# Bump when rendering output changes so every artifact is rebuilt.
+BUILD_FORMAT = 1
+MANIFEST_FILENAME = "manifest.json"
+SEARCH_INDEX_FILENAME = "search.sqlite3"
+OBJECTS_DIR_NAME = "objects"
+LIBRARY_ROOTS = {"docs": "docs", "apps_docs": "apps/docs"}
+DOCUMENT_EXTENSIONS = (
+    rendering.MARKDOWN_FILE_EXTENSIONS
+    | rendering.PLAINTEXT_FILE_EXTENSIONS
+    | rendering.CSV_FILE_EXTENSIONS
+    | {".rst"}
+)
+SEARCH_BACKEND_FTS5 = "fts5"
+SEARCH_BACKEND_INVERTED = "inverted"
+SEARCH_RESULT_LIMIT = 20
+SNIPPET_TOKENS = 16
+_MATCH_START = "\x02"
+_MATCH_END = "\x03"
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_TAG_RE = re.compile(r"<[^>]+>")
+_HEADING_RE = re.compile(r"^#{1,6}\s+(?P<title>.+?)\s*#*\s*$", re.MULTILINE)
+
+_MANIFEST_CACHE: dict[Path, tuple[tuple[int, int, int], "Manifest"]] = {}
+
+
+def default_build_dir() -> Path:
+    configured = getattr(settings, "DOCS_PREBUILD_DIR", "")
+    if configured:
+        return Path(configured)
+    return Path(settings.BASE_DIR) / "work" / "docs" / "prebuilt"
+
+
+def iter_document_paths(root: Path) -> list[Path]:
+    """Return allowed documentation files under ``root``."""
+
+    if not root.exists():
+        return []
+    documents: list[Path] = []
+    for path in root.rglob("*"):
+        if not path.is_file():
+            continue
+        relative = path.relative_to(root)
+        if any(part.startswith(".") for part in relative.parts):
+            continue
+        if path.suffix.lower() not in DOCUMENT_EXTENSIONS:
+            continue
+        documents.append(path)
+    return sorted(documents)
+
+
+def _readme_paths(base_dir: Path) -> list[Path]:
+    readmes = sorted(base_dir.glob("README*.md"))
+    locale_dir = base_dir / "locale"
+    if locale_dir.is_dir():
+        readmes.extend(sorted(locale_dir.glob("README*.md")))
+    return [path for path in readmes if path.is_file()]
+
+
+def source_hash(data: bytes, extension: str) -> str:
+    digest = hashlib.sha256(f"{BUILD_FORMAT}:{extension.lower()}:".encode("utf-8"))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def _object_path(output_dir: Path, digest: str) -> Path:
+    return output_dir / OBJECTS_DIR_NAME / digest[:2] / f"{digest}.json"
+
+
+def _html_text(html: str) -> str:
+    return " ".join(html_lib.unescape(_TAG_RE.sub(" ", html)).split())
+
+
+def _document_title(text: str, path: Path) -> str:
+    if path.suffix.lower() in rendering.MARKDOWN_FILE_EXTENSIONS:
+        match = _HEADING_RE.search(text)
+        if match:
+            return match.group("title").strip()
+    return path.stem
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(handle, "wb") as stream:
+            stream.write(data)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+@dataclass
+class Manifest:
+    base_dir: Path
+    output_dir: Path
+    documents: dict[str, dict[str, Any]] = field(default_factory=dict)
+    library: dict[str, list[str]] = field(default_factory=dict)
+    search_backend: str = ""
+    built_at: str = ""
+
+    def entry_for(self, path: Path) -> dict[str, Any] | None:
+        try:
+            relative = path.resolve().relative_to(self.base_dir).as_posix()
+        except ValueError:
+            return None
+        return self.documents.get(relative)
+
+    def library_paths(self, key: str) -> list[Path]:
+        return [self.base_dir / relative for relative in self.library.get(key, [])]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "format": BUILD_FORMAT,
+            "base_dir": str(self.base_dir),
+            "built_at": self.built_at,
+            "search_backend": self.search_backend,
+            "library": self.library,
+            "documents": self.documents,
+        }
+
+
+@dataclass(frozen=True)
+class BuildResult:
+    output_dir: Path
+    documents: int
+    rendered: int
+    reused: int
+    dynamic: int
+    removed_objects: int
+    search_backend: str
+    seconds: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "output_dir": str(self.output_dir),
+            "documents": self.documents,
+            "rendered": self.rendered,
+            "reused": self.reused,
+            "dynamic": self.dynamic,
+            "removed_objects": self.removed_objects,
+            "search_backend": self.search_backend,
+            "seconds": self.seconds,
+        }
+
+
+def load_manifest(output_dir: Path | None = None) -> Manifest | None:
+    """Return the current manifest, re-reading it only when the file changes."""
+
+    output_dir = Path(output_dir or default_build_dir())
+    manifest_path = output_dir / MANIFEST_FILENAME
+    try:
+        stat = manifest_path.stat()
+    except OSError:
+        _MANIFEST_CACHE.pop(manifest_path, None)
+        return None
+    # The manifest is replaced atomically, so a new inode marks a new build
+    # even when two builds land within one timestamp tick.
+    signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    cached = _MANIFEST_CACHE.get(manifest_path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    try:
+        payload = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if payload.get("format") != BUILD_FORMAT:
+        return None
+    manifest = Manifest(
+        base_dir=Path(payload["base_dir"]),
+        output_dir=output_dir,
+        documents=payload.get("documents", {}),
+        library=payload.get("library", {}),
+        search_backend=payload.get("search_backend", ""),
+        built_at=payload.get("built_at", ""),
+    )
+    _MANIFEST_CACHE[manifest_path] = (signature, manifest)
+    return manifest
+
+
+def _read_object(output_dir: Path, digest: str) -> dict[str, Any] | None:
+    try:
+        return json.loads(_object_path(output_dir, digest).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _current_entry(
+    path: Path, output_dir: Path | None
+) -> tuple[Manifest, dict[str, Any]] | None:
+    manifest = load_manifest(output_dir)
+    if manifest is None:
+        return None
+    entry = manifest.entry_for(path)
+    if not entry:
+        return None
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    if stat.st_mtime_ns != entry["mtime_ns"] or stat.st_size != entry["size"]:
+        return None
+    return manifest, entry
+
+
+def load_artifact(path: Path, *, output_dir: Path | None = None) -> tuple[str, str] | None:
+    """Return the prebuilt ``(html, toc)`` for ``path`` if it is still current.
+
+    A file whose size or modification time differs from the build is treated
+    as changed and rendered on demand instead.
+    """
+
+    current = _current_entry(path, output_dir)
+    if current is None or not current[1].get("artifact"):
+        return None
+    manifest, entry = current
+    payload = _read_object(manifest.output_dir, entry["artifact"])
+    if payload is None:
+        return None
+    return payload["html"], payload["toc"]
+
+
+def document_blurb(path: Path, *, output_dir: Path | None = None) -> str | None:
+    """Return the prebuilt blurb for ``path``, or ``None`` when it is not current."""
+
+    current = _current_entry(path, output_dir)
+    return None if current is None else current[1]["blurb"]
+
+
+def library_paths(
+    base_dir: Path, *, output_dir: Path | None = None
+) -> tuple[list[Path], list[Path]] | None:
+    """Return the prebuilt docs and apps/docs listings for ``base_dir``."""
+
+    manifest = load_manifest(output_dir)
+    if manifest is None or manifest.base_dir != base_dir.resolve():
+        return None
+    return manifest.library_paths("docs"), manifest.library_paths("apps_docs")
+
+
+def _render_source(path: Path, data: bytes) -> tuple[dict[str, Any], bool]:
+    raw_text = data.decode("utf-8", errors="replace")
+    text = rendering.read_document_text(path)
+    html, toc = rendering.render_document_text(text, path.suffix)
+    payload = {"html": html, "toc": toc, "text": _html_text(html)}
+    if text == raw_text:
+        return payload, False
+    # Index the unresolved source so sigil values never reach the search index.
+    payload["text"] = _html_text(rendering.render_document_text(raw_text, path.suffix)[0])
+    return payload, True
+
+
+def build(
+    *,
+    base_dir: Path | None = None,
+    output_dir: Path | None = None,
+    force: bool = False,
+) -> BuildResult:
+    """Render changed documents, then rewrite the manifest and search index."""
+
+    started = time.perf_counter()
+    base_dir = Path(base_dir or settings.BASE_DIR).resolve()
+    output_dir = Path(output_dir or default_build_dir())
+    previous = None if force else load_manifest(output_dir)
+    previous_documents = (
+        previous.documents if previous is not None and previous.base_dir == base_dir else {}
+    )
+
+    library = {
+        key: iter_document_paths(base_dir / relative_root)
+        for key, relative_root in LIBRARY_ROOTS.items()
+    }
+    sources = _readme_paths(base_dir) + [path for paths in library.values() for path in paths]
+
+    documents: dict[str, dict[str, Any]] = {}
+    search_rows: list[tuple[str, str, str]] = []
+    rendered = reused = dynamic = 0
+    for path in sources:
+        relative = path.relative_to(base_dir).as_posix()
+        stat = path.stat()
+        entry = previous_documents.get(relative)
+        payload = None
+        if (
+            entry is not None
+            and entry.get("artifact")
+            and entry["mtime_ns"] == stat.st_mtime_ns
+            and entry["size"] == stat.st_size
+        ):
+            payload = _read_object(output_dir, entry["artifact"])
+        if payload is None:
+            data = path.read_bytes()
+            digest = source_hash(data, path.suffix)
+            # Content addressing lets touched, renamed and duplicated files
+            # reuse an artifact that is already in the store.
+            payload = _read_object(output_dir, digest)
+            if payload is None:
+                payload, is_dynamic = _render_source(path, data)
+                rendered += 1
+                if is_dynamic:
+                    dynamic += 1
+                    digest = ""
+                else:
+                    object_path = _object_path(output_dir, digest)
+                    if not object_path.exists():
+                        _write_atomic(object_path, json.dumps(payload).encode("utf-8"))
+            else:
+                reused += 1
+            raw_text = data.decode("utf-8", errors="replace")
+            entry = {
+                "artifact": digest,
+                "title": _document_title(raw_text, path),
+                "blurb": rendering.extract_blurb(raw_text),
+            }
+        else:
+            reused += 1
+        documents[relative] = {
+            **entry,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+        }
+        if not relative.startswith("README") and not relative.startswith("locale/"):
+            search_rows.append((relative, documents[relative]["title"], payload["text"]))
+
+    search_backend = write_search_index(output_dir / SEARCH_INDEX_FILENAME, search_rows)
+    manifest = Manifest(
+        base_dir=base_dir,
+        output_dir=output_dir,
+        documents=documents,
+        library={
+            key: [path.relative_to(base_dir).as_posix() for path in paths]
+            for key, paths in library.items()
+        },
+        search_backend=search_backend,
+        built_at=datetime.now(timezone.utc).isoformat(),
+    )
+    _write_atomic(
+        output_dir / MANIFEST_FILENAME,
+        json.dumps(manifest.as_dict(), sort_keys=True).encode("utf-8"),
+    )
+    removed = _remove_unreferenced_objects(output_dir, documents)
+    return BuildResult(
+        output_dir=output_dir,
+        documents=len(documents),
+        rendered=rendered,
+        reused=reused,
+        dynamic=dynamic,
+        removed_objects=removed,
+        search_backend=search_backend,
+        seconds=time.perf_counter() - started,
+    )
+
+
+def _remove_unreferenced_objects(output_dir: Path, documents: dict[str, dict[str, Any]]) -> int:
+    referenced = {entry["artifact"] for entry in documents.values() if entry.get("artifact")}
+    removed = 0
+    objects_dir = output_dir / OBJECTS_DIR_NAME
+    if not objects_dir.is_dir():
+        return 0
+    for path in objects_dir.glob("*/*.json"):
+        if path.stem not in referenced:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+def fts5_available() -> bool:
+    connection = sqlite3.connect(":memory:")
+    try:
+        connection.execute("CREATE VIRTUAL TABLE probe USING fts5(body)")
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        connection.close()
+    return True
+
+
+def write_search_index(
+    index_path: Path,
+    rows: list[tuple[str, str, str]],
+    *,
+    backend: str | None = None,
+) -> str:
+    """Write ``(doc_path, title, text)`` rows to a fresh index and return its backend."""
+
+    backend = backend or (SEARCH_BACKEND_FTS5 if fts5_available() else SEARCH_BACKEND_INVERTED)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    handle, temp_name = tempfile.mkstemp(dir=index_path.parent, prefix=f".{index_path.name}.")
+    os.close(handle)
+    connection = sqlite3.connect(temp_name)
+    try:
+        with connection:
+            connection.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+            connection.execute("INSERT INTO meta VALUES ('backend', ?)", (backend,))
+            if backend == SEARCH_BACKEND_FTS5:
+                connection.execute(
+                    "CREATE VIRTUAL TABLE documents USING fts5("
+                    "doc_path UNINDEXED, title, body, tokenize='unicode61')"
+                )
+                connection.executemany(
+                    "INSERT INTO documents (doc_path, title, body) VALUES (?, ?, ?)", rows
+                )
+            else:
+                connection.execute(
+                    "CREATE TABLE documents ("
+                    "id INTEGER PRIMARY KEY, doc_path TEXT, title TEXT, body TEXT)"
+                )
+                connection.execute(
+                    "CREATE TABLE postings (term TEXT, document_id INTEGER, hits INTEGER)"
+                )
+                for doc_path, title, body in rows:
+                    cursor = connection.execute(
+                        "INSERT INTO documents (doc_path, title, body) VALUES (?, ?, ?)",
+                        (doc_path, title, body),
+                    )
+                    terms = Counter(_tokens(f"{title} {title} {body}"))
+                    connection.executemany(
+                        "INSERT INTO postings VALUES (?, ?, ?)",
+                        [(term, cursor.lastrowid, hits) for term, hits in terms.items()],
+                    )
+                connection.execute("CREATE INDEX postings_term ON postings (term)")
+    finally:
+        connection.close()
+    os.replace(temp_name, index_path)
+    return backend
+
+
+def _tokens(text: str) -> list[str]:
+    return [token.lower() for token in _TOKEN_RE.findall(text)]
+
+
+def _format_snippet(snippet: str) -> str:
+    return (
+        html_lib.escape(snippet)
+        .replace(_MATCH_START, "<mark>")
+        .replace(_MATCH_END, "</mark>")
+    )
+
+
+def _inverted_snippet(body: str, terms: list[str]) -> str:
+    lowered = body.lower()
+    positions = [lowered.find(term) for term in terms]
+    position = min((found for found in positions if found >= 0), default=0)
+    start = max(0, position - 60)
+    excerpt = body[start : position + 120]
+    for term in sorted(set(terms), key=len, reverse=True):
+        excerpt = re.sub(
+            rf"(?i)\b({re.escape(term)}\w*)",
+            rf"{_MATCH_START}\1{_MATCH_END}",
+            excerpt,
+        )
+    prefix = "…" if start else ""
+    suffix = "…" if position + 120 < len(body) else ""
+    return f"{prefix}{excerpt}{suffix}"
+
+
+def search(
+    query: str,
+    *,
+    limit: int = SEARCH_RESULT_LIMIT,
+    output_dir: Path | None = None,
+) -> list[dict[str, str]] | None:
+    """Return ranked matches for ``query``, or ``None`` when no index is built.
+
+    Every query term must match, as a prefix, in the title or body.
+    Snippets are HTML-escaped with matches wrapped in ``<mark>``.
+    """
+
+    index_path = Path(output_dir or default_build_dir()) / SEARCH_INDEX_FILENAME
+    if not index_path.exists():
+        return None
+    terms = _tokens(query)
+    if not terms:
+        return []
+    connection = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True)
+    try:
+        (backend,) = connection.execute(
+            "SELECT value FROM meta WHERE key = 'backend'"
+        ).fetchone()
+        if backend == SEARCH_BACKEND_FTS5:
+            match = " ".join(f'"{term}"*' for term in terms)
+            rows = connection.execute(
+                "SELECT doc_path, title, snippet(documents, 2, ?, ?, '…', ?) "
+                "FROM documents WHERE documents MATCH ? "
+                "ORDER BY bm25(documents, 0.0, 5.0, 1.0) LIMIT ?",
+                (_MATCH_START, _MATCH_END, SNIPPET_TOKENS, match, limit),
+            ).fetchall()
+        else:
+            matched: dict[int, int] | None = None
+            for term in terms:
+                hits: dict[int, int] = {}
+                for document_id, count in connection.execute(
+                    "SELECT document_id, SUM(hits) FROM postings "
+                    "WHERE term >= ? AND term < ? GROUP BY document_id",
+                    (term, f"{term}\uffff"),
+                ):
+                    hits[document_id] = count
+                matched = (
+                    hits
+                    if matched is None
+                    else {key: matched[key] + hits[key] for key in matched.keys() & hits.keys()}
+                )
+            ranked = sorted((matched or {}).items(), key=lambda pair: (-pair[1], pair[0]))[:limit]
+            rows = []
+            for document_id, _score in ranked:
+                doc_path, title, body = connection.execute(
+                    "SELECT doc_path, title, body FROM documents WHERE id = ?",
+                    (document_id,),
+                ).fetchone()
+                rows.append((doc_path, title, _inverted_snippet(body, terms)))
+    finally:
+        connection.close()
+    return [
+        {"doc_path": doc_path, "title": title, "snippet": _format_snippet(snippet)}
+        for doc_path, title, snippet in rows
+    ]
@@ -193,8 +193,13 @@ def read_document_text(file_path: Path) -> str:
 def render_document_file(file_path: Path) -> tuple[str, str]:
     """Render a documentation file according to its extension."""
 
-    extension = file_path.suffix.lower()
-    text = read_document_text(file_path)
+    return render_document_text(read_document_text(file_path), file_path.suffix)
+
+
+def render_document_text(text: str, extension: str) -> tuple[str, str]:
+    """Render already-read document ``text`` according to ``extension``."""
+
+    extension = extension.lower()
     if extension in MARKDOWN_FILE_EXTENSIONS:
         return render_markdown_with_toc(text)
     if extension in CSV_FILE_EXTENSIONS:
@@ -227,3 +232,42 @@ def split_html_sections(html: str, keep_sections: int) -> tuple[str, str]:
 
     split_index = heading_matches[keep_sections].start()
     return html[:split_index], html[split_index:]
+
+
+def extract_blurb(raw_text: str, *, max_length: int = 220) -> str:
+    """Return a short summary of the first prose lines of ``raw_text``."""
+
+    candidates: list[str] = []
+    in_front_matter = False
+    seen_non_blank = False
+    for line in raw_text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped == "---":
+            if in_front_matter or not seen_non_blank:
+                in_front_matter = not in_front_matter
+                continue
+        seen_non_blank = True
+        if in_front_matter:
+            continue
+        if stripped.startswith("#"):
+            continue
+        if stripped == "---":
+            continue
+        candidates.append(stripped)
+        if len(candidates) >= 3:
+            break
+
+    if not candidates:
+        return ""
+
+    summary = " ".join(candidates)
+    if len(summary) <= max_length:
+        return summary
+
+    cut_off = summary.rfind(" ", 0, max_length)
+    if cut_off == -1:
+        cut_off = max_length - 1
+
+    return f"{summary[:cut_off].rstrip()}…"
@@ -0,0 +1,117 @@
+import json
+import os
+
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+
+from apps.docs import prebuild
+
+pytestmark = pytest.mark.django_db
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def doc_tree(tmp_path):
+    base_dir = tmp_path / "repo"
+    _write(base_dir / "README.md", "# Suite\n\nOverview of the suite.\n")
+    _write(base_dir / "docs" / "charging.md", "# Charging\n\nStart a session with an RFID tag.\n")
+    _write(base_dir / "docs" / "copy.md", "# Charging\n\nStart a session with an RFID tag.\n")
+    _write(base_dir / "apps" / "docs" / "guide.rst", "Guide\n=====\n\nFirmware <upgrades> explained.\n")
+    return base_dir, tmp_path / "prebuilt"
+
+
+@pytest.fixture(autouse=True)
+def _plain_sigils(monkeypatch):
+    monkeypatch.setattr(prebuild.rendering, "resolve_sigils", lambda text, **kwargs: text)
+
+
+def test_build_reuses_unchanged_documents_and_shares_identical_artifacts(doc_tree):
+    base_dir, output_dir = doc_tree
+
+    first = prebuild.build(base_dir=base_dir, output_dir=output_dir)
+    second = prebuild.build(base_dir=base_dir, output_dir=output_dir)
+    _write(base_dir / "docs" / "charging.md", "# Charging\n\nUse the app instead.\n")
+    third = prebuild.build(base_dir=base_dir, output_dir=output_dir)
+
+    assert (first.documents, first.rendered, first.reused) == (4, 3, 1)
+    assert (second.rendered, second.reused) == (0, 4)
+    assert (third.rendered, third.reused, third.removed_objects) == (1, 3, 0)
+    assert len(list((output_dir / prebuild.OBJECTS_DIR_NAME).glob("*/*.json"))) == 4
+
+
+def test_load_artifact_serves_current_files_only(doc_tree):
+    base_dir, output_dir = doc_tree
+    prebuild.build(base_dir=base_dir, output_dir=output_dir)
+    charging = base_dir / "docs" / "charging.md"
+
+    html, toc = prebuild.load_artifact(charging, output_dir=output_dir)
+    assert "RFID tag" in html
+    assert prebuild.document_blurb(charging, output_dir=output_dir).startswith("Start a session")
+
+    _write(charging, "# Charging\n\nEdited after the build.\n")
+    assert prebuild.load_artifact(charging, output_dir=output_dir) is None
+    assert prebuild.document_blurb(charging, output_dir=output_dir) is None
+
+
+def test_sigil_documents_are_left_to_render_on_demand(doc_tree, monkeypatch):
+    base_dir, output_dir = doc_tree
+    _write(base_dir / "docs" / "live.md", "# Live\n\nVersion [CONF.VERSION].\n")
+    monkeypatch.setattr(
+        prebuild.rendering,
+        "resolve_sigils",
+        lambda text, **kwargs: text.replace("[CONF.VERSION]", "1.2.3"),
+    )
+
+    result = prebuild.build(base_dir=base_dir, output_dir=output_dir)
+
+    assert result.dynamic == 1
+    assert prebuild.load_artifact(base_dir / "docs" / "live.md", output_dir=output_dir) is None
+    assert prebuild.search("1.2.3", output_dir=output_dir) == []
+
+
+@pytest.mark.parametrize(
+    "backend", [prebuild.SEARCH_BACKEND_FTS5, prebuild.SEARCH_BACKEND_INVERTED]
+)
+def test_search_matches_prefixes_and_escapes_snippets(doc_tree, monkeypatch, backend):
+    if backend == prebuild.SEARCH_BACKEND_FTS5 and not prebuild.fts5_available():
+        pytest.skip("SQLite was built without FTS5")
+    monkeypatch.setattr(prebuild, "fts5_available", lambda: backend == prebuild.SEARCH_BACKEND_FTS5)
+    base_dir, output_dir = doc_tree
+
+    result = prebuild.build(base_dir=base_dir, output_dir=output_dir)
+    matches = prebuild.search("firm upgra", output_dir=output_dir)
+
+    assert result.search_backend == backend
+    assert [match["doc_path"] for match in matches] == ["apps/docs/guide.rst"]
+    assert "<mark>" in matches[0]["snippet"]
+    assert "&lt;" in matches[0]["snippet"]
+    assert {match["doc_path"] for match in prebuild.search("rfid", output_dir=output_dir)} == {
+        "docs/charging.md",
+        "docs/copy.md",
+    }
+    assert prebuild.search("suite", output_dir=output_dir) == []
+
+
+def test_search_returns_none_before_the_first_build(tmp_path):
+    assert prebuild.search("anything", output_dir=tmp_path / "missing") is None
+
+
+def test_search_view_links_matches_to_document_pages(doc_tree, client, django_user_model):
+    base_dir, output_dir = doc_tree
+    prebuild.build(base_dir=base_dir, output_dir=output_dir)
+    client.force_login(
+        django_user_model.objects.create_superuser("docs-admin", "docs@example.com", "pw")
+    )
+
+    with override_settings(DOCS_PREBUILD_DIR=os.fspath(output_dir)):
+        response = client.get(reverse("docs:docs-search"), {"q": "firmware"})
+
+    payload = json.loads(response.content)
+    assert response.status_code == 200
+    assert payload["results"][0]["url"] == reverse("docs:apps-docs-document", args=["guide.rst"])
@@ -16,6 +16,7 @@ urlpatterns = [
     path("read/<path:doc>", views.readme, name="readme-document"),
     path("docs/", views.readme, {"prepend_docs": True}, name="docs-index"),
     path("docs/library/", views.document_library, name="docs-library"),
+    path("docs/search/", views.document_search, name="docs-search"),
     path("docs/github/", views.github_issue_viewer, name="docs-github-viewer"),
     path(
         "docs/github/<int:number>/",
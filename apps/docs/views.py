@@ -10,7 +10,7 @@ from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.core.cache import cache
 from django.db.models import Q
-from django.http import FileResponse, Http404, HttpRequest, HttpResponse
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import redirect, render
 from django.urls import NoReverseMatch, reverse
 from django.utils import timezone
@@ -33,7 +33,7 @@ from apps.repos.services import github as github_service
 from apps.repos.services.github import GitHubRepositoryError
 from apps.sites.utils import module_pill_link_validation
 
-from . import assets, rendering
+from . import assets, prebuild, rendering
 from .models import DocumentIndex
 
 logger = logging.getLogger(__name__)
@@ -211,6 +211,9 @@ def _normalize_docs_path(doc: str | None, prepend_docs: bool) -> str | None:
 
 
 def _render_document_cached(file_path: Path, cache_key: str) -> tuple[str, str]:
+    prebuilt = prebuild.load_artifact(file_path)
+    if prebuilt is not None:
+        return prebuilt
     cached = cache.get(cache_key)
     if cached:
         return cached
@@ -240,63 +243,20 @@ def _should_force_controller_full_document(request: HttpRequest) -> bool:
 def _iter_document_paths(root: Path) -> list[Path]:
     """Return allowed documentation files under ``root``."""
 
-    if not root.exists():
-        return []
-    documents: list[Path] = []
-    for path in root.rglob("*"):
-        if not path.is_file():
-            continue
-        relative = path.relative_to(root)
-        if any(part.startswith(".") for part in relative.parts):
-            continue
-        if not _is_allowed_doc_path(path):
-            continue
-        documents.append(path)
-    return sorted(documents)
+    return prebuild.iter_document_paths(root)
 
 
 def _extract_document_blurb(path: Path, *, max_length: int = 220) -> str:
     """Return a short summary line for the library index entry at ``path``."""
 
+    prebuilt = prebuild.document_blurb(path)
+    if prebuilt is not None:
+        return prebuilt
     try:
         raw_text = path.read_text(encoding="utf-8")
     except (OSError, UnicodeDecodeError):
         return ""
-
-    candidates: list[str] = []
-    in_front_matter = False
-    seen_non_blank = False
-    for line in raw_text.splitlines():
-        stripped = line.strip()
-        if not stripped:
-            continue
-        if stripped == "---":
-            if in_front_matter or not seen_non_blank:
-                in_front_matter = not in_front_matter
-                continue
-        seen_non_blank = True
-        if in_front_matter:
-            continue
-        if stripped.startswith("#"):
-            continue
-        if stripped == "---":
-            continue
-        candidates.append(stripped)
-        if len(candidates) >= 3:
-            break
-
-    if not candidates:
-        return ""
-
-    summary = " ".join(candidates)
-    if len(summary) <= max_length:
-        return summary
-
-    cut_off = summary.rfind(" ", 0, max_length)
-    if cut_off == -1:
-        cut_off = max_length - 1
-
-    return f"{summary[:cut_off].rstrip()}…"
+    return rendering.extract_blurb(raw_text, max_length=max_length)
 
 
 def _build_library_item(
@@ -671,6 +631,10 @@ def _get_cached_document_library_paths(
 ) -> tuple[list[Path], list[Path]]:
     """Return cached document path lists to avoid repeated filesystem scans."""
 
+    prebuilt = prebuild.library_paths(root_base)
+    if prebuilt is not None:
+        return prebuilt
+
     cache_key = f"{DOCUMENT_LIBRARY_CACHE_KEY}:paths:{root_base.as_posix()}"
     cached_paths = cache.get(cache_key)
     if cached_paths is not None:
@@ -878,7 +842,9 @@ def render_readme_page(
     cache_key = _build_render_cache_key(document.file, lang)
     is_authenticated = getattr(request, "user", None) and request.user.is_authenticated
     if is_authenticated:
-        html, toc_html = rendering.render_document_file(document.file)
+        html, toc_html = prebuild.load_artifact(document.file) or rendering.render_document_file(
+            document.file
+        )
     else:
         html, toc_html = _render_document_cached(document.file, cache_key)
     force_full_document = _should_default_full_document(normalized_doc)
@@ -1286,6 +1252,26 @@ def document_library(request):
     return _render_document_library(request)
 
 
+@security_group_required(*DEVELOPER_DOCUMENTS_SECURITY_GROUP_NAMES)
+def document_search(request):
+    """Return full-text search matches from the prebuilt documentation index."""
+
+    query = (request.GET.get("q") or "").strip()
+    results = prebuild.search(query) if query else []
+    if results is None:
+        return JsonResponse(
+            {"query": query, "results": [], "error": "Documentation search index is not built."},
+            status=503,
+        )
+    route_names = {"docs/": "docs:docs-document", "apps/docs/": "docs:apps-docs-document"}
+    for result in results:
+        prefix = "apps/docs/" if result["doc_path"].startswith("apps/docs/") else "docs/"
+        result["url"] = reverse(
+            route_names[prefix], args=[result["doc_path"][len(prefix) :]]
+        )
+    return JsonResponse({"query": query, "results": results})
+
+
 def _render_missing_document(
     request, *, doc: str | None, prepend_docs: bool
 ) -> HttpResponse:
@@ -0,0 +1,176 @@
+"""Benchmark incremental UID sync against the full-search poll on a local mailbox."""
+
+from __future__ import annotations
+
+import json
+import random
+import time
+from dataclasses import dataclass
+
+from django.core.management.base import CommandError
+
+from apps.core.benchmarks import BenchmarkScenario
+from apps.emails.local_imap import LocalImapMailbox
+from apps.emails.models import EmailInbox
+from apps.emails.sync import CollectorRule, SyncCursor, sync_mailbox
+
+DEFAULT_MAILBOX_SIZES = (1000, 10000)
+DEFAULT_POLLS = 5
+DEFAULT_NEW_PER_POLL = 3
+MATCH_SUBJECT = "invoice"
+MATCH_RATE = 0.1
+VOCABULARY = (
+    "agenda backup charger digest energy firmware meter network newsletter "
+    "report reminder session station status tariff ticket update weekly"
+).split()
+
+
+@dataclass
+class BenchmarkRun:
+    mailbox_size: int
+    implementation: str
+    polls: int
+    duration_seconds: float
+    connections: int
+    commands: int
+    bytes_fetched: int
+
+    @property
+    def per_poll_ms(self) -> float:
+        if self.polls <= 0:
+            return 0.0
+        return self.duration_seconds * 1000.0 / self.polls
+
+    def to_dict(self) -> dict:
+        return {
+            "mailbox_size": self.mailbox_size,
+            "implementation": self.implementation,
+            "polls": self.polls,
+            "duration_seconds": self.duration_seconds,
+            "per_poll_ms": self.per_poll_ms,
+            "connections": self.connections,
+            "commands": self.commands,
+            "bytes_fetched": self.bytes_fetched,
+        }
+
+
+class EmailSyncBenchmark(BenchmarkScenario):
+    help = (
+        "Benchmark incremental UID sync against the legacy full-search poll on an "
+        "in-process mailbox."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--messages",
+            nargs="+",
+            type=int,
+            default=list(DEFAULT_MAILBOX_SIZES),
+            help="Mailbox sizes to benchmark (default: 1000 10000).",
+        )
+        parser.add_argument(
+            "--polls", type=int, default=DEFAULT_POLLS, help="Polls per implementation."
+        )
+        parser.add_argument(
+            "--new-per-poll",
+            type=int,
+            default=DEFAULT_NEW_PER_POLL,
+            help="Messages delivered between polls.",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for synthetic mail.")
+        parser.add_argument("--json", action="store_true", help="Emit JSON summary output.")
+
+    def handle(self, **options):
+        sizes = sorted(set(options["messages"]))
+        if any(value <= 0 for value in sizes):
+            raise CommandError("--messages values must be greater than zero.")
+        if options["polls"] <= 0:
+            raise CommandError("--polls must be greater than zero.")
+        if options["new_per_poll"] < 0:
+            raise CommandError("--new-per-poll cannot be negative.")
+
+        results: list[BenchmarkRun] = []
+        for size in sizes:
+            for implementation in ("legacy", "incremental"):
+                results.append(
+                    self._run(
+                        size,
+                        implementation,
+                        polls=options["polls"],
+                        new_per_poll=options["new_per_poll"],
+                        seed=options["seed"],
+                    )
+                )
+
+        payload = {"runs": [run.to_dict() for run in results]}
+        if options["json"]:
+            self.stdout.write(json.dumps(payload, indent=2))
+            return
+
+        self.stdout.write("Email sync benchmark summary:")
+        for run in results:
+            self.stdout.write(
+                f"  {run.mailbox_size} messages {run.implementation}: "
+                f"{run.per_poll_ms:.2f} ms/poll, {run.commands} commands, "
+                f"{run.connections} connections, {run.bytes_fetched} bytes fetched"
+            )
+
+    def _run(
+        self, size: int, implementation: str, *, polls: int, new_per_poll: int, seed: int
+    ) -> BenchmarkRun:
+        rng = random.Random(seed)
+        mailbox = LocalImapMailbox()
+        for _index in range(size):
+            self._deliver(mailbox, rng)
+
+        if implementation == "legacy":
+            inbox = EmailInbox(username="bench@example.com", password="bench")
+            inbox.open_imap_connection = lambda login=True: mailbox.connect()
+
+            def poll():
+                inbox.search_messages(subject=MATCH_SUBJECT, limit=10)
+
+            cleanup = None
+        else:
+            rules = [CollectorRule(collector_id=1, subject=MATCH_SUBJECT)]
+            conn = mailbox.connect()
+            conn.login("bench@example.com", "bench")
+            # Prime the watermark so the timed polls measure steady-state cost.
+            cursor = sync_mailbox(conn, SyncCursor(), rules).cursor
+
+            def poll():
+                nonlocal cursor
+                cursor = sync_mailbox(conn, cursor, rules).cursor
+
+            cleanup = conn.logout
+
+        mailbox.reset_counters()
+        duration = 0.0
+        for _poll in range(polls):
+            for _index in range(new_per_poll):
+                self._deliver(mailbox, rng)
+            start = time.perf_counter()
+            poll()
+            duration += time.perf_counter() - start
+        run = BenchmarkRun(
+            mailbox_size=size,
+            implementation=implementation,
+            polls=polls,
+            duration_seconds=duration,
+            connections=mailbox.connections,
+            commands=sum(mailbox.commands.values()),
+            bytes_fetched=mailbox.bytes_sent,
+        )
+        if cleanup is not None:
+            cleanup()
+        return run
+
+    def _deliver(self, mailbox: LocalImapMailbox, rng: random.Random) -> None:
+        words = rng.sample(VOCABULARY, 3)
+        if rng.random() < MATCH_RATE:
+            words.insert(0, MATCH_SUBJECT)
+        mailbox.add_message(
+            subject=" ".join(words).capitalize(),
+            sender=f"{rng.choice(VOCABULARY)}@example.com",
+            body=" ".join(rng.choices(VOCABULARY, k=200)),
+        )
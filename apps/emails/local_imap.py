@@ -0,0 +1,252 @@
+"""In-process IMAP stand-in for exercising inbox sync without a mail server.
+
+:class:`LocalImapMailbox` stores RFC 822 messages with UIDs and hands out
+:class:`LocalImapConnection` objects that implement the subset of the
+``imaplib.IMAP4`` API used by :mod:`apps.emails` and return responses in the
+same shapes. Connections, commands and payload bytes are counted so tests and
+benchmarks can compare fetch strategies.
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from email.message import EmailMessage
+from email.utils import format_datetime
+
+_HEADER_FIELDS_RE = re.compile(r"HEADER\.FIELDS \(([^)]*)\)", re.IGNORECASE)
+
+
+class LocalImapMailbox:
+    """Single-folder mailbox shared by every connection opened from it."""
+
+    def __init__(self, *, uid_validity: int = 1, latency: float = 0.0):
+        self.uid_validity = uid_validity
+        self.latency = latency
+        self.messages: dict[int, bytes] = {}
+        self.next_uid = 1
+        self.connections = 0
+        self.active_connections = 0
+        self.peak_active_connections = 0
+        self.commands_in_flight = 0
+        self.peak_commands_in_flight = 0
+        self.commands: Counter[str] = Counter()
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+
+    def append(self, raw: bytes) -> int:
+        uid = self.next_uid
+        self.messages[uid] = raw
+        self.next_uid += 1
+        return uid
+
+    def add_message(
+        self,
+        *,
+        subject: str,
+        sender: str = "sender@example.com",
+        body: str = "",
+        date: datetime | None = None,
+    ) -> int:
+        message = EmailMessage()
+        message["Subject"] = subject
+        message["From"] = sender
+        message["To"] = "inbox@example.com"
+        message["Date"] = format_datetime(date or datetime.now(timezone.utc))
+        message.set_content(body)
+        return self.append(message.as_bytes())
+
+    def reset_uids(self, uid_validity: int) -> None:
+        """Renumber every message as a server would after a UIDVALIDITY change."""
+
+        messages = list(self.messages.values())
+        self.uid_validity = uid_validity
+        self.messages = {}
+        self.next_uid = 1
+        for raw in messages:
+            self.append(raw)
+
+    def reset_counters(self) -> None:
+        self.connections = 0
+        self.peak_active_connections = self.active_connections
+        self.peak_commands_in_flight = 0
+        self.commands.clear()
+        self.bytes_sent = 0
+
+    def connect(self, *_args, **_kwargs) -> "LocalImapConnection":
+        with self._lock:
+            self.connections += 1
+            self.active_connections += 1
+            self.peak_active_connections = max(
+                self.peak_active_connections, self.active_connections
+            )
+        return LocalImapConnection(self)
+
+    def _record(self, command: str) -> None:
+        with self._lock:
+            self.commands[command] += 1
+            self.commands_in_flight += 1
+            self.peak_commands_in_flight = max(
+                self.peak_commands_in_flight, self.commands_in_flight
+            )
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.commands_in_flight -= 1
+
+    def _record_bytes(self, payload_bytes: int) -> None:
+        with self._lock:
+            self.bytes_sent += payload_bytes
+
+    def _disconnect(self) -> None:
+        with self._lock:
+            self.active_connections -= 1
+
+
+class LocalImapConnection:
+    """``imaplib.IMAP4``-compatible connection to a :class:`LocalImapMailbox`."""
+
+    def __init__(self, mailbox: LocalImapMailbox):
+        self.mailbox = mailbox
+        self._responses: dict[str, list[bytes]] = {}
+        self._open = True
+
+    def login(self, _user, _password):
+        self.mailbox._record("LOGIN")
+        return "OK", [b"LOGIN completed"]
+
+    def logout(self):
+        if self._open:
+            self._open = False
+            self.mailbox._record("LOGOUT")
+            self.mailbox._disconnect()
+        return "BYE", [b"Logging out"]
+
+    def select(self, mailbox="INBOX", readonly=False):
+        self.mailbox._record("SELECT")
+        if str(mailbox).upper() != "INBOX":
+            return "NO", [b"Mailbox does not exist"]
+        self._responses["UIDVALIDITY"] = [str(self.mailbox.uid_validity).encode()]
+        return "OK", [str(len(self.mailbox.messages)).encode()]
+
+    def response(self, code):
+        return code, self._responses.pop(code, [None])
+
+    def _positions(self) -> dict[int, int]:
+        return {uid: number for number, uid in enumerate(self.mailbox.messages, start=1)}
+
+    def search(self, charset, *criteria):
+        self.mailbox._record("SEARCH")
+        positions = self._positions()
+        numbers = [str(positions[uid]) for uid in self._search_uids(criteria)]
+        return "OK", [" ".join(numbers).encode()]
+
+    def fetch(self, message_set, items):
+        self.mailbox._record("FETCH")
+        sequence = list(self.mailbox.messages)
+        uids = [sequence[int(number) - 1] for number in _decode(message_set).split(",")]
+        return "OK", self._fetch_items(uids, _decode(items), include_uid=False)
+
+    def uid(self, command, *args):
+        command = str(command).upper()
+        self.mailbox._record(f"UID {command}")
+        if command == "SEARCH":
+            uids = self._search_uids(args[1:])
+            return "OK", [" ".join(str(uid) for uid in uids).encode()]
+        if command == "FETCH":
+            uid_set, items = args
+            wanted = [int(value) for value in _decode(uid_set).split(",") if value]
+            uids = [uid for uid in wanted if uid in self.mailbox.messages]
+            return "OK", self._fetch_items(uids, _decode(items), include_uid=True)
+        return "BAD", [f"Unsupported UID command {command}".encode()]
+
+    def _search_uids(self, criteria) -> list[int]:
+        tokens: list[str] = []
+        for token in criteria:
+            token = _decode(token)
+            tokens.extend([token] if token.startswith('"') else token.split())
+        uids = list(self.mailbox.messages)
+        index = 0
+        while index < len(tokens):
+            key = tokens[index].upper()
+            if key == "ALL":
+                index += 1
+                continue
+            if key == "UID":
+                low, _sep, high = tokens[index + 1].partition(":")
+                start = int(low)
+                matched = uids[bisect.bisect_left(uids, start) :]
+                if high == "*" and not matched and uids:
+                    # RFC 3501: "n:*" always includes the highest UID.
+                    matched = [uids[-1]]
+                uids = matched
+                index += 2
+                continue
+            needle = tokens[index + 1].strip('"').lower()
+            uids = [
+                uid
+                for uid in uids
+                if needle in self._search_field(uid, key).lower()
+            ]
+            index += 2
+        return uids
+
+    def _search_field(self, uid: int, key: str) -> str:
+        raw = self.mailbox.messages[uid]
+        headers, _sep, body = raw.partition(b"\n\n")
+        if key == "TEXT":
+            return raw.decode("utf-8", errors="ignore")
+        name = {"SUBJECT": b"subject", "FROM": b"from"}.get(key)
+        for line in headers.splitlines():
+            field, _sep, value = line.partition(b":")
+            if name is not None and field.strip().lower() == name:
+                return value.decode("utf-8", errors="ignore")
+        return ""
+
+    def _fetch_items(self, uids: list[int], items: str, *, include_uid: bool):
+        header_fields = _HEADER_FIELDS_RE.search(items)
+        sequence = list(self.mailbox.messages)
+        data: list = []
+        for uid in uids:
+            raw = self.mailbox.messages[uid]
+            if header_fields:
+                names = {name.lower().encode() for name in header_fields.group(1).split()}
+                payload = _select_headers(raw, names)
+                label = f"BODY[HEADER.FIELDS ({header_fields.group(1)})]"
+            elif "RFC822" in items.upper():
+                payload = raw
+                label = "RFC822"
+            else:
+                payload = raw
+                label = "BODY[]"
+            uid_part = f"UID {uid} " if include_uid else ""
+            prefix = f"{bisect.bisect_left(sequence, uid) + 1} ({uid_part}{label} {{{len(payload)}}}"
+            self.mailbox._record_bytes(len(payload))
+            data.append((prefix.encode(), payload))
+            data.append(b")")
+        return data
+
+
+def _decode(value) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="ignore")
+    return str(value)
+
+
+def _select_headers(raw: bytes, names: set[bytes]) -> bytes:
+    headers = raw.split(b"\n\n", 1)[0]
+    selected = []
+    keep = False
+    for line in headers.splitlines():
+        if line[:1] in (b" ", b"\t"):
+            if keep:
+                selected.append(line)
+            continue
+        keep = line.partition(b":")[0].strip().lower() in names
+        if keep:
+            selected.append(line)
+    return b"\r\n".join(selected) + b"\r\n\r\n"
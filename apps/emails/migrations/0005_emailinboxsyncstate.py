@@ -0,0 +1,31 @@
+# Generated by Django 5.2.12 on 2026-10-18 21:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emails', '0004_emailcollector_odoo_customer_address_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailInboxSyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uid_validity', models.BigIntegerField(blank=True, help_text='UIDVALIDITY reported by the server when the watermark was taken.', null=True)),
+                ('last_uid', models.BigIntegerField(default=0, help_text='Highest message UID already examined by the collector.')),
+                ('synced_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('inbox', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sync_states', to='emails.emailinbox')),
+                ('collector', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sync_states', to='emails.emailcollector')),
+            ],
+            options={
+                'verbose_name': 'Email Inbox Sync State',
+                'verbose_name_plural': 'Email Inbox Sync States',
+                'constraints': [models.UniqueConstraint(fields=('inbox', 'collector'), name='emails_sync_state_inbox_collector_unique')],
+            },
+        ),
+    ]
@@ -2,5 +2,12 @@ from apps.emails.models.bridge import EmailBridge
 from apps.emails.models.collector import EmailCollector
 from apps.emails.models.inbox import EmailInbox
 from apps.emails.models.outbox import EmailOutbox
+from apps.emails.models.sync_state import EmailInboxSyncState
 
-__all__ = ["EmailBridge", "EmailCollector", "EmailInbox", "EmailOutbox"]
+__all__ = [
+    "EmailBridge",
+    "EmailCollector",
+    "EmailInbox",
+    "EmailInboxSyncState",
+    "EmailOutbox",
+]
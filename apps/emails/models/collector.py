@@ -370,7 +370,19 @@ class EmailCollector(Entity):
         if not self.is_enabled:
             return
 
-        messages = self.search_messages(limit=limit)
+        self.store_messages(self.search_messages(limit=limit))
+
+    def store_messages(self, messages) -> int:
+        """Record artifacts for ``messages`` and notify for each new one.
+
+        Args:
+            messages: Message dictionaries with ``subject``, ``from``, ``body``
+                and ``date`` keys, newest first.
+
+        Returns:
+            Number of artifacts created.
+        """
+        created_count = 0
         odoo_snapshot_sigils = None
         for msg in messages:
             fp = EmailArtifact.fingerprint_for(
@@ -390,6 +402,7 @@ class EmailCollector(Entity):
             )
             if not created:
                 continue
+            created_count += 1
 
             if odoo_snapshot_sigils is None:
                 odoo_snapshot_sigils = sigils
@@ -406,3 +419,4 @@ class EmailCollector(Entity):
                 logger.exception(
                     "Failed to update Odoo fields for collector %s", self.pk
                 )
+        return created_count
@@ -1,4 +1,6 @@
 import logging
+import re
+from email.header import decode_header
 
 from django.core.exceptions import ValidationError
 from django.db import models
@@ -9,6 +11,75 @@ from apps.sigils.fields import SigilShortAutoField
 logger = logging.getLogger(__name__)
 
 
+def compile_filter(pattern: str | None):
+    """Compile a case-insensitive collector filter, raising ``ValidationError``."""
+
+    if not pattern:
+        return None
+    try:
+        return re.compile(pattern, re.IGNORECASE)
+    except re.error as exc:
+        raise ValidationError(str(exc))
+
+
+def text_matches(value: str, needle: str, regex) -> bool:
+    """Return whether ``value`` satisfies a substring or compiled regex filter."""
+
+    value = value or ""
+    if regex is not None:
+        return bool(regex.search(value))
+    if not needle:
+        return True
+    return needle.lower() in value.lower()
+
+
+def message_body_text(msg) -> str:
+    """Return the first inline ``text/plain`` part of ``msg`` as text."""
+
+    if msg.is_multipart():
+        for part in msg.walk():
+            if part.get_content_type() == "text/plain" and not part.get_filename():
+                charset = part.get_content_charset() or "utf-8"
+                return part.get_payload(decode=True).decode(charset, errors="ignore")
+        return ""
+    charset = msg.get_content_charset() or "utf-8"
+    return msg.get_payload(decode=True).decode(charset, errors="ignore")
+
+
+def decode_header_value(value) -> str:
+    """Decode an RFC 2047 header value, tolerating unknown encodings."""
+
+    if not value:
+        return ""
+    if isinstance(value, bytes):
+        value = value.decode("utf-8", errors="ignore")
+    try:
+        parts = decode_header(value)
+    except Exception:
+        return value if isinstance(value, str) else ""
+    decoded = []
+    for text, encoding in parts:
+        if isinstance(text, bytes):
+            encodings_to_try = []
+            if encoding:
+                encodings_to_try.append(encoding)
+            encodings_to_try.extend(["utf-8", "latin-1"])
+            for candidate in encodings_to_try:
+                try:
+                    decoded.append(text.decode(candidate, errors="ignore"))
+                    break
+                except LookupError:
+                    continue
+            else:
+                try:
+                    decoded.append(text.decode("utf-8", errors="ignore"))
+                except Exception:
+                    decoded.append("")
+        else:
+            decoded.append(text)
+    return "".join(decoded)
+
+
 class EmailInbox(CoreProfile):
     """Credentials and configuration for connecting to an email mailbox."""
 
@@ -78,14 +149,7 @@ class EmailInbox(CoreProfile):
         """Attempt to connect to the configured mailbox."""
         try:
             if self.protocol == self.IMAP:
-                import imaplib
-
-                conn = (
-                    imaplib.IMAP4_SSL(self.host, self.port)
-                    if self.use_ssl
-                    else imaplib.IMAP4(self.host, self.port)
-                )
-                conn.login(self.username, self.password)
+                conn = self.open_imap_connection()
                 conn.logout()
             else:
                 import poplib
@@ -112,6 +176,27 @@ class EmailInbox(CoreProfile):
             )
             return False
 
+    def open_imap_connection(self, *, login: bool = True):
+        """Return an ``imaplib`` connection to this inbox, logged in by default."""
+
+        import imaplib
+
+        conn = (
+            imaplib.IMAP4_SSL(self.host, self.port)
+            if self.use_ssl
+            else imaplib.IMAP4(self.host, self.port)
+        )
+        if login:
+            try:
+                conn.login(self.username, self.password)
+            except Exception:
+                try:
+                    conn.logout()
+                except Exception:  # pragma: no cover - best effort cleanup
+                    pass
+                raise
+        return conn
+
     def search_messages(
         self,
         subject="",
@@ -122,80 +207,13 @@ class EmailInbox(CoreProfile):
     ):
         """Retrieve up to ``limit`` recent messages matching the filters."""
 
-        def _compile(pattern: str | None):
-            if not pattern:
-                return None
-            import re
-
-            try:
-                return re.compile(pattern, re.IGNORECASE)
-            except re.error as exc:
-                raise ValidationError(str(exc))
-
         subject_regex = sender_regex = body_regex = None
         if use_regular_expressions:
-            subject_regex = _compile(subject)
-            sender_regex = _compile(from_address)
-            body_regex = _compile(body)
-
-        def _matches(value: str, needle: str, regex):
-            value = value or ""
-            if regex is not None:
-                return bool(regex.search(value))
-            if not needle:
-                return True
-            return needle.lower() in value.lower()
-
-        from email.header import decode_header
-
-        def _get_body(msg):
-            if msg.is_multipart():
-                for part in msg.walk():
-                    if (
-                        part.get_content_type() == "text/plain"
-                        and not part.get_filename()
-                    ):
-                        charset = part.get_content_charset() or "utf-8"
-                        return part.get_payload(decode=True).decode(
-                            charset, errors="ignore"
-                        )
-                return ""
-            charset = msg.get_content_charset() or "utf-8"
-            return msg.get_payload(decode=True).decode(charset, errors="ignore")
-
-        def _decode_header_value(value):
-            if not value:
-                return ""
-            if isinstance(value, bytes):
-                value = value.decode("utf-8", errors="ignore")
-            try:
-                parts = decode_header(value)
-            except Exception:
-                return value if isinstance(value, str) else ""
-            decoded = []
-            for text, encoding in parts:
-                if isinstance(text, bytes):
-                    encodings_to_try = []
-                    if encoding:
-                        encodings_to_try.append(encoding)
-                    encodings_to_try.extend(["utf-8", "latin-1"])
-                    for candidate in encodings_to_try:
-                        try:
-                            decoded.append(text.decode(candidate, errors="ignore"))
-                            break
-                        except LookupError:
-                            continue
-                    else:
-                        try:
-                            decoded.append(text.decode("utf-8", errors="ignore"))
-                        except Exception:
-                            decoded.append("")
-                else:
-                    decoded.append(text)
-            return "".join(decoded)
+            subject_regex = compile_filter(subject)
+            sender_regex = compile_filter(from_address)
+            body_regex = compile_filter(body)
 
         if self.protocol == self.IMAP:
-            import imaplib
             import email
 
             def _decode_imap_bytes(value):
@@ -203,11 +221,7 @@ class EmailInbox(CoreProfile):
                     return value.decode("utf-8", errors="ignore")
                 return str(value)
 
-            conn = (
-                imaplib.IMAP4_SSL(self.host, self.port)
-                if self.use_ssl
-                else imaplib.IMAP4(self.host, self.port)
-            )
+            conn = self.open_imap_connection(login=False)
             try:
                 conn.login(self.username, self.password)
                 typ, data = conn.select("INBOX")
@@ -269,13 +283,13 @@ class EmailInbox(CoreProfile):
                     if typ != "OK" or not msg_data:
                         continue
                     msg = email.message_from_bytes(msg_data[0][1])
-                    body_text = _get_body(msg)
-                    subj_value = _decode_header_value(msg.get("Subject", ""))
-                    from_value = _decode_header_value(msg.get("From", ""))
+                    body_text = message_body_text(msg)
+                    subj_value = decode_header_value(msg.get("Subject", ""))
+                    from_value = decode_header_value(msg.get("From", ""))
                     if not (
-                        _matches(subj_value, subject, subject_regex)
-                        and _matches(from_value, from_address, sender_regex)
-                        and _matches(body_text, body, body_regex)
+                        text_matches(subj_value, subject, subject_regex)
+                        and text_matches(from_value, from_address, sender_regex)
+                        and text_matches(body_text, body, body_regex)
                     ):
                         continue
                     messages.append(
@@ -310,13 +324,13 @@ class EmailInbox(CoreProfile):
         for i in range(count, 0, -1):
             resp, lines, octets = conn.retr(i)
             msg = email.message_from_bytes(b"\n".join(lines))
-            subj = _decode_header_value(msg.get("Subject", ""))
-            frm = _decode_header_value(msg.get("From", ""))
-            body_text = _get_body(msg)
+            subj = decode_header_value(msg.get("Subject", ""))
+            frm = decode_header_value(msg.get("From", ""))
+            body_text = message_body_text(msg)
             if not (
-                _matches(subj, subject, subject_regex)
-                and _matches(frm, from_address, sender_regex)
-                and _matches(body_text, body, body_regex)
+                text_matches(subj, subject, subject_regex)
+                and text_matches(frm, from_address, sender_regex)
+                and text_matches(body_text, body, body_regex)
             ):
                 continue
             messages.append(
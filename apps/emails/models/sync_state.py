@@ -0,0 +1,47 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from apps.emails.models.inbox import EmailInbox
+
+
+class EmailInboxSyncState(models.Model):
+    """UID watermark of one collector's incremental IMAP polling of an inbox.
+
+    Watermarks are kept per collector so a collector added to an inbox that
+    has already synced still backfills the messages below the others' marks.
+    """
+
+    inbox = models.ForeignKey(
+        EmailInbox,
+        related_name="sync_states",
+        on_delete=models.CASCADE,
+    )
+    collector = models.ForeignKey(
+        "emails.EmailCollector",
+        related_name="sync_states",
+        on_delete=models.CASCADE,
+    )
+    uid_validity = models.BigIntegerField(
+        null=True,
+        blank=True,
+        help_text=_("UIDVALIDITY reported by the server when the watermark was taken."),
+    )
+    last_uid = models.BigIntegerField(
+        default=0,
+        help_text=_("Highest message UID already examined by the collector."),
+    )
+    synced_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name = _("Email Inbox Sync State")
+        verbose_name_plural = _("Email Inbox Sync States")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["inbox", "collector"],
+                name="emails_sync_state_inbox_collector_unique",
+            )
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover - simple representation
+        return f"{self.inbox} / {self.collector_id} @ {self.last_uid}"
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from apps.core.models import EmailArtifact
+from apps.emails.local_imap import LocalImapMailbox
+from apps.emails.models import EmailCollector, EmailInbox, EmailInboxSyncState
+from apps.emails.sync import (
+    CollectorRule,
+    MailboxConnectionPool,
+    SyncCursor,
+    collect_all,
+    sync_mailbox,
+)
+from apps.users.models import User
+
+
+def _mailbox(count: int, **kwargs) -> LocalImapMailbox:
+    mailbox = LocalImapMailbox(**kwargs)
+    for index in range(count):
+        subject = f"Invoice {index}" if index % 2 == 0 else f"Newsletter {index}"
+        mailbox.add_message(subject=subject, body=f"body {index}")
+    return mailbox
+
+
+def _connect(mailbox: LocalImapMailbox):
+    conn = mailbox.connect()
+    conn.login("user", "secret")
+    return conn
+
+
+def _inbox(username: str) -> EmailInbox:
+    return EmailInbox.objects.create(
+        user=User.objects.create_user(username=username),
+        username=f"{username}@example.com",
+        host="imap.example.com",
+        port=993,
+        password="secret",
+    )
+
+
+def test_first_sync_backfills_newest_messages_and_sets_watermark():
+    mailbox = _mailbox(20, uid_validity=7)
+    rule = CollectorRule(collector_id=1, subject="invoice")
+
+    result = sync_mailbox(_connect(mailbox), SyncCursor(), [rule], backfill=5)
+
+    assert result.cursor == SyncCursor(uid_validity=7, last_uid=20)
+    assert result.headers_fetched == 5
+    assert result.bodies_fetched == 2
+    assert [item["subject"] for item in result.matches[1]] == ["Invoice 18", "Invoice 16"]
+
+
+def test_later_syncs_only_examine_new_uids():
+    mailbox = _mailbox(100)
+    rule = CollectorRule(collector_id=1, subject="invoice")
+    conn = _connect(mailbox)
+    cursor = sync_mailbox(conn, SyncCursor(), [rule]).cursor
+
+    mailbox.add_message(subject="Invoice new", body="fresh")
+    mailbox.add_message(subject="Weekly digest", body="skip")
+    mailbox.reset_counters()
+    result = sync_mailbox(conn, cursor, [rule])
+
+    assert result.cursor.last_uid == 102
+    assert result.headers_fetched == 2
+    assert [item["subject"] for item in result.matches[1]] == ["Invoice new"]
+    assert mailbox.commands["UID FETCH"] == 2
+
+    mailbox.reset_counters()
+    idle = sync_mailbox(conn, result.cursor, [rule])
+    assert idle.cursor == result.cursor
+    assert idle.headers_fetched == 0
+    assert mailbox.commands["UID FETCH"] == 0
+
+
+def test_body_filter_is_checked_after_header_match():
+    mailbox = LocalImapMailbox()
+    mailbox.add_message(subject="Invoice A", body="paid in full")
+    mailbox.add_message(subject="Invoice B", body="overdue notice")
+    rule = CollectorRule(collector_id=3, subject="invoice", body="overdue")
+
+    result = sync_mailbox(_connect(mailbox), SyncCursor(), [rule])
+
+    assert result.bodies_fetched == 2
+    assert [item["subject"] for item in result.matches[3]] == ["Invoice B"]
+
+
+def test_uid_validity_change_restarts_from_backfill():
+    mailbox = _mailbox(10, uid_validity=1)
+    rule = CollectorRule(collector_id=1, subject="invoice")
+    conn = _connect(mailbox)
+    cursor = sync_mailbox(conn, SyncCursor(), [rule]).cursor
+
+    mailbox.reset_uids(uid_validity=2)
+    result = sync_mailbox(conn, cursor, [rule], backfill=3)
+
+    assert result.cursor == SyncCursor(uid_validity=2, last_uid=10)
+    assert result.headers_fetched == 3
+
+
+def test_new_collector_backfills_below_existing_watermark():
+    mailbox = _mailbox(10)
+    tracked = CollectorRule(collector_id=1, subject="invoice")
+    added = CollectorRule(collector_id=2, subject="newsletter")
+    conn = _connect(mailbox)
+    cursor = sync_mailbox(conn, SyncCursor(), [tracked]).cursor
+
+    mailbox.add_message(subject="Invoice new", body="fresh")
+    result = sync_mailbox(conn, {1: cursor}, [tracked, added], backfill=4)
+
+    assert result.cursor.last_uid == 11
+    assert [item["subject"] for item in result.matches[1]] == ["Invoice new"]
+    assert [item["subject"] for item in result.matches[2]] == [
+        "Newsletter 9",
+        "Newsletter 7",
+    ]
+
+
+@pytest.mark.django_db
+def test_collect_all_stores_artifacts_and_advances_watermark():
+    inbox = _inbox("sync-owner")
+    collector = EmailCollector.objects.create(inbox=inbox, subject="invoice")
+    mailbox = _mailbox(6)
+    pool = MailboxConnectionPool(connect=lambda _inbox: _connect(mailbox))
+
+    summary = collect_all(pool=pool)
+
+    assert summary.errors == {}
+    assert summary.artifacts_created == 3
+    assert EmailArtifact.objects.filter(collector=collector).count() == 3
+    state = EmailInboxSyncState.objects.get(inbox=inbox)
+    assert (state.uid_validity, state.last_uid) == (1, 6)
+    assert state.synced_at is not None
+
+    mailbox.reset_counters()
+    second = collect_all(pool=pool)
+
+    assert second.headers_fetched == 0
+    assert second.artifacts_created == 0
+    assert mailbox.commands["UID FETCH"] == 0
+    assert mailbox.connections == 0
+    pool.close()
+    assert mailbox.active_connections == 0
+
+
+@pytest.mark.django_db
+def test_collect_all_keeps_watermarks_per_collector():
+    inbox = _inbox("sync-shared")
+    invoices = EmailCollector.objects.create(inbox=inbox, subject="invoice")
+    mailbox = _mailbox(6)
+    pool = MailboxConnectionPool(connect=lambda _inbox: _connect(mailbox))
+    collect_all(pool=pool)
+
+    newsletters = EmailCollector.objects.create(inbox=inbox, subject="newsletter")
+    summary = collect_all(pool=pool)
+    pool.close()
+
+    assert summary.artifacts_created == 3
+    assert EmailArtifact.objects.filter(collector=newsletters).count() == 3
+    assert EmailArtifact.objects.filter(collector=invoices).count() == 3
+    states = EmailInboxSyncState.objects.filter(inbox=inbox)
+    assert {(state.collector_id, state.last_uid) for state in states} == {
+        (invoices.pk, 6),
+        (newsletters.pk, 6),
+    }
+
+
+@pytest.mark.django_db
+def test_collect_all_bounds_concurrent_connections():
+    mailbox = _mailbox(4, latency=0.01)
+    for index in range(6):
+        EmailCollector.objects.create(inbox=_inbox(f"sync-{index}"), subject="invoice")
+
+    summary = collect_all(
+        max_workers=2,
+        pool=MailboxConnectionPool(connect=lambda _inbox: _connect(mailbox)),
+    )
+
+    assert summary.inboxes == 6
+    assert summary.errors == {}
+    assert mailbox.connections == 6
+    assert mailbox.peak_commands_in_flight == 2
+    assert EmailInboxSyncState.objects.filter(last_uid=4).count() == 6
+
+
+@pytest.mark.django_db
+def test_collect_all_records_per_inbox_errors():
+    broken = _inbox("sync-broken")
+    healthy = _inbox("sync-healthy")
+    EmailCollector.objects.create(inbox=broken, subject="invoice")
+    EmailCollector.objects.create(inbox=healthy, subject="invoice")
+    mailbox = _mailbox(2)
+
+    def connect(inbox):
+        if inbox.pk == broken.pk:
+            raise OSError("connection refused")
+        return _connect(mailbox)
+
+    summary = collect_all(pool=MailboxConnectionPool(connect=connect))
+
+    assert summary.errors == {broken.pk: "connection refused"}
+    assert EmailInboxSyncState.objects.get(inbox=broken).last_error == "connection refused"
+    assert EmailInboxSyncState.objects.get(inbox=healthy).last_uid == 2
+
+
+def test_legacy_search_runs_against_local_mailbox():
+    mailbox = _mailbox(6)
+    inbox = EmailInbox(username="legacy@example.com", password="secret")
+    inbox.open_imap_connection = lambda login=True: mailbox.connect()
+
+    messages = inbox.search_messages(subject="invoice", limit=2)
+
+    assert [item["subject"] for item in messages] == ["Invoice 4", "Invoice 2"]
+    assert mailbox.active_connections == 0
+
+
+def test_benchmark_email_sync_reports_json():
+    stdout = StringIO()
+
+    call_command(
+        "benchmark", "email-sync", "--messages", "50", "--polls", "2", "--json", stdout=stdout
+    )
+
+    runs = json.loads(stdout.getvalue())["runs"]
+    by_name = {run["implementation"]: run for run in runs}
+    assert set(by_name) == {"legacy", "incremental"}
+    assert by_name["incremental"]["bytes_fetched"] < by_name["legacy"]["bytes_fetched"]
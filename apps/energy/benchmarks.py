@@ -0,0 +1,163 @@
+"""Benchmark client energy report dataset generation on synthetic sessions."""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from datetime import timezone as pytimezone
+from decimal import Decimal
+
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+
+from apps.cards.models import RFID
+from apps.core.benchmarks import BenchmarkScenario
+from apps.energy.services.report_dataset import build_evcs_session_dataset
+from apps.ocpp.models import Charger, MeterValue, Transaction
+
+DEFAULT_SIZES = (100, 10_000, 100_000)
+BENCH_CHARGERS = 10
+BENCH_TAGS = 25
+BULK_BATCH_SIZE = 5000
+PERIOD_START = date(2024, 1, 1)
+PERIOD_END = date(2024, 1, 31)
+
+
+@dataclass
+class BenchmarkRun:
+    transactions: int
+    duration_seconds: float
+    queries: int
+    rows: int
+
+    def to_dict(self) -> dict:
+        return {
+            "transactions": self.transactions,
+            "duration_seconds": self.duration_seconds,
+            "queries": self.queries,
+            "rows": self.rows,
+        }
+
+
+def _seed_sessions(size: int) -> None:
+    """Create ``size`` sessions over connector chargers in the report period.
+
+    Every tenth session has no meter start/stop, so the builder falls back to
+    its meter readings.
+    """
+
+    connectors = [
+        Charger.objects.create(charger_id=f"BENCH-REPORT-{index:02d}", connector_id=connector)
+        for index in range(BENCH_CHARGERS)
+        for connector in (1, 2)
+    ]
+    tags = [
+        RFID.objects.create(rfid=f"{0xBE000000 + index:08X}") for index in range(BENCH_TAGS)
+    ]
+
+    period_start = datetime.combine(PERIOD_START, datetime.min.time(), tzinfo=pytimezone.utc)
+    period_seconds = int((PERIOD_END - PERIOD_START).days + 1) * 86400
+    sessions = []
+    for index in range(size):
+        start_time = period_start + timedelta(seconds=(index * 7919) % period_seconds)
+        with_meters = index % 10 != 0
+        sessions.append(
+            Transaction(
+                charger=connectors[index % len(connectors)],
+                rfid=tags[index % len(tags)].rfid,
+                meter_start=index * 10 if with_meters else None,
+                meter_stop=index * 10 + (index % 40) * 250 if with_meters else None,
+                start_time=start_time,
+                stop_time=start_time + timedelta(minutes=30 + index % 90),
+            )
+        )
+    created = Transaction.objects.bulk_create(sessions, batch_size=BULK_BATCH_SIZE)
+    MeterValue.objects.bulk_create(
+        (
+            MeterValue(
+                charger=tx.charger,
+                transaction=tx,
+                connector_id=tx.charger.connector_id,
+                timestamp=tx.start_time + timedelta(minutes=step * 20),
+                context="Sample.Periodic",
+                energy=Decimal(step * (tx.pk % 9 + 1)),
+            )
+            for tx in created
+            if tx.meter_start is None
+            for step in range(2)
+        ),
+        batch_size=BULK_BATCH_SIZE,
+    )
+
+
+class _QueryCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class _Rollback(Exception):
+    pass
+
+
+class ClientReportBenchmark(BenchmarkScenario):
+    help = (
+        "Benchmark client energy report dataset generation for synthetic "
+        "sessions. Fixture rows are written inside a transaction that is "
+        "rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=list(DEFAULT_SIZES),
+            help="Sessions per benchmark period (default: 100 10000 100000).",
+        )
+        parser.add_argument("--json", action="store_true", help="Emit JSON summary output.")
+
+    def handle(self, **options):
+        sizes = sorted(set(options["sizes"]))
+        if any(size <= 0 for size in sizes):
+            raise CommandError("--sizes values must be greater than zero.")
+
+        results: list[BenchmarkRun] = []
+        for size in sizes:
+            try:
+                with transaction.atomic():
+                    _seed_sessions(size)
+                    results.append(self._run_size(size))
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+        payload = {"runs": [run.to_dict() for run in results]}
+        if options["json"]:
+            self.stdout.write(json.dumps(payload, indent=2))
+            return
+
+        self.stdout.write("Client report benchmark summary:")
+        for run in results:
+            self.stdout.write(
+                f"  {run.transactions} sessions: {run.duration_seconds * 1000:.1f} ms, "
+                f"{run.queries} queries, {run.rows} rows"
+            )
+
+    def _run_size(self, size: int) -> BenchmarkRun:
+        queries = _QueryCounter()
+        with connection.execute_wrapper(queries):
+            began = time.perf_counter()
+            dataset = build_evcs_session_dataset(PERIOD_START, PERIOD_END)
+            duration = time.perf_counter() - began
+        return BenchmarkRun(
+            transactions=size,
+            duration_seconds=duration,
+            queries=queries.count,
+            rows=sum(len(entry["transactions"]) for entry in dataset["evcs"]),
+        )
@@ -272,230 +272,9 @@ class ClientReport(Entity):
 
     @staticmethod
     def _build_dataset(start_date=None, end_date=None, *, chargers=None):
-        from datetime import datetime, time, timedelta, timezone as pytimezone
-        from apps.ocpp.models import Transaction, annotate_transaction_energy_bounds
-
-        Charger = apps.get_model("ocpp", "Charger")
-        RFID = apps.get_model("cards", "RFID")
-
-        qs = Transaction.objects.all()
-
-        start_dt = None
-        end_dt = None
-        if start_date:
-            start_dt = datetime.combine(start_date, time.min, tzinfo=pytimezone.utc)
-            qs = qs.filter(start_time__gte=start_dt)
-        if end_date:
-            end_dt = datetime.combine(
-                end_date + timedelta(days=1), time.min, tzinfo=pytimezone.utc
-            )
-            qs = qs.filter(start_time__lt=end_dt)
-
-        selected_base_ids = None
-        if chargers:
-            selected_base_ids = {
-                charger.charger_id for charger in chargers if charger.charger_id
-            }
-            if selected_base_ids:
-                qs = qs.filter(charger__charger_id__in=selected_base_ids)
-
-        qs = qs.select_related("account", "charger")
-        qs = annotate_transaction_energy_bounds(
-            qs,
-            start_field="report_meter_energy_start",
-            end_field="report_meter_energy_end",
-        )
-        transactions = list(qs.order_by("start_time", "pk"))
-
-        rfid_values = {tx.rfid for tx in transactions if tx.rfid}
-        tag_map: dict[str, RFID] = {}
-        if rfid_values:
-            tag_map = {
-                tag.rfid: tag
-                for tag in RFID.objects.filter(rfid__in=rfid_values).prefetch_related(
-                    "energy_accounts"
-                )
-            }
-
-        charger_ids = {
-            tx.charger.charger_id
-            for tx in transactions
-            if getattr(tx, "charger", None) and tx.charger.charger_id
-        }
-        aggregator_map: dict[str, Charger] = {}
-        if charger_ids:
-            aggregator_map = {
-                charger.charger_id: charger
-                for charger in Charger.objects.filter(
-                    charger_id__in=charger_ids, connector_id__isnull=True
-                )
-            }
-
-        groups: dict[str, dict[str, Any]] = {}
-        for tx in transactions:
-            charger = getattr(tx, "charger", None)
-            if charger is None:
-                continue
-            base_id = charger.charger_id
-            if selected_base_ids is not None and base_id not in selected_base_ids:
-                continue
-            aggregator = aggregator_map.get(base_id) or charger
-            entry = groups.setdefault(
-                base_id,
-                {"charger": aggregator, "transactions": []},
-            )
-            entry["transactions"].append(tx)
-
-        evcs_entries: list[dict[str, Any]] = []
-        total_all_time = 0.0
-        total_period = 0.0
-
-        def _sort_key(tx):
-            anchor = getattr(tx, "start_time", None)
-            if anchor is None:
-                anchor = datetime.min.replace(tzinfo=pytimezone.utc)
-            return (anchor, tx.pk or 0)
-
-        for base_id, info in sorted(groups.items(), key=lambda item: item[0]):
-            aggregator = info["charger"]
-            txs = sorted(info["transactions"], key=_sort_key)
-            total_kw_all = float(getattr(aggregator, "total_kw", 0.0) or 0.0)
-            total_kw_period = 0.0
-            if hasattr(aggregator, "total_kw_for_range"):
-                total_kw_period = float(
-                    aggregator.total_kw_for_range(start=start_dt, end=end_dt) or 0.0
-                )
-            total_all_time += total_kw_all
-            total_period += total_kw_period
-
-            session_rows: list[dict[str, Any]] = []
-            for tx in txs:
-                session_kw = float(getattr(tx, "kw", 0.0) or 0.0)
-                if session_kw <= 0:
-                    continue
+        from apps.energy.services.report_dataset import build_evcs_session_dataset
 
-                start_kwh, end_kwh = ClientReport._resolve_meter_bounds(tx)
-
-                connector_number = (
-                    tx.connector_id
-                    if getattr(tx, "connector_id", None) is not None
-                    else getattr(getattr(tx, "charger", None), "connector_id", None)
-                )
-                connector_letter = (
-                    Charger.connector_letter_from_value(connector_number)
-                    if connector_number not in {None, ""}
-                    else None
-                )
-                connector_order = (
-                    connector_number if isinstance(connector_number, int) else None
-                )
-
-                rfid_value = (tx.rfid or "").strip()
-                tag = tag_map.get(rfid_value)
-                label = None
-                account_name = (
-                    tx.account.name
-                    if tx.account and getattr(tx.account, "name", None)
-                    else None
-                )
-                if tag:
-                    label = tag.custom_label or str(tag.label_id)
-                    if not account_name:
-                        account = next(iter(tag.energy_accounts.all()), None)
-                        if account and getattr(account, "name", None):
-                            account_name = account.name
-                elif rfid_value:
-                    label = rfid_value
-
-                session_rows.append(
-                    {
-                        "connector": connector_number,
-                        "connector_label": connector_letter,
-                        "connector_order": connector_order,
-                        "rfid_label": label,
-                        "account_name": account_name,
-                        "start_kwh": start_kwh,
-                        "end_kwh": end_kwh,
-                        "session_kwh": session_kw,
-                        "start": tx.start_time.isoformat()
-                        if getattr(tx, "start_time", None)
-                        else None,
-                        "end": tx.stop_time.isoformat()
-                        if getattr(tx, "stop_time", None)
-                        else None,
-                    }
-                )
-
-            evcs_entries.append(
-                {
-                    "charger_id": aggregator.pk,
-                    "serial_number": aggregator.charger_id,
-                    "display_name": aggregator.display_name
-                    or aggregator.name
-                    or aggregator.charger_id,
-                    "total_kw": total_kw_all,
-                    "total_kw_period": total_kw_period,
-                    "transactions": session_rows,
-                }
-            )
-
-        filters: dict[str, Any] = {}
-        if selected_base_ids:
-            filters["chargers"] = sorted(selected_base_ids)
-
-        return {
-            "schema": "evcs-session/v1",
-            "evcs": evcs_entries,
-            "totals": {
-                "total_kw": total_all_time,
-                "total_kw_period": total_period,
-            },
-            "filters": filters,
-        }
-
-    @staticmethod
-    def _resolve_meter_bounds(tx) -> tuple[float | None, float | None]:
-        def _convert(value):
-            if value in {None, ""}:
-                return None
-            try:
-                return float(value) / 1000.0
-            except (TypeError, ValueError):
-                return None
-
-        start_value = _convert(getattr(tx, "meter_start", None))
-        end_value = _convert(getattr(tx, "meter_stop", None))
-
-        def _coerce_energy(value):
-            if value in {None, ""}:
-                return None
-            try:
-                return float(value)
-            except (TypeError, ValueError):
-                return None
-
-        if start_value is None:
-            annotated_start = getattr(tx, "report_meter_energy_start", None)
-            start_value = _coerce_energy(annotated_start)
-
-        if end_value is None:
-            annotated_end = getattr(tx, "report_meter_energy_end", None)
-            end_value = _coerce_energy(annotated_end)
-
-        if start_value is None or end_value is None:
-            readings_manager = getattr(tx, "meter_values", None)
-            if readings_manager is not None:
-                qs = readings_manager.filter(energy__isnull=False).order_by("timestamp")
-                if start_value is None:
-                    first_energy = qs.values_list("energy", flat=True).first()
-                    start_value = _coerce_energy(first_energy)
-                if end_value is None:
-                    last_energy = qs.order_by("-timestamp").values_list(
-                        "energy", flat=True
-                    ).first()
-                    end_value = _coerce_energy(last_energy)
-
-        return start_value, end_value
+        return build_evcs_session_dataset(start_date, end_date, chargers=chargers)
 
     @staticmethod
     def _format_session_datetime(value):
@@ -0,0 +1,398 @@
+"""Set-based builder for the ``evcs-session/v1`` consumer report dataset.
+
+The builder streams one ordered ``values()`` query over the period's sessions
+instead of loading ``Transaction`` instances and resolving meter bounds,
+RFID labels and charger totals one session or charger at a time. Lifetime
+charger totals are computed by a single grouped query.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as pytimezone
+from itertools import groupby
+from typing import Any
+
+from django.apps import apps
+from django.db.models import Case, F, FloatField, Sum, Value, When
+from django.db.models.functions import Cast
+from django.db.models.lookups import GreaterThan
+
+from apps.ocpp.models import annotate_transaction_energy_bounds
+
+SESSION_CHUNK_SIZE = 2000
+
+_SESSION_FIELDS = (
+    "pk",
+    "charger_id",
+    "charger__charger_id",
+    "charger__connector_id",
+    "connector_id",
+    "meter_start",
+    "meter_stop",
+    "rfid",
+    "account__name",
+    "start_time",
+    "stop_time",
+    "meter_energy_start",
+    "meter_energy_end",
+)
+
+
+def _period_bounds(
+    start_date: date | None, end_date: date | None
+) -> tuple[datetime | None, datetime | None]:
+    start_dt = (
+        datetime.combine(start_date, time.min, tzinfo=pytimezone.utc)
+        if start_date
+        else None
+    )
+    end_dt = (
+        datetime.combine(end_date + timedelta(days=1), time.min, tzinfo=pytimezone.utc)
+        if end_date
+        else None
+    )
+    return start_dt, end_dt
+
+
+def period_sessions(
+    start_dt: datetime | None,
+    end_dt: datetime | None,
+    base_ids: set[str] | None = None,
+):
+    """Return the queryset of sessions started within the report window."""
+
+    Transaction = apps.get_model("ocpp", "Transaction")
+    qs = Transaction.objects.filter(charger__isnull=False)
+    if start_dt is not None:
+        qs = qs.filter(start_time__gte=start_dt)
+    if end_dt is not None:
+        qs = qs.filter(start_time__lt=end_dt)
+    if base_ids:
+        qs = qs.filter(charger__charger_id__in=base_ids)
+    return qs
+
+
+def _coerce_energy(value) -> float | None:
+    if value in {None, ""}:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def session_bounds(row: dict[str, Any]) -> tuple[float | None, float | None]:
+    """Return start/end kWh for a session row, as ``Transaction.kw`` resolves them."""
+
+    start_kwh = (
+        float(row["meter_start"]) / 1000.0
+        if row["meter_start"] is not None
+        else _coerce_energy(row["meter_energy_start"])
+    )
+    end_kwh = (
+        float(row["meter_stop"]) / 1000.0
+        if row["meter_stop"] is not None
+        else _coerce_energy(row["meter_energy_end"])
+    )
+    return start_kwh, end_kwh
+
+
+def session_energy(start_kwh: float | None, end_kwh: float | None) -> float:
+    if start_kwh is None or end_kwh is None:
+        return 0.0
+    return max(end_kwh - start_kwh, 0.0)
+
+
+def iter_period_sessions(
+    start_dt: datetime | None,
+    end_dt: datetime | None,
+    base_ids: set[str] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield session rows ordered by charger serial, start time and pk."""
+
+    qs = annotate_transaction_energy_bounds(period_sessions(start_dt, end_dt, base_ids))
+    return (
+        qs.order_by("charger__charger_id", "start_time", "pk")
+        .values(*_SESSION_FIELDS)
+        .iterator(chunk_size=SESSION_CHUNK_SIZE)
+    )
+
+
+def lifetime_energy_by_charger(
+    charger_pks: Iterable[int], *, exclude_pks: Iterable[int] = ()
+) -> dict[int, float]:
+    """Return all-time delivered kWh per charger row in one grouped query."""
+
+    Transaction = apps.get_model("ocpp", "Transaction")
+    float_field = FloatField()
+    start_kwh = Case(
+        When(
+            meter_start__isnull=False,
+            then=Cast("meter_start", float_field) / Value(1000.0),
+        ),
+        default=Cast("meter_energy_start", float_field),
+        output_field=float_field,
+    )
+    end_kwh = Case(
+        When(
+            meter_stop__isnull=False,
+            then=Cast("meter_stop", float_field) / Value(1000.0),
+        ),
+        default=Cast("meter_energy_end", float_field),
+        output_field=float_field,
+    )
+    qs = (
+        Transaction.objects.filter(charger_id__in=list(charger_pks))
+        .exclude(pk__in=list(exclude_pks))
+    )
+    qs = (
+        annotate_transaction_energy_bounds(qs)
+        .annotate(start_kwh=start_kwh, end_kwh=end_kwh)
+        .annotate(
+            session_kwh=Case(
+                When(
+                    GreaterThan(F("end_kwh"), F("start_kwh")),
+                    then=F("end_kwh") - F("start_kwh"),
+                ),
+                default=Value(0.0),
+                output_field=float_field,
+            )
+        )
+        .order_by()
+        .values("charger_id")
+        .annotate(total=Sum("session_kwh"))
+    )
+    return {row["charger_id"]: float(row["total"] or 0.0) for row in qs}
+
+
+def _rfid_details(
+    start_dt: datetime | None, end_dt: datetime | None, base_ids: set[str] | None
+) -> dict[str, tuple[str, str | None]]:
+    """Return ``rfid -> (label, first account name)`` for tags used in the period."""
+
+    RFID = apps.get_model("cards", "RFID")
+    qs = period_sessions(start_dt, end_dt, base_ids).exclude(rfid="")
+    rfid_values = set(qs.order_by().values_list("rfid", flat=True).distinct())
+    if not rfid_values:
+        return {}
+
+    details: dict[str, tuple[str, str | None]] = {}
+    for tag in RFID.objects.filter(rfid__in=rfid_values).prefetch_related(
+        "energy_accounts"
+    ):
+        account = next(iter(tag.energy_accounts.all()), None)
+        account_name = getattr(account, "name", None) or None
+        details[tag.rfid] = (tag.custom_label or str(tag.label_id), account_name)
+    return details
+
+
+class _ChargerTotals:
+    """Resolve lifetime and period totals the way ``Charger.total_kw`` does.
+
+    Aggregator rows (``connector_id`` is ``None``) sum every charger row that
+    shares their serial; connector rows only count themselves. Sessions held
+    in the live store are excluded from the database sums and counted from
+    their in-memory instance instead.
+    """
+
+    def __init__(self, chargers_by_base: dict[str, list], start_dt, end_dt) -> None:
+        from apps.ocpp import store
+
+        self.chargers_by_base = chargers_by_base
+        self.start_dt = start_dt
+        self.end_dt = end_dt
+        self.active: dict[int, list] = {}
+        for chargers in chargers_by_base.values():
+            for charger in chargers:
+                if charger.connector_id is None:
+                    continue
+                tx_active = store.get_transaction(charger.charger_id, charger.connector_id)
+                if tx_active is not None:
+                    self.active.setdefault(charger.pk, []).append(tx_active)
+        self.active_pks = {
+            tx.pk for txs in self.active.values() for tx in txs if tx.pk is not None
+        }
+        self.period_by_charger: dict[int, float] = {}
+        self._lifetime: dict[int, float] | None = None
+
+    def add_session(self, charger_pk: int, tx_pk: int, energy: float) -> None:
+        if tx_pk in self.active_pks:
+            return
+        if energy:
+            self.period_by_charger[charger_pk] = (
+                self.period_by_charger.get(charger_pk, 0.0) + energy
+            )
+
+    def _targets(self, aggregator) -> list:
+        if aggregator.connector_id is None:
+            return self.chargers_by_base.get(aggregator.charger_id, [aggregator])
+        return [aggregator]
+
+    def _active_energy(self, charger, *, windowed: bool) -> float:
+        total = 0.0
+        for tx_active in self.active.get(charger.pk, ()):
+            if windowed:
+                start_time = getattr(tx_active, "start_time", None)
+                if self.start_dt is not None and start_time and start_time < self.start_dt:
+                    continue
+                if self.end_dt is not None and start_time and start_time >= self.end_dt:
+                    continue
+            total += tx_active.kw or 0.0
+        return total
+
+    def lifetime(self, aggregator) -> float:
+        if self._lifetime is None:
+            pks = [
+                charger.pk
+                for chargers in self.chargers_by_base.values()
+                for charger in chargers
+            ]
+            self._lifetime = lifetime_energy_by_charger(pks, exclude_pks=self.active_pks)
+        return sum(
+            self._lifetime.get(charger.pk, 0.0)
+            + self._active_energy(charger, windowed=False)
+            for charger in self._targets(aggregator)
+        )
+
+    def period(self, aggregator) -> float:
+        return sum(
+            self.period_by_charger.get(charger.pk, 0.0)
+            + self._active_energy(charger, windowed=True)
+            for charger in self._targets(aggregator)
+        )
+
+
+def build_evcs_session_dataset(
+    start_date: date | None = None,
+    end_date: date | None = None,
+    *,
+    chargers=None,
+) -> dict[str, Any]:
+    """Return the ``evcs-session/v1`` report payload for the period."""
+
+    Charger = apps.get_model("ocpp", "Charger")
+
+    start_dt, end_dt = _period_bounds(start_date, end_date)
+    selected_base_ids = None
+    if chargers:
+        selected_base_ids = {
+            charger.charger_id for charger in chargers if charger.charger_id
+        }
+
+    base_filter = selected_base_ids or None
+    rfid_details = _rfid_details(start_dt, end_dt, base_filter)
+
+    period_base_ids = set(
+        period_sessions(start_dt, end_dt, base_filter)
+        .order_by().values_list("charger__charger_id", flat=True).distinct()
+    )
+
+    chargers_by_base: dict[str, list] = {}
+    charger_rows: dict[int, Any] = {}
+    for charger in Charger.objects.filter(charger_id__in=period_base_ids).select_related(
+        "location"
+    ):
+        chargers_by_base.setdefault(charger.charger_id, []).append(charger)
+        charger_rows[charger.pk] = charger
+    aggregators = {
+        base_id: charger
+        for base_id, rows in chargers_by_base.items()
+        for charger in rows
+        if charger.connector_id is None
+    }
+    totals = _ChargerTotals(chargers_by_base, start_dt, end_dt)
+
+    evcs_entries: list[dict[str, Any]] = []
+    rows = iter_period_sessions(start_dt, end_dt, base_filter)
+    for base_id, group in groupby(rows, key=lambda row: row["charger__charger_id"]):
+        session_rows: list[dict[str, Any]] = []
+        aggregator = aggregators.get(base_id)
+        for row in group:
+            if aggregator is None:
+                aggregator = charger_rows[row["charger_id"]]
+            start_kwh, end_kwh = session_bounds(row)
+            energy = session_energy(start_kwh, end_kwh)
+            totals.add_session(row["charger_id"], row["pk"], energy)
+            if energy <= 0:
+                continue
+            session_rows.append(_session_row(row, start_kwh, end_kwh, energy, rfid_details))
+
+        total_kw_all = float(totals.lifetime(aggregator) or 0.0)
+        total_kw_period = float(totals.period(aggregator) or 0.0)
+        evcs_entries.append(
+            {
+                "charger_id": aggregator.pk,
+                "serial_number": aggregator.charger_id,
+                "display_name": aggregator.display_name
+                or aggregator.name
+                or aggregator.charger_id,
+                "total_kw": total_kw_all,
+                "total_kw_period": total_kw_period,
+                "transactions": session_rows,
+            }
+        )
+
+    # Serials are grouped in database order; the payload keeps Python's
+    # ordering so the result does not depend on the database collation.
+    evcs_entries.sort(key=lambda entry: entry["serial_number"])
+
+    filters: dict[str, Any] = {}
+    if selected_base_ids:
+        filters["chargers"] = sorted(selected_base_ids)
+
+    return {
+        "schema": "evcs-session/v1",
+        "evcs": evcs_entries,
+        "totals": {
+            "total_kw": sum(entry["total_kw"] for entry in evcs_entries),
+            "total_kw_period": sum(entry["total_kw_period"] for entry in evcs_entries),
+        },
+        "filters": filters,
+    }
+
+
+def _session_row(
+    row: dict[str, Any],
+    start_kwh: float | None,
+    end_kwh: float | None,
+    energy: float,
+    rfid_details: dict[str, tuple[str, str | None]],
+) -> dict[str, Any]:
+    Charger = apps.get_model("ocpp", "Charger")
+
+    connector_number = (
+        row["connector_id"]
+        if row["connector_id"] is not None
+        else row["charger__connector_id"]
+    )
+    connector_letter = (
+        Charger.connector_letter_from_value(connector_number)
+        if connector_number not in {None, ""}
+        else None
+    )
+
+    rfid_value = (row["rfid"] or "").strip()
+    account_name = row["account__name"] or None
+    label = None
+    tag_details = rfid_details.get(rfid_value)
+    if tag_details:
+        label, tag_account = tag_details
+        if not account_name:
+            account_name = tag_account
+    elif rfid_value:
+        label = rfid_value
+
+    return {
+        "connector": connector_number,
+        "connector_label": connector_letter,
+        "connector_order": connector_number if isinstance(connector_number, int) else None,
+        "rfid_label": label,
+        "account_name": account_name,
+        "start_kwh": start_kwh,
+        "end_kwh": end_kwh,
+        "session_kwh": energy,
+        "start": row["start_time"].isoformat() if row["start_time"] else None,
+        "end": row["stop_time"].isoformat() if row["stop_time"] else None,
+    }
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from datetime import timezone as pytimezone
+from decimal import Decimal
+from typing import Any
+
+from apps.cards.models import RFID
+from apps.energy.models import CustomerAccount
+from apps.ocpp.models import (
+    Charger,
+    MeterValue,
+    Transaction,
+    annotate_transaction_energy_bounds,
+)
+
+SEED_CHARGERS = 10
+SEED_TAGS = 25
+BULK_BATCH_SIZE = 5000
+PERIOD_START = date(2024, 1, 1)
+PERIOD_END = date(2024, 1, 31)
+
+
+def _legacy_meter_bounds(tx) -> tuple[float | None, float | None]:
+    def _convert(value):
+        if value in {None, ""}:
+            return None
+        try:
+            return float(value) / 1000.0
+        except (TypeError, ValueError):
+            return None
+
+    def _coerce_energy(value):
+        if value in {None, ""}:
+            return None
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    start_value = _convert(getattr(tx, "meter_start", None))
+    end_value = _convert(getattr(tx, "meter_stop", None))
+    if start_value is None:
+        start_value = _coerce_energy(getattr(tx, "report_meter_energy_start", None))
+    if end_value is None:
+        end_value = _coerce_energy(getattr(tx, "report_meter_energy_end", None))
+
+    if start_value is None or end_value is None:
+        qs = tx.meter_values.filter(energy__isnull=False).order_by("timestamp")
+        if start_value is None:
+            start_value = _coerce_energy(qs.values_list("energy", flat=True).first())
+        if end_value is None:
+            end_value = _coerce_energy(
+                qs.order_by("-timestamp").values_list("energy", flat=True).first()
+            )
+    return start_value, end_value
+
+
+def legacy_build_dataset(start_date=None, end_date=None, *, chargers=None) -> dict[str, Any]:
+    """Reproduce the previous per-instance ``evcs-session/v1`` dataset builder."""
+
+    qs = Transaction.objects.all()
+    start_dt = None
+    end_dt = None
+    if start_date:
+        start_dt = datetime.combine(start_date, datetime.min.time(), tzinfo=pytimezone.utc)
+        qs = qs.filter(start_time__gte=start_dt)
+    if end_date:
+        end_dt = datetime.combine(
+            end_date + timedelta(days=1), datetime.min.time(), tzinfo=pytimezone.utc
+        )
+        qs = qs.filter(start_time__lt=end_dt)
+
+    selected_base_ids = None
+    if chargers:
+        selected_base_ids = {
+            charger.charger_id for charger in chargers if charger.charger_id
+        }
+        if selected_base_ids:
+            qs = qs.filter(charger__charger_id__in=selected_base_ids)
+
+    qs = annotate_transaction_energy_bounds(
+        qs.select_related("account", "charger"),
+        start_field="report_meter_energy_start",
+        end_field="report_meter_energy_end",
+    )
+    transactions = list(qs.order_by("start_time", "pk"))
+
+    rfid_values = {tx.rfid for tx in transactions if tx.rfid}
+    tag_map: dict[str, RFID] = {}
+    if rfid_values:
+        tag_map = {
+            tag.rfid: tag
+            for tag in RFID.objects.filter(rfid__in=rfid_values).prefetch_related(
+                "energy_accounts"
+            )
+        }
+
+    charger_ids = {tx.charger.charger_id for tx in transactions if tx.charger}
+    aggregator_map = {
+        charger.charger_id: charger
+        for charger in Charger.objects.filter(
+            charger_id__in=charger_ids, connector_id__isnull=True
+        )
+    }
+
+    groups: dict[str, dict[str, Any]] = {}
+    for tx in transactions:
+        if tx.charger is None:
+            continue
+        base_id = tx.charger.charger_id
+        aggregator = aggregator_map.get(base_id) or tx.charger
+        groups.setdefault(base_id, {"charger": aggregator, "transactions": []})[
+            "transactions"
+        ].append(tx)
+
+    evcs_entries: list[dict[str, Any]] = []
+    total_all_time = 0.0
+    total_period = 0.0
+    for base_id, info in sorted(groups.items(), key=lambda item: item[0]):
+        aggregator = info["charger"]
+        total_kw_all = float(aggregator.total_kw or 0.0)
+        total_kw_period = float(
+            aggregator.total_kw_for_range(start=start_dt, end=end_dt) or 0.0
+        )
+        total_all_time += total_kw_all
+        total_period += total_kw_period
+
+        session_rows: list[dict[str, Any]] = []
+        for tx in sorted(info["transactions"], key=lambda tx: (tx.start_time, tx.pk)):
+            session_kw = float(tx.kw or 0.0)
+            if session_kw <= 0:
+                continue
+            start_kwh, end_kwh = _legacy_meter_bounds(tx)
+            connector_number = (
+                tx.connector_id if tx.connector_id is not None else tx.charger.connector_id
+            )
+            rfid_value = (tx.rfid or "").strip()
+            tag = tag_map.get(rfid_value)
+            label = None
+            account_name = tx.account.name if tx.account and tx.account.name else None
+            if tag:
+                label = tag.custom_label or str(tag.label_id)
+                if not account_name:
+                    account = next(iter(tag.energy_accounts.all()), None)
+                    if account and account.name:
+                        account_name = account.name
+            elif rfid_value:
+                label = rfid_value
+            session_rows.append(
+                {
+                    "connector": connector_number,
+                    "connector_label": (
+                        Charger.connector_letter_from_value(connector_number)
+                        if connector_number not in {None, ""}
+                        else None
+                    ),
+                    "connector_order": (
+                        connector_number if isinstance(connector_number, int) else None
+                    ),
+                    "rfid_label": label,
+                    "account_name": account_name,
+                    "start_kwh": start_kwh,
+                    "end_kwh": end_kwh,
+                    "session_kwh": session_kw,
+                    "start": tx.start_time.isoformat() if tx.start_time else None,
+                    "end": tx.stop_time.isoformat() if tx.stop_time else None,
+                }
+            )
+
+        evcs_entries.append(
+            {
+                "charger_id": aggregator.pk,
+                "serial_number": aggregator.charger_id,
+                "display_name": aggregator.display_name
+                or aggregator.name
+                or aggregator.charger_id,
+                "total_kw": total_kw_all,
+                "total_kw_period": total_kw_period,
+                "transactions": session_rows,
+            }
+        )
+
+    filters: dict[str, Any] = {}
+    if selected_base_ids:
+        filters["chargers"] = sorted(selected_base_ids)
+    return {
+        "schema": "evcs-session/v1",
+        "evcs": evcs_entries,
+        "totals": {"total_kw": total_all_time, "total_kw_period": total_period},
+        "filters": filters,
+    }
+
+
+def seed_sessions(size: int, *, prefix: str = "REPORT") -> list[Charger]:
+    """Create ``size`` sessions across aggregate and connector chargers.
+
+    Most sessions carry ``meter_start``/``meter_stop``; every tenth one relies
+    on meter readings and every fifteenth sits outside the report period.
+    """
+
+    chargers: list[Charger] = []
+    for index in range(SEED_CHARGERS):
+        serial = f"{prefix}-{index:02d}"
+        if index % 3:
+            chargers.append(Charger.objects.create(charger_id=serial))
+        for connector in (1, 2):
+            chargers.append(Charger.objects.create(charger_id=serial, connector_id=connector))
+    connectors = [charger for charger in chargers if charger.connector_id is not None]
+
+    accounts = [
+        CustomerAccount.objects.create(name=f"{prefix} account {index}")
+        for index in range(5)
+    ]
+    tags = []
+    for index in range(SEED_TAGS):
+        tag = RFID.objects.create(
+            rfid=f"{0xBE000000 + index:08X}",
+            custom_label=f"Card {index}" if index % 2 else "",
+        )
+        if index % 4 == 0:
+            accounts[index % len(accounts)].rfids.add(tag)
+        tags.append(tag)
+
+    period_start = datetime.combine(PERIOD_START, datetime.min.time(), tzinfo=pytimezone.utc)
+    period_seconds = int((PERIOD_END - PERIOD_START).days + 1) * 86400
+    sessions = []
+    for index in range(size):
+        charger = connectors[index % len(connectors)]
+        offset = (index * 7919) % period_seconds
+        start_time = period_start + timedelta(seconds=offset)
+        if index % 15 == 0:
+            start_time -= timedelta(days=45)
+        with_meters = index % 10 != 0
+        sessions.append(
+            Transaction(
+                charger=charger,
+                connector_id=charger.connector_id if index % 6 else None,
+                account=accounts[index % len(accounts)] if index % 3 == 0 else None,
+                rfid=tags[index % len(tags)].rfid if index % 5 else f"UNKNOWN{index % 7}",
+                meter_start=index * 10 if with_meters else None,
+                meter_stop=index * 10 + (index % 40) * 250 if with_meters else None,
+                start_time=start_time,
+                stop_time=start_time + timedelta(minutes=30 + index % 90),
+            )
+        )
+    created = Transaction.objects.bulk_create(sessions, batch_size=BULK_BATCH_SIZE)
+
+    readings = []
+    for tx in created:
+        if tx.meter_start is not None:
+            continue
+        for step in range(2):
+            readings.append(
+                MeterValue(
+                    charger=tx.charger,
+                    transaction=tx,
+                    connector_id=tx.charger.connector_id,
+                    timestamp=tx.start_time + timedelta(minutes=step * 20),
+                    context="Sample.Periodic",
+                    energy=Decimal(tx.pk % 50 + step * (tx.pk % 9)) / Decimal(4),
+                )
+            )
+    MeterValue.objects.bulk_create(readings, batch_size=BULK_BATCH_SIZE)
+    return chargers
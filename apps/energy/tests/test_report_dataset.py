@@ -0,0 +1,97 @@
+import json
+from datetime import date, datetime, timedelta
+from datetime import timezone as pytimezone
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from apps.energy.models import ClientReport
+from apps.energy.services.report_dataset import build_evcs_session_dataset
+from apps.energy.tests.helpers import (
+    PERIOD_END,
+    PERIOD_START,
+    legacy_build_dataset,
+    seed_sessions,
+)
+from apps.ocpp import store
+from apps.ocpp.models import Charger, Transaction
+
+pytestmark = pytest.mark.django_db
+
+
+def _assert_matches_legacy(dataset, expected):
+    assert dataset["schema"] == expected["schema"]
+    assert dataset["filters"] == expected["filters"]
+    assert dataset["totals"] == pytest.approx(expected["totals"])
+    assert len(dataset["evcs"]) == len(expected["evcs"])
+    for entry, legacy_entry in zip(dataset["evcs"], expected["evcs"]):
+        assert entry["transactions"] == legacy_entry["transactions"]
+        for key in ("charger_id", "serial_number", "display_name"):
+            assert entry[key] == legacy_entry[key]
+        assert entry["total_kw"] == pytest.approx(legacy_entry["total_kw"])
+        assert entry["total_kw_period"] == pytest.approx(legacy_entry["total_kw_period"])
+
+
+def test_set_based_dataset_matches_legacy_builder():
+    seed_sessions(240)
+
+    dataset = build_evcs_session_dataset(PERIOD_START, PERIOD_END)
+
+    assert sum(len(entry["transactions"]) for entry in dataset["evcs"]) > 100
+    _assert_matches_legacy(dataset, legacy_build_dataset(PERIOD_START, PERIOD_END))
+
+
+def test_set_based_dataset_matches_legacy_for_selected_chargers():
+    chargers = seed_sessions(120)
+    selected = [chargers[0], chargers[-1]]
+
+    dataset = ClientReport.build_rows(PERIOD_START, PERIOD_END, chargers=selected)
+
+    assert len(dataset["evcs"]) == 2
+    _assert_matches_legacy(
+        dataset, legacy_build_dataset(PERIOD_START, PERIOD_END, chargers=selected)
+    )
+
+
+def test_set_based_dataset_counts_live_sessions_like_legacy(monkeypatch):
+    charger = Charger.objects.create(charger_id="REPORT-LIVE", connector_id=1)
+    start = datetime(2024, 3, 2, 8, tzinfo=pytimezone.utc)
+    Transaction.objects.create(
+        charger=charger, start_time=start, meter_start=1000, meter_stop=6000
+    )
+    live = Transaction.objects.create(
+        charger=charger, start_time=start + timedelta(hours=2), meter_start=6000
+    )
+    live.meter_stop = 9500
+    monkeypatch.setattr(
+        store,
+        "get_transaction",
+        lambda serial, connector: live if serial == "REPORT-LIVE" else None,
+    )
+
+    dataset = build_evcs_session_dataset(date(2024, 3, 1), date(2024, 3, 31))
+
+    _assert_matches_legacy(
+        dataset, legacy_build_dataset(date(2024, 3, 1), date(2024, 3, 31))
+    )
+    assert dataset["evcs"][0]["total_kw"] == pytest.approx(8.5)
+    assert dataset["evcs"][0]["total_kw_period"] == pytest.approx(8.5)
+
+
+def test_set_based_dataset_uses_constant_query_count(django_assert_max_num_queries):
+    seed_sessions(150)
+
+    with django_assert_max_num_queries(8):
+        build_evcs_session_dataset(PERIOD_START, PERIOD_END)
+
+
+def test_benchmark_rolls_back_synthetic_sessions():
+    stdout = StringIO()
+
+    call_command("benchmark", "client-report", "--sizes", "30", "--json", stdout=stdout)
+
+    runs = json.loads(stdout.getvalue())["runs"]
+    assert [run["transactions"] for run in runs] == [30]
+    assert runs[0]["rows"] > 0
+    assert not Charger.objects.filter(charger_id__startswith="BENCH-REPORT").exists()
@@ -0,0 +1,207 @@
+"""Benchmark Evergo order sync against an in-process fake upstream."""
+
+from __future__ import annotations
+
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+
+from apps.core.benchmarks import BenchmarkScenario
+from apps.evergo.models import EvergoUser
+
+DEFAULT_SIZES = (100, 1000, 10000)
+DEFAULT_PAGE_SIZE = 50
+EVERGO_USER_ID = 58642
+
+
+class _FakeUpstream:
+    """Serve generated order pages; orders in ``changed`` carry a newer stamp."""
+
+    def __init__(self, *, total: int, page_size: int, latency: float) -> None:
+        self.total = total
+        self.page_size = page_size
+        self.latency = latency
+        self.changed: set[int] = set()
+
+    def _order(self, index: int) -> dict:
+        remote_id = 100000 + index
+        customer_id = 500000 + index // 2
+        engineer = {"id": EVERGO_USER_ID, "name": "Bench Engineer"}
+        return {
+            "id": remote_id,
+            "numero_orden": f"GLY{remote_id}",
+            "idSitio": 36,
+            "idCliente": customer_id,
+            "idOrdenEstatus": 8,
+            "monto": f"{1000 + index}.50",
+            "user_tecnico_id": EVERGO_USER_ID,
+            "created_at": "2026-01-16T22:38:58.000000Z",
+            "updated_at": f"2026-02-21T18:{int(index in self.changed):02d}:58.000000Z",
+            "sitio": {"id": 36, "nombre": "Geely"},
+            "estatus": {"id": 8, "nombre": "Orden concluida"},
+            "cliente": {"id": customer_id, "name": f"Customer {customer_id}"},
+            "orden_instalacion": {"calle": "Santa Barbara", "num_ext": str(index)},
+            "orden_instalador": {"idIngeniero": EVERGO_USER_ID, "ingeniero": engineer},
+            "cargadores": [{"id": index}],
+        }
+
+    def request_json(self, *, session, timeout, method, url, **kwargs):
+        if "catalogs/sitios/all" in url:
+            return [{"id": 36, "nombre": "Geely"}]
+        if "search-ingenieros" in url:
+            return [{"id": EVERGO_USER_ID, "name": "Bench Engineer"}]
+        if "catalogs/orden-estatus" in url:
+            return [{"id": 8, "nombre": "Orden concluida"}]
+        if self.latency:
+            time.sleep(self.latency)
+        page = int(kwargs.get("params", {}).get("page", 1))
+        start = (page - 1) * self.page_size
+        return {
+            "current_page": page,
+            "last_page": max(1, -(-self.total // self.page_size)),
+            "data": [
+                self._order(index)
+                for index in range(start, min(self.total, start + self.page_size))
+            ],
+        }
+
+
+@contextmanager
+def count_queries():
+    counter = {"queries": 0}
+
+    def wrapper(execute, sql, params, many, context):
+        counter["queries"] += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(wrapper):
+        yield counter
+
+
+@dataclass
+class BenchmarkRun:
+    orders: int
+    phase: str
+    created: int
+    updated: int
+    queries: int
+    seconds: float
+
+    def to_dict(self) -> dict:
+        return {
+            "orders": self.orders,
+            "phase": self.phase,
+            "created": self.created,
+            "updated": self.updated,
+            "queries": self.queries,
+            "seconds": self.seconds,
+        }
+
+
+class _Rollback(Exception):
+    pass
+
+
+class EvergoSyncBenchmark(BenchmarkScenario):
+    help = (
+        "Benchmark Evergo order sync against an in-process fake upstream: the first "
+        "load, a resync with no upstream changes and a resync with one order in "
+        "ten changed. All rows are written inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=list(DEFAULT_SIZES),
+            help="Order counts to benchmark (default: 100 1000 10000).",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=DEFAULT_PAGE_SIZE,
+            help=f"Orders per API page (default: {DEFAULT_PAGE_SIZE}).",
+        )
+        parser.add_argument(
+            "--page-latency-ms",
+            type=float,
+            default=20.0,
+            help="Simulated API time per order page in milliseconds (default: 20).",
+        )
+        parser.add_argument(
+            "--no-prefetch",
+            action="store_true",
+            help="Request pages strictly one after another.",
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Emit JSON summary output."
+        )
+
+    def handle(self, **options):
+        if any(size < 1 for size in options["sizes"]) or options["page_size"] < 1:
+            raise CommandError("--sizes and --page-size must be positive.")
+
+        results: list[BenchmarkRun] = []
+        with override_settings(EVERGO_ORDER_PAGE_PREFETCH=not options["no_prefetch"]):
+            for size in options["sizes"]:
+                try:
+                    with transaction.atomic():
+                        results.extend(self._run_size(size, options))
+                        raise _Rollback
+                except _Rollback:
+                    pass
+
+        payload = {"runs": [run.to_dict() for run in results]}
+        if options["json"]:
+            self.stdout.write(json.dumps(payload, indent=2))
+            return
+
+        self.stdout.write("Evergo order sync benchmark summary:")
+        for run in results:
+            self.stdout.write(
+                f"  {run.orders} orders {run.phase}: {run.queries} queries, "
+                f"{run.seconds:.2f} s (created {run.created}, updated {run.updated})"
+            )
+
+    def _run_size(self, size: int, options) -> list[BenchmarkRun]:
+        owner = get_user_model().objects.create_user(username=f"evergo-bench-{size}")
+        profile = EvergoUser.objects.create(
+            user=owner,
+            evergo_email=f"bench-{size}@evergo.example.com",
+            evergo_password="bench",  # noqa: S106
+            evergo_user_id=EVERGO_USER_ID,
+        )
+        upstream = _FakeUpstream(
+            total=size,
+            page_size=options["page_size"],
+            latency=options["page_latency_ms"] / 1000,
+        )
+        profile._request_json = upstream.request_json
+        profile._login_session = lambda **_: None
+
+        runs = []
+        for phase in ("initial", "unchanged", "changed_10pct"):
+            if phase == "changed_10pct":
+                upstream.changed.update(range(0, size, 10))
+            with count_queries() as counter:
+                began = time.perf_counter()
+                created, updated = profile.load_orders()
+                elapsed = time.perf_counter() - began
+            runs.append(
+                BenchmarkRun(
+                    orders=size,
+                    phase=phase,
+                    created=created,
+                    updated=updated,
+                    queries=counter["queries"],
+                    seconds=elapsed,
+                )
+            )
+        return runs
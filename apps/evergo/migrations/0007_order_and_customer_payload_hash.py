@@ -0,0 +1,23 @@
+# Generated by Django 5.2.12 on 2026-10-19 01:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("evergo", "0006_seed_evergo_workspace"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="evergocustomer",
+            name="payload_hash",
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="evergoorder",
+            name="payload_hash",
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
@@ -28,6 +28,7 @@ class EvergoCustomer(models.Model):
     )
     latest_order_updated_at = models.DateTimeField(null=True, blank=True)
     raw_payload = models.JSONField(default=dict, blank=True)
+    payload_hash = models.CharField(max_length=64, blank=True, editable=False)
     refreshed_at = models.DateTimeField(auto_now=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -0,0 +1,482 @@
+"""Page-at-a-time ingestion of Evergo order payloads.
+
+Every order payload is hashed before it is written. A page of payloads costs
+one prefetch query per model, and only rows whose hash changed are written,
+with bulk inserts and updates inside one transaction. Customers and dropdown
+field values are derived from the same payloads and follow the same pattern.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import TYPE_CHECKING, Any
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.evergo.exceptions import EvergoAPIError
+
+from .customer import EvergoCustomer
+from .order import EvergoOrder, EvergoOrderFieldValue
+from .parsing import (
+    nested_dict,
+    nested_int,
+    nested_name,
+    parse_dt,
+    placeholder_remote_id,
+    to_int,
+)
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .user import EvergoUser
+
+
+def payload_hash(*parts: Any) -> str:
+    """Return a stable digest of JSON-like ``parts``."""
+    encoded = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def parse_amount(value: Any) -> Decimal | None:
+    """Convert the loosely typed ``monto`` field into a decimal amount."""
+    if value in (None, ""):
+        return None
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def dynamic_field_entries(payload: dict[str, Any]) -> list[tuple[str, int | None, str, dict[str, Any]]]:
+    """Return ``(field_name, remote_id, remote_name, raw_payload)`` values seen in an order."""
+    entries = []
+    mapping = (
+        (EvergoOrderFieldValue.FIELD_SITIO, payload.get("sitio")),
+        (EvergoOrderFieldValue.FIELD_ESTATUS, payload.get("estatus")),
+        (EvergoOrderFieldValue.FIELD_PREORDEN_TIPO, payload.get("preorden_tipo")),
+    )
+    for field_name, source in mapping:
+        if not isinstance(source, dict):
+            continue
+        remote_id = to_int(source.get("id"))
+        remote_name = nested_name(source)
+        if remote_id is None or not remote_name:
+            continue
+        entries.append((field_name, remote_id, remote_name, source))
+
+    payment_by = str(payload.get("paymentBy") or "").strip()
+    if payment_by:
+        entries.append(
+            (EvergoOrderFieldValue.FIELD_PAYMENT_BY, None, payment_by, {"value": payment_by})
+        )
+    return entries
+
+
+def order_field_values(payload: dict[str, Any]) -> dict[str, Any]:
+    """Map a raw Evergo order payload onto `EvergoOrder` field values."""
+    installation_data = payload.get("orden_instalacion")
+    if not isinstance(installation_data, dict):
+        installation_data = {}
+
+    state_payload = payload.get("estado")
+    last_contact = (
+        parse_dt(payload.get("last_contact_at"))
+        or parse_dt(payload.get("last_comment_at"))
+        or parse_dt(payload.get("fecha_ultimo_contacto"))
+        or parse_dt(payload.get("fecha_ultimo_comentario"))
+    )
+
+    values = {
+        "order_number": str(payload.get("numero_orden") or ""),
+        "prefix": str(payload.get("prefijo") or ""),
+        "suffix": str(payload.get("sufijo") or ""),
+        "uuid": to_int(payload.get("uuid")),
+        "scheduled_for": parse_dt(payload.get("fecha_programada_timestamp"))
+        or parse_dt(payload.get("fecha_programada")),
+        "status_id": to_int(payload.get("idOrdenEstatus")),
+        "status_name": nested_name(payload.get("estatus")),
+        "site_id": to_int(payload.get("idSitio")),
+        "site_name": nested_name(payload.get("sitio")),
+        "client_id": to_int(payload.get("idCliente")),
+        "client_name": nested_name(payload.get("cliente")),
+        "phone_primary": str(
+            installation_data.get("telefono_celular")
+            or installation_data.get("telefono_fijo1")
+            or ""
+        ).strip(),
+        "phone_secondary": str(
+            installation_data.get("telefono_fijo1")
+            or installation_data.get("telefono_fijo2")
+            or ""
+        ).strip(),
+        "address_street": str(installation_data.get("calle") or "").strip(),
+        "address_num_ext": str(installation_data.get("num_ext") or "").strip(),
+        "address_num_int": str(installation_data.get("num_int") or "").strip(),
+        "address_between_streets": str(installation_data.get("entre_calles") or "").strip(),
+        "address_neighborhood": str(installation_data.get("colonia") or "").strip(),
+        "address_municipality": str(installation_data.get("municipio") or "").strip(),
+        "address_city": str(installation_data.get("ciudad") or "").strip(),
+        "address_state": nested_name(state_payload)
+        or str(installation_data.get("estado") or "").strip(),
+        "address_postal_code": str(installation_data.get("codigo_postal") or "").strip(),
+        "assigned_engineer_id": nested_int(payload.get("orden_instalador"), "idIngeniero"),
+        "assigned_engineer_name": nested_name(nested_dict(payload.get("orden_instalador"), "ingeniero")),
+        "assigned_coordinator_id": nested_int(payload.get("orden_instalador"), "idCoordinador"),
+        "assigned_coordinator_name": nested_name(nested_dict(payload.get("orden_instalador"), "coordinador")),
+        "has_charger": bool(to_int(payload.get("has_charger"))),
+        "has_vehicle": bool(to_int(payload.get("has_vehicle"))),
+        "estimated_amount": parse_amount(payload.get("monto")),
+        "raw_payload": payload,
+        "source_created_at": parse_dt(payload.get("created_at")),
+        "source_updated_at": parse_dt(payload.get("updated_at")),
+        "source_last_contact_at": last_contact,
+        "validation_state": EvergoOrder.VALIDATION_STATE_VALIDATED,
+    }
+    charge_points = payload.get("cargadores")
+    if isinstance(charge_points, list):
+        values["charger_count"] = len(charge_points)
+    return values
+
+
+def customer_field_values(payload: dict[str, Any]) -> tuple[int | None, dict[str, Any]] | None:
+    """Map an order payload onto ``(remote_id, values)`` for its `EvergoCustomer`.
+
+    Returns ``None`` when the payload carries no usable customer data. The
+    ``latest_order`` value is left for the caller to resolve.
+    """
+    customer_payload = payload.get("cliente")
+    install_payload = payload.get("orden_instalacion")
+    if not isinstance(customer_payload, dict) and not isinstance(install_payload, dict):
+        return None
+
+    customer_id = to_int(customer_payload.get("id")) if isinstance(customer_payload, dict) else None
+    customer_name = ""
+    if isinstance(customer_payload, dict):
+        customer_name = nested_name(customer_payload)
+    if not customer_name and isinstance(install_payload, dict):
+        customer_name = str(install_payload.get("nombre_completo") or "").strip()
+    if customer_id is None and not customer_name:
+        return None
+
+    phone = ""
+    address = ""
+    if isinstance(install_payload, dict):
+        phone = str(
+            install_payload.get("telefono_celular")
+            or install_payload.get("telefono_fijo1")
+            or install_payload.get("telefono_fijo2")
+            or ""
+        ).strip()
+        municipio = str(install_payload.get("municipio") or "").strip()
+        ciudad = str(install_payload.get("ciudad") or "").strip()
+        locality = municipio or ciudad
+        address = str(
+            install_payload.get("direccion")
+            or " ".join(
+                filter(
+                    None,
+                    [
+                        install_payload.get("calle"),
+                        install_payload.get("num_ext"),
+                        install_payload.get("num_int"),
+                        install_payload.get("colonia"),
+                        locality,
+                        install_payload.get("codigo_postal"),
+                    ],
+                )
+            )
+            or ""
+        ).strip()
+
+    return customer_id, {
+        "name": customer_name,
+        "email": str(customer_payload.get("email") or "") if isinstance(customer_payload, dict) else "",
+        "phone_number": phone,
+        "address": address,
+        "latest_so": str(payload.get("numero_orden") or "").strip(),
+        "latest_order_updated_at": parse_dt(payload.get("updated_at")),
+        "raw_payload": {
+            "cliente": customer_payload if isinstance(customer_payload, dict) else {},
+            "orden_instalacion": install_payload if isinstance(install_payload, dict) else {},
+        },
+    }
+
+
+@dataclass(slots=True)
+class IngestResult:
+    """Counters and touched rows for one ingested batch of order payloads."""
+
+    orders_created: int = 0
+    orders_updated: int = 0
+    orders_unchanged: int = 0
+    customers_created: int = 0
+    orders: list[tuple[bool, EvergoOrder]] = field(default_factory=list)
+    customers: list[tuple[bool, EvergoCustomer | None]] = field(default_factory=list)
+
+
+class OrderIngestor:
+    """Upsert Evergo order payloads for one `EvergoUser` in bulk."""
+
+    ORDER_WRITE_FIELDS = (
+        "user",
+        "payload_hash",
+        "refreshed_at",
+        "charger_count",
+        *order_field_values({}).keys(),
+    )
+    CUSTOMER_WRITE_FIELDS = (
+        "payload_hash",
+        "latest_order",
+        "refreshed_at",
+        "name",
+        "email",
+        "phone_number",
+        "address",
+        "latest_so",
+        "latest_order_updated_at",
+        "raw_payload",
+    )
+
+    def __init__(self, user: EvergoUser) -> None:
+        self.user = user
+
+    def ingest(self, payloads: list[dict[str, Any]]) -> IngestResult:
+        """Write orders, their customers and field values in one transaction."""
+        with transaction.atomic():
+            result = self.write_orders(payloads)
+            orders_by_remote_id = {order.remote_id: order for _, order in result.orders}
+            customers = self.write_customers(payloads, orders_by_remote_id=orders_by_remote_id)
+        result.customers = customers.customers
+        result.customers_created = customers.customers_created
+        return result
+
+    def write_orders(self, payloads: list[dict[str, Any]]) -> IngestResult:
+        """Upsert orders, returning ``(created, order)`` pairs aligned with ``payloads``."""
+        result = IngestResult()
+        latest: dict[int, dict[str, Any]] = {}
+        remote_ids = []
+        for payload in payloads:
+            remote_id = to_int(payload.get("id"))
+            if remote_id is None:
+                raise EvergoAPIError("Evergo order payload is missing a valid 'id'.")
+            latest[remote_id] = payload
+            remote_ids.append(remote_id)
+        if not remote_ids:
+            return result
+
+        existing = EvergoOrder.objects.in_bulk(list(latest), field_name="remote_id")
+        upserts: dict[int, EvergoOrder] = {}
+        field_entries: list[tuple[str, int | None, str, dict[str, Any]]] = []
+        for remote_id, payload in latest.items():
+            digest = payload_hash(self.user.pk, payload)
+            current = existing.get(remote_id)
+            if current is not None and current.payload_hash == digest:
+                continue
+            values = order_field_values(payload)
+            values.setdefault("charger_count", current.charger_count if current else 0)
+            upserts[remote_id] = EvergoOrder(
+                remote_id=remote_id, user=self.user, payload_hash=digest, **values
+            )
+            field_entries.extend(dynamic_field_entries(payload))
+
+        with transaction.atomic(savepoint=False):
+            if upserts:
+                # One INSERT ... ON CONFLICT for new and changed rows alike.
+                EvergoOrder.objects.bulk_create(
+                    list(upserts.values()),
+                    update_conflicts=True,
+                    unique_fields=["remote_id"],
+                    update_fields=list(self.ORDER_WRITE_FIELDS),
+                )
+            self._drop_placeholders(latest.values())
+            upsert_field_values(field_entries)
+
+        for remote_id, order in upserts.items():
+            if remote_id in existing:
+                order.created_at = existing[remote_id].created_at
+        orders = {**existing, **upserts}
+        seen: set[int] = set()
+        for remote_id in remote_ids:
+            result.orders.append((remote_id not in existing and remote_id not in seen, orders[remote_id]))
+            seen.add(remote_id)
+        result.orders_created = sum(1 for remote_id in upserts if remote_id not in existing)
+        result.orders_updated = len(upserts) - result.orders_created
+        result.orders_unchanged = len(latest) - len(upserts)
+        return result
+
+    @staticmethod
+    def _drop_placeholders(payloads) -> None:
+        placeholder_ids = {
+            placeholder_remote_id(order_number=number)
+            for number in (str(payload.get("numero_orden") or "").strip().upper() for payload in payloads)
+            if number
+        }
+        if placeholder_ids:
+            EvergoOrder.objects.filter(
+                remote_id__in=placeholder_ids,
+                validation_state=EvergoOrder.VALIDATION_STATE_PLACEHOLDER,
+            ).delete()
+
+    def write_customers(
+        self,
+        payloads: list[dict[str, Any]],
+        *,
+        orders_by_remote_id: dict[int, EvergoOrder] | None = None,
+    ) -> IngestResult:
+        """Upsert the customer snapshot carried by each order payload."""
+        result = IngestResult()
+        keys: list[tuple[str, Any] | None] = []
+        latest: dict[tuple[str, Any], dict[str, Any]] = {}
+        for payload in payloads:
+            parsed = customer_field_values(payload)
+            if parsed is None:
+                keys.append(None)
+                continue
+            customer_id, values = parsed
+            values["latest_order"] = to_int(payload.get("id"))
+            key = ("id", customer_id) if customer_id is not None else ("name", values["name"])
+            keys.append(key)
+            latest[key] = values
+        if not latest:
+            result.customers = [(False, None)] * len(payloads)
+            return result
+
+        if orders_by_remote_id is None:
+            orders_by_remote_id = EvergoOrder.objects.in_bulk(
+                [values["latest_order"] for values in latest.values() if values["latest_order"]],
+                field_name="remote_id",
+            )
+        existing = self._existing_customers(latest)
+        customers = dict(existing)
+        upserts: list[EvergoCustomer] = []
+        new_by_name: list[EvergoCustomer] = []
+        changed_by_name: list[EvergoCustomer] = []
+        for key, values in latest.items():
+            values["latest_order"] = orders_by_remote_id.get(values["latest_order"])
+            order = values["latest_order"]
+            digest = payload_hash(
+                {name: value for name, value in values.items() if name != "latest_order"},
+                order.remote_id if order else None,
+            )
+            current = existing.get(key)
+            if current is not None and current.payload_hash == digest:
+                continue
+            if key[0] == "id":
+                customer = EvergoCustomer(user=self.user, remote_id=key[1])
+                if current is not None:
+                    customer.public_id = current.public_id
+                upserts.append(customer)
+            elif current is None:
+                customer = EvergoCustomer(user=self.user, remote_id=None)
+                new_by_name.append(customer)
+            else:
+                customer = current
+                customer.refreshed_at = timezone.now()
+                changed_by_name.append(customer)
+            customer.payload_hash = digest
+            for name, value in values.items():
+                setattr(customer, name, value)
+            customers[key] = customer
+
+        with transaction.atomic(savepoint=False):
+            if upserts:
+                EvergoCustomer.objects.bulk_create(
+                    upserts,
+                    update_conflicts=True,
+                    unique_fields=["user", "remote_id"],
+                    update_fields=list(self.CUSTOMER_WRITE_FIELDS),
+                )
+            if new_by_name:
+                EvergoCustomer.objects.bulk_create(new_by_name)
+            if changed_by_name:
+                EvergoCustomer.objects.bulk_update(changed_by_name, self.CUSTOMER_WRITE_FIELDS)
+
+        for key, current in existing.items():
+            if customers[key] is not current:
+                customers[key].created_at = current.created_at
+        counted: set[tuple[str, Any]] = set()
+        for key in keys:
+            if key is None:
+                result.customers.append((False, None))
+                continue
+            created = key not in existing and key not in counted
+            counted.add(key)
+            result.customers.append((created, customers[key]))
+        result.customers_created = len(latest) - len(existing)
+        return result
+
+    def _existing_customers(self, keys) -> dict[tuple[str, Any], EvergoCustomer]:
+        remote_ids: set[int] = set()
+        names: set[str] = set()
+        for kind, value in keys:
+            (remote_ids if kind == "id" else names).add(value)
+        found: dict[tuple[str, Any], EvergoCustomer] = {}
+        if remote_ids:
+            for customer in EvergoCustomer.objects.filter(user=self.user, remote_id__in=remote_ids):
+                found[("id", customer.remote_id)] = customer
+        if names:
+            for customer in EvergoCustomer.objects.filter(
+                user=self.user, remote_id__isnull=True, name__in=names
+            ).order_by("-id"):
+                found[("name", customer.name)] = customer
+        return found
+
+
+def upsert_field_values(entries: list[tuple[str, int | None, str, dict[str, Any]]]) -> None:
+    """Record dropdown values with one upsert for keyed values and one lookup for free text."""
+    if not entries:
+        return
+    now = timezone.now()
+    keyed: dict[tuple[str, int], EvergoOrderFieldValue] = {}
+    free_text: dict[tuple[str, str], dict[str, Any]] = {}
+    for field_name, remote_id, remote_name, raw_payload in entries:
+        if remote_id is None:
+            free_text[(field_name, remote_name)] = raw_payload
+            continue
+        keyed[(field_name, remote_id)] = EvergoOrderFieldValue(
+            field_name=field_name,
+            remote_id=remote_id,
+            remote_name=remote_name,
+            raw_payload=raw_payload,
+            last_seen_at=now,
+        )
+    if keyed:
+        EvergoOrderFieldValue.objects.bulk_create(
+            list(keyed.values()),
+            update_conflicts=True,
+            unique_fields=["field_name", "remote_id"],
+            update_fields=["remote_name", "raw_payload", "last_seen_at"],
+        )
+    if free_text:
+        known = {
+            (row.field_name, row.remote_name): row
+            for row in EvergoOrderFieldValue.objects.filter(
+                remote_id__isnull=True,
+                field_name__in={key[0] for key in free_text},
+                remote_name__in={key[1] for key in free_text},
+            )
+        }
+        new_rows = []
+        for key, raw_payload in free_text.items():
+            row = known.get(key)
+            if row is None:
+                new_rows.append(
+                    EvergoOrderFieldValue(
+                        field_name=key[0],
+                        remote_id=None,
+                        remote_name=key[1],
+                        raw_payload=raw_payload,
+                    )
+                )
+                continue
+            row.raw_payload = raw_payload
+            row.last_seen_at = now
+        if new_rows:
+            EvergoOrderFieldValue.objects.bulk_create(new_rows)
+        if known:
+            EvergoOrderFieldValue.objects.bulk_update(
+                list(known.values()), ["raw_payload", "last_seen_at"]
+            )
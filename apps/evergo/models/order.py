@@ -2,13 +2,9 @@
 
 from __future__ import annotations
 
-from decimal import Decimal, InvalidOperation
 from typing import Any
 
 from django.db import models
-from django.utils import timezone
-
-from .parsing import nested_name, to_int
 
 
 class EvergoOrderFieldValue(models.Model):
@@ -88,6 +84,7 @@ class EvergoOrder(models.Model):
     source_updated_at = models.DateTimeField(null=True, blank=True)
     source_last_contact_at = models.DateTimeField(null=True, blank=True)
     raw_payload = models.JSONField(default=dict, blank=True)
+    payload_hash = models.CharField(max_length=64, blank=True, editable=False)
     validation_state = models.CharField(
         max_length=20,
         choices=VALIDATION_STATE_CHOICES,
@@ -109,40 +106,8 @@ class EvergoOrder(models.Model):
 
     def sync_dynamic_field_values(self, payload: dict[str, Any]) -> None:
         """Track dropdown-like field values as they appear in incoming order payloads."""
-        mapping = (
-            (EvergoOrderFieldValue.FIELD_SITIO, payload.get("sitio")),
-            (EvergoOrderFieldValue.FIELD_ESTATUS, payload.get("estatus")),
-            (EvergoOrderFieldValue.FIELD_PREORDEN_TIPO, payload.get("preorden_tipo")),
-        )
-        for field_name, source in mapping:
-            if not isinstance(source, dict):
-                continue
-            remote_id = to_int(source.get("id"))
-            remote_name = nested_name(source)
-            if remote_id is None or not remote_name:
-                continue
-            EvergoOrderFieldValue.objects.update_or_create(
-                field_name=field_name,
-                remote_id=remote_id,
-                defaults={
-                    "remote_name": remote_name,
-                    "raw_payload": source,
-                    "last_seen_at": timezone.now(),
-                },
-            )
-
-        payment_by = str(payload.get("paymentBy") or "").strip()
-        if payment_by:
-            EvergoOrderFieldValue.objects.update_or_create(
-                field_name=EvergoOrderFieldValue.FIELD_PAYMENT_BY,
-                remote_id=None,
-                remote_name=payment_by,
-                defaults={"raw_payload": {"value": payment_by}, "last_seen_at": timezone.now()},
-            )
-
-        amount = payload.get("monto")
-        try:
-            self.estimated_amount = Decimal(str(amount)) if amount not in (None, "") else None
-        except (InvalidOperation, ValueError):
-            self.estimated_amount = None
+        from .ingest import dynamic_field_entries, parse_amount, upsert_field_values
+
+        upsert_field_values(dynamic_field_entries(payload))
+        self.estimated_amount = parse_amount(payload.get("monto"))
         self.save(update_fields=["estimated_amount", "refreshed_at"])
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 import re
 from typing import Any
@@ -21,12 +22,10 @@ from apps.users.models import Profile
 
 from apps.evergo.exceptions import EvergoAPIError, EvergoPhaseSubmissionError
 from .customer import EvergoCustomer
+from .ingest import OrderIngestor, upsert_field_values
 from .order import EvergoOrder, EvergoOrderFieldValue
 from .parsing import (
     first_dict,
-    nested_dict,
-    nested_int,
-    nested_name,
     parse_dt,
     placeholder_remote_id,
     to_int,
@@ -249,7 +248,13 @@ class EvergoUser(Profile):
         self.evergo_updated_at = parse_dt(payload.get("updated_at"))
 
     def load_orders(self, *, timeout: int = 20) -> tuple[int, int]:
-        """Fetch and upsert Evergo orders assigned to this user into local models."""
+        """Fetch and upsert Evergo orders assigned to this user into local models.
+
+        Each page is written in one transaction and orders whose payload has
+        not changed since the last sync are skipped, so ``updated`` only counts
+        rows that were rewritten. Unless ``EVERGO_ORDER_PAGE_PREFETCH`` is
+        disabled, the next page is requested while the current one is written.
+        """
         if not self.evergo_email or not self.evergo_password:
             raise EvergoAPIError("Evergo credentials are incomplete.")
 
@@ -276,45 +281,64 @@ class EvergoUser(Profile):
                 url=self.API_ORDEN_ESTATUS_URL,
             )
 
-            page = 1
-            while True:
-                payload = self._request_json(
-                    session=session,
-                    timeout=timeout,
-                    method="GET",
-                    url=self.API_ORDERS_URL,
-                    params={
-                        "page": page,
-                        "ingenieroAsignadoId": self.evergo_user_id or "",
-                        "numero": "",
-                        "conCargador": "",
-                        "cliente": "",
-                        "from": "",
-                        "to": "",
-                    },
-                )
-                data = payload.get("data") if isinstance(payload, dict) else None
-                if not isinstance(data, list) or not data:
-                    break
-
-                for item in data:
-                    if not isinstance(item, dict) or not self._is_assigned_to_user(item):
-                        continue
-                    was_created, _ = self._upsert_order(item)
-                    self._upsert_customer_from_order(item)
-                    if was_created:
-                        created += 1
+            prefetch = getattr(settings, "EVERGO_ORDER_PAGE_PREFETCH", True)
+            ingestor = OrderIngestor(self)
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                page = 1
+                payload = self._fetch_orders_page(session=session, timeout=timeout, page=page)
+                while True:
+                    data = payload.get("data") if isinstance(payload, dict) else None
+                    if not isinstance(data, list) or not data:
+                        break
+
+                    last_page = to_int(payload.get("last_page")) if isinstance(payload, dict) else None
+                    current_page = to_int(payload.get("current_page")) if isinstance(payload, dict) else page
+                    has_next = not (last_page and current_page and current_page >= last_page)
+                    next_page = None
+                    if has_next and prefetch:
+                        # Fetch the next page while this one is written.
+                        next_page = executor.submit(
+                            self._fetch_orders_page, session=session, timeout=timeout, page=page + 1
+                        )
+
+                    result = ingestor.ingest(
+                        [
+                            item
+                            for item in data
+                            if isinstance(item, dict) and self._is_assigned_to_user(item)
+                        ]
+                    )
+                    created += result.orders_created
+                    updated += result.orders_updated
+
+                    if not has_next:
+                        break
+                    page += 1
+                    if next_page is not None:
+                        payload = next_page.result()
                     else:
-                        updated += 1
-
-                last_page = to_int(payload.get("last_page")) if isinstance(payload, dict) else None
-                current_page = to_int(payload.get("current_page")) if isinstance(payload, dict) else page
-                if last_page and current_page and current_page >= last_page:
-                    break
-                page += 1
+                        payload = self._fetch_orders_page(session=session, timeout=timeout, page=page)
 
         return created, updated
 
+    def _fetch_orders_page(self, *, session: requests.Session, timeout: int, page: int) -> Any:
+        """Request one page of orders assigned to this user."""
+        return self._request_json(
+            session=session,
+            timeout=timeout,
+            method="GET",
+            url=self.API_ORDERS_URL,
+            params={
+                "page": page,
+                "ingenieroAsignadoId": self.evergo_user_id or "",
+                "numero": "",
+                "conCargador": "",
+                "cliente": "",
+                "from": "",
+                "to": "",
+            },
+        )
+
     def load_customers_from_queries(
         self,
         *,
@@ -820,26 +844,16 @@ class EvergoUser(Profile):
         self, order_payloads: list[dict[str, Any]]
     ) -> tuple[int, int, int, set[int], set[int]]:
         """Upsert orders/customers and return counters plus loaded record IDs."""
-        customers_loaded = 0
-        orders_created = 0
-        orders_updated = 0
-        loaded_customer_ids: set[int] = set()
-        loaded_order_ids: set[int] = set()
-
-        for payload in order_payloads:
-            was_created, order = self._upsert_order(payload)
-            customer_created, customer = self._upsert_customer_from_order(payload)
-            loaded_order_ids.add(order.pk)
-            if customer is not None:
-                loaded_customer_ids.add(customer.pk)
-
-            customers_loaded += int(customer_created)
-            if was_created:
-                orders_created += 1
-            else:
-                orders_updated += 1
-
-        return customers_loaded, orders_created, orders_updated, loaded_customer_ids, loaded_order_ids
+        result = OrderIngestor(self).ingest(order_payloads)
+        loaded_order_ids = {order.pk for _, order in result.orders}
+        loaded_customer_ids = {customer.pk for _, customer in result.customers if customer is not None}
+        return (
+            result.customers_created,
+            result.orders_created,
+            result.orders_updated + result.orders_unchanged,
+            loaded_customer_ids,
+            loaded_order_ids,
+        )
 
     def _ensure_placeholder_order(self, *, so_number: str) -> EvergoOrder:
         """Create/update a provisional local order row when SO is not found upstream."""
@@ -857,92 +871,8 @@ class EvergoUser(Profile):
 
     def _upsert_customer_from_order(self, payload: dict[str, Any]) -> tuple[bool, EvergoCustomer | None]:
         """Create/update a customer snapshot derived from one order payload."""
-        customer_payload = payload.get("cliente")
-        install_payload = payload.get("orden_instalacion")
-        if not isinstance(customer_payload, dict) and not isinstance(install_payload, dict):
-            return False, None
-
-        customer_id = to_int(customer_payload.get("id")) if isinstance(customer_payload, dict) else None
-        customer_name = ""
-        if isinstance(customer_payload, dict):
-            customer_name = nested_name(customer_payload)
-        if not customer_name and isinstance(install_payload, dict):
-            customer_name = str(install_payload.get("nombre_completo") or "").strip()
-
-        latest_so = str(payload.get("numero_orden") or "").strip()
-        phone = ""
-        address = ""
-        if isinstance(install_payload, dict):
-            phone = str(
-                install_payload.get("telefono_celular")
-                or install_payload.get("telefono_fijo1")
-                or install_payload.get("telefono_fijo2")
-                or ""
-            ).strip()
-            municipio = str(install_payload.get("municipio") or "").strip()
-            ciudad = str(install_payload.get("ciudad") or "").strip()
-            locality = municipio or ciudad
-            address = str(
-                install_payload.get("direccion")
-                or " ".join(
-                    filter(
-                        None,
-                        [
-                            install_payload.get("calle"),
-                            install_payload.get("num_ext"),
-                            install_payload.get("num_int"),
-                            install_payload.get("colonia"),
-                            locality,
-                            install_payload.get("codigo_postal"),
-                        ],
-                    )
-                )
-                or ""
-            ).strip()
-
-        order = None
-        remote_order_id = to_int(payload.get("id"))
-        if remote_order_id is not None:
-            order = EvergoOrder.objects.filter(remote_id=remote_order_id).first()
-
-        defaults = {
-            "name": customer_name,
-            "email": str(customer_payload.get("email") or "") if isinstance(customer_payload, dict) else "",
-            "phone_number": phone,
-            "address": address,
-            "latest_so": latest_so,
-            "latest_order": order,
-            "latest_order_updated_at": parse_dt(payload.get("updated_at")),
-            "raw_payload": {
-                "cliente": customer_payload if isinstance(customer_payload, dict) else {},
-                "orden_instalacion": install_payload if isinstance(install_payload, dict) else {},
-            },
-        }
-
-        if customer_id is not None:
-            customer, created = EvergoCustomer.objects.update_or_create(
-                user=self,
-                remote_id=customer_id,
-                defaults=defaults,
-            )
-            return created, customer
-
-        if not customer_name:
-            return False, None
-
-        existing_customer = (
-            EvergoCustomer.objects.filter(user=self, remote_id__isnull=True, name=customer_name)
-            .order_by("id")
-            .first()
-        )
-        if existing_customer is not None:
-            for field_name, value in defaults.items():
-                setattr(existing_customer, field_name, value)
-            existing_customer.save(update_fields=[*defaults.keys(), "refreshed_at"])
-            return False, existing_customer
-
-        customer = EvergoCustomer.objects.create(user=self, remote_id=None, **defaults)
-        return True, customer
+        result = OrderIngestor(self).write_customers([payload])
+        return result.customers[0]
 
     def _login_session(self, *, session: requests.Session, timeout: int) -> None:
         """Authenticate a requests session against Evergo."""
@@ -1012,6 +942,7 @@ class EvergoUser(Profile):
         if not isinstance(payload, list):
             return
 
+        entries = []
         for item in payload:
             if not isinstance(item, dict):
                 continue
@@ -1024,15 +955,8 @@ class EvergoUser(Profile):
             )
             if remote_id is None or not remote_name:
                 continue
-            EvergoOrderFieldValue.objects.update_or_create(
-                field_name=field_name,
-                remote_id=remote_id,
-                defaults={
-                    "remote_name": remote_name,
-                    "raw_payload": item,
-                    "last_seen_at": timezone.now(),
-                },
-            )
+            entries.append((field_name, remote_id, remote_name, item))
+        upsert_field_values(entries)
 
     def _is_assigned_to_user(self, payload: dict[str, Any]) -> bool:
         """Check whether the upstream order is assigned to the current Evergo user."""
@@ -1051,85 +975,5 @@ class EvergoUser(Profile):
 
     def _upsert_order(self, payload: dict[str, Any]) -> tuple[bool, EvergoOrder]:
         """Create or update an `EvergoOrder` from raw Evergo API data."""
-        remote_id = to_int(payload.get("id"))
-        if remote_id is None:
-            raise EvergoAPIError("Evergo order payload is missing a valid 'id'.")
-
-        installation_data = payload.get("orden_instalacion")
-        if not isinstance(installation_data, dict):
-            installation_data = {}
-
-        state_payload = payload.get("estado")
-        last_contact = (
-            parse_dt(payload.get("last_contact_at"))
-            or parse_dt(payload.get("last_comment_at"))
-            or parse_dt(payload.get("fecha_ultimo_contacto"))
-            or parse_dt(payload.get("fecha_ultimo_comentario"))
-        )
-
-        defaults = {
-            "user": self,
-            "order_number": str(payload.get("numero_orden") or ""),
-            "prefix": str(payload.get("prefijo") or ""),
-            "suffix": str(payload.get("sufijo") or ""),
-            "uuid": to_int(payload.get("uuid")),
-            "scheduled_for": parse_dt(payload.get("fecha_programada_timestamp"))
-            or parse_dt(payload.get("fecha_programada")),
-            "status_id": to_int(payload.get("idOrdenEstatus")),
-            "status_name": nested_name(payload.get("estatus")),
-            "site_id": to_int(payload.get("idSitio")),
-            "site_name": nested_name(payload.get("sitio")),
-            "client_id": to_int(payload.get("idCliente")),
-            "client_name": nested_name(payload.get("cliente")),
-            "phone_primary": str(
-                installation_data.get("telefono_celular")
-                or installation_data.get("telefono_fijo1")
-                or ""
-            ).strip(),
-            "phone_secondary": str(
-                installation_data.get("telefono_fijo1")
-                or installation_data.get("telefono_fijo2")
-                or ""
-            ).strip(),
-            "address_street": str(installation_data.get("calle") or "").strip(),
-            "address_num_ext": str(installation_data.get("num_ext") or "").strip(),
-            "address_num_int": str(installation_data.get("num_int") or "").strip(),
-            "address_between_streets": str(installation_data.get("entre_calles") or "").strip(),
-            "address_neighborhood": str(installation_data.get("colonia") or "").strip(),
-            "address_municipality": str(installation_data.get("municipio") or "").strip(),
-            "address_city": str(installation_data.get("ciudad") or "").strip(),
-            "address_state": nested_name(state_payload)
-            or str(installation_data.get("estado") or "").strip(),
-            "address_postal_code": str(installation_data.get("codigo_postal") or "").strip(),
-            "assigned_engineer_id": nested_int(payload.get("orden_instalador"), "idIngeniero"),
-            "assigned_engineer_name": nested_name(nested_dict(payload.get("orden_instalador"), "ingeniero")),
-            "assigned_coordinator_id": nested_int(payload.get("orden_instalador"), "idCoordinador"),
-            "assigned_coordinator_name": nested_name(nested_dict(payload.get("orden_instalador"), "coordinador")),
-            "has_charger": bool(to_int(payload.get("has_charger"))),
-            "has_vehicle": bool(to_int(payload.get("has_vehicle"))),
-            "raw_payload": payload,
-            "source_created_at": parse_dt(payload.get("created_at")),
-            "source_updated_at": parse_dt(payload.get("updated_at")),
-            "source_last_contact_at": last_contact,
-            "validation_state": EvergoOrder.VALIDATION_STATE_VALIDATED,
-        }
-        charge_points = payload.get("cargadores")
-        if isinstance(charge_points, list):
-            defaults["charger_count"] = len(charge_points)
-
-        order, created = EvergoOrder.objects.update_or_create(
-            remote_id=remote_id,
-            defaults=defaults,
-        )
-
-        order_number = defaults["order_number"].strip().upper()
-        if order_number:
-            placeholder_id = placeholder_remote_id(order_number=order_number)
-            (
-                EvergoOrder.objects.filter(remote_id=placeholder_id)
-                .exclude(pk=order.pk)
-                .delete()
-            )
-
-        order.sync_dynamic_field_values(payload)
-        return created, order
+        result = OrderIngestor(self).write_orders([payload])
+        return result.orders[0]
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from apps.evergo.models import EvergoUser
+
+DEFAULT_PAGE_SIZE = 50
+EVERGO_USER_ID = 58642
+
+
+class FakeEvergoAPI:
+    """In-process stand-in for the Evergo order and catalog endpoints.
+
+    Orders are generated deterministically; :meth:`touch` changes the
+    ``updated_at`` stamp of a fraction of them to simulate upstream edits.
+    """
+
+    def __init__(
+        self, *, total: int, page_size: int = DEFAULT_PAGE_SIZE, latency: float = 0.0
+    ) -> None:
+        self.total = total
+        self.page_size = page_size
+        self.latency = latency
+        self.revisions: dict[int, int] = {}
+        self.page_requests = 0
+        self._lock = threading.Lock()
+
+    def order(self, index: int) -> dict:
+        remote_id = 100000 + index
+        revision = self.revisions.get(index, 0)
+        customer_id = 500000 + index // 2
+        return {
+            "id": remote_id,
+            "numero_orden": f"GLY{remote_id}",
+            "prefijo": "GLY",
+            "uuid": index,
+            "idSitio": 36,
+            "idCliente": customer_id,
+            "idOrdenEstatus": 8 if index % 3 else 5,
+            "has_charger": 1,
+            "has_vehicle": index % 2,
+            "paymentBy": "Brand" if index % 4 else "Customer",
+            "monto": f"{1000 + index}.50",
+            "user_tecnico_id": EVERGO_USER_ID,
+            "created_at": "2026-01-16T22:38:58.000000Z",
+            "updated_at": f"2026-02-21T18:{revision % 60:02d}:58.000000Z",
+            "sitio": {"id": 36, "nombre": "Geely"},
+            "estatus": {"id": 8, "nombre": "Orden concluida"}
+            if index % 3
+            else {"id": 5, "nombre": "Programada"},
+            "preorden_tipo": {"id": 107, "nombre": "Geely - Instalación"},
+            "cliente": {"id": customer_id, "name": f"Customer {customer_id}"},
+            "orden_instalacion": {
+                "telefono_celular": f"+52811{index:07d}",
+                "calle": "Santa Barbara",
+                "num_ext": str(index),
+                "colonia": "Centro",
+                "municipio": "Apodaca",
+                "codigo_postal": "66647",
+            },
+            "orden_instalador": {
+                "idIngeniero": EVERGO_USER_ID,
+                "idCoordinador": EVERGO_USER_ID,
+                "ingeniero": {"id": EVERGO_USER_ID, "name": "Test Engineer"},
+            },
+            "cargadores": [{"id": index}],
+        }
+
+    def touch(self, fraction: float) -> int:
+        """Bump the revision of every ``1 / fraction``-th order and return how many."""
+        if fraction <= 0:
+            return 0
+        step = max(1, round(1 / fraction))
+        touched = 0
+        for index in range(0, self.total, step):
+            self.revisions[index] = self.revisions.get(index, 0) + 1
+            touched += 1
+        return touched
+
+    def request_json(self, *, session, timeout, method, url, **kwargs):
+        if "catalogs/sitios/all" in url:
+            return [{"id": 36, "nombre": "Geely"}]
+        if "search-ingenieros" in url:
+            return [{"id": EVERGO_USER_ID, "name": "Test Engineer"}]
+        if "catalogs/orden-estatus" in url:
+            return [
+                {"id": 5, "nombre": "Programada"},
+                {"id": 8, "nombre": "Orden concluida"},
+            ]
+        if "ordenes/instalador-coordinador" in url:
+            with self._lock:
+                self.page_requests += 1
+            if self.latency:
+                time.sleep(self.latency)
+            page = int(kwargs.get("params", {}).get("page", 1))
+            last_page = max(1, -(-self.total // self.page_size))
+            start = (page - 1) * self.page_size
+            stop = min(self.total, start + self.page_size)
+            return {
+                "current_page": page,
+                "last_page": last_page,
+                "data": [self.order(index) for index in range(start, stop)],
+            }
+        raise AssertionError(f"Unexpected Evergo URL {url}")
+
+
+def attach_fake_api(profile: EvergoUser, api: FakeEvergoAPI) -> None:
+    """Route ``profile`` requests to ``api`` and skip the login round trip."""
+    profile._request_json = api.request_json
+    profile._login_session = lambda **_: None
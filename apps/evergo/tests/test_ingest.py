@@ -0,0 +1,129 @@
+"""Tests for the page-at-a-time Evergo order ingestion pipeline."""
+
+from __future__ import annotations
+
+import json
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test.utils import override_settings
+
+from apps.evergo.models import (
+    EvergoCustomer,
+    EvergoOrder,
+    EvergoOrderFieldValue,
+    EvergoUser,
+)
+from apps.evergo.tests.helpers import EVERGO_USER_ID, FakeEvergoAPI, attach_fake_api
+
+
+@pytest.fixture
+def profile():
+    owner = get_user_model().objects.create_user(username="evergo-ingest")
+    return EvergoUser.objects.create(
+        user=owner,
+        evergo_email="ingest@evergo.example.com",
+        evergo_password="top-secret",  # noqa: S106
+        evergo_user_id=EVERGO_USER_ID,
+    )
+
+
+@pytest.mark.django_db
+def test_resync_skips_unchanged_orders_and_rewrites_changed_ones(
+    profile, django_assert_max_num_queries
+):
+    api = FakeEvergoAPI(total=40, page_size=20)
+    attach_fake_api(profile, api)
+
+    assert profile.load_orders() == (40, 0)
+    assert EvergoOrder.objects.filter(user=profile).count() == 40
+    assert EvergoCustomer.objects.filter(user=profile).count() == 20
+    order = EvergoOrder.objects.get(remote_id=100003)
+    assert order.estimated_amount is not None
+    assert order.charger_count == 1
+    assert EvergoOrderFieldValue.objects.filter(field_name="payment_by").count() == 2
+
+    # Three catalog upserts, then per page: order prefetch, placeholder check,
+    # customer prefetch and the savepoint pair.
+    with django_assert_max_num_queries(3 + 2 * 5):
+        assert profile.load_orders() == (0, 0)
+
+    api.touch(0.25)
+    assert profile.load_orders() == (0, 10)
+    refreshed = EvergoOrder.objects.get(remote_id=100000)
+    assert refreshed.source_updated_at.minute == 1
+    assert refreshed.charger_count == 1
+
+
+@pytest.mark.django_db
+def test_page_writes_are_batched(profile, django_assert_max_num_queries):
+    api = FakeEvergoAPI(total=200, page_size=200)
+    attach_fake_api(profile, api)
+
+    # Row-by-row upserts needed well over a thousand queries here; batches are
+    # only split by the database's bound-parameter limit.
+    with django_assert_max_num_queries(30):
+        created, _ = profile.load_orders()
+
+    assert created == 200
+
+
+@pytest.mark.django_db
+def test_ingest_keeps_customer_identity_and_replaces_placeholders(profile):
+    api = FakeEvergoAPI(total=2, page_size=2)
+    attach_fake_api(profile, api)
+    placeholder = profile._ensure_placeholder_order(so_number="GLY100000")
+
+    profile.load_orders()
+    customer = EvergoCustomer.objects.get(user=profile, remote_id=500000)
+    public_id = customer.public_id
+
+    api.touch(1)
+    profile.load_orders()
+
+    customer.refresh_from_db()
+    assert customer.public_id == public_id
+    assert customer.latest_so == "GLY100001"
+    assert customer.latest_order.remote_id == 100001
+    assert not EvergoOrder.objects.filter(pk=placeholder.pk).exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_load_orders_reads_every_page_with_and_without_prefetch(profile, prefetch):
+    api = FakeEvergoAPI(total=45, page_size=10)
+    attach_fake_api(profile, api)
+
+    with override_settings(EVERGO_ORDER_PAGE_PREFETCH=prefetch):
+        created, updated = profile.load_orders()
+
+    assert (created, updated) == (45, 0)
+    assert api.page_requests == 5
+
+
+@pytest.mark.django_db
+def test_benchmark_resyncs_only_changed_orders_and_rolls_back():
+    stdout = StringIO()
+
+    call_command(
+        "benchmark",
+        "evergo-sync",
+        "--sizes",
+        "30",
+        "--page-size",
+        "10",
+        "--page-latency-ms",
+        "0",
+        "--json",
+        stdout=stdout,
+    )
+
+    runs = json.loads(stdout.getvalue())["runs"]
+    assert [(run["phase"], run["created"], run["updated"]) for run in runs] == [
+        ("initial", 30, 0),
+        ("unchanged", 0, 0),
+        ("changed_10pct", 0, 3),
+    ]
+    assert not EvergoOrder.objects.exists()
@@ -0,0 +1,374 @@
+"""Benchmark image writing and delivery on local fixtures."""
+
+from __future__ import annotations
+
+import hashlib
+import http.client
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.core.management.base import CommandError
+
+from apps.core.benchmarks import BenchmarkScenario
+from apps.imager.bundles import build_bundle, collect_manifest
+from apps.imager.image_server import ImageHTTPServer
+from apps.imager.services import _should_exclude_suite_bundle_path
+from apps.imager.writer import copy_image, readback_sha256
+
+DEFAULT_SIZES_MB = (64, 256)
+DEFAULT_DATA_RATIO = 0.3
+DEFAULT_IMAGE_MB = 256
+DEFAULT_INTERRUPT_AT = 0.8
+DEFAULT_TREE_FILES = 2000
+FIXTURE_CHUNK = 1024 * 1024
+READ_CHUNK = 1024 * 1024
+
+
+@dataclass
+class WriteRun:
+    size_mb: int
+    implementation: str
+    duration_seconds: float
+    bytes_written: int
+    verified: bool
+
+    @property
+    def mb_per_second(self) -> float:
+        if self.duration_seconds <= 0:
+            return 0.0
+        return self.size_mb / self.duration_seconds
+
+    def to_dict(self) -> dict:
+        return {
+            "size_mb": self.size_mb,
+            "implementation": self.implementation,
+            "duration_seconds": self.duration_seconds,
+            "mb_per_second": self.mb_per_second,
+            "bytes_written": self.bytes_written,
+            "verified": self.verified,
+        }
+
+
+def single_pass_write(
+    source: Path, target: Path, *, size_bytes: int, skip_zero_blocks: bool
+) -> tuple[int, bool]:
+    result = copy_image(
+        source, target, size_bytes=size_bytes, skip_zero_blocks=skip_zero_blocks
+    )
+    return result.bytes_written, result.sha256 == readback_sha256(target, size_bytes=size_bytes)
+
+
+class ImageWriteBenchmark(BenchmarkScenario):
+    help = (
+        "Benchmark the single-pass image writer with and without zero-block "
+        "skipping using sparse image fixtures and loopback target files."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--size-mb",
+            nargs="+",
+            type=int,
+            default=list(DEFAULT_SIZES_MB),
+            help="Fixture image sizes in MiB (default: 64 256).",
+        )
+        parser.add_argument(
+            "--data-ratio",
+            type=float,
+            default=DEFAULT_DATA_RATIO,
+            help="Fraction of 1 MiB chunks that hold data; the rest are holes.",
+        )
+        parser.add_argument(
+            "--workdir",
+            default="",
+            help="Directory for fixtures; defaults to a temporary directory.",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for fixture layout.")
+        parser.add_argument("--json", action="store_true", help="Emit JSON summary output.")
+
+    def handle(self, **options):
+        sizes = sorted(set(options["size_mb"]))
+        if any(value <= 0 for value in sizes):
+            raise CommandError("--size-mb values must be greater than zero.")
+        data_ratio = options["data_ratio"]
+        if not 0.0 <= data_ratio <= 1.0:
+            raise CommandError("--data-ratio must be between 0 and 1.")
+
+        results: list[WriteRun] = []
+        with TemporaryDirectory(dir=options["workdir"] or None) as workdir:
+            for size_mb in sizes:
+                results.extend(
+                    self._run_size(
+                        Path(workdir), size_mb, data_ratio=data_ratio, seed=options["seed"]
+                    )
+                )
+
+        payload = {"data_ratio": data_ratio, "runs": [run.to_dict() for run in results]}
+        if options["json"]:
+            self.stdout.write(json.dumps(payload, indent=2))
+            return
+
+        self.stdout.write("Image write benchmark summary:")
+        for run in results:
+            self.stdout.write(
+                f"  {run.size_mb} MiB {run.implementation}: {run.duration_seconds:.2f}s "
+                f"({run.mb_per_second:.1f} MB/s), {run.bytes_written} bytes written, "
+                f"verified={'yes' if run.verified else 'no'}"
+            )
+
+    def _run_size(
+        self, workdir: Path, size_mb: int, *, data_ratio: float, seed: int
+    ) -> list[WriteRun]:
+        size_bytes = size_mb * FIXTURE_CHUNK
+        source = workdir / f"fixture-{size_mb}.img"
+        self._create_sparse_fixture(source, size_mb, data_ratio=data_ratio, seed=seed)
+
+        implementations = (
+            (
+                "single-pass",
+                lambda target: single_pass_write(
+                    source, target, size_bytes=size_bytes, skip_zero_blocks=False
+                ),
+            ),
+            (
+                "single-pass-skip-zero",
+                lambda target: single_pass_write(
+                    source, target, size_bytes=size_bytes, skip_zero_blocks=True
+                ),
+            ),
+        )
+        results = []
+        for name, write in implementations:
+            target = workdir / f"loop-{size_mb}-{name}.bin"
+            with target.open("wb") as handle:
+                handle.truncate(size_bytes)
+            start = time.perf_counter()
+            bytes_written, verified = write(target)
+            results.append(
+                WriteRun(
+                    size_mb=size_mb,
+                    implementation=name,
+                    duration_seconds=time.perf_counter() - start,
+                    bytes_written=bytes_written,
+                    verified=verified,
+                )
+            )
+            target.unlink()
+        source.unlink()
+        return results
+
+    def _create_sparse_fixture(
+        self, path: Path, size_mb: int, *, data_ratio: float, seed: int
+    ) -> None:
+        rng = random.Random(seed)
+        with path.open("wb") as handle:
+            handle.truncate(size_mb * FIXTURE_CHUNK)
+            for index in range(size_mb):
+                if rng.random() < data_ratio:
+                    handle.seek(index * FIXTURE_CHUNK)
+                    handle.write(rng.randbytes(FIXTURE_CHUNK))
+
+
+@dataclass
+class DeliveryRun:
+    scenario: str
+    implementation: str
+    duration_seconds: float
+    bytes_transferred: int
+    verified: bool
+
+    def to_dict(self) -> dict:
+        return {
+            "scenario": self.scenario,
+            "implementation": self.implementation,
+            "duration_seconds": self.duration_seconds,
+            "bytes_transferred": self.bytes_transferred,
+            "verified": self.verified,
+        }
+
+
+def _download(
+    server: ImageHTTPServer, *, headers: dict[str, str] | None = None, limit: int | None = None
+) -> tuple[int, dict[str, str], bytes]:
+    host, port = server.server_address[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    try:
+        connection.request("GET", f"/{server.filename}", headers=headers or {})
+        response = connection.getresponse()
+        chunks: list[bytes] = []
+        received = 0
+        while limit is None or received < limit:
+            chunk = response.read(READ_CHUNK if limit is None else min(READ_CHUNK, limit - received))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            received += len(chunk)
+        return response.status, dict(response.getheaders()), b"".join(chunks)
+    finally:
+        connection.close()
+
+
+def restarted_download(server: ImageHTTPServer, *, interrupt_at: int) -> tuple[int, bytes]:
+    """Drop the connection part way, then download the whole image again."""
+
+    _status, _headers, partial = _download(server, limit=interrupt_at)
+    _status, _headers, body = _download(server)
+    return len(partial) + len(body), body
+
+
+def resumed_download(server: ImageHTTPServer, *, interrupt_at: int) -> tuple[int, bytes]:
+    """Drop the connection part way, then continue with ``Range``/``If-Range``."""
+
+    _status, headers, partial = _download(server, limit=interrupt_at)
+    status, _headers, rest = _download(
+        server, headers={"Range": f"bytes={len(partial)}-", "If-Range": headers["ETag"]}
+    )
+    if status != 206:
+        raise CommandError(f"Expected a partial response when resuming, got {status}.")
+    return len(partial) + len(rest), partial + rest
+
+
+def cached_bundle(source: Path, cache_dir: Path) -> tuple[int, bool]:
+    manifest = collect_manifest(
+        source,
+        skip_dir=_should_exclude_suite_bundle_path,
+        skip_file=_should_exclude_suite_bundle_path,
+    )
+    bundle = build_bundle(manifest, cache_dir)
+    return bundle.size_bytes, bundle.reused
+
+
+class ImageDeliveryBenchmark(BenchmarkScenario):
+    help = (
+        "Benchmark resumed image downloads against restarted ones, and cold "
+        "against cached suite bundle builds of an unchanged tree."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--image-mb",
+            type=int,
+            default=DEFAULT_IMAGE_MB,
+            help=f"Fixture image size in MiB (default: {DEFAULT_IMAGE_MB}).",
+        )
+        parser.add_argument(
+            "--interrupt-at",
+            type=float,
+            default=DEFAULT_INTERRUPT_AT,
+            help="Fraction of the image received before the simulated disconnect.",
+        )
+        parser.add_argument(
+            "--tree-files",
+            type=int,
+            default=DEFAULT_TREE_FILES,
+            help=f"Files in the synthetic suite tree (default: {DEFAULT_TREE_FILES}).",
+        )
+        parser.add_argument(
+            "--workdir",
+            default="",
+            help="Directory for fixtures; defaults to a temporary directory.",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for fixtures.")
+        parser.add_argument("--json", action="store_true", help="Emit JSON summary output.")
+
+    def handle(self, **options):
+        if options["image_mb"] <= 0:
+            raise CommandError("--image-mb must be greater than zero.")
+        if not 0.0 < options["interrupt_at"] < 1.0:
+            raise CommandError("--interrupt-at must be between 0 and 1.")
+        if options["tree_files"] <= 0:
+            raise CommandError("--tree-files must be greater than zero.")
+
+        rng = random.Random(options["seed"])
+        with TemporaryDirectory(dir=options["workdir"] or None) as workdir:
+            workdir_path = Path(workdir)
+            results = self._run_downloads(
+                workdir_path, options["image_mb"], options["interrupt_at"], rng
+            )
+            results.extend(self._run_bundles(workdir_path, options["tree_files"], rng))
+
+        payload = {
+            "image_mb": options["image_mb"],
+            "interrupt_at": options["interrupt_at"],
+            "tree_files": options["tree_files"],
+            "runs": [run.to_dict() for run in results],
+        }
+        if options["json"]:
+            self.stdout.write(json.dumps(payload, indent=2))
+            return
+
+        self.stdout.write("Image delivery benchmark summary:")
+        for run in results:
+            self.stdout.write(
+                f"  {run.scenario} {run.implementation}: {run.duration_seconds:.3f}s, "
+                f"{run.bytes_transferred} bytes, verified={'yes' if run.verified else 'no'}"
+            )
+
+    def _run_downloads(
+        self, workdir: Path, image_mb: int, interrupt_fraction: float, rng: random.Random
+    ) -> list[DeliveryRun]:
+        image = workdir / "fixture.img"
+        digest = hashlib.sha256()
+        with image.open("wb") as handle:
+            for _index in range(image_mb):
+                chunk = rng.randbytes(FIXTURE_CHUNK)
+                digest.update(chunk)
+                handle.write(chunk)
+        expected = digest.hexdigest()
+        interrupt_at = int(image_mb * FIXTURE_CHUNK * interrupt_fraction)
+
+        results = []
+        with ImageHTTPServer(("127.0.0.1", 0), image, sha256=expected) as server:
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                for name, download in (
+                    ("restart", restarted_download),
+                    ("range-resume", resumed_download),
+                ):
+                    start = time.perf_counter()
+                    transferred, body = download(server, interrupt_at=interrupt_at)
+                    results.append(
+                        DeliveryRun(
+                            scenario="interrupted-download",
+                            implementation=name,
+                            duration_seconds=time.perf_counter() - start,
+                            bytes_transferred=transferred,
+                            verified=hashlib.sha256(body).hexdigest() == expected,
+                        )
+                    )
+            finally:
+                server.shutdown()
+        image.unlink()
+        return results
+
+    def _run_bundles(
+        self, workdir: Path, tree_files: int, rng: random.Random
+    ) -> list[DeliveryRun]:
+        source = workdir / "suite"
+        for index in range(tree_files):
+            path = source / "apps" / f"app{index % 50}" / f"module_{index}.py"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            words = " ".join(f"name_{rng.randrange(500)}" for _ in range(rng.randrange(20, 400)))
+            path.write_text(f'"""Module {index}."""\n\nVALUES = "{words}"\n', encoding="utf-8")
+        cache_dir = workdir / "bundle-cache"
+
+        results = []
+        for name in ("cache-cold", "cache-hit"):
+            start = time.perf_counter()
+            size_bytes, reused = cached_bundle(source, cache_dir)
+            results.append(
+                DeliveryRun(
+                    scenario="unchanged-rebuild",
+                    implementation=name,
+                    duration_seconds=time.perf_counter() - start,
+                    bytes_transferred=size_bytes,
+                    verified=reused == (name == "cache-hit"),
+                )
+            )
+        return results
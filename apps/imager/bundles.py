@@ -0,0 +1,260 @@
+"""Content-addressed cache for the suite source bundle injected into images.
+
+A bundle is keyed by a manifest of every included file's relative path,
+size, mode and modification time. Rebuilding an image from an unchanged tree
+reuses the cached archive without touching file contents; a changed tree is
+archived once and compressed with ``pigz`` across all cores when it is
+installed, falling back to single-threaded :mod:`gzip`.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import stat
+import subprocess
+import tarfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Callable
+
+ARCHIVE_SUFFIX = ".tar.gz"
+METADATA_SUFFIX = ".json"
+CACHE_KEEP = 3
+GZIP_LEVEL = 6
+COPY_CHUNK = 1024 * 1024
+
+PathPredicate = Callable[[PurePosixPath], bool]
+
+
+class BundleError(RuntimeError):
+    """Raised when a bundle cannot be built."""
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    """One file included in a bundle."""
+
+    relative_path: str
+    size: int
+    mode: int
+    mtime_ns: int
+
+
+@dataclass(frozen=True)
+class BundleManifest:
+    """Sorted file listing of a source tree and its digest."""
+
+    source: Path
+    entries: tuple[ManifestEntry, ...]
+
+    @property
+    def digest(self) -> str:
+        digest = hashlib.sha256()
+        for entry in self.entries:
+            digest.update(
+                f"{entry.relative_path}\0{entry.size}\0{entry.mode:o}\0{entry.mtime_ns}\n".encode(
+                    "utf-8", errors="surrogateescape"
+                )
+            )
+        return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class BundleArchive:
+    """Archive produced or reused for a manifest."""
+
+    path: Path
+    sha256: str
+    size_bytes: int
+    file_count: int
+    manifest_digest: str
+    reused: bool
+    compressor: str
+
+
+def collect_manifest(
+    source: Path, *, skip_dir: PathPredicate, skip_file: PathPredicate
+) -> BundleManifest:
+    """Walk ``source`` without following symlinks and list the files to bundle.
+
+    Directories rejected by ``skip_dir`` are not descended into, so large
+    ignored trees such as ``.git`` or virtualenvs cost a single ``stat``.
+    """
+
+    entries: list[ManifestEntry] = []
+    pending = [(source, PurePosixPath())]
+    while pending:
+        directory, relative_dir = pending.pop()
+        with os.scandir(directory) as iterator:
+            for entry in iterator:
+                relative_path = relative_dir / entry.name
+                if entry.is_symlink():
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    if not skip_dir(relative_path):
+                        pending.append((Path(entry.path), relative_path))
+                    continue
+                if not entry.is_file(follow_symlinks=False) or skip_file(relative_path):
+                    continue
+                info = entry.stat(follow_symlinks=False)
+                entries.append(
+                    ManifestEntry(
+                        relative_path=relative_path.as_posix(),
+                        size=info.st_size,
+                        mode=stat.S_IMODE(info.st_mode),
+                        mtime_ns=info.st_mtime_ns,
+                    )
+                )
+    entries.sort(key=lambda item: item.relative_path)
+    return BundleManifest(source=source, entries=tuple(entries))
+
+
+class _HashingWriter:
+    """File sink that hashes and counts everything written through it."""
+
+    def __init__(self, handle: BinaryIO):
+        self.handle = handle
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data) -> int:
+        self.digest.update(data)
+        self.size += len(data)
+        return self.handle.write(data)
+
+    def flush(self) -> None:
+        self.handle.flush()
+
+
+def _write_tar(manifest: BundleManifest, sink) -> None:
+    with tarfile.open(fileobj=sink, mode="w|", format=tarfile.PAX_FORMAT) as archive:
+        for entry in manifest.entries:
+            archive.add(
+                manifest.source / entry.relative_path,
+                arcname=entry.relative_path,
+                recursive=False,
+            )
+
+
+def _pigz_command() -> list[str] | None:
+    pigz = shutil.which("pigz")
+    if not pigz:
+        return None
+    return [pigz, f"-{GZIP_LEVEL}", "-c", "-p", str(max(os.cpu_count() or 1, 1))]
+
+
+def _compress_with_pigz(command: list[str], manifest: BundleManifest, output: _HashingWriter) -> None:
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    errors: list[BaseException] = []
+
+    def feed() -> None:
+        try:
+            _write_tar(manifest, process.stdin)
+        except BaseException as exc:  # pragma: no cover - surfaced below
+            errors.append(exc)
+        finally:
+            process.stdin.close()
+
+    feeder = threading.Thread(target=feed, name="bundle-tar", daemon=True)
+    feeder.start()
+    for chunk in iter(lambda: process.stdout.read(COPY_CHUNK), b""):
+        output.write(chunk)
+    feeder.join()
+    return_code = process.wait()
+    if errors:
+        raise BundleError(f"Could not archive suite source: {errors[0]}") from errors[0]
+    if return_code != 0:
+        raise BundleError(f"pigz exited with status {return_code}")
+
+
+def _compress_with_gzip(manifest: BundleManifest, output: _HashingWriter) -> None:
+    with gzip.GzipFile(fileobj=output, mode="wb", compresslevel=GZIP_LEVEL, mtime=0) as sink:
+        _write_tar(manifest, sink)
+
+
+def _prune_cache(cache_dir: Path, current: Path, *, keep: int) -> None:
+    archives = sorted(
+        (path for path in cache_dir.glob(f"*{ARCHIVE_SUFFIX}") if path != current),
+        key=lambda path: path.stat().st_mtime_ns,
+        reverse=True,
+    )
+    for archive in archives[max(keep - 1, 0) :]:
+        archive.unlink(missing_ok=True)
+        archive.with_name(archive.name[: -len(ARCHIVE_SUFFIX)] + METADATA_SUFFIX).unlink(
+            missing_ok=True
+        )
+
+
+def build_bundle(
+    manifest: BundleManifest,
+    cache_dir: Path,
+    *,
+    keep: int = CACHE_KEEP,
+    use_pigz: bool = True,
+) -> BundleArchive:
+    """Return the cached archive for ``manifest``, building it when missing."""
+
+    digest = manifest.digest
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    archive_path = cache_dir / f"{digest}{ARCHIVE_SUFFIX}"
+    metadata_path = cache_dir / f"{digest}{METADATA_SUFFIX}"
+
+    if archive_path.is_file() and metadata_path.is_file():
+        try:
+            metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            metadata = {}
+        if metadata.get("size_bytes") == archive_path.stat().st_size and metadata.get("sha256"):
+            os.utime(archive_path)
+            return BundleArchive(
+                path=archive_path,
+                sha256=str(metadata["sha256"]),
+                size_bytes=int(metadata["size_bytes"]),
+                file_count=len(manifest.entries),
+                manifest_digest=digest,
+                reused=True,
+                compressor=str(metadata.get("compressor") or ""),
+            )
+
+    command = _pigz_command() if use_pigz else None
+    partial_path = archive_path.with_name(f".{archive_path.name}.{os.getpid()}.partial")
+    try:
+        with partial_path.open("wb") as handle:
+            output = _HashingWriter(handle)
+            if command:
+                _compress_with_pigz(command, manifest, output)
+            else:
+                _compress_with_gzip(manifest, output)
+        os.replace(partial_path, archive_path)
+    except (OSError, tarfile.TarError) as exc:
+        raise BundleError(f"Could not archive suite source: {exc}") from exc
+    finally:
+        partial_path.unlink(missing_ok=True)
+
+    compressor = "pigz" if command else "gzip"
+    metadata_path.write_text(
+        json.dumps(
+            {
+                "sha256": output.digest.hexdigest(),
+                "size_bytes": output.size,
+                "file_count": len(manifest.entries),
+                "compressor": compressor,
+            }
+        ),
+        encoding="utf-8",
+    )
+    _prune_cache(cache_dir, archive_path, keep=keep)
+    return BundleArchive(
+        path=archive_path,
+        sha256=output.digest.hexdigest(),
+        size_bytes=output.size,
+        file_count=len(manifest.entries),
+        manifest_digest=digest,
+        reused=False,
+        compressor=compressor,
+    )
@@ -0,0 +1,255 @@
+"""HTTP delivery of a single image artifact to flashing clients.
+
+Responses carry ``ETag``/``Last-Modified`` validators, honour single byte
+ranges (with ``If-Range``) so interrupted downloads resume where they stopped,
+and stream bodies with :meth:`socket.socket.sendfile` so image bytes go from
+the page cache to the socket without passing through Python. The number of
+simultaneously connected clients is bounded; extra clients get ``503`` with
+``Retry-After`` instead of slowing every transfer down.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+DEFAULT_MAX_CLIENTS = 4
+RETRY_AFTER_SECONDS = 30
+IDLE_TIMEOUT_SECONDS = 60
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(ValueError):
+    """Raised when a syntactically valid range lies outside the file."""
+
+
+@dataclass(frozen=True)
+class ImageValidators:
+    """Cache validators for the served file at a point in time."""
+
+    size: int
+    mtime_ns: int
+    etag: str
+    last_modified: str
+    sha256: str
+
+
+def parse_byte_range(header: str, size: int) -> tuple[int, int] | None:
+    """Return the inclusive ``(start, end)`` of a single-range ``Range`` header.
+
+    ``None`` means the header should be ignored and the full file served:
+    it is absent, malformed, or asks for several ranges.
+
+    Raises:
+        RangeNotSatisfiable: If the range starts at or beyond ``size``.
+    """
+
+    match = _RANGE_PATTERN.match((header or "").strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise RangeNotSatisfiable(header)
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    end = int(last) if last else size - 1
+    return start, min(end, size - 1)
+
+
+class ImageHTTPServer(ThreadingHTTPServer):
+    """Threaded server for one image file with a bounded client pool."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        server_address: tuple[str, int],
+        image_path: Path,
+        *,
+        sha256: str = "",
+        max_clients: int = DEFAULT_MAX_CLIENTS,
+    ):
+        self.image_path = Path(image_path).resolve()
+        self.filename = self.image_path.name
+        self.max_clients = max(int(max_clients), 1)
+        self.client_slots = threading.BoundedSemaphore(self.max_clients)
+        self.stats: Counter = Counter()
+        self._stats_lock = threading.Lock()
+        info = self.image_path.stat()
+        self._checksum = (info.st_size, info.st_mtime_ns, sha256.strip().lower())
+        super().__init__(server_address, ImageRequestHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        host = f"[{host}]" if ":" in host else host
+        return f"http://{host}:{port}/{self.filename}"
+
+    def record(self, key: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def validators(self) -> ImageValidators:
+        """Return validators for the current file contents.
+
+        The checksum supplied at start-up is only trusted while the file keeps
+        the size and mtime it had then.
+        """
+
+        info = self.image_path.stat()
+        known_size, known_mtime_ns, known_sha256 = self._checksum
+        sha256 = (
+            known_sha256
+            if known_sha256 and (info.st_size, info.st_mtime_ns) == (known_size, known_mtime_ns)
+            else ""
+        )
+        etag = f'"{sha256}"' if sha256 else f'"{info.st_size:x}-{info.st_mtime_ns:x}"'
+        return ImageValidators(
+            size=info.st_size,
+            mtime_ns=info.st_mtime_ns,
+            etag=etag,
+            last_modified=formatdate(info.st_mtime_ns / 1e9, usegmt=True),
+            sha256=sha256,
+        )
+
+
+class ImageRequestHandler(BaseHTTPRequestHandler):
+    """Serve ``GET``/``HEAD`` for the image owned by :class:`ImageHTTPServer`."""
+
+    protocol_version = "HTTP/1.1"
+    timeout = IDLE_TIMEOUT_SECONDS
+    server: ImageHTTPServer
+
+    def handle(self) -> None:
+        self.has_slot = self.server.client_slots.acquire(blocking=False)
+        try:
+            super().handle()
+        finally:
+            if self.has_slot:
+                self.server.client_slots.release()
+
+    def do_HEAD(self) -> None:  # noqa: N802
+        self._send_image(include_body=False)
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._send_image(include_body=True)
+
+    def log_message(self, _format: str, *args: object) -> None:
+        return
+
+    def _send_image(self, *, include_body: bool) -> None:
+        server = self.server
+        server.record("requests")
+        if not self.has_slot:
+            server.record("rejected")
+            self.close_connection = True
+            self.send_response(503)
+            self.send_header("Retry-After", str(RETRY_AFTER_SECONDS))
+            self.send_header("Content-Length", "0")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            return
+
+        requested_name = Path(unquote(urlparse(self.path).path).lstrip("/")).name
+        if requested_name != server.filename:
+            self.send_error(404, "Image artifact not found")
+            return
+
+        try:
+            handle = server.image_path.open("rb")
+        except OSError:
+            self.send_error(404, "Image artifact not found")
+            return
+        with handle:
+            validators = server.validators()
+            if self._not_modified(validators):
+                server.record("not_modified")
+                self.send_response(304)
+                self._send_validators(validators)
+                self.end_headers()
+                return
+
+            byte_range = None
+            if self._range_applies(validators):
+                try:
+                    byte_range = parse_byte_range(self.headers.get("Range", ""), validators.size)
+                except RangeNotSatisfiable:
+                    server.record("unsatisfiable")
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{validators.size}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+            if byte_range is None:
+                offset, length = 0, validators.size
+                self.send_response(200)
+            else:
+                offset, length = byte_range[0], byte_range[1] - byte_range[0] + 1
+                server.record("partial")
+                self.send_response(206)
+                self.send_header(
+                    "Content-Range", f"bytes {byte_range[0]}-{byte_range[1]}/{validators.size}"
+                )
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(length))
+            self.send_header("Content-Disposition", f'attachment; filename="{server.filename}"')
+            self._send_validators(validators)
+            self.end_headers()
+            if include_body and length:
+                self._send_body(handle, offset, length)
+
+    def _send_validators(self, validators: ImageValidators) -> None:
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", validators.etag)
+        self.send_header("Last-Modified", validators.last_modified)
+        if validators.sha256:
+            self.send_header("X-Checksum-Sha256", validators.sha256)
+
+    def _not_modified(self, validators: ImageValidators) -> bool:
+        if_none_match = self.headers.get("If-None-Match")
+        if not if_none_match:
+            return False
+        candidates = {
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",") if tag.strip()
+        }
+        return "*" in candidates or validators.etag in candidates
+
+    def _range_applies(self, validators: ImageValidators) -> bool:
+        if "Range" not in self.headers:
+            return False
+        if_range = (self.headers.get("If-Range") or "").strip()
+        if not if_range:
+            return True
+        # If-Range needs a strong match; otherwise the client gets the whole,
+        # current file instead of a splice of two versions.
+        if if_range.startswith('"'):
+            return if_range == validators.etag
+        return if_range == validators.last_modified
+
+    def _send_body(self, handle, offset: int, length: int) -> None:
+        try:
+            sent = self.connection.sendfile(handle, offset, length)
+        except (BrokenPipeError, ConnectionResetError, TimeoutError):
+            self.close_connection = True
+            return
+        self.server.record("bytes_sent", sent)
+        if sent != length:
+            # The file shrank under us; the declared length can't be honoured.
+            self.close_connection = True
+
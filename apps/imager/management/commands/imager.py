@@ -6,6 +6,7 @@ from pathlib import Path
 from django.core.management.base import BaseCommand, CommandError
 from django.utils.translation import gettext as _
 
+from apps.imager.image_server import DEFAULT_MAX_CLIENTS
 from apps.imager.models import RaspberryPiImageArtifact
 from apps.imager.reservations import (
     DEFAULT_RESERVATION_PORTS,
@@ -27,6 +28,7 @@ from apps.imager.services import (
     test_rpi_access,
     write_image_to_device,
 )
+from apps.imager.writer import WriteProgress
 
 
 class Command(BaseCommand):
@@ -217,6 +219,16 @@ class Command(BaseCommand):
             action="store_true",
             help="Confirm destructive write operation.",
         )
+        write_parser.add_argument(
+            "--skip-zero-blocks",
+            action="store_true",
+            help="Seek past all-zero blocks; only for targets already zeroed (for example after blkdiscard).",
+        )
+        write_parser.add_argument(
+            "--direct-io",
+            action="store_true",
+            help="Bypass the page cache with O_DIRECT when the platform supports it.",
+        )
 
         serve_parser = subparsers.add_parser(
             "serve",
@@ -245,6 +257,15 @@ class Command(BaseCommand):
             action="store_true",
             help="Do not persist the generated URL on the artifact record.",
         )
+        serve_parser.add_argument(
+            "--max-clients",
+            type=int,
+            default=DEFAULT_MAX_CLIENTS,
+            help=(
+                "Maximum simultaneous download clients; extra clients are asked to retry "
+                f"(default: {DEFAULT_MAX_CLIENTS})."
+            ),
+        )
 
         access_parser = subparsers.add_parser(
             "test-access",
@@ -513,16 +534,30 @@ class Command(BaseCommand):
                 artifact_name=artifact_name,
                 image_path=image_path,
                 confirmed=bool(options["yes"]),
+                skip_zero_blocks=bool(options.get("skip_zero_blocks")),
+                direct_io=bool(options.get("direct_io")),
+                progress=self._report_write_progress,
             )
         except ImagerBuildError as exc:
             raise CommandError(str(exc)) from exc
 
         self.stdout.write(self.style.SUCCESS(f"Wrote {result.image_path} -> {result.device_path}"))
         self.stdout.write(f"size_bytes={result.size_bytes}")
+        self.stdout.write(f"bytes_skipped={result.bytes_skipped}")
+        self.stdout.write(f"throughput_mb_s={result.mb_per_second:.1f}")
         self.stdout.write(f"source_sha256={result.source_sha256}")
         self.stdout.write(f"written_sha256={result.written_sha256}")
         self.stdout.write(f"verified={'yes' if result.verified else 'no'}")
 
+    def _report_write_progress(self, progress: WriteProgress) -> None:
+        """Print write progress with the current throughput."""
+
+        self.stdout.write(
+            f"progress={progress.percent:.1f}% "
+            f"{progress.bytes_done // (1024 * 1024)}/{progress.bytes_total // (1024 * 1024)} MB "
+            f"{progress.mb_per_second:.1f} MB/s"
+        )
+
     def _handle_serve(self, options: dict[str, object]) -> None:
         """Serve an image artifact over HTTP for deployment workflows."""
 
@@ -548,7 +583,13 @@ class Command(BaseCommand):
         self.stdout.write(f"artifact_url={result.url}")
         self.stdout.write("Press Ctrl+C to stop serving.")
         try:
-            serve_image_file(image_path=result.image_path, host=result.host, port=result.port)
+            serve_image_file(
+                image_path=result.image_path,
+                host=result.host,
+                port=result.port,
+                sha256=result.sha256,
+                max_clients=int(options["max_clients"]),
+            )
         except KeyboardInterrupt:
             self.stdout.write("Stopped image server.")
         except OSError as exc:
@@ -13,11 +13,9 @@ import shlex
 import shutil
 import socket
 import subprocess
-import tarfile
 import zipfile
 from dataclasses import dataclass
-from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
-from pathlib import Path, PurePosixPath
+from pathlib import Path, PurePath, PurePosixPath
 from tempfile import TemporaryDirectory
 from urllib.error import HTTPError, URLError
 from urllib.parse import ParseResult, quote, unquote, urljoin, urlparse
@@ -29,7 +27,10 @@ from django.conf import settings
 from django.db import transaction
 from django.utils import timezone
 
+from apps.imager.bundles import BundleError, build_bundle, collect_manifest
+from apps.imager.image_server import DEFAULT_MAX_CLIENTS, ImageHTTPServer
 from apps.imager.models import RaspberryPiImageArtifact
+from apps.imager.writer import ImageWriteError, ProgressCallback, copy_image, readback_sha256
 from apps.imager.reservations import (
     RESERVATION_ENV_PATH,
     RESERVATION_JSON_PATH,
@@ -401,6 +402,15 @@ class WriteResult:
     source_sha256: str
     written_sha256: str
     verified: bool
+    bytes_skipped: int = 0
+    elapsed_seconds: float = 0.0
+    direct_io: bool = False
+
+    @property
+    def mb_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.size_bytes / self.elapsed_seconds / (1024 * 1024)
 
 
 @dataclass(frozen=True)
@@ -412,6 +422,8 @@ class SuiteBundleInfo:
     sha256: str
     size_bytes: int
     file_count: int
+    archive_path: Path | None = None
+    reused: bool = False
 
 
 @dataclass(frozen=True)
@@ -441,6 +453,7 @@ class ServeResult:
     url: str
     host: str
     port: int
+    sha256: str = ""
 
 
 @dataclass(frozen=True)
@@ -629,23 +642,6 @@ def _sha256_for_file(path: Path) -> str:
     return digest.hexdigest()
 
 
-def _sha256_for_prefix(path: Path, *, size_bytes: int) -> str:
-    """Compute SHA-256 for the first ``size_bytes`` bytes of a file/device."""
-
-    digest = hashlib.sha256()
-    remaining = size_bytes
-    with path.open("rb") as handle:
-        while remaining > 0:
-            chunk = handle.read(min(1024 * 1024, remaining))
-            if not chunk:
-                break
-            digest.update(chunk)
-            remaining -= len(chunk)
-    if remaining != 0:
-        raise ImagerBuildError(f"Could not read expected {size_bytes} bytes from {path}.")
-    return digest.hexdigest()
-
-
 def _ensure_guestfish() -> None:
     """Ensure guestfish is available for image customization."""
 
@@ -671,7 +667,7 @@ def normalize_recovery_authorized_key_line(line: str) -> str | None:
     return normalized
 
 
-def _should_exclude_suite_bundle_path(relative_path: Path) -> bool:
+def _should_exclude_suite_bundle_path(relative_path: PurePath) -> bool:
     """Return whether a repo path should be excluded from the static image bundle."""
 
     parts = relative_path.parts
@@ -685,8 +681,21 @@ def _should_exclude_suite_bundle_path(relative_path: Path) -> bool:
     return name == ".envrc" or name.startswith(".env.") or name.endswith((".env", ".pyc", ".pyo"))
 
 
-def _create_suite_bundle(source_path: Path, archive_path: Path) -> SuiteBundleInfo:
-    """Create a sanitized tarball of the suite source for image injection."""
+def _suite_bundle_cache_dir() -> Path:
+    """Return the directory holding content-addressed suite bundles."""
+
+    configured = getattr(settings, "IMAGER_SUITE_BUNDLE_CACHE_DIR", None)
+    if configured:
+        return Path(configured).expanduser()
+    return Path(settings.BASE_DIR) / "work" / "imager" / "suite-bundles"
+
+
+def _create_suite_bundle(source_path: Path, cache_dir: Path | None = None) -> SuiteBundleInfo:
+    """Return a sanitized tarball of the suite source for image injection.
+
+    The archive is reused from ``cache_dir`` when no bundled file changed
+    since it was built.
+    """
 
     source = source_path.expanduser().resolve()
     if not source.is_dir():
@@ -695,26 +704,26 @@ def _create_suite_bundle(source_path: Path, archive_path: Path) -> SuiteBundleIn
         if not (source / required_file).is_file():
             raise ImagerBuildError(f"Suite source path is missing required file: {required_file}")
 
-    archive_path.parent.mkdir(parents=True, exist_ok=True)
-    file_count = 0
-    with tarfile.open(archive_path, "w:gz") as archive:
-        for path in sorted(source.rglob("*")):
-            if path.is_symlink() or not path.is_file():
-                continue
-            relative_path = path.relative_to(source)
-            if _should_exclude_suite_bundle_path(relative_path):
-                continue
-            archive.add(path, arcname=relative_path.as_posix(), recursive=False)
-            file_count += 1
-    if file_count == 0:
+    manifest = collect_manifest(
+        source,
+        skip_dir=_should_exclude_suite_bundle_path,
+        skip_file=_should_exclude_suite_bundle_path,
+    )
+    if not manifest.entries:
         raise ImagerBuildError(f"Suite source path did not contain any bundleable files: {source}")
+    try:
+        bundle = build_bundle(manifest, cache_dir or _suite_bundle_cache_dir())
+    except (BundleError, OSError) as exc:
+        raise ImagerBuildError(str(exc)) from exc
 
     return SuiteBundleInfo(
         source_path=source,
         remote_path=SUITE_BUNDLE_REMOTE_PATH,
-        sha256=_sha256_for_file(archive_path),
-        size_bytes=archive_path.stat().st_size,
-        file_count=file_count,
+        sha256=bundle.sha256,
+        size_bytes=bundle.size_bytes,
+        file_count=bundle.file_count,
+        archive_path=bundle.path,
+        reused=bundle.reused,
     )
 
 
@@ -1248,14 +1257,13 @@ def _customize_image(
                 error_message="guestfish failed while injecting reserved node metadata",
             )
         if suite_source_path is not None:
-            suite_bundle = work_dir / "arthexis-suite.tar.gz"
-            suite_bundle_info = _create_suite_bundle(suite_source_path, suite_bundle)
+            suite_bundle_info = _create_suite_bundle(suite_source_path)
             _guestfish_run_commands(
                 image_path,
                 [
                     _guestfish_mkdir_p_command(str(PurePosixPath(SUITE_BUNDLE_REMOTE_PATH).parent)),
                     *_guestfish_upload_commands(
-                        suite_bundle,
+                        suite_bundle_info.archive_path,
                         SUITE_BUNDLE_REMOTE_PATH,
                         chmod_mode="0644",
                     ),
@@ -1489,40 +1497,27 @@ def prepare_image_serve(
         url=artifact_url,
         host=host,
         port=port,
+        sha256=artifact.sha256 if artifact is not None else "",
     )
 
 
-def serve_image_file(*, image_path: Path, host: str, port: int) -> None:
-    """Serve a single image file over HTTP until interrupted."""
-
-    image = image_path.resolve()
-    filename = image.name
-
-    class SingleImageHandler(BaseHTTPRequestHandler):
-        def do_HEAD(self) -> None:  # noqa: N802
-            self._send_file(include_body=False)
-
-        def do_GET(self) -> None:  # noqa: N802
-            self._send_file(include_body=True)
-
-        def _send_file(self, *, include_body: bool) -> None:
-            requested_name = Path(unquote(urlparse(self.path).path).lstrip("/")).name
-            if requested_name != filename:
-                self.send_error(404, "Image artifact not found")
-                return
-            self.send_response(200)
-            self.send_header("Content-Type", "application/octet-stream")
-            self.send_header("Content-Length", str(image.stat().st_size))
-            self.send_header("Content-Disposition", f'attachment; filename="{filename}"')
-            self.end_headers()
-            if include_body:
-                with image.open("rb") as handle:
-                    shutil.copyfileobj(handle, self.wfile, length=1024 * 1024)
+def serve_image_file(
+    *,
+    image_path: Path,
+    host: str,
+    port: int,
+    sha256: str = "",
+    max_clients: int = DEFAULT_MAX_CLIENTS,
+) -> None:
+    """Serve a single image file over HTTP until interrupted.
 
-        def log_message(self, _format: str, *args: object) -> None:
-            return
+    See :mod:`apps.imager.image_server` for range, validator and client-limit
+    behaviour.
+    """
 
-    with ThreadingHTTPServer((host, port), SingleImageHandler) as server:
+    with ImageHTTPServer(
+        (host, port), image_path, sha256=sha256, max_clients=max_clients
+    ) as server:
         server.serve_forever()
 
 
@@ -1869,8 +1864,17 @@ def write_image_to_device(
     artifact_name: str = "",
     image_path: str = "",
     confirmed: bool = False,
+    skip_zero_blocks: bool = False,
+    direct_io: bool = False,
+    progress: ProgressCallback | None = None,
 ) -> WriteResult:
-    """Write an artifact/local image to a block device with safety checks and verification."""
+    """Write an artifact/local image to a block device with safety checks and verification.
+
+    The image is hashed while it is copied and verified with one streamed
+    readback. ``skip_zero_blocks`` seeks past all-zero blocks and is only safe
+    on targets that already read back as zeros; verification catches targets
+    that do not.
+    """
 
     if bool(artifact_name) == bool(image_path):
         raise ImagerBuildError("Provide exactly one of artifact_name or image_path.")
@@ -1904,12 +1908,19 @@ def write_image_to_device(
         confirmed=confirmed,
     )
 
-    source_hash = _sha256_for_file(source_path)
-    with source_path.open("rb") as source_handle, open(device_path, "r+b", buffering=0) as device_handle:
-        shutil.copyfileobj(source_handle, device_handle, length=1024 * 1024 * 4)
-        device_handle.flush()
-        os.fsync(device_handle.fileno())
-    write_hash = _sha256_for_prefix(Path(device_path), size_bytes=source_size)
+    try:
+        copy_result = copy_image(
+            source_path,
+            Path(device_path),
+            size_bytes=source_size,
+            skip_zero_blocks=skip_zero_blocks,
+            direct_io=direct_io,
+            progress=progress,
+        )
+        write_hash = readback_sha256(Path(device_path), size_bytes=source_size)
+    except ImageWriteError as exc:
+        raise ImagerBuildError(f"Write to '{device_path}' failed: {exc}") from exc
+    source_hash = copy_result.sha256
     verified = source_hash == write_hash
     if not verified:
         raise ImagerBuildError(f"Verification failed for '{device_path}': checksum mismatch after write.")
@@ -1922,6 +1933,7 @@ def write_image_to_device(
                 "source_path": str(source_path),
                 "size_bytes": source_size,
                 "sha256": source_hash,
+                "bytes_skipped": copy_result.bytes_skipped,
                 "verified": True,
                 "verified_at": timezone.now().isoformat(),
             },
@@ -1935,6 +1947,9 @@ def write_image_to_device(
         source_sha256=source_hash,
         written_sha256=write_hash,
         verified=verified,
+        bytes_skipped=copy_result.bytes_skipped,
+        elapsed_seconds=copy_result.elapsed_seconds,
+        direct_io=copy_result.direct_io,
     )
 
 
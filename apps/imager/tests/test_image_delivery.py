@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import hashlib
+import http.client
+import io
+import json
+import os
+import tarfile
+import threading
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+from apps.imager import bundles
+from apps.imager.bundles import build_bundle, collect_manifest
+from apps.imager.image_server import ImageHTTPServer, RangeNotSatisfiable, parse_byte_range
+from apps.imager.services import _create_suite_bundle, _should_exclude_suite_bundle_path
+
+PAYLOAD = bytes(range(256)) * 64
+
+
+@pytest.fixture
+def image_server(tmp_path: Path):
+    image = tmp_path / "stable-rpi-4b.img"
+    image.write_bytes(PAYLOAD)
+    servers = []
+
+    def start(**kwargs) -> ImageHTTPServer:
+        server = ImageHTTPServer(("127.0.0.1", 0), image, **kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _request(server: ImageHTTPServer, method: str = "GET", headers: dict | None = None):
+    connection = http.client.HTTPConnection(*server.server_address[:2], timeout=10)
+    connection.request(method, f"/{server.filename}", headers=headers or {})
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response, body
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("bytes=0-9", (0, 9)),
+        ("bytes=100-", (100, len(PAYLOAD) - 1)),
+        ("bytes=-10", (len(PAYLOAD) - 10, len(PAYLOAD) - 1)),
+        ("bytes=10-999999", (10, len(PAYLOAD) - 1)),
+        ("bytes=0-1,5-6", None),
+        ("items=0-1", None),
+    ],
+)
+def test_parse_byte_range(header: str, expected) -> None:
+    assert parse_byte_range(header, len(PAYLOAD)) == expected
+
+
+def test_parse_byte_range_rejects_ranges_past_the_end() -> None:
+    with pytest.raises(RangeNotSatisfiable):
+        parse_byte_range(f"bytes={len(PAYLOAD)}-", len(PAYLOAD))
+
+
+def test_range_request_returns_partial_content(image_server) -> None:
+    server = image_server(sha256=hashlib.sha256(PAYLOAD).hexdigest())
+
+    full, _body = _request(server, "HEAD")
+    partial, body = _request(
+        server, headers={"Range": "bytes=1000-", "If-Range": full.getheader("ETag")}
+    )
+
+    assert full.getheader("Accept-Ranges") == "bytes"
+    assert full.getheader("Content-Length") == str(len(PAYLOAD))
+    assert full.getheader("X-Checksum-Sha256") == hashlib.sha256(PAYLOAD).hexdigest()
+    assert partial.status == 206
+    assert partial.getheader("Content-Range") == f"bytes 1000-{len(PAYLOAD) - 1}/{len(PAYLOAD)}"
+    assert body == PAYLOAD[1000:]
+
+
+def test_stale_if_range_serves_the_whole_file(image_server) -> None:
+    server = image_server()
+
+    response, body = _request(server, headers={"Range": "bytes=10-", "If-Range": '"stale"'})
+
+    assert response.status == 200
+    assert body == PAYLOAD
+
+
+def test_unsatisfiable_range_and_not_modified(image_server) -> None:
+    server = image_server()
+
+    unsatisfiable, _body = _request(server, headers={"Range": f"bytes={len(PAYLOAD) + 1}-"})
+    etag = _request(server, "HEAD")[0].getheader("ETag")
+    cached, body = _request(server, headers={"If-None-Match": etag})
+
+    assert unsatisfiable.status == 416
+    assert unsatisfiable.getheader("Content-Range") == f"bytes */{len(PAYLOAD)}"
+    assert cached.status == 304
+    assert body == b""
+
+
+def test_checksum_is_dropped_when_the_image_changes(image_server, tmp_path: Path) -> None:
+    server = image_server(sha256=hashlib.sha256(PAYLOAD).hexdigest())
+    image = tmp_path / "stable-rpi-4b.img"
+    image.write_bytes(PAYLOAD[::-1] + b"x")
+
+    response, _body = _request(server, "HEAD")
+
+    assert response.getheader("X-Checksum-Sha256") is None
+    assert hashlib.sha256(PAYLOAD).hexdigest() not in response.getheader("ETag")
+
+
+def test_extra_clients_are_asked_to_retry(image_server) -> None:
+    server = image_server(max_clients=1)
+    holder = http.client.HTTPConnection(*server.server_address[:2], timeout=10)
+    holder.request("HEAD", f"/{server.filename}")
+    holder.getresponse().read()
+
+    rejected, _body = _request(server)
+    holder.close()
+
+    assert rejected.status == 503
+    assert rejected.getheader("Retry-After")
+    assert server.stats["rejected"] == 1
+
+
+def _tree(root: Path) -> Path:
+    for name in ("manage.py", "start.sh", "env-refresh.sh"):
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_text("#!/usr/bin/env bash\n", encoding="utf-8")
+    (root / "apps" / "core").mkdir(parents=True)
+    (root / "apps" / "core" / "models.py").write_text("VALUE = 1\n", encoding="utf-8")
+    (root / "apps" / "core" / "__pycache__").mkdir()
+    (root / "apps" / "core" / "__pycache__" / "models.pyc").write_bytes(b"\0")
+    (root / ".git").mkdir()
+    (root / ".git" / "HEAD").write_text("ref: refs/heads/main\n", encoding="utf-8")
+    return root
+
+
+def test_unchanged_tree_reuses_cached_bundle(tmp_path: Path) -> None:
+    source = _tree(tmp_path / "suite")
+    cache_dir = tmp_path / "cache"
+
+    first = _create_suite_bundle(source, cache_dir)
+    second = _create_suite_bundle(source, cache_dir)
+
+    assert (first.reused, second.reused) == (False, True)
+    assert second.archive_path == first.archive_path
+    assert second.sha256 == hashlib.sha256(first.archive_path.read_bytes()).hexdigest()
+    with tarfile.open(first.archive_path, "r:gz") as archive:
+        assert sorted(archive.getnames()) == [
+            "apps/core/models.py",
+            "env-refresh.sh",
+            "manage.py",
+            "start.sh",
+        ]
+
+
+def test_changed_tree_builds_a_new_bundle_and_prunes_old_ones(tmp_path: Path) -> None:
+    source = _tree(tmp_path / "suite")
+    cache_dir = tmp_path / "cache"
+    models = source / "apps" / "core" / "models.py"
+    archives = []
+
+    for value in range(3):
+        models.write_text(f"VALUE = {value}\n", encoding="utf-8")
+        os.utime(models, ns=(value * 10**9, value * 10**9))
+        manifest = collect_manifest(
+            source,
+            skip_dir=_should_exclude_suite_bundle_path,
+            skip_file=_should_exclude_suite_bundle_path,
+        )
+        archives.append(build_bundle(manifest, cache_dir, keep=2))
+
+    assert len({archive.manifest_digest for archive in archives}) == 3
+    assert not any(archive.reused for archive in archives)
+    assert sorted(cache_dir.glob("*.tar.gz")) == sorted(archive.path for archive in archives[1:])
+    with tarfile.open(archives[-1].path, "r:gz") as archive:
+        member = archive.extractfile("apps/core/models.py")
+        assert member is not None and member.read() == b"VALUE = 2\n"
+
+
+def test_bundle_uses_pigz_when_available(tmp_path: Path, monkeypatch) -> None:
+    source = _tree(tmp_path / "suite")
+    commands = []
+
+    def fake_pigz(command, manifest, output):
+        commands.append(command)
+        bundles._compress_with_gzip(manifest, output)
+
+    monkeypatch.setattr(bundles, "_pigz_command", lambda: ["pigz", "-c"])
+    monkeypatch.setattr(bundles, "_compress_with_pigz", fake_pigz)
+    manifest = collect_manifest(
+        source,
+        skip_dir=_should_exclude_suite_bundle_path,
+        skip_file=_should_exclude_suite_bundle_path,
+    )
+
+    archive = build_bundle(manifest, tmp_path / "cache")
+
+    assert commands == [["pigz", "-c"]]
+    assert archive.compressor == "pigz"
+    with tarfile.open(fileobj=io.BytesIO(archive.path.read_bytes()), mode="r:gz") as tar:
+        assert "manage.py" in tar.getnames()
+
+
+def test_benchmark_image_delivery_reports_json(tmp_path: Path) -> None:
+    stdout = StringIO()
+
+    call_command(
+        "benchmark",
+        "image-delivery",
+        "--image-mb",
+        "2",
+        "--tree-files",
+        "20",
+        "--workdir",
+        str(tmp_path),
+        "--json",
+        stdout=stdout,
+    )
+
+    runs = {
+        (run["scenario"], run["implementation"]): run
+        for run in json.loads(stdout.getvalue())["runs"]
+    }
+    assert all(run["verified"] for run in runs.values())
+    assert (
+        runs[("interrupted-download", "range-resume")]["bytes_transferred"]
+        < runs[("interrupted-download", "restart")]["bytes_transferred"]
+    )
+    assert ("unchanged-rebuild", "cache-hit") in runs
@@ -1175,6 +1175,7 @@ def test_customize_image_writes_suite_bundle_and_selected_network_profiles(tmp_p
         guestfish_batches.append(commands)
 
     with (
+        override_settings(IMAGER_SUITE_BUNDLE_CACHE_DIR=tmp_path / "suite-bundles"),
         patch("apps.imager.services._ensure_guestfish"),
         patch("apps.imager.services._guestfish_run_commands", side_effect=capture_guestfish),
     ):
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+from apps.imager import writer
+from apps.imager.writer import ImageWriteError, copy_image, readback_sha256
+
+BLOCK = 64 * 1024
+
+
+def _sparse_image(path: Path, *, blocks: int, data_blocks: set[int]) -> bytes:
+    with path.open("wb") as handle:
+        handle.truncate(blocks * BLOCK)
+        for index in sorted(data_blocks):
+            handle.seek(index * BLOCK)
+            handle.write(bytes([index + 1]) * BLOCK)
+    return path.read_bytes()
+
+
+def _blank_target(path: Path, size: int) -> Path:
+    with path.open("wb") as handle:
+        handle.truncate(size)
+    return path
+
+
+def test_copy_image_hashes_while_copying(tmp_path: Path) -> None:
+    source = tmp_path / "source.img"
+    payload = bytes(range(256)) * 1000 + b"tail"
+    source.write_bytes(payload)
+    target = _blank_target(tmp_path / "target.bin", len(payload) + 100)
+
+    result = copy_image(source, target, block_size=BLOCK)
+
+    assert result.sha256 == hashlib.sha256(payload).hexdigest()
+    assert result.bytes_written == len(payload)
+    assert result.bytes_skipped == 0
+    assert target.read_bytes()[: len(payload)] == payload
+    assert readback_sha256(target, size_bytes=len(payload)) == result.sha256
+
+
+def test_copy_image_skips_zero_blocks_on_zeroed_target(tmp_path: Path) -> None:
+    source = tmp_path / "sparse.img"
+    payload = _sparse_image(source, blocks=8, data_blocks={1, 4})
+    target = tmp_path / "loop.bin"
+    target.touch()
+
+    result = copy_image(source, target, block_size=BLOCK, skip_zero_blocks=True)
+
+    assert result.bytes_written == 2 * BLOCK
+    assert result.bytes_skipped == 6 * BLOCK
+    assert result.sha256 == hashlib.sha256(payload).hexdigest()
+    assert target.read_bytes() == payload
+
+
+def test_copy_image_overwrites_zero_blocks_by_default(tmp_path: Path) -> None:
+    source = tmp_path / "sparse.img"
+    payload = _sparse_image(source, blocks=4, data_blocks={0})
+    target = tmp_path / "dirty.bin"
+    target.write_bytes(b"\xff" * len(payload))
+
+    result = copy_image(source, target, block_size=BLOCK)
+
+    assert result.bytes_skipped == 0
+    assert target.read_bytes() == payload
+
+
+def test_data_extents_reports_holes_as_zero_runs(tmp_path: Path) -> None:
+    source = tmp_path / "sparse.img"
+    _sparse_image(source, blocks=4, data_blocks={2})
+
+    with source.open("rb") as handle:
+        extents = writer._data_extents(handle.fileno(), 4 * BLOCK)
+
+    assert sum(length for _offset, length, _data in extents) == 4 * BLOCK
+    covered = [(offset, offset + length) for offset, length, is_data in extents if is_data]
+    assert any(start <= 2 * BLOCK and end >= 3 * BLOCK for start, end in covered)
+
+
+def test_copy_image_direct_io_handles_unaligned_tail(tmp_path: Path) -> None:
+    source = tmp_path / "source.img"
+    payload = b"x" * (BLOCK + 123)
+    source.write_bytes(payload)
+    target = _blank_target(tmp_path / "target.bin", len(payload))
+
+    result = copy_image(source, target, block_size=BLOCK, direct_io=True)
+
+    assert target.read_bytes() == payload
+    assert result.sha256 == hashlib.sha256(payload).hexdigest()
+
+
+def test_copy_image_reports_progress_with_throughput(tmp_path: Path) -> None:
+    source = tmp_path / "source.img"
+    source.write_bytes(b"p" * (3 * BLOCK))
+    target = _blank_target(tmp_path / "target.bin", 3 * BLOCK)
+    updates = []
+
+    copy_image(source, target, block_size=BLOCK, progress=updates.append)
+
+    assert updates[-1].bytes_done == 3 * BLOCK
+    assert updates[-1].percent == 100.0
+    assert updates[-1].mb_per_second >= 0
+
+
+def test_copy_image_rejects_short_source(tmp_path: Path) -> None:
+    source = tmp_path / "short.img"
+    source.write_bytes(b"abc")
+    target = _blank_target(tmp_path / "target.bin", 16)
+
+    with pytest.raises(ImageWriteError, match="Source ended"):
+        copy_image(source, target, size_bytes=10, block_size=BLOCK)
+
+
+def test_benchmark_image_write_reports_json() -> None:
+    stdout = StringIO()
+
+    call_command("benchmark", "image-write", "--size-mb", "2", "--json", stdout=stdout)
+
+    runs = {run["implementation"]: run for run in json.loads(stdout.getvalue())["runs"]}
+    assert set(runs) == {"single-pass", "single-pass-skip-zero"}
+    assert all(run["verified"] for run in runs.values())
+    assert runs["single-pass-skip-zero"]["bytes_written"] < runs["single-pass"]["bytes_written"]
@@ -0,0 +1,351 @@
+"""Single-pass image writer used by :func:`apps.imager.services.write_image_to_device`.
+
+The source image is read once by a reader thread into a small ring of large
+buffers while the calling thread hashes each block and writes it to the
+target, so reading, hashing and writing overlap. Verification streams the
+target back once and compares digests.
+
+Zero blocks are detected while copying. When the caller knows the target is
+already zero-filled (a fresh loopback file, or media cleared with
+``blkdiscard``), those blocks are skipped with a seek instead of written. For
+sparse source files the filesystem block map (``SEEK_DATA``/``SEEK_HOLE``) is
+used so holes are not even read.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import queue
+import stat
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+DEFAULT_BLOCK_SIZE = 8 * 1024 * 1024
+DIRECT_IO_ALIGNMENT = 4096
+BUFFER_COUNT = 2
+PROGRESS_INTERVAL = 0.5
+
+_O_DIRECT = getattr(os, "O_DIRECT", 0)
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+
+class ImageWriteError(RuntimeError):
+    """Raised when copying or verifying an image fails."""
+
+
+@dataclass(frozen=True)
+class WriteProgress:
+    """Snapshot passed to progress callbacks while an image is written."""
+
+    bytes_done: int
+    bytes_total: int
+    bytes_skipped: int
+    elapsed_seconds: float
+
+    @property
+    def mb_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.bytes_done / self.elapsed_seconds / (1024 * 1024)
+
+    @property
+    def percent(self) -> float:
+        if self.bytes_total <= 0:
+            return 100.0
+        return self.bytes_done * 100.0 / self.bytes_total
+
+
+@dataclass(frozen=True)
+class CopyResult:
+    """Outcome of :func:`copy_image`."""
+
+    size_bytes: int
+    sha256: str
+    bytes_written: int
+    bytes_skipped: int
+    elapsed_seconds: float
+    direct_io: bool
+
+    @property
+    def mb_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.size_bytes / self.elapsed_seconds / (1024 * 1024)
+
+
+ProgressCallback = Callable[[WriteProgress], None]
+
+
+def _allocate(block_size: int, *, aligned: bool):
+    # Anonymous mmaps are page aligned, which O_DIRECT requires.
+    return mmap.mmap(-1, block_size) if aligned else bytearray(block_size)
+
+
+def _is_zero(buffer, length: int, zero_block: bytes) -> bool:
+    if length == len(zero_block) and isinstance(buffer, bytearray):
+        return buffer == zero_block
+    return bytes(memoryview(buffer)[:length]) == zero_block[:length]
+
+
+def _data_extents(fd: int, size_bytes: int) -> list[tuple[int, int, bool]]:
+    """Return ``(offset, length, is_data)`` runs covering ``size_bytes``.
+
+    Falls back to one data run when the platform or filesystem cannot report
+    holes.
+    """
+
+    if not hasattr(os, "SEEK_DATA"):
+        return [(0, size_bytes, True)]
+    extents: list[tuple[int, int, bool]] = []
+    offset = 0
+    try:
+        while offset < size_bytes:
+            try:
+                data_start = os.lseek(fd, offset, os.SEEK_DATA)
+            except OSError:
+                # ENXIO: no data after ``offset``; the rest is a hole.
+                data_start = size_bytes
+            data_start = min(data_start, size_bytes)
+            if data_start > offset:
+                extents.append((offset, data_start - offset, False))
+            if data_start >= size_bytes:
+                break
+            data_end = min(os.lseek(fd, data_start, os.SEEK_HOLE), size_bytes)
+            extents.append((data_start, data_end - data_start, True))
+            offset = data_end
+    except OSError:
+        return [(0, size_bytes, True)]
+    finally:
+        os.lseek(fd, 0, os.SEEK_SET)
+    return extents
+
+
+def _read_fully(handle, view: memoryview) -> int:
+    filled = 0
+    while filled < len(view):
+        count = handle.readinto(view[filled:])
+        if not count:
+            break
+        filled += count
+    return filled
+
+
+def _write_fully(fd: int, view: memoryview) -> None:
+    while len(view):
+        written = os.write(fd, view)
+        if written <= 0:
+            raise ImageWriteError("Short write to target.")
+        view = view[written:]
+
+
+class _BlockReader(threading.Thread):
+    """Fill free buffers from the source and hand them to the writer in order."""
+
+    def __init__(self, handle, size_bytes: int, buffers, *, use_block_map: bool):
+        super().__init__(name="imager-reader", daemon=True)
+        self.handle = handle
+        self.size_bytes = size_bytes
+        self.block_size = len(buffers[0])
+        self.free: queue.Queue = queue.Queue()
+        self.filled: queue.Queue = queue.Queue()
+        self.use_block_map = use_block_map
+        self.stop = threading.Event()
+        for buffer in buffers:
+            self.free.put(buffer)
+
+    def run(self) -> None:
+        try:
+            extents = (
+                _data_extents(self.handle.fileno(), self.size_bytes)
+                if self.use_block_map
+                else [(0, self.size_bytes, True)]
+            )
+            for offset, length, is_data in extents:
+                end = offset + length
+                while offset < end and not self.stop.is_set():
+                    count = min(self.block_size, end - offset)
+                    if not is_data:
+                        self.filled.put((None, count))
+                        offset += count
+                        continue
+                    buffer = self.free.get()
+                    if buffer is None:
+                        return
+                    self.handle.seek(offset)
+                    read = _read_fully(self.handle, memoryview(buffer)[:count])
+                    if read != count:
+                        raise ImageWriteError(
+                            f"Source ended after {offset + read} of {self.size_bytes} bytes."
+                        )
+                    self.filled.put((buffer, count))
+                    offset += count
+            self.filled.put(None)
+        except BaseException as exc:  # pragma: no cover - surfaced by the writer
+            self.filled.put(exc)
+
+
+def _open_target(path: Path, *, direct_io: bool) -> tuple[int, bool]:
+    flags = os.O_WRONLY | _O_BINARY
+    if direct_io and _O_DIRECT:
+        try:
+            return os.open(path, flags | _O_DIRECT), True
+        except OSError:
+            pass
+    return os.open(path, flags), False
+
+
+def _disable_direct_io(fd: int) -> None:
+    import fcntl
+
+    flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+    fcntl.fcntl(fd, fcntl.F_SETFL, flags & ~_O_DIRECT)
+
+
+def copy_image(
+    source_path: Path,
+    target_path: Path,
+    *,
+    size_bytes: int | None = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    skip_zero_blocks: bool = False,
+    direct_io: bool = False,
+    progress: ProgressCallback | None = None,
+) -> CopyResult:
+    """Copy ``source_path`` onto ``target_path`` in one pass and return its digest.
+
+    Args:
+        source_path: Image file to read.
+        target_path: Existing block device or file to overwrite from offset 0.
+        size_bytes: Bytes to copy; defaults to the source file size.
+        block_size: Buffer size; rounded up to ``DIRECT_IO_ALIGNMENT``.
+        skip_zero_blocks: Seek past all-zero blocks instead of writing them.
+            Only safe when the target already reads back as zeros there.
+        direct_io: Open the target with ``O_DIRECT`` when the platform allows
+            it, bypassing the page cache.
+        progress: Called with a :class:`WriteProgress` about every
+            ``PROGRESS_INTERVAL`` seconds and once at the end.
+
+    Raises:
+        ImageWriteError: If the source is shorter than ``size_bytes`` or the
+            target rejects a write.
+    """
+
+    source_path = Path(source_path)
+    target_path = Path(target_path)
+    if size_bytes is None:
+        size_bytes = source_path.stat().st_size
+    block_size = max(
+        DIRECT_IO_ALIGNMENT, -(-block_size // DIRECT_IO_ALIGNMENT) * DIRECT_IO_ALIGNMENT
+    )
+
+    digest = hashlib.sha256()
+    zero_block = bytes(block_size)
+    bytes_written = bytes_skipped = bytes_done = 0
+    started = last_report = time.monotonic()
+
+    source_handle = source_path.open("rb", buffering=0)
+    target_fd = None
+    reader = None
+    try:
+        target_fd, direct_enabled = _open_target(target_path, direct_io=direct_io)
+        buffers = [_allocate(block_size, aligned=direct_enabled) for _ in range(BUFFER_COUNT)]
+        reader = _BlockReader(
+            source_handle, size_bytes, buffers, use_block_map=skip_zero_blocks
+        )
+        reader.start()
+        direct_active = direct_enabled
+        while True:
+            item = reader.filled.get()
+            if item is None:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            buffer, count = item
+            if buffer is None:
+                view = memoryview(zero_block)[:count]
+                zero = True
+            else:
+                view = memoryview(buffer)[:count]
+                zero = skip_zero_blocks and _is_zero(buffer, count, zero_block)
+            digest.update(view)
+            if zero and skip_zero_blocks:
+                os.lseek(target_fd, count, os.SEEK_CUR)
+                bytes_skipped += count
+            else:
+                if direct_active and count % DIRECT_IO_ALIGNMENT:
+                    _disable_direct_io(target_fd)
+                    direct_active = False
+                _write_fully(target_fd, view)
+                bytes_written += count
+            view.release()
+            if buffer is not None:
+                reader.free.put(buffer)
+            bytes_done += count
+
+            now = time.monotonic()
+            if progress is not None and now - last_report >= PROGRESS_INTERVAL:
+                last_report = now
+                progress(WriteProgress(bytes_done, size_bytes, bytes_skipped, now - started))
+
+        target_stat = os.fstat(target_fd)
+        if stat.S_ISREG(target_stat.st_mode) and target_stat.st_size < size_bytes:
+            # Skipped trailing zero blocks never extended a regular file.
+            os.ftruncate(target_fd, size_bytes)
+        os.fsync(target_fd)
+    finally:
+        if reader is not None:
+            reader.stop.set()
+            reader.free.put(None)
+            reader.join(timeout=5)
+        if target_fd is not None:
+            os.close(target_fd)
+        source_handle.close()
+
+    elapsed = time.monotonic() - started
+    if progress is not None:
+        progress(WriteProgress(bytes_done, size_bytes, bytes_skipped, elapsed))
+    return CopyResult(
+        size_bytes=size_bytes,
+        sha256=digest.hexdigest(),
+        bytes_written=bytes_written,
+        bytes_skipped=bytes_skipped,
+        elapsed_seconds=elapsed,
+        direct_io=direct_enabled,
+    )
+
+
+def readback_sha256(
+    path: Path, *, size_bytes: int, block_size: int = DEFAULT_BLOCK_SIZE
+) -> str:
+    """Hash the first ``size_bytes`` of ``path`` in one streamed read.
+
+    Cached pages for the range are dropped first where supported, so the
+    digest reflects what reached the media rather than the page cache.
+    """
+
+    digest = hashlib.sha256()
+    buffer = bytearray(block_size)
+    remaining = size_bytes
+    with Path(path).open("rb", buffering=0) as handle:
+        if hasattr(os, "posix_fadvise"):
+            try:
+                os.posix_fadvise(handle.fileno(), 0, size_bytes, os.POSIX_FADV_DONTNEED)
+                os.posix_fadvise(handle.fileno(), 0, size_bytes, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+        view = memoryview(buffer)
+        while remaining > 0:
+            count = _read_fully(handle, view[: min(block_size, remaining)])
+            if count == 0:
+                break
+            digest.update(view[:count])
+            remaining -= count
+        view.release()
+    if remaining != 0:
+        raise ImageWriteError(f"Could not read expected {size_bytes} bytes from {path}.")
+    return digest.hexdigest()
@@ -15,6 +15,18 @@ class LinksConfig(AppConfig):
     label = "links"
 
     def ready(self):  # pragma: no cover - import for side effects
+        from django.db.models.signals import post_delete, post_save
+
+        from .services.share_links import _short_url_changed
+
+        short_url_model = self.get_model("ShortURL")
+        for signal in (post_save, post_delete):
+            signal.connect(
+                _short_url_changed,
+                sender=short_url_model,
+                dispatch_uid=f"links_short_url_changed_{signal is post_delete}",
+            )
+
         if not is_celery_enabled():
             return
 
@@ -0,0 +1,145 @@
+"""Benchmark page rendering with quick web share disabled and enabled."""
+
+from __future__ import annotations
+
+import json
+import statistics
+import time
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.core.management.base import CommandError
+from django.db import transaction
+from django.test import Client
+
+from apps.core.benchmarks import BenchmarkScenario
+from apps.features.models import Feature
+from apps.features.utils import QUICK_WEB_SHARE_FEATURE_SLUG
+from apps.links.services.share_links import reset_share_caches
+
+DEFAULT_PATHS = ("/",)
+DEFAULT_REQUESTS = 20
+
+
+@dataclass
+class BenchmarkRun:
+    path: str
+    mode: str
+    requests: int
+    mean_seconds: float
+    p95_seconds: float
+    response_bytes: int
+    qr_bytes: int
+
+    def to_dict(self) -> dict:
+        return {
+            "path": self.path,
+            "mode": self.mode,
+            "requests": self.requests,
+            "mean_seconds": self.mean_seconds,
+            "p95_seconds": self.p95_seconds,
+            "response_bytes": self.response_bytes,
+            "qr_bytes": self.qr_bytes,
+        }
+
+
+def _set_quick_web_share(enabled: bool) -> None:
+    Feature.objects.update_or_create(
+        slug=QUICK_WEB_SHARE_FEATURE_SLUG,
+        defaults={"display": "Quick Web Share", "is_enabled": enabled},
+    )
+    cache.delete("features:quick-web-share:enabled")
+
+
+class _Rollback(Exception):
+    pass
+
+
+class ShareLinksBenchmark(BenchmarkScenario):
+    help = (
+        "Benchmark page render time and response size with quick web share "
+        "disabled and enabled (cold and warm short-link caches). Feature and "
+        "short URL rows are written inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--paths",
+            nargs="+",
+            default=list(DEFAULT_PATHS),
+            help="Page paths to render (default: /).",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=DEFAULT_REQUESTS,
+            help=f"Requests per path and mode (default: {DEFAULT_REQUESTS}).",
+        )
+        parser.add_argument("--host", default="localhost", help="Host header to send.")
+        parser.add_argument("--json", action="store_true", help="Emit JSON summary output.")
+
+    def handle(self, **options):
+        if options["requests"] < 1:
+            raise CommandError("--requests must be at least 1.")
+
+        client = Client(HTTP_HOST=options["host"])
+        for path in options["paths"]:
+            client.get(path)
+        results: list[BenchmarkRun] = []
+        try:
+            with transaction.atomic():
+                for path in options["paths"]:
+                    results.extend(self._run_path(client, path, options["requests"]))
+                raise _Rollback
+        except _Rollback:
+            pass
+        finally:
+            reset_share_caches()
+
+        payload = {"runs": [run.to_dict() for run in results]}
+        if options["json"]:
+            self.stdout.write(json.dumps(payload, indent=2))
+            return
+
+        self.stdout.write("Quick web share benchmark summary:")
+        for run in results:
+            self.stdout.write(
+                f"  {run.path} {run.mode}: mean {run.mean_seconds * 1000:.1f} ms, "
+                f"p95 {run.p95_seconds * 1000:.1f} ms, {run.response_bytes} bytes"
+                + (f" (+{run.qr_bytes} bytes QR, fetched once)" if run.qr_bytes else "")
+            )
+
+    def _run_path(self, client: Client, path: str, requests: int) -> list[BenchmarkRun]:
+        results = []
+        for mode, enabled in (("off", False), ("on_cold", True), ("on_warm", True)):
+            _set_quick_web_share(enabled)
+            if mode == "on_cold":
+                reset_share_caches()
+                cache.clear()
+                _set_quick_web_share(enabled)
+            durations = []
+            size = 0
+            qr_bytes = 0
+            for _ in range(requests if mode != "on_cold" else 1):
+                began = time.perf_counter()
+                response = client.get(path)
+                durations.append(time.perf_counter() - began)
+                if response.status_code != 200:
+                    raise CommandError(f"{path} returned HTTP {response.status_code}")
+                size = len(response.content)
+                qr_url = response.context and response.context.get("share_short_url_qr")
+                if qr_url and not qr_bytes:
+                    qr_bytes = len(client.get(qr_url).content)
+            durations.sort()
+            results.append(
+                BenchmarkRun(
+                    path=path,
+                    mode=mode,
+                    requests=len(durations),
+                    mean_seconds=statistics.fmean(durations),
+                    p95_seconds=durations[max(0, int(len(durations) * 0.95) - 1)],
+                    response_bytes=size,
+                    qr_bytes=qr_bytes,
+                )
+            )
+        return results
@@ -1,56 +1,17 @@
-import base64
 from urllib.parse import urlsplit
 
 from django.contrib.sites.models import Site
 from django.core.exceptions import DisallowedHost
 from django.db.utils import DatabaseError
+from django.urls import reverse
 
 from apps.features.utils import QUICK_WEB_SHARE_FEATURE_SLUG, get_cached_feature_enabled
 
-from .models import get_or_create_short_url
-from .qr_utils import build_qr_png_bytes
+from .services.share_links import resolve_share_slug
 
-_FALLBACK_QR_PNG_BYTES = base64.b64decode(
-    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mP8/x8AAwMB"
-    "/oX6zj4AAAAASUVORK5CYII="
-)
 _QUICK_WEB_SHARE_ENABLED_CACHE_KEY = "features:quick-web-share:enabled"
 
 
-def _encode_share_qr_data_uri(url: str) -> str:
-    """Encode a share URL as a QR image data URI.
-
-    Parameters
-    ----------
-    url : str
-        Absolute URL to encode as a QR code.
-
-    Returns
-    -------
-    str
-        PNG QR image encoded as a ``data:image/png;base64,...`` URI.
-
-    Raises
-    ------
-    None
-        Known QR generation failures are handled with a fallback PNG.
-    """
-    if not url:
-        return ""
-    try:
-        png_bytes = build_qr_png_bytes(
-            url,
-            box_size=6,
-            border=2,
-            fill_color="#0b1420",
-            back_color="white",
-        )
-    except (RuntimeError, ValueError, OSError):
-        png_bytes = _FALLBACK_QR_PNG_BYTES
-    encoded = base64.b64encode(png_bytes).decode("ascii")
-    return f"data:image/png;base64,{encoded}"
-
-
 def share_short_url(request):
     """Build public share-link context for the site share modal.
 
@@ -63,12 +24,12 @@ def share_short_url(request):
     -------
     dict[str, str]
         Mapping containing ``quick_web_share_enabled``, ``share_short_url``, and
-        ``share_short_url_qr``.
+        ``share_short_url_qr`` (the URL of the cacheable QR image endpoint).
 
     Raises
     ------
     None
-        Exceptions from QR generation are handled and converted to an empty QR value.
+        Database errors while resolving the short URL leave the page URL unshortened.
     """
     disabled_context = {
         "quick_web_share_enabled": False,
@@ -159,20 +120,16 @@ def share_short_url(request):
 
     share_url = _build_absolute_with_fallback(request.path)
     try:
-        short_url = get_or_create_short_url(share_url)
+        slug = resolve_share_slug(share_url)
     except DatabaseError:
-        short_url = None
-    if short_url:
-        redirect_path = short_url.redirect_path()
-        share_url = _build_absolute_with_fallback(redirect_path)
-
-    try:
-        qr_data_uri = _encode_share_qr_data_uri(share_url)
-    except Exception:
-        qr_data_uri = ""
+        slug = ""
+    qr_url = ""
+    if slug:
+        share_url = _build_absolute_with_fallback(reverse("links:short-url", args=[slug]))
+        qr_url = reverse("links:share-qr", args=[slug])
 
     return {
         "quick_web_share_enabled": True,
         "share_short_url": share_url,
-        "share_short_url_qr": qr_data_uri,
+        "share_short_url_qr": qr_url,
     }
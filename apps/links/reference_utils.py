@@ -46,6 +46,18 @@ def url_targets_local_loopback(url: str | None) -> bool:
     return host_is_local_loopback(parsed.hostname)
 
 
+def reference_visible_to_user(ref: "Reference", user) -> bool:
+    """Return whether ``ref``'s footer visibility allows ``user`` to see it."""
+
+    if ref.footer_visibility == ref.FOOTER_PUBLIC:
+        return True
+    if not getattr(user, "is_authenticated", False):
+        return False
+    if ref.footer_visibility == ref.FOOTER_PRIVATE:
+        return True
+    return ref.footer_visibility == ref.FOOTER_STAFF and bool(user.is_staff)
+
+
 def filter_visible_references(
     refs: Iterable["Reference"],
     *,
@@ -120,20 +132,8 @@ def filter_visible_references(
                 continue
 
         if respect_footer_visibility:
-            if ref.footer_visibility == ref.FOOTER_PUBLIC:
-                visible_refs.append(ref)
-            elif (
-                ref.footer_visibility == ref.FOOTER_PRIVATE
-                and request
-                and request.user.is_authenticated
-            ):
-                visible_refs.append(ref)
-            elif (
-                ref.footer_visibility == ref.FOOTER_STAFF
-                and request
-                and request.user.is_authenticated
-                and request.user.is_staff
-            ):
+            user = request.user if request else None
+            if reference_visible_to_user(ref, user):
                 visible_refs.append(ref)
         else:
             visible_refs.append(ref)
@@ -144,5 +144,6 @@ def filter_visible_references(
 __all__ = [
     "filter_visible_references",
     "host_is_local_loopback",
+    "reference_visible_to_user",
     "url_targets_local_loopback",
 ]
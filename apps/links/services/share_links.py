@@ -0,0 +1,191 @@
+"""Short-link resolution and QR images for the quick web share modal.
+
+Page renders only need the short URL slug for the current page. Slugs are
+resolved from a per-process LRU backed by the shared Django cache, keyed by
+the canonical page URL. Pages without a short URL get their row created on
+first render, before the slug is published to the shared cache, so every
+worker can serve it. QR images are served by a dedicated, cacheable endpoint
+and kept on disk once rendered.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+
+from apps.links.models import ShortURL
+from apps.links.qr_utils import build_qr_png_bytes
+
+logger = logging.getLogger(__name__)
+
+SHARE_SLUG_CACHE_TIMEOUT = 24 * 60 * 60
+SHARE_SLUG_CACHE_PREFIX = "links:share-slug:"
+LOCAL_CACHE_SIZE = 2048
+LOCAL_CACHE_TTL = 5 * 60
+QR_RENDER_OPTIONS = {
+    "box_size": 6,
+    "border": 2,
+    "fill_color": "#0b1420",
+    "back_color": "white",
+}
+QR_CACHE_VERSION = "1"
+_SLUG_RE = re.compile(r"^[-a-zA-Z0-9_]{1,32}$")
+
+FALLBACK_QR_PNG_BYTES = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mP8/x8AAwMB"
+    "/oX6zj4AAAAASUVORK5CYII="
+)
+
+_lock = threading.Lock()
+_local_slugs: OrderedDict[str, tuple[str, float]] = OrderedDict()
+
+
+def canonical_share_url(url: str) -> str:
+    """Return ``url`` with a lower-case scheme and host and no fragment."""
+
+    url = (url or "").strip()
+    if not url:
+        return ""
+    parts = urlsplit(url)
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.query, "")
+    )
+
+
+def _cache_key(url: str) -> str:
+    return SHARE_SLUG_CACHE_PREFIX + hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def _remember(url: str, slug: str) -> None:
+    with _lock:
+        _local_slugs[url] = (slug, time.monotonic() + LOCAL_CACHE_TTL)
+        _local_slugs.move_to_end(url)
+        while len(_local_slugs) > LOCAL_CACHE_SIZE:
+            _local_slugs.popitem(last=False)
+
+
+def forget_share_url(url: str) -> None:
+    """Drop cached slugs for ``url`` so the next render looks it up again."""
+
+    url = canonical_share_url(url)
+    with _lock:
+        _local_slugs.pop(url, None)
+    cache.delete(_cache_key(url))
+
+
+def _stored_slug(url: str) -> str:
+    for field in ("target_url", "original_url"):
+        slug = (
+            ShortURL.objects.filter(**{field: url})
+            .order_by("pk")
+            .values_list("slug", flat=True)
+            .first()
+        )
+        if slug:
+            return slug
+    return ""
+
+
+def resolve_share_slug(url: str) -> str:
+    """Return the short URL slug for ``url``, allocating one when missing.
+
+    A missing :class:`ShortURL` row is created before its slug is cached, so
+    the slug never resolves anywhere without a row behind it.
+    """
+
+    url = canonical_share_url(url)
+    if not url:
+        return ""
+    with _lock:
+        slug, expires_at = _local_slugs.get(url, ("", 0.0))
+    if slug and expires_at > time.monotonic():
+        return slug
+
+    key = _cache_key(url)
+    slug = cache.get(key) or _stored_slug(url)
+    if not slug:
+        try:
+            slug = ShortURL.objects.create(original_url=url, target_url=url).slug
+        except DatabaseError:
+            logger.warning("Unable to store short URL for %s", url, exc_info=True)
+            return ""
+    cache.set(key, slug, SHARE_SLUG_CACHE_TIMEOUT)
+    _remember(url, slug)
+    return slug
+
+
+def _short_url_changed(sender, instance, **kwargs) -> None:
+    for url in {instance.original_url, instance.target_url}:
+        if url:
+            forget_share_url(url)
+
+
+def is_share_slug(slug: str) -> bool:
+    """Return whether ``slug`` names an existing short URL."""
+
+    if not _SLUG_RE.match(slug or ""):
+        return False
+    return ShortURL.objects.filter(slug=slug).exists()
+
+
+def qr_cache_dir() -> Path:
+    configured = getattr(settings, "LINKS_SHARE_QR_CACHE_DIR", "")
+    if configured:
+        return Path(configured)
+    location = getattr(settings, "CACHE_LOCATION", "") or Path(settings.BASE_DIR) / "cache"
+    return Path(location) / "share-qr"
+
+
+def share_qr_png(url: str) -> tuple[bytes, str]:
+    """Return ``(png_bytes, etag)`` for a QR code encoding ``url``.
+
+    The ETag is empty when QR generation failed and a placeholder is returned.
+
+    Rendered images are stored under :func:`qr_cache_dir`, named by a digest
+    of the encoded URL and render options, so each URL is rasterized once.
+    """
+
+    digest = hashlib.sha256(
+        f"{QR_CACHE_VERSION}|{sorted(QR_RENDER_OPTIONS.items())}|{url}".encode("utf-8")
+    ).hexdigest()
+    etag = f'"{digest[:32]}"'
+    path = qr_cache_dir() / digest[:2] / f"{digest}.png"
+    try:
+        return path.read_bytes(), etag
+    except OSError:
+        pass
+
+    try:
+        png_bytes = build_qr_png_bytes(url, **QR_RENDER_OPTIONS)
+    except (RuntimeError, ValueError, OSError):
+        return FALLBACK_QR_PNG_BYTES, ""
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(png_bytes)
+        os.replace(tmp_name, path)
+    except OSError:
+        logger.debug("Unable to cache share QR image at %s", path, exc_info=True)
+    return png_bytes, etag
+
+
+def reset_share_caches() -> None:
+    """Drop process-local slugs (used by tests)."""
+
+    with _lock:
+        _local_slugs.clear()
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from apps.features.models import Feature
+from apps.features.utils import QUICK_WEB_SHARE_FEATURE_SLUG
+from apps.links.context_processors import share_short_url
+from apps.links.models import ShortURL
+from apps.links.services import share_links
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _isolated_share_caches(settings, tmp_path):
+    settings.LINKS_SHARE_QR_CACHE_DIR = str(tmp_path / "share-qr")
+    share_links.reset_share_caches()
+    cache.clear()
+    yield
+    share_links.reset_share_caches()
+
+
+def _enable_quick_web_share() -> None:
+    Feature.objects.update_or_create(
+        slug=QUICK_WEB_SHARE_FEATURE_SLUG,
+        defaults={"display": "Quick Web Share", "is_enabled": True},
+    )
+    cache.delete("features:quick-web-share:enabled")
+
+
+def test_share_context_creates_row_before_caching_slug(
+    rf, django_assert_num_queries
+):
+    _enable_quick_web_share()
+    share_short_url(rf.get("/warmup/"))
+
+    first = share_short_url(rf.get("/public/"))
+    with django_assert_num_queries(0):
+        second = share_short_url(rf.get("/public/"))
+
+    assert first == second
+    short_url = ShortURL.objects.get(target_url="http://testserver/public/")
+    assert first["share_short_url"].endswith(f"/links/s/{short_url.slug}/")
+    assert first["share_short_url_qr"] == reverse("links:share-qr", args=[short_url.slug])
+
+
+def test_share_context_reuses_existing_short_url(rf):
+    _enable_quick_web_share()
+    existing = ShortURL.objects.create(
+        original_url="http://testserver/about/", target_url="http://testserver/about/"
+    )
+
+    context = share_short_url(rf.get("/about/"))
+
+    assert context["share_short_url"] == f"http://testserver/links/s/{existing.slug}/"
+    assert ShortURL.objects.count() == 1
+
+
+def test_new_slug_is_served_by_other_workers(client, rf):
+    _enable_quick_web_share()
+    context = share_short_url(rf.get("/fresh/"))
+    slug = context["share_short_url"].rstrip("/").rsplit("/", 1)[-1]
+    share_links.reset_share_caches()
+
+    qr_response = client.get(reverse("links:share-qr", args=[slug]))
+    response = client.get(reverse("links:short-url", args=[slug]))
+
+    assert cache.get(share_links._cache_key("http://testserver/fresh/")) == slug
+    assert qr_response.status_code == 200
+    assert response.status_code == 302
+    assert response["Location"] == "http://testserver/fresh/"
+
+
+def test_share_qr_endpoint_is_cacheable_and_disk_backed(client, settings, monkeypatch):
+    short_url = ShortURL.objects.create(
+        original_url="/qr-page/", target_url="/qr-page/"
+    )
+    url = reverse("links:share-qr", args=[short_url.slug])
+
+    response = client.get(url)
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "image/png"
+    assert "max-age=31536000" in response["Cache-Control"]
+    etag = response["ETag"]
+    assert list((share_links.qr_cache_dir()).rglob("*.png"))
+
+    def fail_render(*args, **kwargs):
+        raise AssertionError("QR image should be served from the disk cache")
+
+    monkeypatch.setattr(share_links, "build_qr_png_bytes", fail_render)
+    cached = client.get(url)
+    not_modified = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert cached.content == response.content
+    assert not_modified.status_code == 304
+    assert client.get(reverse("links:share-qr", args=["missing"])).status_code == 404
@@ -8,6 +8,7 @@ app_name = "links"
 urlpatterns = [
     path("references/<int:reference_id>/frame/", views.reference_public_frame_view, name="reference-public-frame"),
     path("s/<slug:slug>/", views.short_url_redirect, name="short-url"),
+    path("s/<slug:slug>/qr.png", views.share_qr_image, name="share-qr"),
     path("qr/<slug:slug>/", views.qr_redirect, name="qr-redirect"),
     path("qr/<slug:slug>/view/", views.qr_redirect_public_view, name="qr-redirect-public"),
 ]
@@ -7,13 +7,17 @@ from urllib.parse import urlparse
 from .qr_utils import build_qr_png_bytes
 from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest, Http404
 from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
 from django.utils.http import url_has_allowed_host_and_scheme
 
 from .models import ExperienceReference, QRRedirect, QRRedirectLead, ShortURL
 from .reference_utils import filter_visible_references
+from .services import share_links
 
 logger = logging.getLogger(__name__)
 
+SHARE_QR_MAX_AGE = 365 * 24 * 60 * 60
+
 
 def _resolve_target_url(request: HttpRequest, target_url: str) -> str:
     target_url = (target_url or "").strip()
@@ -54,6 +58,27 @@ def _extract_client_ip(request: HttpRequest) -> str:
     return ""
 
 
+def share_qr_image(request: HttpRequest, slug: str) -> HttpResponse:
+    """Serve the QR code for a share short URL with long-lived caching."""
+
+    if not share_links.is_share_slug(slug):
+        raise Http404("Short URL not found.")
+    share_url = request.build_absolute_uri(reverse("links:short-url", args=[slug]))
+    png_bytes, etag = share_links.share_qr_png(share_url)
+    if not etag:
+        response = HttpResponse(png_bytes, content_type="image/png")
+        response["Cache-Control"] = "no-cache"
+        return response
+
+    if etag in request.headers.get("If-None-Match", ""):
+        response = HttpResponse(status=304)
+    else:
+        response = HttpResponse(png_bytes, content_type="image/png")
+    response["ETag"] = etag
+    response["Cache-Control"] = f"public, max-age={SHARE_QR_MAX_AGE}, immutable"
+    return response
+
+
 def qr_redirect(request: HttpRequest, slug: str) -> HttpResponse:
     qr_entry = get_object_or_404(QRRedirect, slug=slug)
     try:
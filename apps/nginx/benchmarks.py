@@ -0,0 +1,152 @@
+"""Benchmark static asset delivery through Django versus the nginx static location."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.core.management.base import CommandError
+from django.test import Client
+from django.test.utils import override_settings
+
+from apps.core.benchmarks import BenchmarkScenario
+from apps.nginx.config_utils import EdgeOptions, edge_location_lines
+
+DEFAULT_ASSETS = 20
+DEFAULT_REQUESTS = 500
+DEFAULT_ASSET_KB = 48
+
+
+@dataclass
+class BenchmarkRun:
+    mode: str
+    requests: int
+    bytes_sent: int
+    seconds: float
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "mode": self.mode,
+            "requests": self.requests,
+            "bytes_sent": self.bytes_sent,
+            "seconds": self.seconds,
+            "requests_per_second": self.requests_per_second,
+        }
+
+
+def write_assets(root: Path, count: int, size_kb: int) -> list[str]:
+    """Write hashed-name assets with gzip siblings under *root* and return their URLs."""
+
+    urls = []
+    line = "body .panel-%d { color: #%06x; margin: %dpx; }\n"
+    for index in range(count):
+        body = "".join(line % (index, row, row % 17) for row in range(size_kb * 20)).encode()
+        name = f"bench/asset-{index}.{index:012x}.css"
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(body)
+        path.with_name(path.name + ".gz").write_bytes(gzip.compress(body))
+        urls.append(f"/static/{name}")
+    return urls
+
+
+def alias_for(lines: list[str], prefix: str) -> str:
+    """Return the ``alias`` path of the rendered ``location ^~ prefix`` block."""
+
+    inside = False
+    for line in lines:
+        stripped = line.strip()
+        if stripped == f"location ^~ {prefix} {{":
+            inside = True
+        elif inside and stripped.startswith("alias "):
+            return stripped[len("alias ") : -1]
+    raise CommandError(f"Rendered config has no alias for {prefix}")
+
+
+class StaticAssetsBenchmark(BenchmarkScenario):
+    help = (
+        "Benchmark static asset delivery through the Django/WhiteNoise stack "
+        "against the direct file reads performed by the generated nginx "
+        "static location, using synthetic hashed assets with gzip variants."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--assets",
+            type=int,
+            default=DEFAULT_ASSETS,
+            help=f"Number of synthetic assets (default: {DEFAULT_ASSETS}).",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=DEFAULT_REQUESTS,
+            help=f"Requests per mode (default: {DEFAULT_REQUESTS}).",
+        )
+        parser.add_argument(
+            "--asset-kb",
+            type=int,
+            default=DEFAULT_ASSET_KB,
+            help=f"Approximate uncompressed asset size in KiB (default: {DEFAULT_ASSET_KB}).",
+        )
+        parser.add_argument("--json", action="store_true", help="Emit JSON summary output.")
+
+    def handle(self, **options):
+        if min(options["assets"], options["requests"], options["asset_kb"]) < 1:
+            raise CommandError("--assets, --requests and --asset-kb must be at least 1.")
+
+        with tempfile.TemporaryDirectory(prefix="static-bench-") as directory:
+            root = Path(directory)
+            urls = write_assets(root, options["assets"], options["asset_kb"])
+            requests = [urls[index % len(urls)] for index in range(options["requests"])]
+            results = [self._django(root, requests), self._edge(root, requests)]
+
+        payload = {"runs": [run.to_dict() for run in results]}
+        if options["json"]:
+            self.stdout.write(json.dumps(payload, indent=2))
+            return
+
+        self.stdout.write("Static asset benchmark summary:")
+        for run in results:
+            self.stdout.write(
+                f"  {run.mode}: {run.requests} requests in {run.seconds:.3f} s "
+                f"({run.requests_per_second:.0f} req/s, {run.bytes_sent} bytes)"
+            )
+
+    def _django(self, root: Path, requests: list[str]) -> BenchmarkRun:
+        with override_settings(STATIC_ROOT=str(root), WHITENOISE_AUTOREFRESH=False):
+            client = Client(HTTP_ACCEPT_ENCODING="gzip")
+            sent = 0
+            began = time.perf_counter()
+            for url in requests:
+                response = client.get(url)
+                if response.status_code != 200:
+                    raise CommandError(f"Django returned {response.status_code} for {url}")
+                sent += sum(len(chunk) for chunk in response.streaming_content)
+                response.close()
+            elapsed = time.perf_counter() - began
+        return BenchmarkRun(mode="django_whitenoise", requests=len(requests), bytes_sent=sent, seconds=elapsed)
+
+    def _edge(self, root: Path, requests: list[str]) -> BenchmarkRun:
+        lines = edge_location_lines(EdgeOptions(static_root=str(root)), "127.0.0.1:8888")
+        alias = alias_for(lines, "/static/")
+        sent = 0
+        began = time.perf_counter()
+        for url in requests:
+            path = os.path.join(alias, url[len("/static/") :])
+            # gzip_static: prefer the precompressed sibling when the client accepts it.
+            compressed = f"{path}.gz"
+            target = compressed if os.path.exists(compressed) else path
+            with open(target, "rb") as handle:
+                sent += len(handle.read())
+        elapsed = time.perf_counter() - began
+        return BenchmarkRun(mode="nginx_alias", requests=len(requests), bytes_sent=sent, seconds=elapsed)
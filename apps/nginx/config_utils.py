@@ -6,6 +6,7 @@ import shlex
 import subprocess
 import tempfile
 import textwrap
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable
 
@@ -24,6 +25,42 @@ MAINTENANCE_ERROR_LINES = (
     "error_page 404 /maintenance/404.html;",
     "error_page 500 502 503 504 /maintenance/app-down.html;",
 )
+UPSTREAM_KEEPALIVE_CONNECTIONS = 32
+APP_FALLBACK_LOCATION = "@arthexis_app"
+# ManifestStaticFilesStorage names hashed copies ``name.<12 hex digits>.ext``.
+HASHED_ASSET_PATTERN = r"\.[0-9a-f]{12}\.[0-9A-Za-z]+$"
+MICROCACHE_ZONE = "arthexis_microcache"
+MICROCACHE_BYPASS_VARIABLE = "$arthexis_microcache_bypass"
+DEFAULT_MICROCACHE_PATH = "/var/cache/nginx/arthexis"
+
+
+@dataclass(frozen=True)
+class EdgeOptions:
+    """What nginx serves itself instead of proxying to the application server."""
+
+    static_root: str | None = None
+    media_root: str | None = None
+    brotli_static: bool = False
+    microcache_seconds: int = 0
+    microcache_path: str = DEFAULT_MICROCACHE_PATH
+    session_cookie_name: str = "sessionid"
+
+    @classmethod
+    def from_settings(cls, settings_obj=settings) -> "EdgeOptions":
+        static_root = getattr(settings_obj, "STATIC_ROOT", None)
+        media_root = getattr(settings_obj, "MEDIA_ROOT", None)
+        serve_static = getattr(settings_obj, "NGINX_SERVE_STATIC", True)
+        serve_media = getattr(settings_obj, "NGINX_SERVE_MEDIA", False)
+        return cls(
+            static_root=str(static_root) if serve_static and static_root else None,
+            media_root=str(media_root) if serve_media and media_root else None,
+            brotli_static=bool(getattr(settings_obj, "NGINX_BROTLI_STATIC", False)),
+            microcache_seconds=int(getattr(settings_obj, "NGINX_MICROCACHE_SECONDS", 0) or 0),
+            microcache_path=str(
+                getattr(settings_obj, "NGINX_MICROCACHE_PATH", DEFAULT_MICROCACHE_PATH)
+            ),
+            session_cookie_name=getattr(settings_obj, "SESSION_COOKIE_NAME", "sessionid"),
+        )
 
 
 def slugify(domain: str) -> str:
@@ -77,16 +114,74 @@ WEBSOCKET_SEND_TIMEOUT = "proxy_send_timeout 1d;"
 
 
 def websocket_map() -> str:
+    # Plain requests send an empty Connection header so upstream keepalive
+    # connections stay open between requests.
     return textwrap.dedent(
         """
         map $http_upgrade $connection_upgrade {
             default upgrade;
-            '' close;
+            '' '';
         }
         """
     ).strip()
 
 
+def upstream_name(proxy_target: str) -> str:
+    """Return the nginx upstream name used for *proxy_target*."""
+
+    slug = re.sub(r"[^a-z0-9]+", "_", proxy_target.lower()).strip("_")
+    return f"arthexis_{slug or 'app'}"
+
+
+def upstream_block(
+    proxy_target: str, *, keepalive: int = UPSTREAM_KEEPALIVE_CONNECTIONS
+) -> str:
+    """Return an upstream pool for *proxy_target* that keeps idle connections open."""
+
+    return textwrap.dedent(
+        f"""
+        upstream {upstream_name(proxy_target)} {{
+            server {proxy_target};
+            keepalive {keepalive};
+        }}
+        """
+    ).strip()
+
+
+def microcache_blocks(edge: EdgeOptions) -> str:
+    """Return the http-level cache zone and bypass map for the page microcache.
+
+    Requests carrying a session cookie, an Authorization header or a websocket
+    upgrade always go to the application.
+    """
+
+    cookie = re.sub(r"[^A-Za-z0-9_]", "_", edge.session_cookie_name)
+    return textwrap.dedent(
+        f"""
+        proxy_cache_path {edge.microcache_path} levels=1:2 keys_zone={MICROCACHE_ZONE}:10m max_size=256m inactive=10m use_temp_path=off;
+
+        map "$http_upgrade$http_authorization$cookie_{cookie}" {MICROCACHE_BYPASS_VARIABLE} {{
+            default 1;
+            "" 0;
+        }}
+        """
+    ).strip()
+
+
+def _microcache_directives(seconds: int) -> str:
+    return textwrap.dedent(
+        f"""
+        proxy_cache {MICROCACHE_ZONE};
+        proxy_cache_key $scheme$host$request_uri;
+        proxy_cache_valid 200 {seconds}s;
+        proxy_cache_bypass {MICROCACHE_BYPASS_VARIABLE};
+        proxy_no_cache {MICROCACHE_BYPASS_VARIABLE};
+        proxy_cache_lock on;
+        proxy_cache_use_stale updating;
+        """
+    ).strip()
+
+
 def websocket_directives() -> tuple[str, ...]:
     return (
         WEBSOCKET_MAP_DIRECTIVE,
@@ -135,14 +230,80 @@ def maintenance_block_lines() -> list[str]:
     return [f"    {line}" if line else "" for line in content.splitlines()]
 
 
+def edge_location_lines(edge: EdgeOptions | None, proxy_target: str) -> list[str]:
+    """Return locations that serve collected static files and media from disk.
+
+    Static misses fall back to the application so assets that have not been
+    collected yet are still found through the staticfiles finders.
+    """
+
+    if edge is None:
+        return []
+
+    lines: list[str] = []
+    if edge.static_root:
+        lines.extend(
+            [
+                "    location ^~ /static/ {",
+                f"        alias {edge.static_root.rstrip('/')}/;",
+                "        gzip_static on;",
+            ]
+        )
+        if edge.brotli_static:
+            lines.append("        brotli_static on;")
+        lines.extend(
+            [
+                "        access_log off;",
+                "        expires 1h;",
+                f"        error_page 404 = {APP_FALLBACK_LOCATION};",
+                "",
+                f'        location ~* "{HASHED_ASSET_PATTERN}" {{',
+                # Without this the inherited ``expires`` adds a second header.
+                "            expires off;",
+                '            add_header Cache-Control "public, max-age=31536000, immutable";',
+                "        }",
+                "    }",
+                "",
+                f"    location {APP_FALLBACK_LOCATION} {{",
+                f"        proxy_pass http://{proxy_target};",
+                "        proxy_http_version 1.1;",
+                '        proxy_set_header Connection "";',
+                "        proxy_set_header Host $host;",
+                "        proxy_set_header X-Real-IP $remote_addr;",
+                "        proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;",
+                "        proxy_set_header X-Forwarded-Host $host;",
+                "        proxy_set_header X-Forwarded-Proto $scheme;",
+                "    }",
+            ]
+        )
+    if edge.media_root:
+        if lines:
+            lines.append("")
+        lines.extend(
+            [
+                "    location ^~ /media/ {",
+                f"        alias {edge.media_root.rstrip('/')}/;",
+                "        access_log off;",
+                "        expires 1h;",
+                "    }",
+            ]
+        )
+    return lines
+
+
 def proxy_block(
     port: int | None = None,
     *,
     trailing_slash: bool = True,
     external_websockets: bool = True,
     proxy_target: str | None = None,
+    microcache_seconds: int = 0,
 ) -> str:
-    """Return the proxy pass configuration block for *port* or *proxy_target*."""
+    """Return the proxy pass configuration block for *port* or *proxy_target*.
+
+    A positive *microcache_seconds* caches anonymous responses for that long;
+    it requires the zone from :func:`microcache_blocks` in the http context.
+    """
 
     if proxy_target is None and port is None:
         raise ValueError("proxy_block requires a port or proxy_target")
@@ -169,6 +330,10 @@ def proxy_block(
             """
         ).strip()
 
+    proxy_lines = [websocket_lines]
+    if microcache_seconds > 0:
+        proxy_lines.append(_microcache_directives(microcache_seconds))
+
     return "\n".join(
         [
             textwrap.dedent(
@@ -186,7 +351,7 @@ def proxy_block(
             proxy_http_version 1.1;
         """
             ).strip(),
-            textwrap.indent(websocket_lines, "    "),
+            textwrap.indent("\n".join(proxy_lines), "    "),
             textwrap.dedent(
                 """
             proxy_set_header Host $host;
@@ -249,6 +414,7 @@ def http_proxy_server(
     trailing_slash: bool = True,
     external_websockets: bool = True,
     proxy_target: str | None = None,
+    edge: EdgeOptions | None = None,
 ) -> str:
     """Return an HTTP proxy server block for *server_names*."""
 
@@ -264,6 +430,10 @@ def http_proxy_server(
     lines.append("")
     lines.extend(maintenance_block_lines())
     lines.append("")
+    edge_lines = edge_location_lines(edge, proxy_target or f"127.0.0.1:{port}")
+    if edge_lines:
+        lines.extend(edge_lines)
+        lines.append("")
     lines.append(
         textwrap.indent(
             proxy_block(
@@ -271,6 +441,7 @@ def http_proxy_server(
                 trailing_slash=trailing_slash,
                 external_websockets=external_websockets,
                 proxy_target=proxy_target,
+                microcache_seconds=edge.microcache_seconds if edge else 0,
             ),
             "    ",
         )
@@ -334,6 +505,7 @@ def https_proxy_server(
     trailing_slash: bool = True,
     external_websockets: bool = True,
     proxy_target: str | None = None,
+    edge: EdgeOptions | None = None,
 ) -> str:
     """Return an HTTPS proxy server block for *server_names*."""
 
@@ -360,6 +532,10 @@ def https_proxy_server(
     lines.append("")
     lines.extend(maintenance_block_lines())
     lines.append("")
+    edge_lines = edge_location_lines(edge, proxy_target or f"127.0.0.1:{port}")
+    if edge_lines:
+        lines.extend(edge_lines)
+        lines.append("")
     lines.append(
         textwrap.indent(
             proxy_block(
@@ -367,6 +543,7 @@ def https_proxy_server(
                 trailing_slash=trailing_slash,
                 external_websockets=external_websockets,
                 proxy_target=proxy_target,
+                microcache_seconds=edge.microcache_seconds if edge else 0,
             ),
             "    ",
         )
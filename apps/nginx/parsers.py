@@ -9,7 +9,8 @@ from django.utils.translation import gettext_lazy as _
 
 
 SUBDOMAIN_PREFIX_RE = re.compile(r"^[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?$")
-NGINX_PROXY_PASS_RE = re.compile(r"proxy_pass\s+https?://[^:]+:(\d+)")
+# Matches ``proxy_pass http://host:port`` and upstream ``server host:port;`` entries.
+NGINX_PROXY_PASS_RE = re.compile(r"(?:proxy_pass\s+https?://|\bserver\s+)[^:\s;{]+:(\d+)")
 NGINX_SSL_LISTEN_RE = re.compile(r"listen\s+[^;]*\b443\b[^;]*ssl", re.IGNORECASE)
 NGINX_SSL_CERTIFICATE_RE = re.compile(r"ssl_certificate\s+[^;]+;", re.IGNORECASE)
 NGINX_IPV6_LISTEN_RE = re.compile(r"listen\s+\[::\][^;]*;", re.IGNORECASE)
@@ -4,11 +4,15 @@ import json
 from pathlib import Path
 
 from apps.nginx.config_utils import (
+    EdgeOptions,
     default_reject_server,
     http_proxy_server,
     http_redirect_server,
     https_proxy_server,
+    microcache_blocks,
     slugify,
+    upstream_block,
+    upstream_name,
     websocket_map,
 )
 
@@ -80,6 +84,7 @@ def generate_primary_config(
     https_enabled: bool = False,
     include_ipv6: bool = False,
     external_websockets: bool = True,
+    edge: EdgeOptions | None = None,
 ) -> str:
     """Render the primary nginx config for public or internal deployments.
 
@@ -92,6 +97,8 @@ def generate_primary_config(
         https_enabled: Whether HTTPS blocks should be rendered.
         include_ipv6: Whether IPv6 listeners should be added.
         external_websockets: Whether websocket support directives are enabled.
+        edge: Optional static/media and microcache options; read from settings
+            when omitted.
 
     Returns:
         The rendered nginx configuration for the primary site.
@@ -115,9 +122,15 @@ def generate_primary_config(
     certificate_path = getattr(certificate, "certificate_path", None)
     certificate_key_path = getattr(certificate, "certificate_key_path", None)
 
-    prefix_blocks: list[str] = []
-    proxy_target = f"127.0.0.1:{port}"
+    if edge is None:
+        edge = EdgeOptions.from_settings()
 
+    app_server = f"127.0.0.1:{port}"
+    prefix_blocks: list[str] = [upstream_block(app_server)]
+    proxy_target = upstream_name(app_server)
+
+    if edge.microcache_seconds > 0:
+        prefix_blocks.append(microcache_blocks(edge))
     if external_websockets:
         prefix_blocks.insert(0, websocket_map())
 
@@ -134,6 +147,7 @@ def generate_primary_config(
                 trailing_slash=False,
                 external_websockets=external_websockets,
                 proxy_target=proxy_target,
+                edge=edge,
             )
         http_default = default_reject_server(http_listens)
 
@@ -148,6 +162,7 @@ def generate_primary_config(
                 trailing_slash=False,
                 external_websockets=external_websockets,
                 proxy_target=proxy_target,
+                edge=edge,
             )
             https_default = default_reject_server(
                 https_listens,
@@ -166,6 +181,7 @@ def generate_primary_config(
         trailing_slash=False,
         external_websockets=external_websockets,
         proxy_target=proxy_target,
+        edge=edge,
     )
     blocks = [*prefix_blocks, http_block]
 
@@ -179,6 +195,7 @@ def generate_primary_config(
             trailing_slash=False,
             external_websockets=external_websockets,
             proxy_target=proxy_target,
+            edge=edge,
         )
         blocks.append(https_block)
     return "\n\n".join(blocks) + "\n"
@@ -195,6 +212,7 @@ def generate_site_entries_content(
     proxy_target: str | None = None,
     subdomain_prefixes: list[str] | None = None,
     excluded_domains: set[str] | None = None,
+    edge: EdgeOptions | None = None,
 ) -> str:
     """Render managed site server blocks from staged site definitions.
 
@@ -209,6 +227,7 @@ def generate_site_entries_content(
         subdomain_prefixes: Optional managed-site subdomain prefixes.
         excluded_domains: Optional set of domains to omit from managed-site rendering
             (case-insensitive).
+        edge: Optional static/media and microcache options for the server blocks.
 
     Returns:
         The rendered nginx server blocks for managed sites.
@@ -257,6 +276,7 @@ def generate_site_entries_content(
                     port,
                     external_websockets=external_websockets,
                     proxy_target=proxy_target,
+                    edge=edge,
                 )
             )
 
@@ -268,6 +288,7 @@ def generate_site_entries_content(
                     listens=https_listens,
                     external_websockets=external_websockets,
                     proxy_target=proxy_target,
+                    edge=edge,
                 )
             )
         elif require_https:
@@ -292,6 +313,7 @@ def generate_unified_config(
     external_websockets: bool = True,
     site_config_path: Path | None = None,
     subdomain_prefixes: list[str] | None = None,
+    edge: EdgeOptions | None = None,
 ) -> str:
     """Return the single nginx config that combines primary and managed sites.
 
@@ -304,11 +326,16 @@ def generate_unified_config(
         external_websockets: Whether websocket support directives are enabled.
         site_config_path: Optional path to staged managed-site definitions.
         subdomain_prefixes: Optional managed-site subdomain prefixes.
+        edge: Optional static/media and microcache options; read from settings
+            when omitted.
 
     Returns:
         The rendered unified nginx configuration.
     """
 
+    if edge is None:
+        edge = EdgeOptions.from_settings()
+
     primary_content = generate_primary_config(
         mode,
         port,
@@ -316,6 +343,7 @@ def generate_unified_config(
         https_enabled=https_enabled,
         include_ipv6=include_ipv6,
         external_websockets=external_websockets,
+        edge=edge,
     ).rstrip()
 
     parts = [primary_content]
@@ -333,8 +361,10 @@ def generate_unified_config(
             https_enabled=https_enabled,
             include_ipv6=include_ipv6,
             external_websockets=external_websockets,
+            proxy_target=upstream_name(f"127.0.0.1:{port}"),
             subdomain_prefixes=subdomain_prefixes,
             excluded_domains=excluded_domains,
+            edge=edge,
         ).rstrip()
         parts.append(managed_content)
 
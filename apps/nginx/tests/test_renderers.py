@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import json
+import re
+
+from django.test.utils import override_settings
+
+from apps.nginx.config_utils import HASHED_ASSET_PATTERN, EdgeOptions
+from apps.nginx.parsers import _extract_proxy_port
+from apps.nginx.renderers import generate_primary_config, generate_unified_config
+
+
+def _location(content: str, header: str) -> str:
+    start = content.index(header)
+    return content[start : content.index("\n    }\n", start)]
+
+
+def test_primary_config_proxies_through_keepalive_upstream():
+    content = generate_primary_config("internal", 8888, edge=EdgeOptions())
+
+    assert "upstream arthexis_127_0_0_1_8888 {\n    server 127.0.0.1:8888;\n    keepalive 32;\n}" in content
+    assert "proxy_pass http://arthexis_127_0_0_1_8888;" in content
+    assert "'' '';" in content
+    assert "location ^~ /static/" not in content
+    assert "proxy_cache " not in content
+    assert _extract_proxy_port(content) == 8888
+
+
+def test_static_location_serves_precompressed_assets_with_app_fallback():
+    edge = EdgeOptions(static_root="/srv/arthexis/static/")
+    content = generate_primary_config("internal", 8888, edge=edge)
+
+    static = _location(content, "location ^~ /static/ {")
+    assert "alias /srv/arthexis/static/;" in static
+    assert "gzip_static on;" in static
+    assert "brotli_static" not in static
+    assert "error_page 404 = @arthexis_app;" in static
+    assert 'add_header Cache-Control "public, max-age=31536000, immutable";' in static
+    assert "location @arthexis_app {\n        proxy_pass http://arthexis_127_0_0_1_8888;" in content
+    assert "location ^~ /media/" not in content
+
+    hashed = re.compile(HASHED_ASSET_PATTERN, re.IGNORECASE)
+    assert hashed.search("/static/core/base.3f2a9c0d1e4b.css")
+    assert not hashed.search("/static/core/base.css")
+
+
+def _cache_control_directives(content: str) -> dict[str, int]:
+    """Count the Cache-Control headers each location emits, with inheritance."""
+
+    counts: dict[str, int] = {}
+    stack: list[dict] = []
+    for raw in content.splitlines():
+        line = raw.strip()
+        if line.startswith("location ") and line.endswith("{"):
+            parent = stack[-1] if stack else {"expires": None, "headers": 0}
+            stack.append(
+                {
+                    "name": line[: -1].strip(),
+                    "expires": parent["expires"],
+                    "inherited_headers": parent["headers"],
+                    "headers": 0,
+                    "own_headers": False,
+                }
+            )
+        elif line == "}" and stack:
+            block = stack.pop()
+            headers = block["headers"] if block["own_headers"] else block["inherited_headers"]
+            expires = block["expires"] not in (None, "off")
+            counts[block["name"]] = headers + int(expires)
+        elif stack and line.startswith("expires "):
+            stack[-1]["expires"] = line.removeprefix("expires ").rstrip(";")
+        elif stack and line.startswith("add_header "):
+            stack[-1]["own_headers"] = True
+            stack[-1]["headers"] += int(line.startswith("add_header Cache-Control "))
+    return counts
+
+
+def test_edge_locations_emit_one_cache_control_header():
+    edge = EdgeOptions(static_root="/srv/static", media_root="/srv/media")
+    content = generate_primary_config("internal", 8888, edge=edge)
+
+    counts = _cache_control_directives(content)
+    edge_locations = {
+        name: count
+        for name, count in counts.items()
+        if "/static/" in name or "/media/" in name or HASHED_ASSET_PATTERN in name
+    }
+    assert len(edge_locations) == 3
+    assert set(edge_locations.values()) == {1}
+
+
+def test_brotli_and_media_are_opt_in():
+    edge = EdgeOptions(static_root="/srv/static", media_root="/srv/media", brotli_static=True)
+    content = generate_primary_config("internal", 8888, edge=edge)
+
+    assert "brotli_static on;" in _location(content, "location ^~ /static/ {")
+    media = _location(content, "location ^~ /media/ {")
+    assert "alias /srv/media/;" in media
+    assert "error_page" not in media
+
+
+def test_microcache_skips_sessions_authorization_and_websockets():
+    edge = EdgeOptions(microcache_seconds=5, microcache_path="/tmp/microcache")
+    content = generate_primary_config("internal", 8888, edge=edge)
+
+    http_context = content[: content.index("server {")]
+    assert "proxy_cache_path /tmp/microcache " in http_context
+    assert 'map "$http_upgrade$http_authorization$cookie_sessionid" $arthexis_microcache_bypass' in http_context
+    proxy = _location(content, "location / {")
+    assert "proxy_cache arthexis_microcache;" in proxy
+    assert "proxy_cache_valid 200 5s;" in proxy
+    assert "proxy_cache_bypass $arthexis_microcache_bypass;" in proxy
+    assert "proxy_no_cache $arthexis_microcache_bypass;" in proxy
+
+
+@override_settings(
+    STATIC_ROOT="/srv/app/static",
+    MEDIA_ROOT="/srv/app/media",
+    NGINX_SERVE_MEDIA=False,
+    NGINX_MICROCACHE_SECONDS=3,
+    SESSION_COOKIE_NAME="app-session",
+)
+def test_edge_options_follow_settings():
+    edge = EdgeOptions.from_settings()
+
+    assert edge.static_root == "/srv/app/static"
+    assert edge.media_root is None
+    assert edge.microcache_seconds == 3
+    assert "$cookie_app_session" in generate_primary_config("internal", 8888)
+
+
+def test_unified_config_shares_one_upstream_with_managed_sites(tmp_path):
+    sites = tmp_path / "sites.json"
+    sites.write_text(json.dumps([{"domain": "shop.example.com"}]), encoding="utf-8")
+    edge = EdgeOptions(static_root="/srv/static")
+
+    content = generate_unified_config("public", 8888, site_config_path=sites, edge=edge)
+
+    assert content.count("upstream arthexis_127_0_0_1_8888 {") == 1
+    managed = content[content.index("# Managed site for shop.example.com") :]
+    assert "proxy_pass http://arthexis_127_0_0_1_8888/;" in managed
+    assert "location ^~ /static/ {" in managed
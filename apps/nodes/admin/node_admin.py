@@ -35,6 +35,7 @@ from apps.core.admin import SaveBeforeChangeAction
 from apps.discovery.services import record_discovery_item, start_discovery
 from apps.locals.user_data import EntityModelAdmin
 from apps.nodes.logging import get_register_visitor_logger
+from apps.nodes.services.peer_polling import PeerPollError, RegistrationCredentials
 from apps.ocpp import store
 from apps.ocpp.models import (
     Charger,
@@ -859,43 +860,10 @@ class NodeAdmin(SaveBeforeChangeAction, EntityModelAdmin):
             except Exception as exc:  # pragma: no cover - unexpected errors
                 return {"ok": False, "message": str(exc)}
 
-        security_dir = local_node.get_base_path() / "security"
-        priv_path = security_dir / f"{local_node.public_endpoint}"
-        if not priv_path.exists():
-            return {
-                "ok": False,
-                "message": "Local node private key not found.",
-            }
         try:
-            private_key = serialization.load_pem_private_key(
-                priv_path.read_bytes(), password=None
-            )
-        except Exception as exc:  # pragma: no cover - unexpected errors
-            return {"ok": False, "message": f"Failed to load private key: {exc}"}
-
-        token = uuid.uuid4().hex
-        signature, error = Node.sign_payload(token, private_key)
-        if error or not signature:
-            return {"ok": False, "message": f"Failed to sign payload: {error}"}
-
-        payload = {
-            "hostname": local_node.hostname,
-            "network_hostname": local_node.network_hostname,
-            "address": local_node.address,
-            "ipv4_address": local_node.ipv4_address,
-            "ipv6_address": local_node.ipv6_address,
-            "port": local_node.port,
-            "mac_address": local_node.mac_address,
-            "public_key": local_node.public_key,
-            "token": token,
-            "signature": signature,
-        }
-        if local_node.installed_version:
-            payload["installed_version"] = local_node.installed_version
-        if local_node.installed_revision:
-            payload["installed_revision"] = local_node.installed_revision
-
-        payload_json = json.dumps(payload, separators=(",", ":"), sort_keys=True)
+            payload_json = RegistrationCredentials.for_node(local_node).signed_body()
+        except PeerPollError as exc:
+            return {"ok": False, "message": str(exc)}
         headers = {"Content-Type": "application/json"}
 
         last_error = ""
@@ -0,0 +1,263 @@
+"""Benchmark peer polling cycle time against simulated peers."""
+
+from __future__ import annotations
+
+import json
+import random
+import time
+from dataclasses import dataclass
+from ipaddress import IPv4Address
+from urllib.parse import urlsplit
+
+import requests
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.core.management.base import CommandError
+from django.db import transaction
+
+from apps.core.benchmarks import BenchmarkScenario
+from apps.nodes.models import Node
+from apps.nodes.services.peer_polling import (
+    PeerPoller,
+    RegistrationCredentials,
+    node_info_cursor,
+)
+from apps.nodes.tasks import _resolve_node_admin
+
+DEFAULT_SIZES = (5, 50, 500)
+BENCH_NETWORK = IPv4Address("10.77.0.1")
+
+
+class _SimulatedPeers:
+    """Transport answering peer requests in-process after a per-host delay.
+
+    A host mapped to ``None`` refuses connections; a delay above the request
+    timeout sleeps for the timeout and then times out.
+    """
+
+    def __init__(self, delays: dict[str, float | None]) -> None:
+        self.delays = delays
+        self.full_responses = 0
+        self.unchanged_responses = 0
+
+    def _wait(self, url: str, timeout: float) -> str:
+        host = urlsplit(url).hostname or ""
+        delay = self.delays.get(host)
+        if delay is None:
+            raise requests.ConnectionError(f"Connection refused: {url}")
+        time.sleep(min(delay, timeout))
+        if delay > timeout:
+            raise requests.Timeout(f"Read timed out: {url}")
+        return host
+
+    @staticmethod
+    def _response(payload: dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response._content = json.dumps(payload).encode()
+        return response
+
+    def get(self, url: str, *, params: dict[str, str], timeout: float):
+        host = self._wait(url, timeout)
+        data = {
+            "hostname": host,
+            "address": host,
+            "port": 8888,
+            "installed_version": "1.0",
+        }
+        cursor = node_info_cursor(data)
+        if params.get("since") == cursor:
+            self.unchanged_responses += 1
+            return self._response({"sync_cursor": cursor, "unchanged": True})
+        self.full_responses += 1
+        return self._response(dict(data, sync_cursor=cursor))
+
+    def post(self, url: str, *, data: str, headers: dict[str, str], timeout: float):
+        self._wait(url, timeout)
+        return self._response({"id": 1})
+
+
+def _seed_peers(
+    size: int, *, latency: float, slow_latency: float
+) -> tuple[list[Node], _SimulatedPeers]:
+    """Create ``size`` peer nodes; one in ten is down and one in ten is too slow."""
+
+    rng = random.Random(0)
+    delays: dict[str, float | None] = {}
+    nodes = []
+    for index in range(size):
+        host = str(BENCH_NETWORK + index)
+        bucket = index % 10
+        if bucket == 1:
+            delays[host] = slow_latency
+        elif bucket != 2:
+            delays[host] = latency * rng.uniform(0.5, 1.5)
+        nodes.append(
+            Node(
+                hostname=host,
+                address=host,
+                port=8888,
+                public_endpoint=f"bench-peer-{index}",
+                current_relation=Node.Relation.PEER,
+                installed_version="1.0",
+            )
+        )
+    return Node.objects.bulk_create(nodes), _SimulatedPeers(delays)
+
+
+def _credentials() -> RegistrationCredentials:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return RegistrationCredentials(
+        payload={"hostname": "bench-local", "port": 8888}, private_key=private_key
+    )
+
+
+@dataclass
+class BenchmarkRun:
+    peers: int
+    mode: str
+    duration_seconds: float
+    reachable: int
+    full_responses: int
+    unchanged_responses: int
+
+    def to_dict(self) -> dict:
+        return {
+            "peers": self.peers,
+            "mode": self.mode,
+            "duration_seconds": self.duration_seconds,
+            "reachable": self.reachable,
+            "full_responses": self.full_responses,
+            "unchanged_responses": self.unchanged_responses,
+        }
+
+
+class _Rollback(Exception):
+    pass
+
+
+class PeerPollingBenchmark(BenchmarkScenario):
+    help = (
+        "Benchmark peer polling cycle time against simulated peers that "
+        "inject latency and failures. Compares a sequential full refresh with "
+        "concurrent polling (first cycle and delta cycle). Peer rows are written "
+        "inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=list(DEFAULT_SIZES),
+            help="Peer counts to benchmark (default: 5 50 500).",
+        )
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.02,
+            help="Typical stub peer response latency in seconds (default: 0.02).",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=0.25,
+            help="Per-request timeout in seconds (default: 0.25).",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=16,
+            help="Worker threads for concurrent polling (default: 16).",
+        )
+        parser.add_argument(
+            "--skip-sequential",
+            action="store_true",
+            help="Skip the sequential baseline.",
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Emit JSON summary output."
+        )
+
+    def handle(self, **options):
+        sizes = sorted(set(options["sizes"]))
+        if any(size <= 0 for size in sizes):
+            raise CommandError("--sizes values must be greater than zero.")
+        if options["concurrency"] < 1:
+            raise CommandError("--concurrency must be at least 1.")
+
+        credentials = _credentials()
+        results: list[BenchmarkRun] = []
+        for size in sizes:
+            try:
+                with transaction.atomic():
+                    results.extend(self._run_size(size, credentials, options))
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+        payload = {"runs": [run.to_dict() for run in results]}
+        if options["json"]:
+            self.stdout.write(json.dumps(payload, indent=2))
+            return
+
+        self.stdout.write("Peer polling benchmark summary:")
+        for run in results:
+            self.stdout.write(
+                f"  {run.peers} peers {run.mode}: {run.duration_seconds * 1000:.1f} ms, "
+                f"{run.reachable} reachable, {run.full_responses} full / "
+                f"{run.unchanged_responses} unchanged responses"
+            )
+
+    def _run_size(self, size: int, credentials, options) -> list[BenchmarkRun]:
+        nodes, network = _seed_peers(
+            size,
+            latency=options["latency"],
+            slow_latency=options["timeout"] * 4,
+        )
+        node_admin = _resolve_node_admin()
+        modes = [
+            ("concurrent_first", options["concurrency"], False),
+            ("concurrent_delta", options["concurrency"], False),
+        ]
+        if not options["skip_sequential"]:
+            modes.insert(0, ("sequential_full", 1, True))
+
+        results = []
+        for mode, concurrency, reset_cursor in modes:
+            if reset_cursor:
+                Node.objects.filter(pk__in=[node.pk for node in nodes]).update(
+                    poll_sync_cursor=""
+                )
+            network.full_responses = network.unchanged_responses = 0
+            poller = PeerPoller(
+                node_admin,
+                transport=network,
+                credentials=credentials,
+                concurrency=concurrency,
+                timeout=options["timeout"],
+                deadline=options["timeout"] * 3,
+            )
+            peers = list(
+                PeerPoller.peer_queryset(due_only=False).filter(
+                    pk__in=[node.pk for node in nodes]
+                )
+            )
+            began = time.perf_counter()
+            polled = poller.poll(peers)
+            duration = time.perf_counter() - began
+            results.append(
+                BenchmarkRun(
+                    peers=size,
+                    mode=mode,
+                    duration_seconds=duration,
+                    reachable=sum(1 for _, local, _ in polled if local.get("ok")),
+                    full_responses=network.full_responses,
+                    unchanged_responses=network.unchanged_responses,
+                )
+            )
+            if reset_cursor:
+                Node.objects.filter(pk__in=[node.pk for node in nodes]).update(
+                    poll_sync_cursor=""
+                )
+        return results
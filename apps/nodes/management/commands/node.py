@@ -662,10 +662,10 @@ class Command(BaseCommand):
         )
 
     def _handle_peers(self, **options):
-        self._report_summary(poll_peers())
+        self._report_summary(poll_peers(due_only=False))
 
     def _handle_check(self, **options):
-        self._report_summary(poll_peers(enforce_feature=False))
+        self._report_summary(poll_peers(enforce_feature=False, due_only=False))
 
     def _handle_ready(self, **options):
         self._run_registration_checks()
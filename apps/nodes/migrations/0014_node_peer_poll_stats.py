@@ -0,0 +1,72 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("nodes", "0013_node_reserved"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="node",
+            name="last_poll_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When the peer poller last contacted this node.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="node",
+            name="next_poll_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Earliest time the peer poller will contact this node again.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="node",
+            name="last_poll_change_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When a peer poll last returned changed node information.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="node",
+            name="poll_rtt_ms",
+            field=models.FloatField(
+                blank=True,
+                help_text="Round-trip time of the last successful peer poll in milliseconds.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="node",
+            name="poll_failure_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Consecutive peer polls that could not reach this node.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="node",
+            name="poll_failure_total",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Peer polls that could not reach this node.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="node",
+            name="poll_sync_cursor",
+            field=models.CharField(
+                blank=True,
+                help_text="Watermark of the last node information received from this peer.",
+                max_length=64,
+            ),
+        ),
+    ]
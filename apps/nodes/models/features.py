@@ -584,8 +584,8 @@ class NodeFeatureMixin:
 
         if celery_enabled:
             schedule, _ = IntervalSchedule.objects.get_or_create(
-                every=1,
-                period=IntervalSchedule.HOURS,
+                every=5,
+                period=IntervalSchedule.MINUTES,
             )
             PeriodicTask.objects.update_or_create(
                 name=task_name,
@@ -598,7 +598,8 @@ class NodeFeatureMixin:
                     "args": "[]",
                     "kwargs": "{}",
                     "description": (
-                        "Refreshes node details hourly using the admin Update nodes action."
+                        "Polls peer nodes that are due for a refresh; each peer "
+                        "keeps its own adaptive interval."
                     ),
                 },
             )
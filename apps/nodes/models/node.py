@@ -174,6 +174,39 @@ class Node(NodeFeatureMixin, NodeNetworkingMixin, Entity):
     mesh_key_fingerprint_metadata = models.JSONField(default=dict, blank=True)
     last_mesh_heartbeat = models.DateTimeField(null=True, blank=True)
     mesh_capability_flags = models.JSONField(default=list, blank=True)
+    last_poll_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the peer poller last contacted this node.",
+    )
+    next_poll_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Earliest time the peer poller will contact this node again.",
+    )
+    last_poll_change_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When a peer poll last returned changed node information.",
+    )
+    poll_rtt_ms = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Round-trip time of the last successful peer poll in milliseconds.",
+    )
+    poll_failure_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Consecutive peer polls that could not reach this node.",
+    )
+    poll_failure_total = models.PositiveIntegerField(
+        default=0,
+        help_text="Peer polls that could not reach this node.",
+    )
+    poll_sync_cursor = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="Watermark of the last node information received from this peer.",
+    )
     upgrade_policies = models.ManyToManyField(
         "nodes.UpgradePolicy",
         through="nodes.NodeUpgradePolicyAssignment",
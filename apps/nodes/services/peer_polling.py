@@ -0,0 +1,465 @@
+"""Concurrent peer polling with adaptive cadence and delta sync.
+
+Each poll cycle contacts the peers that are due, with a bounded worker pool
+and a per-peer deadline so one slow or offline peer cannot stall the cycle.
+Worker threads only perform network I/O; node information and poll
+statistics are written from the calling thread once every exchange has
+finished.
+
+Peers answer ``/nodes/info/`` requests carrying the last ``sync_cursor`` they
+handed out with a small ``{"unchanged": true}`` response when their
+information has not changed since.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterable
+
+import requests
+from cryptography.hazmat.primitives import serialization
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils import timezone
+from requests import RequestException
+
+from apps.core.metrics import counter, histogram
+from apps.nodes.models.node import Node
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_TIMEOUT_SECONDS = 5.0
+DEFAULT_DEADLINE_SECONDS = 15.0
+DEFAULT_ACTIVE_INTERVAL_SECONDS = 5 * 60
+DEFAULT_IDLE_INTERVAL_SECONDS = 60 * 60
+DEFAULT_ACTIVE_WINDOW_SECONDS = 60 * 60
+DEFAULT_BACKOFF_BASE_SECONDS = 5 * 60
+DEFAULT_BACKOFF_MAX_SECONDS = 6 * 60 * 60
+
+INFO_PATH = "/nodes/info/"
+REGISTER_PATH = "/nodes/register/"
+
+peer_polls = counter(
+    "nodes_peer_polls_total",
+    "Peer polls by outcome (changed, unchanged or unreachable).",
+    ("outcome",),
+)
+peer_poll_rtt = histogram(
+    "nodes_peer_poll_rtt_seconds",
+    "Round-trip time of successful peer information requests.",
+)
+poll_cycle_duration = histogram(
+    "nodes_peer_poll_cycle_seconds",
+    "Wall-clock time of one peer polling cycle.",
+)
+
+
+class PeerPollError(Exception):
+    """Raised when the local node cannot prepare a registration push."""
+
+
+def _setting(name: str, default: float) -> float:
+    value = getattr(settings, name, default)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float(default)
+
+
+def node_info_cursor(data: dict[str, Any]) -> str:
+    """Return the sync watermark for a ``/nodes/info/`` payload."""
+
+    encoded = json.dumps(
+        data, cls=DjangoJSONEncoder, sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def next_poll_delay(*, failures: int, active: bool) -> timedelta:
+    """Return how long to wait before polling a peer again.
+
+    Unreachable peers back off exponentially from
+    ``NODES_PEER_POLL_BACKOFF_BASE`` up to ``NODES_PEER_POLL_BACKOFF_MAX``.
+    Reachable peers whose information changed recently use the faster
+    ``NODES_PEER_POLL_ACTIVE_INTERVAL``; quiet peers use
+    ``NODES_PEER_POLL_IDLE_INTERVAL``.
+    """
+
+    if failures > 0:
+        base = _setting("NODES_PEER_POLL_BACKOFF_BASE", DEFAULT_BACKOFF_BASE_SECONDS)
+        ceiling = _setting("NODES_PEER_POLL_BACKOFF_MAX", DEFAULT_BACKOFF_MAX_SECONDS)
+        return timedelta(seconds=min(base * 2 ** min(failures - 1, 32), ceiling))
+    if active:
+        return timedelta(
+            seconds=_setting(
+                "NODES_PEER_POLL_ACTIVE_INTERVAL", DEFAULT_ACTIVE_INTERVAL_SECONDS
+            )
+        )
+    return timedelta(
+        seconds=_setting("NODES_PEER_POLL_IDLE_INTERVAL", DEFAULT_IDLE_INTERVAL_SECONDS)
+    )
+
+
+@dataclass(frozen=True)
+class RegistrationCredentials:
+    """Local node details pushed to peers through ``/nodes/register/``."""
+
+    payload: dict[str, Any]
+    private_key: Any
+
+    @classmethod
+    def for_node(cls, local_node: Node) -> "RegistrationCredentials":
+        security_dir = local_node.get_base_path() / "security"
+        priv_path = security_dir / f"{local_node.public_endpoint}"
+        if not priv_path.exists():
+            raise PeerPollError("Local node private key not found.")
+        try:
+            private_key = serialization.load_pem_private_key(
+                priv_path.read_bytes(), password=None
+            )
+        except Exception as exc:  # pragma: no cover - unexpected errors
+            raise PeerPollError(f"Failed to load private key: {exc}") from exc
+
+        payload = {
+            "hostname": local_node.hostname,
+            "network_hostname": local_node.network_hostname,
+            "address": local_node.address,
+            "ipv4_address": local_node.ipv4_address,
+            "ipv6_address": local_node.ipv6_address,
+            "port": local_node.port,
+            "mac_address": local_node.mac_address,
+            "public_key": local_node.public_key,
+        }
+        if local_node.installed_version:
+            payload["installed_version"] = local_node.installed_version
+        if local_node.installed_revision:
+            payload["installed_revision"] = local_node.installed_revision
+        return cls(payload=payload, private_key=private_key)
+
+    def signed_body(self) -> str:
+        """Return the JSON request body with a fresh signed token."""
+
+        token = uuid.uuid4().hex
+        signature, error = Node.sign_payload(token, self.private_key)
+        if error or not signature:
+            raise PeerPollError(f"Failed to sign payload: {error}")
+        payload = dict(self.payload, token=token, signature=signature)
+        return json.dumps(payload, separators=(",", ":"), sort_keys=True)
+
+
+class HttpPeerTransport:
+    """Issue peer requests through one keep-alive session per worker thread."""
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
+
+    def get(self, url: str, *, params: dict[str, str], timeout: float):
+        return self._session().get(url, params=params, timeout=timeout)
+
+    def post(self, url: str, *, data: str, headers: dict[str, str], timeout: float):
+        return self._session().post(url, data=data, headers=headers, timeout=timeout)
+
+
+@dataclass
+class PeerExchange:
+    """Network outcome of polling one peer."""
+
+    node: Node
+    info: dict[str, Any] | None = None
+    info_url: str = ""
+    info_error: str = ""
+    unchanged: bool = False
+    sync_cursor: str = ""
+    rtt_seconds: float | None = None
+    push_ok: bool = False
+    push_url: str = ""
+    push_error: str = ""
+    host_candidates: list[str] = field(default_factory=list)
+
+    @property
+    def info_ok(self) -> bool:
+        return self.unchanged or self.info is not None
+
+    @property
+    def reachable(self) -> bool:
+        return self.info_ok or self.push_ok
+
+
+class PeerPoller:
+    """Poll peer nodes concurrently and record per-peer statistics."""
+
+    def __init__(
+        self,
+        node_admin,
+        *,
+        transport=None,
+        credentials: RegistrationCredentials | None = None,
+        credentials_error: str = "",
+        concurrency: int | None = None,
+        timeout: float | None = None,
+        deadline: float | None = None,
+        clock: Callable[[], datetime] = timezone.now,
+    ) -> None:
+        self.node_admin = node_admin
+        self.transport = transport or HttpPeerTransport()
+        self.credentials = credentials
+        self.credentials_error = credentials_error
+        self.concurrency = max(
+            1,
+            int(
+                concurrency
+                if concurrency is not None
+                else _setting("NODES_PEER_POLL_CONCURRENCY", DEFAULT_CONCURRENCY)
+            ),
+        )
+        self.timeout = (
+            timeout
+            if timeout is not None
+            else _setting("NODES_PEER_POLL_TIMEOUT", DEFAULT_TIMEOUT_SECONDS)
+        )
+        self.deadline = (
+            deadline
+            if deadline is not None
+            else _setting("NODES_PEER_POLL_DEADLINE", DEFAULT_DEADLINE_SECONDS)
+        )
+        self.clock = clock
+
+    @staticmethod
+    def peer_queryset(*, due_only: bool = True, now: datetime | None = None):
+        """Return peers to poll, limited to those due when ``due_only`` is set."""
+
+        qs = Node.objects.filter(current_relation=Node.Relation.PEER).select_related(
+            "base_site", "base_site__profile"
+        )
+        if due_only:
+            qs = qs.filter(
+                Q(next_poll_at__isnull=True) | Q(next_poll_at__lte=now or timezone.now())
+            )
+        return qs.order_by("pk")
+
+    def poll(self, nodes: Iterable[Node]) -> list[tuple[Node, dict, dict]]:
+        """Poll ``nodes`` and return ``(node, local_result, remote_result)`` tuples."""
+
+        nodes = list(nodes)
+        started = time.perf_counter()
+        exchanges: dict[int, PeerExchange] = {}
+        remote_nodes = [node for node in nodes if not node.is_local]
+        if remote_nodes:
+            workers = min(self.concurrency, len(remote_nodes))
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="peer-poll"
+            ) as executor:
+                for exchange in executor.map(self._exchange, remote_nodes):
+                    exchanges[exchange.node.pk] = exchange
+
+        results = []
+        for node in nodes:
+            exchange = exchanges.get(node.pk)
+            if exchange is None:
+                results.append(self._poll_local(node))
+                continue
+            results.append(self._apply(exchange))
+        poll_cycle_duration.observe(time.perf_counter() - started)
+        return results
+
+    def _poll_local(self, node: Node) -> tuple[Node, dict, dict]:
+        try:
+            local_result = self.node_admin._refresh_local_information(node)
+        except Exception as exc:  # pragma: no cover - unexpected admin failure
+            logger.exception("Local refresh failed for node %s", node.pk)
+            local_result = {"ok": False, "message": str(exc)}
+        try:
+            remote_result = self.node_admin._push_remote_information(node)
+        except Exception as exc:  # pragma: no cover - unexpected admin failure
+            logger.exception("Remote update failed for node %s", node.pk)
+            remote_result = {"ok": False, "message": str(exc)}
+        return node, local_result, remote_result
+
+    def _exchange(self, node: Node) -> PeerExchange:
+        exchange = PeerExchange(node=node)
+        expires_at = time.monotonic() + self.deadline
+        try:
+            self._fetch_info(exchange, expires_at)
+            self._push_registration(exchange, expires_at)
+            if not (exchange.info_ok and exchange.push_ok):
+                exchange.host_candidates = node.get_remote_host_candidates()
+        except Exception as exc:  # pragma: no cover - unexpected worker failure
+            logger.exception("Peer poll failed for node %s", node.pk)
+            exchange.info_error = exchange.info_error or str(exc)
+            exchange.push_error = exchange.push_error or str(exc)
+        return exchange
+
+    def _request_timeout(self, expires_at: float) -> float | None:
+        remaining = expires_at - time.monotonic()
+        if remaining <= 0:
+            return None
+        return min(self.timeout, remaining)
+
+    def _fetch_info(self, exchange: PeerExchange, expires_at: float) -> None:
+        node = exchange.node
+        params = {"since": node.poll_sync_cursor} if node.poll_sync_cursor else {}
+        for url in node.iter_remote_urls(INFO_PATH):
+            timeout = self._request_timeout(expires_at)
+            if timeout is None:
+                exchange.info_error = "Peer poll deadline exceeded."
+                return
+            began = time.perf_counter()
+            try:
+                response = self.transport.get(url, params=params, timeout=timeout)
+            except RequestException as exc:
+                exchange.info_error = str(exc)
+                continue
+            if not response.ok:
+                exchange.info_error = f"{response.status_code} {response.reason}"
+                continue
+            try:
+                payload = response.json()
+            except ValueError:
+                exchange.info_error = "Invalid JSON response"
+                continue
+            if not isinstance(payload, dict):
+                exchange.info_error = "Invalid JSON response"
+                continue
+            exchange.rtt_seconds = time.perf_counter() - began
+            exchange.info_url = url
+            exchange.sync_cursor = str(payload.get("sync_cursor") or "")[:64]
+            if payload.get("unchanged") and exchange.sync_cursor:
+                exchange.unchanged = True
+            else:
+                exchange.info = payload
+            exchange.info_error = ""
+            return
+
+    def _push_registration(self, exchange: PeerExchange, expires_at: float) -> None:
+        if self.credentials is None:
+            exchange.push_error = self.credentials_error or "Local node is not registered."
+            return
+        try:
+            body = self.credentials.signed_body()
+        except PeerPollError as exc:
+            exchange.push_error = str(exc)
+            return
+        headers = {"Content-Type": "application/json"}
+        for url in exchange.node.iter_remote_urls(REGISTER_PATH):
+            timeout = self._request_timeout(expires_at)
+            if timeout is None:
+                exchange.push_error = "Peer poll deadline exceeded."
+                return
+            try:
+                response = self.transport.post(
+                    url, data=body, headers=headers, timeout=timeout
+                )
+            except RequestException as exc:
+                exchange.push_error = str(exc)
+                continue
+            if response.ok:
+                exchange.push_ok = True
+                exchange.push_url = url
+                exchange.push_error = ""
+                return
+            exchange.push_error = f"{response.status_code} {response.text}"
+
+    def _apply(self, exchange: PeerExchange) -> tuple[Node, dict, dict]:
+        node = exchange.node
+        now = self.clock()
+        changed = False
+
+        if exchange.info is not None:
+            try:
+                updated = self.node_admin._apply_remote_node_info(node, exchange.info)
+            except Exception as exc:  # pragma: no cover - unexpected admin failure
+                logger.exception("Applying remote information failed for node %s", node.pk)
+                local_result = {"ok": False, "message": str(exc)}
+            else:
+                changed = any(name != "last_updated" for name in updated)
+                local_result = {
+                    "ok": True,
+                    "url": exchange.info_url,
+                    "updated_fields": updated,
+                    "message": (
+                        "Remote information applied."
+                        if updated
+                        else "Remote information fetched (no changes)."
+                    ),
+                }
+        elif exchange.unchanged:
+            local_result = {
+                "ok": True,
+                "url": exchange.info_url,
+                "updated_fields": [],
+                "unchanged": True,
+                "message": "Remote information unchanged since last sync.",
+            }
+        else:
+            local_result = {
+                "ok": False,
+                "message": self.node_admin._build_connectivity_hint(
+                    exchange.info_error, exchange.host_candidates
+                ),
+            }
+
+        if exchange.push_ok:
+            remote_result = {"ok": True, "url": exchange.push_url, "message": "Remote updated."}
+        elif self.credentials is None:
+            remote_result = {"ok": False, "message": exchange.push_error}
+        else:
+            remote_result = {
+                "ok": False,
+                "message": self.node_admin._build_connectivity_hint(
+                    exchange.push_error, exchange.host_candidates
+                ),
+            }
+
+        self._record_stats(exchange, now=now, changed=changed)
+        return node, local_result, remote_result
+
+    def _record_stats(self, exchange: PeerExchange, *, now: datetime, changed: bool) -> None:
+        node = exchange.node
+        updates: dict[str, Any] = {"last_poll_at": now}
+        if exchange.reachable:
+            updates["poll_failure_count"] = 0
+            if changed:
+                updates["last_poll_change_at"] = now
+            if exchange.rtt_seconds is not None:
+                updates["poll_rtt_ms"] = round(exchange.rtt_seconds * 1000.0, 3)
+                peer_poll_rtt.observe(exchange.rtt_seconds)
+            if exchange.info_ok:
+                updates["poll_sync_cursor"] = exchange.sync_cursor
+            if exchange.unchanged:
+                updates["last_updated"] = now
+            last_change = updates.get("last_poll_change_at", node.last_poll_change_at)
+            active_window = timedelta(
+                seconds=_setting(
+                    "NODES_PEER_POLL_ACTIVE_WINDOW", DEFAULT_ACTIVE_WINDOW_SECONDS
+                )
+            )
+            active = last_change is not None and now - last_change <= active_window
+            delay = next_poll_delay(failures=0, active=active)
+            peer_polls.labels("changed" if changed else "unchanged").inc()
+        else:
+            updates["poll_failure_count"] = node.poll_failure_count + 1
+            updates["poll_failure_total"] = node.poll_failure_total + 1
+            delay = next_poll_delay(failures=updates["poll_failure_count"], active=False)
+            peer_polls.labels("unreachable").inc()
+        updates["next_poll_at"] = now + delay
+
+        Node.objects.filter(pk=node.pk).update(**updates)
+        for name, value in updates.items():
+            setattr(node, name, value)
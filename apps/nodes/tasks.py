@@ -31,6 +31,7 @@ from apps.screens.startup_notifications import (
 )
 from utils import revision
 from .models import NetMessage, Node, NodeUpgradePolicyAssignment, PendingNetMessage
+from .services.peer_polling import PeerPoller, PeerPollError, RegistrationCredentials
 
 logger = logging.getLogger(__name__)
 
@@ -494,11 +495,13 @@ def _summarize_update_results(
 
 
 @shared_task
-def poll_peers(enforce_feature: bool = True) -> dict:
+def poll_peers(enforce_feature: bool = True, due_only: bool = True) -> dict:
     """Invoke the admin "Update nodes" workflow for peer nodes.
 
-    When ``enforce_feature`` is False the celery-queue requirement is skipped to
-    allow manual refreshes from management commands.
+    Peers are polled concurrently through :class:`PeerPoller`. Only peers whose
+    adaptive ``next_poll_at`` has passed are contacted unless ``due_only`` is
+    False. When ``enforce_feature`` is False the celery-queue requirement is
+    skipped to allow manual refreshes from management commands.
     """
 
     summary = {
@@ -506,49 +509,54 @@ def poll_peers(enforce_feature: bool = True) -> dict:
         "success": 0,
         "partial": 0,
         "error": 0,
+        "deferred": 0,
         "results": [],
     }
 
     try:
         local_node, _ = Node.register_current(notify_peers=False)
     except Exception as exc:  # pragma: no cover - unexpected registration failure
-        logger.exception("Skipping hourly node refresh; failed to refresh local node")
+        logger.exception("Skipping peer poll; failed to refresh local node")
         summary["skipped"] = True
         summary["reason"] = f"Local node registration failed: {exc}"
         return summary
 
     if local_node is None:
-        logger.info("Skipping hourly node refresh; local node not registered")
+        logger.info("Skipping peer poll; local node not registered")
         summary["skipped"] = True
         summary["reason"] = "Local node not registered"
         return summary
 
     if enforce_feature and not local_node.has_feature("celery-queue"):
         logger.info(
-            "Skipping hourly node refresh; local node missing celery-queue feature"
+            "Skipping peer poll; local node missing celery-queue feature"
         )
         summary["skipped"] = True
         summary["reason"] = "Local node missing celery-queue feature"
         return summary
 
-    node_admin = _resolve_node_admin()
-
-    peer_qs = Node.objects.filter(current_relation=Node.Relation.PEER)
-    for node in peer_qs.order_by("pk").iterator():
-        summary["total"] += 1
-        try:
-            local_result = node_admin._refresh_local_information(node)
-        except Exception as exc:  # pragma: no cover - unexpected admin failure
-            logger.exception("Local refresh failed for node %s", node.pk)
-            local_result = {"ok": False, "message": str(exc)}
-
-        try:
-            remote_result = node_admin._push_remote_information(node)
-        except Exception as exc:  # pragma: no cover - unexpected admin failure
-            logger.exception("Remote update failed for node %s", node.pk)
-            remote_result = {"ok": False, "message": str(exc)}
+    credentials = None
+    credentials_error = ""
+    try:
+        credentials = RegistrationCredentials.for_node(local_node)
+    except PeerPollError as exc:
+        credentials_error = str(exc)
+
+    poller = PeerPoller(
+        _resolve_node_admin(),
+        credentials=credentials,
+        credentials_error=credentials_error,
+    )
+    peers = list(PeerPoller.peer_queryset(due_only=due_only))
+    if due_only:
+        summary["deferred"] = (
+            Node.objects.filter(current_relation=Node.Relation.PEER).count()
+            - len(peers)
+        )
 
+    for node, local_result, remote_result in poller.poll(peers):
         status = _summarize_update_results(local_result, remote_result)
+        summary["total"] += 1
         summary[status] += 1
         summary["results"].append(
             {
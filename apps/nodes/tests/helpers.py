@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from ipaddress import IPv4Address
+from urllib.parse import urlsplit
+
+import requests
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from apps.nodes.models import Node
+from apps.nodes.services.peer_polling import RegistrationCredentials, node_info_cursor
+
+STUB_NETWORK = IPv4Address("10.77.0.1")
+
+
+@dataclass
+class StubPeer:
+    """In-process peer that answers ``/nodes/info/`` and ``/nodes/register/``."""
+
+    host: str
+    port: int = 8888
+    latency: float = 0.0
+    fail: bool = False
+    version: int = 0
+    full_responses: int = 0
+    unchanged_responses: int = 0
+    registrations: int = 0
+    timeouts: list[float] = field(default_factory=list)
+    waited: float = 0.0
+
+    def info_payload(self) -> dict:
+        return {
+            "hostname": self.host,
+            "address": self.host,
+            "port": self.port,
+            "installed_version": f"1.{self.version}",
+        }
+
+
+class _StubResponse:
+    def __init__(self, status_code: int, payload: dict | None = None) -> None:
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.reason = "OK" if self.ok else "Error"
+        self._payload = payload
+        self.text = json.dumps(payload) if payload is not None else ""
+
+    def json(self):
+        if self._payload is None:
+            raise ValueError("No JSON body")
+        return self._payload
+
+
+@dataclass
+class StubPeerNetwork:
+    """Transport routing peer requests to :class:`StubPeer` instances by host."""
+
+    peers: dict[str, StubPeer] = field(default_factory=dict)
+
+    def add(self, peer: StubPeer) -> StubPeer:
+        self.peers[peer.host] = peer
+        return peer
+
+    def _peer(self, url: str, timeout: float) -> StubPeer:
+        peer = self.peers.get(urlsplit(url).hostname or "")
+        if peer is None:
+            raise requests.ConnectionError(f"Connection refused: {url}")
+        peer.timeouts.append(timeout)
+        if peer.fail:
+            raise requests.ConnectionError(f"Connection refused: {url}")
+        if peer.latency > timeout:
+            peer.waited += timeout
+            time.sleep(timeout)
+            raise requests.Timeout(f"Read timed out: {url}")
+        if peer.latency:
+            peer.waited += peer.latency
+            time.sleep(peer.latency)
+        return peer
+
+    def get(self, url: str, *, params: dict[str, str], timeout: float):
+        peer = self._peer(url, timeout)
+        data = peer.info_payload()
+        cursor = node_info_cursor(data)
+        if params.get("since") == cursor:
+            peer.unchanged_responses += 1
+            return _StubResponse(200, {"sync_cursor": cursor, "unchanged": True})
+        peer.full_responses += 1
+        return _StubResponse(200, dict(data, sync_cursor=cursor))
+
+    def post(self, url: str, *, data: str, headers: dict[str, str], timeout: float):
+        peer = self._peer(url, timeout)
+        peer.registrations += 1
+        return _StubResponse(200, {"id": 1})
+
+
+def stub_credentials() -> RegistrationCredentials:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return RegistrationCredentials(
+        payload={"hostname": "stub-local", "port": 8888}, private_key=private_key
+    )
+
+
+def seed_peers(
+    network: StubPeerNetwork,
+    size: int,
+    *,
+    latency: float,
+    slow_latency: float,
+    seed: int = 0,
+) -> list[Node]:
+    """Create ``size`` peer nodes backed by stub peers.
+
+    One peer in ten never answers and one in ten answers slower than the poll
+    timeout; the rest respond after ``latency`` seconds.
+    """
+
+    rng = random.Random(seed)
+    nodes = []
+    for index in range(size):
+        host = str(STUB_NETWORK + index)
+        bucket = index % 10
+        network.add(
+            StubPeer(
+                host=host,
+                latency=slow_latency if bucket == 1 else latency * rng.uniform(0.5, 1.5),
+                fail=bucket == 2,
+            )
+        )
+        nodes.append(
+            Node(
+                hostname=host,
+                address=host,
+                port=8888,
+                public_endpoint=f"stub-peer-{index}",
+                current_relation=Node.Relation.PEER,
+                installed_version="1.0",
+            )
+        )
+    return Node.objects.bulk_create(nodes)
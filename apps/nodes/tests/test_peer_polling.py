@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import json
+import socket
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.nodes.models import Node
+from apps.nodes.services.peer_polling import PeerPoller, next_poll_delay
+from apps.nodes.tasks import _resolve_node_admin
+from apps.nodes.tests.helpers import (
+    StubPeer,
+    StubPeerNetwork,
+    seed_peers,
+    stub_credentials,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(scope="module")
+def credentials():
+    return stub_credentials()
+
+
+def _poller(network, credentials, **kwargs):
+    kwargs.setdefault("timeout", 0.2)
+    kwargs.setdefault("deadline", 0.6)
+    return PeerPoller(
+        _resolve_node_admin(), transport=network, credentials=credentials, **kwargs
+    )
+
+
+def test_slow_and_offline_peers_do_not_stall_the_cycle(credentials):
+    network = StubPeerNetwork()
+    nodes = seed_peers(network, 10, latency=0.05, slow_latency=5.0)
+
+    poller = _poller(network, credentials, concurrency=10)
+    results = poller.poll(nodes)
+
+    # Every request is bounded by the per-request timeout, and the time a
+    # peer spends answering never outlives its deadline.
+    for peer in network.peers.values():
+        assert peer.timeouts
+        assert max(peer.timeouts) <= poller.timeout
+        assert peer.waited <= poller.deadline
+    statuses = {node.hostname: local["ok"] for node, local, _ in results}
+    assert statuses == {
+        node.hostname: not (network.peers[node.hostname].fail or index == 1)
+        for index, node in enumerate(nodes)
+    }
+    slow = Node.objects.get(pk=nodes[1].pk)
+    offline = Node.objects.get(pk=nodes[2].pk)
+    healthy = Node.objects.get(pk=nodes[0].pk)
+    assert slow.poll_failure_count == 1
+    assert offline.poll_failure_count == offline.poll_failure_total == 1
+    assert healthy.poll_failure_count == 0
+    assert healthy.poll_rtt_ms is not None and healthy.poll_rtt_ms >= 25
+    assert network.peers[healthy.hostname].registrations == 1
+
+
+def test_unchanged_peers_answer_deltas_with_empty_response(credentials):
+    network = StubPeerNetwork()
+    peer = network.add(StubPeer(host="10.77.1.1"))
+    node = Node.objects.create(
+        hostname=peer.host,
+        address=peer.host,
+        port=peer.port,
+        public_endpoint="delta-peer",
+        current_relation=Node.Relation.PEER,
+    )
+    poller = _poller(network, credentials)
+
+    _, first, _ = poller.poll([node])[0]
+    _, second, _ = poller.poll([node])[0]
+    peer.version += 1
+    _, third, _ = poller.poll([node])[0]
+
+    assert "installed_version" in first["updated_fields"]
+    assert second["unchanged"] is True
+    assert third["updated_fields"] == ["installed_version", "last_updated"]
+    assert (peer.full_responses, peer.unchanged_responses) == (2, 1)
+    node.refresh_from_db()
+    assert node.installed_version == "1.1"
+    assert node.poll_sync_cursor
+
+
+def test_adaptive_schedule_backs_off_unreachable_peers(credentials, settings):
+    settings.NODES_PEER_POLL_BACKOFF_BASE = 60
+    settings.NODES_PEER_POLL_BACKOFF_MAX = 300
+    settings.NODES_PEER_POLL_ACTIVE_INTERVAL = 30
+    settings.NODES_PEER_POLL_IDLE_INTERVAL = 900
+
+    assert [next_poll_delay(failures=n, active=False).seconds for n in (1, 2, 3, 4)] == [
+        60,
+        120,
+        240,
+        300,
+    ]
+
+    now = timezone.now()
+    network = StubPeerNetwork()
+    offline = network.add(StubPeer(host="10.77.2.1", fail=True))
+    active = network.add(StubPeer(host="10.77.2.2"))
+    nodes = [
+        Node.objects.create(
+            hostname=peer.host,
+            address=peer.host,
+            port=peer.port,
+            public_endpoint=f"schedule-{index}",
+            current_relation=Node.Relation.PEER,
+        )
+        for index, peer in enumerate((offline, active))
+    ]
+    poller = _poller(network, credentials, clock=lambda: now)
+    poller.poll(nodes)
+    poller.poll(nodes)
+
+    offline_node, active_node = (Node.objects.get(pk=node.pk) for node in nodes)
+    assert offline_node.poll_failure_count == 2
+    assert offline_node.next_poll_at == now + timedelta(seconds=120)
+    assert active_node.next_poll_at == now + timedelta(seconds=30)
+
+    Node.objects.filter(pk=active_node.pk).update(
+        last_poll_change_at=now - timedelta(hours=2)
+    )
+    poller.poll([Node.objects.get(pk=active_node.pk)])
+    assert Node.objects.get(pk=active_node.pk).next_poll_at == now + timedelta(
+        seconds=900
+    )
+    due = PeerPoller.peer_queryset(now=now + timedelta(seconds=60))
+    assert not due.filter(pk__in=[node.pk for node in nodes]).exists()
+
+
+def test_node_info_returns_unchanged_for_current_cursor(client, monkeypatch):
+    Node._local_cache.clear()
+    monkeypatch.setattr(Node, "get_current_mac", staticmethod(lambda: "00:11:22:33:44:66"))
+    monkeypatch.setattr(
+        Node, "_resolve_ip_addresses", classmethod(lambda _, *__: ([], []))
+    )
+    monkeypatch.setattr(socket, "gethostname", lambda: "cursor-host")
+    monkeypatch.setattr(socket, "getfqdn", lambda *_: "cursor-host.local")
+    monkeypatch.setattr(socket, "gethostbyname", lambda *_: "127.0.0.1")
+
+    full = client.get(reverse("node-info")).json()
+    cursor = full["sync_cursor"]
+    unchanged = client.get(reverse("node-info"), {"since": cursor}).json()
+    stale = client.get(reverse("node-info"), {"since": "stale"}).json()
+
+    assert unchanged == {"sync_cursor": cursor, "unchanged": True}
+    assert stale["sync_cursor"] == cursor
+    assert stale["hostname"] == full["hostname"]
+
+
+def test_benchmark_reports_delta_cycle_and_rolls_back():
+    stdout = StringIO()
+
+    call_command(
+        "benchmark",
+        "peer-polling",
+        "--sizes",
+        "10",
+        "--latency",
+        "0.01",
+        "--timeout",
+        "0.05",
+        "--skip-sequential",
+        "--json",
+        stdout=stdout,
+    )
+
+    first, delta = json.loads(stdout.getvalue())["runs"]
+    assert (first["mode"], delta["mode"]) == ("concurrent_first", "concurrent_delta")
+    assert first["reachable"] == delta["reachable"] == 8
+    assert first["full_responses"] == 8
+    assert (delta["full_responses"], delta["unchanged_responses"]) == (0, 8)
+    assert not Node.objects.filter(public_endpoint__startswith="bench-peer-").exists()
@@ -23,6 +23,7 @@ from django.views.decorators.http import require_POST
 from apps.nodes.logging import get_register_visitor_logger
 from apps.nodes.models import Node, NodeRole, node_information_updated
 from apps.nodes.services.enrollment import submit_public_key
+from apps.nodes.services.peer_polling import node_info_cursor
 from config.request_utils import is_https_request
 from utils.api import api_login_required
 
@@ -183,7 +184,7 @@ def node_list(request):
             "ipv6_address": node.ipv6_address,
             "port": node.port,
             "last_updated": node.last_updated,
-            "features": list(node.features.values_list("slug", flat=True)),
+            "features": sorted(node.features.values_list("slug", flat=True)),
             "installed_version": node.installed_version,
             "installed_revision": node.installed_revision,
             "mesh_enrollment_state": node.mesh_enrollment_state,
@@ -258,7 +259,7 @@ def node_info(request):
         "port": advertised_port,
         "mac_address": node.mac_address,
         "public_key": node.public_key,
-        "features": list(node.features.values_list("slug", flat=True)),
+        "features": sorted(node.features.values_list("slug", flat=True)),
         "role": node.role.name if node.role_id else "",
         "contact_hosts": node.get_remote_host_candidates(),
         "installed_version": node.installed_version,
@@ -273,6 +274,13 @@ def node_info(request):
         "sibling_ipc": node.get_sibling_ipc_status(),
     }
 
+    sync_cursor = node_info_cursor(data)
+    if not token and request.GET.get("since", "") == sync_cursor:
+        response = JsonResponse({"sync_cursor": sync_cursor, "unchanged": True})
+        response["Access-Control-Allow-Origin"] = "*"
+        return response
+    data["sync_cursor"] = sync_cursor
+
     _sign_token_for_node(data, node, token)
 
     response = JsonResponse(data)
@@ -6,13 +6,6 @@ from django.contrib import admin, messages
 from django.http import HttpResponse, HttpResponseRedirect
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _, ngettext
-from reportlab.graphics import renderPDF
-from reportlab.graphics.barcode import qr
-from reportlab.graphics.shapes import Drawing
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.units import mm
-from reportlab.pdfgen import canvas
 
 from apps.locals.user_data import EntityModelAdmin
 
@@ -160,6 +153,14 @@ class PublicConnectorPageAdmin(EntityModelAdmin):
             )
             return HttpResponseRedirect(request.get_full_path())
 
+        from reportlab.graphics import renderPDF
+        from reportlab.graphics.barcode import qr
+        from reportlab.graphics.shapes import Drawing
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.units import mm
+        from reportlab.pdfgen import canvas
+
         buffer = BytesIO()
         pdf = canvas.Canvas(buffer, pagesize=letter)
         width, height = letter
@@ -6,6 +6,7 @@ class OcppConfig(AppConfig):
     name = "apps.ocpp"
     label = "ocpp"
     verbose_name = "OCPP"
+    deferred_imports = ("reportlab",)
 
     def ready(self):  # pragma: no cover - startup import side effects
         from . import signals  # noqa: F401
@@ -0,0 +1,466 @@
+"""Benchmark OCPP chart payloads and meter value retention on synthetic data."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.core.cache import cache
+from django.core.management.base import CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.benchmarks import BenchmarkScenario
+from apps.ocpp.models import Charger, MeterValue, Transaction
+from apps.ocpp.services.chart_series import (
+    DEFAULT_CHART_POINTS,
+    series_cache_key,
+    transaction_series,
+)
+from apps.ocpp.services.meter_retention import (
+    DEFAULT_PURGE_CHUNK_SIZE,
+    DEFAULT_PURGE_PAUSE_SECONDS,
+)
+
+DEFAULT_SIZES = (100, 10_000, 100_000)
+SAMPLE_INTERVAL_SECONDS = 10
+BULK_BATCH_SIZE = 5000
+
+
+@dataclass
+class ChartRun:
+    readings: int
+    implementation: str
+    duration_seconds: float
+    points: int
+    payload_bytes: int
+
+    def to_dict(self) -> dict:
+        return {
+            "readings": self.readings,
+            "implementation": self.implementation,
+            "duration_seconds": self.duration_seconds,
+            "points": self.points,
+            "payload_bytes": self.payload_bytes,
+        }
+
+
+class _Rollback(Exception):
+    pass
+
+
+class ChartPayloadBenchmark(BenchmarkScenario):
+    help = (
+        "Benchmark charger chart series generation (full resolution versus "
+        "downsampled, incremental and cached series) for synthetic sessions. "
+        "Fixture rows are written inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=list(DEFAULT_SIZES),
+            help="Meter readings per session (default: 100 10000 100000).",
+        )
+        parser.add_argument(
+            "--points",
+            type=int,
+            default=DEFAULT_CHART_POINTS,
+            help=f"Point budget for the downsampled series (default: {DEFAULT_CHART_POINTS}).",
+        )
+        parser.add_argument("--json", action="store_true", help="Emit JSON summary output.")
+
+    def handle(self, **options):
+        sizes = sorted(set(options["sizes"]))
+        if any(size <= 0 for size in sizes):
+            raise CommandError("--sizes values must be greater than zero.")
+        if options["points"] < 3:
+            raise CommandError("--points must be at least 3.")
+
+        results: list[ChartRun] = []
+        try:
+            with transaction.atomic():
+                for size in sizes:
+                    results.extend(self._run_size(size, options["points"]))
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        payload = {"points": options["points"], "runs": [run.to_dict() for run in results]}
+        if options["json"]:
+            self.stdout.write(json.dumps(payload, indent=2))
+            return
+
+        self.stdout.write("Chart payload benchmark summary:")
+        for run in results:
+            self.stdout.write(
+                f"  {run.readings} readings {run.implementation}: "
+                f"{run.duration_seconds * 1000:.1f} ms, {run.points} points, "
+                f"{run.payload_bytes} bytes"
+            )
+
+    def _run_size(self, size: int, max_points: int) -> list[ChartRun]:
+        charger = Charger.objects.create(
+            charger_id=f"BENCH-CHART-{size}", connector_id=1
+        )
+        start = timezone.now() - timedelta(seconds=size * SAMPLE_INTERVAL_SECONDS)
+        tx = Transaction.objects.create(
+            charger=charger,
+            start_time=start,
+            stop_time=start + timedelta(seconds=(size + 1) * SAMPLE_INTERVAL_SECONDS),
+            meter_start=0,
+        )
+        MeterValue.objects.bulk_create(
+            (
+                MeterValue(
+                    charger=charger,
+                    transaction=tx,
+                    connector_id=1,
+                    timestamp=start + timedelta(seconds=index * SAMPLE_INTERVAL_SECONDS),
+                    context="Sample.Periodic",
+                    energy=Decimal(index * 7) / Decimal(1000),
+                )
+                for index in range(size)
+            ),
+            batch_size=BULK_BATCH_SIZE,
+        )
+        cache.delete(series_cache_key(tx, max_points))
+        tail_cursor = start + timedelta(seconds=(size - 6) * SAMPLE_INTERVAL_SECONDS)
+        live_tx = Transaction.objects.get(pk=tx.pk)
+        live_tx.stop_time = None
+
+        implementations = (
+            ("full", lambda: transaction_series(live_tx, max_points=size)),
+            ("downsampled", lambda: transaction_series(tx, max_points=max_points)),
+            ("cached", lambda: transaction_series(tx, max_points=max_points)),
+            (
+                "incremental",
+                lambda: transaction_series(live_tx, since=tail_cursor, max_points=max_points),
+            ),
+        )
+        results = []
+        for name, build in implementations:
+            began = time.perf_counter()
+            points = build()
+            body = json.dumps(
+                {"labels": [label for label, _ in points], "values": [v for _, v in points]}
+            )
+            results.append(
+                ChartRun(
+                    readings=size,
+                    implementation=name,
+                    duration_seconds=time.perf_counter() - began,
+                    points=len(points),
+                    payload_bytes=len(body.encode()),
+                )
+            )
+        cache.delete(series_cache_key(tx, max_points))
+        return results
+
+
+DEFAULT_ROWS = 10_000_000
+DEFAULT_CHARGERS = 200
+READINGS_PER_SESSION = 1000
+SPAN_SECONDS = 14 * 24 * 60 * 60
+RETENTION_SECONDS = 7 * 24 * 60 * 60
+WRITER_INTERVAL = 0.01
+QUERY_REPEATS = 20
+
+SCHEMA = """
+CREATE TABLE ocpp_transaction (
+    id INTEGER PRIMARY KEY,
+    charger_id INTEGER NOT NULL,
+    meter_stop INTEGER NULL
+);
+CREATE TABLE ocpp_metervalue (
+    id INTEGER PRIMARY KEY,
+    charger_id INTEGER NOT NULL,
+    connector_id INTEGER NULL,
+    transaction_id INTEGER NULL,
+    timestamp INTEGER NOT NULL,
+    energy REAL NULL,
+    is_seed_data INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX ocpp_mv_charger_fk ON ocpp_metervalue (charger_id);
+CREATE INDEX ocpp_mv_transaction_fk ON ocpp_metervalue (transaction_id);
+"""
+
+COMPOSITE_INDEXES = """
+CREATE INDEX ocpp_mv_tx_ts_idx ON ocpp_metervalue (transaction_id, timestamp);
+CREATE INDEX ocpp_mv_charger_ts_idx ON ocpp_metervalue (charger_id, connector_id, timestamp);
+CREATE INDEX ocpp_mv_ts_idx ON ocpp_metervalue (timestamp);
+"""
+
+ELIGIBLE = (
+    "mv.timestamp < :cutoff AND mv.is_seed_data = 0 AND ("
+    "mv.transaction_id IS NULL OR EXISTS ("
+    "SELECT 1 FROM ocpp_transaction tx "
+    "WHERE tx.id = mv.transaction_id AND tx.meter_stop IS NOT NULL))"
+)
+
+QUERIES = {
+    "session-series": (
+        "SELECT timestamp, energy FROM ocpp_metervalue "
+        "WHERE transaction_id = :tx AND timestamp > :session_since ORDER BY timestamp"
+    ),
+    "connector-latest": (
+        "SELECT timestamp, energy FROM ocpp_metervalue "
+        "WHERE charger_id = :charger AND connector_id = 1 ORDER BY timestamp DESC LIMIT 1"
+    ),
+    "recent-window": (
+        "SELECT COUNT(*) FROM ocpp_metervalue WHERE timestamp >= :since"
+    ),
+}
+
+
+@dataclass
+class RetentionRun:
+    scenario: str
+    implementation: str
+    duration_seconds: float
+    rows: int
+    max_lock_seconds: float
+
+    def to_dict(self) -> dict:
+        return {
+            "scenario": self.scenario,
+            "implementation": self.implementation,
+            "duration_seconds": self.duration_seconds,
+            "rows": self.rows,
+            "max_lock_seconds": self.max_lock_seconds,
+        }
+
+
+def build_dataset(path: Path, rows: int, chargers: int) -> None:
+    """Create the synthetic meter value table with ``rows`` readings.
+
+    Readings are spread evenly over two weeks. Every tenth session is still
+    open and every tenth reading has no transaction.
+    """
+
+    sessions = max(rows // READINGS_PER_SESSION, 1)
+    connection = sqlite3.connect(path)
+    try:
+        connection.executescript(SCHEMA)
+        with connection:
+            connection.execute(
+                """
+                WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < ?)
+                INSERT INTO ocpp_transaction (id, charger_id, meter_stop)
+                SELECT n, n % ?, CASE WHEN n % 10 = 0 THEN NULL ELSE 1 END FROM seq
+                """,
+                (sessions, chargers),
+            )
+            connection.execute(
+                """
+                WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < ?)
+                INSERT INTO ocpp_metervalue
+                    (id, charger_id, connector_id, transaction_id, timestamp, energy)
+                SELECT
+                    n,
+                    ((n - 1) / ?) % ?,
+                    1,
+                    CASE WHEN n % 10 = 0 THEN NULL ELSE (n - 1) / ? + 1 END,
+                    (n * ?) / ?,
+                    (n % ?) * 0.01
+                FROM seq
+                """,
+                (
+                    rows,
+                    READINGS_PER_SESSION,
+                    chargers,
+                    READINGS_PER_SESSION,
+                    SPAN_SECONDS,
+                    rows,
+                    READINGS_PER_SESSION,
+                ),
+            )
+    finally:
+        connection.close()
+
+
+class _Writer(threading.Thread):
+    """Insert readings on a second connection and record the slowest insert."""
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(daemon=True)
+        self.path = path
+        self.stop = threading.Event()
+        self.max_wait = 0.0
+
+    def run(self) -> None:
+        connection = sqlite3.connect(self.path, timeout=600)
+        try:
+            while not self.stop.is_set():
+                began = time.perf_counter()
+                with connection:
+                    connection.execute(
+                        "INSERT INTO ocpp_metervalue (charger_id, connector_id, timestamp) "
+                        "VALUES (0, 1, ?)",
+                        (SPAN_SECONDS,),
+                    )
+                self.max_wait = max(self.max_wait, time.perf_counter() - began)
+                self.stop.wait(WRITER_INTERVAL)
+        finally:
+            connection.close()
+
+
+def chunked_purge(connection: sqlite3.Connection, cutoff: int, chunk_size: int) -> tuple[int, float]:
+    """Mirror ``delete_in_chunks``: primary-key ranges in short transactions."""
+
+    deleted = 0
+    longest = 0.0
+    last_pk = 0
+    while True:
+        bounds = [
+            row[0]
+            for row in connection.execute(
+                f"SELECT mv.id FROM ocpp_metervalue mv WHERE {ELIGIBLE} AND mv.id > :last "
+                "ORDER BY mv.id LIMIT :limit",
+                {"cutoff": cutoff, "last": last_pk, "limit": chunk_size},
+            )
+        ]
+        if not bounds:
+            break
+        began = time.perf_counter()
+        with connection:
+            deleted += connection.execute(
+                f"DELETE FROM ocpp_metervalue WHERE id IN (SELECT mv.id FROM ocpp_metervalue mv "
+                f"WHERE mv.id BETWEEN :first AND :last AND {ELIGIBLE})",
+                {"cutoff": cutoff, "first": bounds[0], "last": bounds[-1]},
+            ).rowcount
+        longest = max(longest, time.perf_counter() - began)
+        last_pk = bounds[-1]
+        time.sleep(DEFAULT_PURGE_PAUSE_SECONDS)
+    return deleted, longest
+
+
+class MeterRetentionBenchmark(BenchmarkScenario):
+    help = (
+        "Benchmark meter value retention on a synthetic SQLite table: query latency "
+        "with foreign-key indexes only and with the composite indexes, and "
+        "primary-key chunked purges while a writer keeps inserting."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=DEFAULT_ROWS,
+            help=f"Synthetic meter readings (default: {DEFAULT_ROWS}).",
+        )
+        parser.add_argument(
+            "--chargers",
+            type=int,
+            default=DEFAULT_CHARGERS,
+            help=f"Distinct chargers in the dataset (default: {DEFAULT_CHARGERS}).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_PURGE_CHUNK_SIZE,
+            help=f"Rows per purge transaction (default: {DEFAULT_PURGE_CHUNK_SIZE}).",
+        )
+        parser.add_argument(
+            "--workdir",
+            default="",
+            help="Directory for the SQLite files; defaults to a temporary directory.",
+        )
+        parser.add_argument("--json", action="store_true", help="Emit JSON summary output.")
+
+    def handle(self, **options):
+        rows = options["rows"]
+        if rows <= 0:
+            raise CommandError("--rows must be greater than zero.")
+        if options["chargers"] <= 0:
+            raise CommandError("--chargers must be greater than zero.")
+        if options["chunk_size"] <= 0:
+            raise CommandError("--chunk-size must be greater than zero.")
+
+        with TemporaryDirectory(dir=options["workdir"] or None) as workdir:
+            base = Path(workdir) / "base.sqlite3"
+            build_dataset(base, rows, options["chargers"])
+
+            results = self._run_queries(base, "fk-only", rows, options["chargers"])
+            connection = sqlite3.connect(base)
+            connection.executescript(COMPOSITE_INDEXES)
+            connection.close()
+            results.extend(self._run_queries(base, "indexed", rows, options["chargers"]))
+
+            results.append(self._run_purge(base, "chunked", chunked_purge, options))
+
+        payload = {
+            "rows": rows,
+            "chunk_size": options["chunk_size"],
+            "runs": [run.to_dict() for run in results],
+        }
+        if options["json"]:
+            self.stdout.write(json.dumps(payload, indent=2))
+            return
+
+        self.stdout.write("Meter retention benchmark summary:")
+        for run in results:
+            self.stdout.write(
+                f"  {run.scenario} {run.implementation}: {run.duration_seconds * 1000:.2f} ms, "
+                f"{run.rows} rows, max lock {run.max_lock_seconds * 1000:.2f} ms"
+            )
+
+    def _run_queries(
+        self, path: Path, implementation: str, rows: int, chargers: int
+    ) -> list[RetentionRun]:
+        sessions = max(rows // READINGS_PER_SESSION, 1)
+        params = {
+            "tx": sessions // 2 or 1,
+            "session_since": 0,
+            "since": SPAN_SECONDS - 3600,
+            "charger": chargers // 2,
+        }
+        connection = sqlite3.connect(path)
+        results = []
+        try:
+            for name, sql in QUERIES.items():
+                began = time.perf_counter()
+                for _repeat in range(QUERY_REPEATS):
+                    fetched = connection.execute(sql, params).fetchall()
+                results.append(
+                    RetentionRun(
+                        scenario=f"query:{name}",
+                        implementation=implementation,
+                        duration_seconds=(time.perf_counter() - began) / QUERY_REPEATS,
+                        rows=len(fetched),
+                        max_lock_seconds=0.0,
+                    )
+                )
+        finally:
+            connection.close()
+        return results
+
+    def _run_purge(self, path: Path, implementation: str, purge, options) -> RetentionRun:
+        cutoff = SPAN_SECONDS - RETENTION_SECONDS
+        connection = sqlite3.connect(path, timeout=600)
+        writer = _Writer(path)
+        writer.start()
+        try:
+            began = time.perf_counter()
+            deleted, longest = purge(connection, cutoff, options["chunk_size"])
+            duration = time.perf_counter() - began
+        finally:
+            writer.stop.set()
+            writer.join()
+            connection.close()
+        return RetentionRun(
+            scenario="purge",
+            implementation=implementation,
+            duration_seconds=duration,
+            rows=deleted,
+            max_lock_seconds=max(longest, writer.max_wait),
+        )
@@ -1,10 +1,13 @@
 import base64
 import json
 import logging
+import time
 from asyncio import CancelledError, create_task
 from functools import cached_property
 
-from ... import store
+from apps.core.metrics import count_queries
+
+from ... import metrics, store
 from ...call_error_handlers import dispatch_call_error
 from ...call_result_handlers import dispatch_call_result
 from ...models import Charger
@@ -103,15 +106,22 @@ class DispatchMixin:
     async def _handle_call_message(self, msg, raw, text_data):
         msg_id, action = msg[1], msg[2]
         payload = msg[3] if len(msg) > 3 else {}
-        connector_hint = payload.get("connectorId") if isinstance(payload, dict) else None
-        self._log_triggered_follow_up(action, connector_hint)
-        await self._assign_connector(payload.get("connectorId"))
-        reply_payload = {}
         handler = self._action_router.resolve(action)
+        started = time.perf_counter()
+        with count_queries() as queries:
+            connector_hint = payload.get("connectorId") if isinstance(payload, dict) else None
+            self._log_triggered_follow_up(action, connector_hint)
+            await self._assign_connector(payload.get("connectorId"))
+            reply_payload = {}
+            if handler:
+                reply_payload = await handler(payload, msg_id, raw, text_data)
+            response = [3, msg_id, reply_payload]
+            await self.send(json.dumps(response))
         if handler:
-            reply_payload = await handler(payload, msg_id, raw, text_data)
-        response = [3, msg_id, reply_payload]
-        await self.send(json.dumps(response))
+            metrics.action_duration.labels(action).observe(time.perf_counter() - started)
+            metrics.action_queries.labels(action).observe(queries[0])
+        else:
+            metrics.unhandled_actions.inc()
         store.add_log(
             self.store_key, f"< {json.dumps(response)}", log_type="charger"
         )
@@ -0,0 +1,36 @@
+"""Runtime metrics recorded by the OCPP consumers and store."""
+
+from __future__ import annotations
+
+from apps.core.metrics import QUERY_COUNT_BUCKETS, counter, histogram
+
+action_duration = histogram(
+    "ocpp_action_duration_seconds",
+    "Time spent handling an inbound OCPP call, including the reply.",
+    ("action",),
+)
+action_queries = histogram(
+    "ocpp_action_db_queries",
+    "Database queries executed while handling one inbound OCPP call.",
+    ("action",),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+unhandled_actions = counter(
+    "ocpp_unhandled_actions_total",
+    "Inbound OCPP calls without a registered handler.",
+)
+pending_call_round_trip = histogram(
+    "ocpp_pending_call_round_trip_seconds",
+    "Time between sending a CSMS call and receiving the charger's reply.",
+    ("action",),
+)
+pending_call_timeouts = counter(
+    "ocpp_pending_call_timeouts_total",
+    "CSMS calls that were not answered before their timeout.",
+    ("action",),
+)
+log_write_duration = histogram(
+    "ocpp_log_write_seconds",
+    "Time spent appending one entry to the OCPP log files.",
+    ("log_type",),
+)
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.12 on 2026-10-18 22:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ocpp', '0008_correct_iocharger_ioc750200a_t08_specs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MeterValueRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_seed_data', models.BooleanField(default=False, editable=False)),
+                ('is_user_data', models.BooleanField(default=False, editable=False)),
+                ('is_deleted', models.BooleanField(default=False, editable=False)),
+                ('connector_id', models.PositiveIntegerField(default=0)),
+                ('resolution', models.PositiveIntegerField(choices=[(60, '1 minute'), (900, '15 minutes')])),
+                ('bucket_start', models.DateTimeField()),
+                ('sample_count', models.PositiveIntegerField(default=0)),
+                ('max_reading_pk', models.BigIntegerField(default=0)),
+                ('energy_min', models.DecimalField(blank=True, decimal_places=3, max_digits=12, null=True)),
+                ('energy_max', models.DecimalField(blank=True, decimal_places=3, max_digits=12, null=True)),
+                ('energy_avg', models.DecimalField(blank=True, decimal_places=3, max_digits=12, null=True)),
+                ('energy_last', models.DecimalField(blank=True, decimal_places=3, max_digits=12, null=True)),
+                ('current_import_min', models.DecimalField(blank=True, decimal_places=3, max_digits=12, null=True)),
+                ('current_import_max', models.DecimalField(blank=True, decimal_places=3, max_digits=12, null=True)),
+                ('current_import_avg', models.DecimalField(blank=True, decimal_places=3, max_digits=12, null=True)),
+                ('current_import_last', models.DecimalField(blank=True, decimal_places=3, max_digits=12, null=True)),
+                ('voltage_min', models.DecimalField(blank=True, decimal_places=3, max_digits=12, null=True)),
+                ('voltage_max', models.DecimalField(blank=True, decimal_places=3, max_digits=12, null=True)),
+                ('voltage_avg', models.DecimalField(blank=True, decimal_places=3, max_digits=12, null=True)),
+                ('voltage_last', models.DecimalField(blank=True, decimal_places=3, max_digits=12, null=True)),
+                ('soc_min', models.DecimalField(blank=True, decimal_places=3, max_digits=12, null=True)),
+                ('soc_max', models.DecimalField(blank=True, decimal_places=3, max_digits=12, null=True)),
+                ('soc_avg', models.DecimalField(blank=True, decimal_places=3, max_digits=12, null=True)),
+                ('soc_last', models.DecimalField(blank=True, decimal_places=3, max_digits=12, null=True)),
+            ],
+            options={
+                'verbose_name': 'Meter Value Rollup',
+                'verbose_name_plural': 'Meter Value Rollups',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='metervalue',
+            index=models.Index(fields=['transaction', 'timestamp'], name='ocpp_mv_tx_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='metervalue',
+            index=models.Index(fields=['charger', 'connector_id', 'timestamp'], name='ocpp_mv_charger_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='metervalue',
+            index=models.Index(fields=['timestamp'], name='ocpp_mv_ts_idx'),
+        ),
+        migrations.AddField(
+            model_name='metervaluerollup',
+            name='charger',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='meter_value_rollups', to='ocpp.charger'),
+        ),
+        migrations.AddIndex(
+            model_name='metervaluerollup',
+            index=models.Index(fields=['resolution', 'bucket_start'], name='ocpp_mv_rollup_res_ts_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='metervaluerollup',
+            constraint=models.UniqueConstraint(fields=('charger', 'connector_id', 'resolution', 'bucket_start'), name='ocpp_mv_rollup_bucket_unique'),
+        ),
+    ]
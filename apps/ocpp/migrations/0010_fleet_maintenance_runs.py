@@ -0,0 +1,41 @@
+# Generated by Django 5.2.12 on 2026-10-19 03:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ocpp', '0009_meter_value_indexes_and_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FleetMaintenanceRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_seed_data', models.BooleanField(default=False, editable=False)),
+                ('is_user_data', models.BooleanField(default=False, editable=False)),
+                ('is_deleted', models.BooleanField(default=False, editable=False)),
+                ('job', models.CharField(choices=[('configuration', 'Configuration check'), ('firmware', 'Firmware snapshot'), ('projection', 'Power projection')], max_length=32)),
+                ('window_start', models.DateTimeField()),
+                ('window_seconds', models.PositiveIntegerField()),
+                ('rate_per_second', models.FloatField()),
+                ('max_in_flight', models.PositiveIntegerField()),
+                ('job_kwargs', models.JSONField(blank=True, default=dict)),
+                ('plan', models.JSONField(blank=True, default=list)),
+                ('dispatched', models.PositiveIntegerField(default=0)),
+                ('enqueued', models.PositiveIntegerField(default=0)),
+                ('completed', models.PositiveIntegerField(default=0)),
+                ('skipped', models.PositiveIntegerField(default=0)),
+                ('next_send_offset', models.FloatField(default=0.0)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Fleet Maintenance Run',
+                'verbose_name_plural': 'Fleet Maintenance Runs',
+                'indexes': [models.Index(fields=['job', 'window_start'], name='ocpp_fleet_run_job_start')],
+            },
+        ),
+    ]
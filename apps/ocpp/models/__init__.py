@@ -15,6 +15,8 @@ from .transaction import Transaction, annotate_transaction_energy_bounds
 from .security_event import SecurityEvent
 from .charger_log_request import ChargerLogRequest, generate_log_request_id
 from .meter_value import MeterValue
+from .meter_value_rollup import MeterValueRollup
+from .fleet_maintenance import FleetMaintenanceRun
 from .meter_reading import MeterReading, MeterReadingManager
 from .simulator import Simulator
 from .data_transfer_message import DataTransferMessage
@@ -68,6 +70,8 @@ __all__ = [
     "ChargerLogRequest",
     "generate_log_request_id",
     "MeterValue",
+    "MeterValueRollup",
+    "FleetMaintenanceRun",
     "MeterReadingManager",
     "MeterReading",
     "Simulator",
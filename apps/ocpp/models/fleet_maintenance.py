@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from .base import *
+
+
+class FleetMaintenanceRun(Entity):
+    """Progress of one jittered, rate-shaped fleet maintenance window.
+
+    ``plan`` holds ``[offset_seconds, charger_pk]`` pairs sorted by offset and
+    ``dispatched`` is the number of plan entries already handled, so a pump
+    that starts after a worker restart continues from where the last one
+    stopped instead of re-running the window.
+    """
+
+    class Job(models.TextChoices):
+        CONFIGURATION = "configuration", _("Configuration check")
+        FIRMWARE = "firmware", _("Firmware snapshot")
+        PROJECTION = "projection", _("Power projection")
+
+    job = models.CharField(max_length=32, choices=Job.choices)
+    window_start = models.DateTimeField()
+    window_seconds = models.PositiveIntegerField()
+    rate_per_second = models.FloatField()
+    max_in_flight = models.PositiveIntegerField()
+    job_kwargs = models.JSONField(default=dict, blank=True)
+    plan = models.JSONField(default=list, blank=True)
+    dispatched = models.PositiveIntegerField(default=0)
+    enqueued = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0)
+    next_send_offset = models.FloatField(default=0.0)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:  # pragma: no cover - simple representation
+        return f"{self.get_job_display()} {self.window_start:%Y-%m-%d %H:%M}"
+
+    @property
+    def in_flight(self) -> int:
+        return max(0, self.enqueued - self.completed)
+
+    class Meta:
+        verbose_name = _("Fleet Maintenance Run")
+        verbose_name_plural = _("Fleet Maintenance Runs")
+        indexes = [
+            models.Index(fields=["job", "window_start"], name="ocpp_fleet_run_job_start"),
+        ]
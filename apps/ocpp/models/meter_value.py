@@ -47,3 +47,14 @@ class MeterValue(Entity):
     class Meta:
         verbose_name = _("Meter Value")
         verbose_name_plural = _("Meter Values")
+        indexes = [
+            models.Index(
+                fields=["transaction", "timestamp"],
+                name="ocpp_mv_tx_ts_idx",
+            ),
+            models.Index(
+                fields=["charger", "connector_id", "timestamp"],
+                name="ocpp_mv_charger_ts_idx",
+            ),
+            models.Index(fields=["timestamp"], name="ocpp_mv_ts_idx"),
+        ]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from .base import *
+
+
+class MeterValueRollup(Entity):
+    """Per-connector aggregate of meter values over a fixed time bucket.
+
+    Rollups outlive the raw :class:`MeterValue` rows they summarize so long
+    term charts and reports keep working after raw readings are purged.
+    ``connector_id`` is ``0`` for readings not tied to a connector.
+    ``max_reading_pk`` is the highest :class:`MeterValue` primary key folded
+    into the bucket, which lets later runs find readings that arrived late.
+    """
+
+    class Resolution(models.IntegerChoices):
+        MINUTE = 60, _("1 minute")
+        QUARTER_HOUR = 900, _("15 minutes")
+
+    charger = models.ForeignKey(
+        "Charger", on_delete=models.CASCADE, related_name="meter_value_rollups"
+    )
+    connector_id = models.PositiveIntegerField(default=0)
+    resolution = models.PositiveIntegerField(choices=Resolution.choices)
+    bucket_start = models.DateTimeField()
+    sample_count = models.PositiveIntegerField(default=0)
+    max_reading_pk = models.BigIntegerField(default=0)
+
+    energy_min = models.DecimalField(max_digits=12, decimal_places=3, null=True, blank=True)
+    energy_max = models.DecimalField(max_digits=12, decimal_places=3, null=True, blank=True)
+    energy_avg = models.DecimalField(max_digits=12, decimal_places=3, null=True, blank=True)
+    energy_last = models.DecimalField(max_digits=12, decimal_places=3, null=True, blank=True)
+    current_import_min = models.DecimalField(
+        max_digits=12, decimal_places=3, null=True, blank=True
+    )
+    current_import_max = models.DecimalField(
+        max_digits=12, decimal_places=3, null=True, blank=True
+    )
+    current_import_avg = models.DecimalField(
+        max_digits=12, decimal_places=3, null=True, blank=True
+    )
+    current_import_last = models.DecimalField(
+        max_digits=12, decimal_places=3, null=True, blank=True
+    )
+    voltage_min = models.DecimalField(max_digits=12, decimal_places=3, null=True, blank=True)
+    voltage_max = models.DecimalField(max_digits=12, decimal_places=3, null=True, blank=True)
+    voltage_avg = models.DecimalField(max_digits=12, decimal_places=3, null=True, blank=True)
+    voltage_last = models.DecimalField(max_digits=12, decimal_places=3, null=True, blank=True)
+    soc_min = models.DecimalField(max_digits=12, decimal_places=3, null=True, blank=True)
+    soc_max = models.DecimalField(max_digits=12, decimal_places=3, null=True, blank=True)
+    soc_avg = models.DecimalField(max_digits=12, decimal_places=3, null=True, blank=True)
+    soc_last = models.DecimalField(max_digits=12, decimal_places=3, null=True, blank=True)
+
+    def __str__(self) -> str:  # pragma: no cover - simple representation
+        return f"{self.charger} {self.bucket_start} ({self.resolution}s)"
+
+    class Meta:
+        verbose_name = _("Meter Value Rollup")
+        verbose_name_plural = _("Meter Value Rollups")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["charger", "connector_id", "resolution", "bucket_start"],
+                name="ocpp_mv_rollup_bucket_unique",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["resolution", "bucket_start"],
+                name="ocpp_mv_rollup_res_ts_idx",
+            ),
+        ]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Any
 
 from django.http import Http404
@@ -14,44 +15,21 @@ from .chargers import (
     get_charger_for_read,
     live_sessions,
 )
+from .chart_series import DEFAULT_CHART_POINTS, transaction_series
 
 
 class ChargerAccessDeniedError(PermissionError):
     """Raised when a user cannot access the requested charger."""
 
 
-def _series_from_transaction(tx: Transaction) -> list[tuple[str, float]]:
-    """Build cumulative kWh points from a transaction's meter readings.
-
-    Parameters:
-        tx: Transaction whose meter values should be transformed into chart points.
-
-    Returns:
-        list[tuple[str, float]]: ISO timestamp and cumulative kWh pairs.
-    """
-
-    points: list[tuple[str, float]] = []
-    readings = list(
-        tx.meter_values.filter(energy__isnull=False).order_by("timestamp")
-    )
-    start_val = float(tx.meter_start) / 1000.0 if tx.meter_start is not None else None
-    for reading in readings:
-        try:
-            val = float(reading.energy)
-        except (TypeError, ValueError):
-            continue
-        if start_val is None:
-            start_val = val
-        points.append((reading.timestamp.isoformat(), max(val - start_val, 0.0)))
-    return points
-
-
 def build_charger_chart_payload(
     *,
     user,
     cid: str,
     connector: str | None = None,
     session_id: str | None = None,
+    since: datetime | None = None,
+    max_points: int = DEFAULT_CHART_POINTS,
 ) -> dict[str, Any]:
     """Return the chart payload consumed by the charger status UI.
 
@@ -60,9 +38,13 @@ def build_charger_chart_payload(
         cid: Charger identifier.
         connector: Optional connector slug.
         session_id: Optional transaction identifier for historic sessions.
+        since: Only include readings after this timestamp, for live refreshes.
+        max_points: Point budget for each dataset.
 
     Returns:
-        dict[str, Any]: JSON-serializable chart payload with labels and datasets.
+        dict[str, Any]: JSON-serializable chart payload with labels, datasets,
+        the charted transaction ids in ``series`` and a ``cursor`` holding the
+        newest label for the next ``since``.
 
     Raises:
         ChargerAccessDeniedError: If the user is not allowed to view the charger.
@@ -106,10 +88,18 @@ def build_charger_chart_payload(
                 tx_obj = session_tx
                 break
 
-    chart_data: dict[str, Any] = {"labels": [], "datasets": []}
+    chart_data: dict[str, Any] = {
+        "labels": [],
+        "datasets": [],
+        "since": since.isoformat() if since else None,
+        "cursor": since.isoformat() if since else None,
+        "max_points": max_points,
+        "series": [],
+    }
 
     if tx_obj and (charger.connector_id is not None or past_session):
-        series_points = _series_from_transaction(tx_obj)
+        chart_data["series"].append(tx_obj.pk)
+        series_points = transaction_series(tx_obj, since=since, max_points=max_points)
         if series_points:
             chart_data["labels"] = [ts for ts, _ in series_points]
             charger_ref = (
@@ -129,7 +119,8 @@ def build_charger_chart_payload(
         for sibling, sibling_tx in sessions:
             if sibling.connector_id is None or not sibling_tx:
                 continue
-            points = _series_from_transaction(sibling_tx)
+            chart_data["series"].append(sibling_tx.pk)
+            points = transaction_series(sibling_tx, since=since, max_points=max_points)
             if not points:
                 continue
             dataset_points.append(
@@ -150,4 +141,6 @@ def build_charger_chart_payload(
                     }
                 )
 
+    if chart_data["labels"]:
+        chart_data["cursor"] = chart_data["labels"][-1]
     return chart_data
@@ -0,0 +1,173 @@
+"""Energy series extraction and downsampling for charger charts."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Sequence
+
+from django.core.cache import cache
+
+from apps.ocpp.models import Transaction
+
+DEFAULT_CHART_POINTS = 500
+MIN_CHART_POINTS = 10
+MAX_CHART_POINTS = 5000
+SERIES_CACHE_PREFIX = "ocpp:chart-series"
+SERIES_CACHE_TIMEOUT = 6 * 60 * 60
+READ_CHUNK_SIZE = 2000
+
+
+def clamp_point_budget(value: int | str | None) -> int:
+    """Return a point budget within the supported chart range.
+
+    Parameters:
+        value: Requested number of points; blank or invalid values use the default.
+
+    Returns:
+        int: Budget between ``MIN_CHART_POINTS`` and ``MAX_CHART_POINTS``.
+    """
+
+    try:
+        budget = int(value) if value not in (None, "") else DEFAULT_CHART_POINTS
+    except (TypeError, ValueError):
+        budget = DEFAULT_CHART_POINTS
+    return max(MIN_CHART_POINTS, min(budget, MAX_CHART_POINTS))
+
+
+def lttb_indices(xs: Sequence[float], ys: Sequence[float], threshold: int) -> list[int]:
+    """Select indices with the Largest-Triangle-Three-Buckets algorithm.
+
+    The first and last points are always kept. Each bucket in between keeps
+    the point forming the largest triangle with the previously kept point and
+    the average of the next bucket, which preserves the visual shape of the
+    series far better than taking every n-th reading.
+
+    Parameters:
+        xs: Monotonic x coordinates.
+        ys: Y coordinates aligned with ``xs``.
+        threshold: Maximum number of points to keep.
+
+    Returns:
+        list[int]: Ascending indices of the kept points.
+    """
+
+    count = len(xs)
+    if threshold >= count:
+        return list(range(count))
+    if threshold < 3:
+        return [0, count - 1][: max(threshold, 0)]
+
+    kept = [0]
+    bucket_size = (count - 2) / (threshold - 2)
+    anchor = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        next_start = end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, count)
+        if next_start >= next_end:
+            next_start, next_end = count - 1, count
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        anchor_x = xs[anchor]
+        anchor_y = ys[anchor]
+        best_area = -1.0
+        best = start
+        for index in range(start, end):
+            area = abs(
+                (anchor_x - avg_x) * (ys[index] - anchor_y)
+                - (anchor_x - xs[index]) * (avg_y - anchor_y)
+            )
+            if area > best_area:
+                best_area = area
+                best = index
+        kept.append(best)
+        anchor = best
+    kept.append(count - 1)
+    return kept
+
+
+def _start_value(tx: Transaction) -> float | None:
+    if tx.meter_start is not None:
+        return float(tx.meter_start) / 1000.0
+    first = (
+        tx.meter_values.filter(energy__isnull=False)
+        .order_by("timestamp")
+        .values_list("energy", flat=True)
+        .first()
+    )
+    return float(first) if first is not None else None
+
+
+def _read_series(tx: Transaction, *, since: datetime | None) -> tuple[list[datetime], list[float]]:
+    readings = tx.meter_values.filter(energy__isnull=False)
+    if since is not None:
+        readings = readings.filter(timestamp__gt=since)
+    start_value = _start_value(tx)
+    timestamps: list[datetime] = []
+    values: list[float] = []
+    for timestamp, energy in (
+        readings.order_by("timestamp")
+        .values_list("timestamp", "energy")
+        .iterator(chunk_size=READ_CHUNK_SIZE)
+    ):
+        try:
+            value = float(energy)
+        except (TypeError, ValueError):
+            continue
+        if start_value is None:
+            start_value = value
+        timestamps.append(timestamp)
+        values.append(max(value - start_value, 0.0))
+    return timestamps, values
+
+
+def series_cache_key(tx: Transaction, max_points: int) -> str:
+    """Return the cache key for a finished session's downsampled series.
+
+    The stop time is part of the key so a session that is reopened or
+    re-stopped, or a reused primary key, never serves an older series.
+    """
+
+    stopped = int(tx.stop_time.timestamp() * 1_000_000) if tx.stop_time else 0
+    return f"{SERIES_CACHE_PREFIX}:{tx.pk}:{stopped}:{max_points}"
+
+
+def transaction_series(
+    tx: Transaction,
+    *,
+    since: datetime | None = None,
+    max_points: int = DEFAULT_CHART_POINTS,
+) -> list[tuple[str, float]]:
+    """Return cumulative kWh chart points for a transaction.
+
+    Parameters:
+        tx: Transaction whose meter readings should be charted.
+        since: Only return readings strictly after this timestamp.
+        max_points: Point budget; longer series are reduced with LTTB.
+
+    Returns:
+        list[tuple[str, float]]: ISO timestamp and cumulative kWh pairs.
+    """
+
+    cacheable = since is None and tx.stop_time is not None and tx.pk is not None
+    if cacheable:
+        cached = cache.get(series_cache_key(tx, max_points))
+        if cached is not None:
+            return [tuple(point) for point in cached]
+
+    timestamps, values = _read_series(tx, since=since)
+    if len(timestamps) > max_points:
+        xs = [timestamp.timestamp() for timestamp in timestamps]
+        indices = lttb_indices(xs, values, max_points)
+        points = [(timestamps[index].isoformat(), values[index]) for index in indices]
+    else:
+        points = [
+            (timestamp.isoformat(), value) for timestamp, value in zip(timestamps, values)
+        ]
+
+    if cacheable:
+        cache.set(series_cache_key(tx, max_points), points, SERIES_CACHE_TIMEOUT)
+    return points
@@ -0,0 +1,267 @@
+"""Jittered, rate-shaped dispatch of per-charger fleet maintenance calls.
+
+Nightly jobs such as configuration checks used to enqueue one task per
+charger at the same crontab instant. A fleet run instead gives every charger
+a deterministic offset inside a window, and a periodic pump enqueues the
+chargers that are due. Sends are spaced to respect a global rate and a cap on
+calls still in flight. Progress lives in :class:`FleetMaintenanceRun`, so a
+pump after a worker restart carries on from the persisted cursor.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import Callable, Iterable
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, QuerySet
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from apps.ocpp.models import Charger, FleetMaintenanceRun
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW_SECONDS = 1800
+DEFAULT_RATE_PER_SECOND = 5.0
+DEFAULT_MAX_IN_FLIGHT = 50
+DEFAULT_ONLINE_SECONDS = 600
+# Beat interval of the pump; each pump schedules sends a little beyond it so
+# consecutive pumps leave no gap.
+PUMP_INTERVAL_SECONDS = 10
+PUMP_HORIZON_SECONDS = 15.0
+# Every per-charger call gives up on its response after this many seconds,
+# so a call holds an in-flight slot for at most this long.
+CALL_TIMEOUT_SECONDS = 5.0
+# How long a run waits for enqueued calls to report back before it closes.
+COMPLETION_GRACE_SECONDS = 300
+# A call sent this long ago has either expired in the queue or given up on
+# its charger; if it never reported back, its worker died or was killed.
+STALE_CALL_SECONDS = COMPLETION_GRACE_SECONDS + CALL_TIMEOUT_SECONDS
+CANDIDATE_CHUNK_SIZE = 500
+
+Sender = Callable[[FleetMaintenanceRun, int, float], bool]
+
+
+def _setting_number(name: str, default, cast=int):
+    try:
+        value = cast(getattr(settings, name, default))
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
+
+
+def window_seconds() -> int:
+    return _setting_number("OCPP_FLEET_WINDOW_SECONDS", DEFAULT_WINDOW_SECONDS)
+
+
+def rate_per_second() -> float:
+    return _setting_number("OCPP_FLEET_RATE_PER_SECOND", DEFAULT_RATE_PER_SECOND, float)
+
+
+def max_in_flight() -> int:
+    return _setting_number("OCPP_FLEET_MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT)
+
+
+def online_seconds() -> int:
+    return _setting_number("OCPP_FLEET_ONLINE_SECONDS", DEFAULT_ONLINE_SECONDS)
+
+
+def jitter_offset(charger_id: str, job: str, window: float) -> float:
+    """Return the stable offset in seconds of *charger_id* inside *window*.
+
+    The offset depends on the job as well, so one charger is not first in
+    line for every nightly job.
+    """
+
+    digest = hashlib.sha256(f"{job}:{charger_id}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") / 2**64 * window
+
+
+def online_chargers(queryset: QuerySet, *, now: datetime | None = None) -> QuerySet:
+    """Filter *queryset* to chargers that reported activity recently.
+
+    Websocket connections live in the web process, so the worker judges
+    connectivity from the persisted heartbeat and status timestamps.
+    """
+
+    cutoff = (now or timezone.now()) - timedelta(seconds=online_seconds())
+    return queryset.annotate(
+        fleet_last_activity=Greatest(
+            Coalesce("last_status_timestamp", "last_heartbeat"),
+            Coalesce("last_heartbeat", "last_status_timestamp"),
+        )
+    ).filter(fleet_last_activity__gte=cutoff)
+
+
+def start_run(
+    job: str,
+    chargers: Iterable[tuple[int, str]],
+    *,
+    now: datetime | None = None,
+    job_kwargs: dict | None = None,
+) -> tuple[FleetMaintenanceRun, bool]:
+    """Plan a fleet run for *job* over ``(pk, charger_id)`` pairs.
+
+    A run of the same job whose window started less than one window ago is
+    returned instead of planning a second one, so a redelivered scheduler
+    task does not repeat the night's work.
+    """
+
+    now = now or timezone.now()
+    window = window_seconds()
+    existing = (
+        FleetMaintenanceRun.objects.filter(
+            job=job, window_start__gt=now - timedelta(seconds=window)
+        )
+        .order_by("-window_start")
+        .first()
+    )
+    if existing is not None:
+        return existing, False
+
+    plan = sorted(
+        [round(jitter_offset(charger_id, job, window), 3), pk] for pk, charger_id in chargers
+    )
+    run = FleetMaintenanceRun.objects.create(
+        job=job,
+        window_start=now,
+        window_seconds=window,
+        rate_per_second=rate_per_second(),
+        max_in_flight=max_in_flight(),
+        job_kwargs=job_kwargs or {},
+        plan=plan,
+        finished_at=None if plan else now,
+    )
+    return run, True
+
+
+def live_in_flight(run: FleetMaintenanceRun, elapsed: float, interval: float) -> int:
+    """Return the in-flight calls of *run* that may still be running.
+
+    Calls that are dropped by their expiry, killed by a time limit or lost
+    with their worker never report back. Sends are at least *interval*
+    apart and all precede ``next_send_offset``, which bounds how many were
+    sent within the last :data:`STALE_CALL_SECONDS`; older ones count as
+    finished.
+    """
+
+    recent_since = elapsed - STALE_CALL_SECONDS
+    if run.next_send_offset <= recent_since:
+        return 0
+    return min(run.in_flight, math.ceil((run.next_send_offset - recent_since) / interval))
+
+
+def dispatch_due(
+    run: FleetMaintenanceRun,
+    send: Sender,
+    *,
+    now: datetime | None = None,
+    horizon: float = PUMP_HORIZON_SECONDS,
+) -> int:
+    """Enqueue the plan entries of *run* whose send slot falls within *horizon*.
+
+    ``send(run, charger_pk, countdown)`` enqueues one call and returns
+    ``False`` when the broker refuses it; the pump then stops and the next
+    one retries from the same entry. Chargers that are offline when their
+    turn comes are skipped without using a send slot. Returns the number of
+    calls enqueued.
+
+    The run row stays locked while its calls are sent, so pumps that pile up
+    behind a busy worker run one after another and never send the same
+    entries twice.
+    """
+
+    with transaction.atomic():
+        locked = FleetMaintenanceRun.objects.select_for_update().filter(pk=run.pk).first()
+        if locked is None:
+            return 0
+        enqueued = 0
+        if locked.finished_at is None:
+            enqueued = _dispatch_locked(
+                locked, send, now=now or timezone.now(), horizon=horizon
+            )
+    run.refresh_from_db()
+    return enqueued
+
+
+def _dispatch_locked(
+    run: FleetMaintenanceRun, send: Sender, *, now: datetime, horizon: float
+) -> int:
+    elapsed = (now - run.window_start).total_seconds()
+    # Spacing sends by timeout / cap keeps at most ``max_in_flight`` calls
+    # awaiting a response at any moment.
+    interval = max(1.0 / run.rate_per_second, CALL_TIMEOUT_SECONDS / run.max_in_flight)
+    # Calls still queued beyond what the slots allow mean the workers have
+    # fallen behind; stop feeding them until they catch up.
+    capacity = run.max_in_flight + int(horizon / interval) - live_in_flight(
+        run, elapsed, interval
+    )
+    plan = run.plan
+    index = run.dispatched
+    slot = run.next_send_offset
+    enqueued = skipped = 0
+    blocked = False
+
+    while not blocked and index < len(plan) and enqueued < capacity:
+        chunk = []
+        for offset, charger_pk in plan[index : index + CANDIDATE_CHUNK_SIZE]:
+            if offset >= elapsed + horizon:
+                break
+            chunk.append((offset, charger_pk))
+        if not chunk:
+            break
+        online = set(
+            online_chargers(
+                Charger.objects.filter(pk__in=[pk for _offset, pk in chunk]), now=now
+            ).values_list("pk", flat=True)
+        )
+        for offset, charger_pk in chunk:
+            if charger_pk not in online:
+                skipped += 1
+                index += 1
+                continue
+            send_at = max(offset, slot, elapsed)
+            if enqueued >= capacity or send_at >= elapsed + horizon:
+                blocked = True
+                break
+            if not send(run, charger_pk, send_at - elapsed):
+                blocked = True
+                break
+            enqueued += 1
+            index += 1
+            slot = round(send_at + interval, 6)
+
+    fields = {
+        "dispatched": index,
+        "enqueued": F("enqueued") + enqueued,
+        "skipped": F("skipped") + skipped,
+        "next_send_offset": slot,
+        "updated_at": now,
+    }
+    if index >= len(plan):
+        run.refresh_from_db(fields=["completed"])
+        waited = elapsed - slot
+        if run.enqueued + enqueued <= run.completed or waited > COMPLETION_GRACE_SECONDS:
+            fields["finished_at"] = now
+    FleetMaintenanceRun.objects.filter(pk=run.pk).update(**fields)
+    return enqueued
+
+
+def record_completion(run_pk: int) -> None:
+    """Count one finished call of a fleet run, releasing its in-flight slot."""
+
+    FleetMaintenanceRun.objects.filter(pk=run_pk).update(completed=F("completed") + 1)
+
+
+def pump_open_runs(send: Sender, *, now: datetime | None = None) -> int:
+    """Dispatch due entries of every unfinished run and return the calls enqueued."""
+
+    total = 0
+    for run in FleetMaintenanceRun.objects.filter(finished_at__isnull=True).order_by("pk"):
+        total += dispatch_due(run, send, now=now)
+    return total
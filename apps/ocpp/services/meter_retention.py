@@ -0,0 +1,496 @@
+"""Tiered retention for meter values: rollups first, then chunked purges."""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+
+from apps.ocpp.models import MeterValue, MeterValueRollup
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RAW_RETENTION_DAYS = 7
+DEFAULT_MINUTE_ROLLUP_RETENTION_DAYS = 90
+DEFAULT_PURGE_CHUNK_SIZE = 1000
+# Combined budget of one retention run; fits the maintenance task class's
+# 300 s soft limit with room for the rollup step and the final commit.
+DEFAULT_PURGE_MAX_SECONDS = 240.0
+DEFAULT_PURGE_PAUSE_SECONDS = 0.01
+ROLLUP_FIELDS = ("energy", "current_import", "voltage", "soc")
+ROLLUP_LOOKBACK = timedelta(hours=1)
+ROLLUP_SLICE = timedelta(hours=6)
+ROLLUP_MAX_WINDOW = timedelta(days=2)
+ROLLUP_BATCH_SIZE = 500
+READ_CHUNK_SIZE = 5000
+_QUANTUM = Decimal("0.001")
+
+
+@dataclass
+class PurgeResult:
+    deleted: int = 0
+    soft_deleted: int = 0
+    chunks: int = 0
+    elapsed_seconds: float = 0.0
+    max_chunk_seconds: float = 0.0
+    complete: bool = True
+
+    def to_dict(self) -> dict:
+        return {
+            "deleted": self.deleted,
+            "soft_deleted": self.soft_deleted,
+            "chunks": self.chunks,
+            "elapsed_seconds": self.elapsed_seconds,
+            "max_chunk_seconds": self.max_chunk_seconds,
+            "complete": self.complete,
+        }
+
+
+def _setting_days(name: str, default: int) -> int:
+    try:
+        days = int(getattr(settings, name, default))
+    except (TypeError, ValueError):
+        return default
+    return days if days > 0 else default
+
+
+def raw_retention_cutoff(now: datetime | None = None) -> datetime:
+    """Return the timestamp before which raw meter values may be purged."""
+
+    days = _setting_days("OCPP_METER_VALUE_RETENTION_DAYS", DEFAULT_RAW_RETENTION_DAYS)
+    return (now or timezone.now()) - timedelta(days=days)
+
+
+def minute_rollup_cutoff(now: datetime | None = None) -> datetime:
+    """Return the bucket start before which 1-minute rollups may be purged.
+
+    15-minute rollups are kept indefinitely.
+    """
+
+    days = _setting_days(
+        "OCPP_METER_ROLLUP_MINUTE_RETENTION_DAYS", DEFAULT_MINUTE_ROLLUP_RETENTION_DAYS
+    )
+    return (now or timezone.now()) - timedelta(days=days)
+
+
+def _floor(moment: datetime, seconds: int) -> datetime:
+    epoch = int(moment.timestamp())
+    return datetime.fromtimestamp(epoch - epoch % seconds, tz=dt_timezone.utc)
+
+
+class _Bucket:
+    __slots__ = ("count", "minimum", "maximum", "total", "samples", "last", "max_pk")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.max_pk = 0
+        self.minimum: list[Decimal | None] = [None] * len(ROLLUP_FIELDS)
+        self.maximum: list[Decimal | None] = [None] * len(ROLLUP_FIELDS)
+        self.total = [Decimal(0)] * len(ROLLUP_FIELDS)
+        self.samples = [0] * len(ROLLUP_FIELDS)
+        self.last: list[Decimal | None] = [None] * len(ROLLUP_FIELDS)
+
+    def add(self, pk: int, values) -> None:
+        self.count += 1
+        self.max_pk = max(self.max_pk, pk)
+        for index, value in enumerate(values):
+            if value is None:
+                continue
+            if self.minimum[index] is None or value < self.minimum[index]:
+                self.minimum[index] = value
+            if self.maximum[index] is None or value > self.maximum[index]:
+                self.maximum[index] = value
+            self.total[index] += value
+            self.samples[index] += 1
+            self.last[index] = value
+
+    def merge(self, rollup: MeterValueRollup) -> None:
+        """Fold a stored rollup into this bucket of late readings.
+
+        The stored ``last`` values win, and averages are weighted by the
+        stored sample count, so they are approximate for fields that were
+        missing from some of the summarized readings.
+        """
+
+        self.count += rollup.sample_count
+        self.max_pk = max(self.max_pk, rollup.max_reading_pk)
+        for index, name in enumerate(ROLLUP_FIELDS):
+            for stat, current, better in (
+                ("min", self.minimum, min),
+                ("max", self.maximum, max),
+            ):
+                stored = getattr(rollup, f"{name}_{stat}")
+                if stored is not None:
+                    value = current[index]
+                    current[index] = stored if value is None else better(stored, value)
+            average = getattr(rollup, f"{name}_avg")
+            if average is not None:
+                self.total[index] += average * rollup.sample_count
+                self.samples[index] += rollup.sample_count
+            last = getattr(rollup, f"{name}_last")
+            if last is not None:
+                self.last[index] = last
+
+    def fields(self) -> dict[str, Decimal | None]:
+        result: dict[str, Decimal | None] = {}
+        for index, name in enumerate(ROLLUP_FIELDS):
+            samples = self.samples[index]
+            result[f"{name}_min"] = self.minimum[index]
+            result[f"{name}_max"] = self.maximum[index]
+            result[f"{name}_avg"] = (
+                (self.total[index] / samples).quantize(_QUANTUM) if samples else None
+            )
+            result[f"{name}_last"] = self.last[index]
+        return result
+
+
+def _rolled_up_reading_pk() -> int | None:
+    return (
+        MeterValueRollup.objects.filter(resolution=MeterValueRollup.Resolution.QUARTER_HOUR)
+        .aggregate(latest=Max("max_reading_pk"))
+        .get("latest")
+    )
+
+
+def _rollup_window_start(end: datetime) -> datetime | None:
+    latest = (
+        MeterValueRollup.objects.filter(resolution=MeterValueRollup.Resolution.QUARTER_HOUR)
+        .aggregate(latest=Max("bucket_start"))
+        .get("latest")
+    )
+    if latest is not None:
+        return latest - ROLLUP_LOOKBACK
+    earliest = MeterValue.objects.filter(timestamp__lt=end).aggregate(
+        earliest=Min("timestamp")
+    )["earliest"]
+    return earliest
+
+
+def _rollup_slice(
+    start: datetime,
+    end: datetime,
+    *,
+    charger_id: int | None = None,
+    after_pk: int | None = None,
+) -> int:
+    """Upsert rollups for readings in ``[start, end)``.
+
+    With ``after_pk`` only readings above that primary key are read and they
+    are merged into the stored rollups instead of replacing them.
+    """
+
+    buckets: dict[tuple[int, int, int, datetime], _Bucket] = {}
+    resolutions = [choice.value for choice in MeterValueRollup.Resolution]
+    readings = MeterValue.objects.filter(timestamp__gte=start, timestamp__lt=end)
+    if charger_id is not None:
+        readings = readings.filter(charger_id=charger_id)
+    if after_pk is not None:
+        readings = readings.filter(pk__gt=after_pk)
+    readings = (
+        readings.order_by("timestamp", "pk")
+        .values_list("pk", "charger_id", "connector_id", "timestamp", *ROLLUP_FIELDS)
+        .iterator(chunk_size=READ_CHUNK_SIZE)
+    )
+    for pk, charger, connector_id, timestamp, *values in readings:
+        for resolution in resolutions:
+            key = (charger, connector_id or 0, resolution, _floor(timestamp, resolution))
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = _Bucket()
+            bucket.add(pk, values)
+    if not buckets:
+        return 0
+
+    if after_pk is not None:
+        stored = MeterValueRollup.objects.filter(
+            charger_id__in={key[0] for key in buckets},
+            bucket_start__gte=start,
+            bucket_start__lt=end,
+        )
+        for rollup in stored.iterator(chunk_size=READ_CHUNK_SIZE):
+            bucket = buckets.get(
+                (rollup.charger_id, rollup.connector_id, rollup.resolution, rollup.bucket_start)
+            )
+            if bucket is not None:
+                bucket.merge(rollup)
+
+    rows = [
+        MeterValueRollup(
+            charger_id=charger,
+            connector_id=connector_id,
+            resolution=resolution,
+            bucket_start=bucket_start,
+            sample_count=bucket.count,
+            max_reading_pk=bucket.max_pk,
+            **bucket.fields(),
+        )
+        for (charger, connector_id, resolution, bucket_start), bucket in buckets.items()
+    ]
+    update_fields = ["sample_count", "max_reading_pk"] + [
+        f"{name}_{stat}" for name in ROLLUP_FIELDS for stat in ("min", "max", "avg", "last")
+    ]
+    with transaction.atomic():
+        MeterValueRollup.objects.bulk_create(
+            rows,
+            batch_size=ROLLUP_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["charger", "connector_id", "resolution", "bucket_start"],
+            update_fields=update_fields,
+        )
+    return len(rows)
+
+
+def _rollup_range(
+    start: datetime,
+    end: datetime,
+    *,
+    charger_id: int | None = None,
+    after_pk: int | None = None,
+) -> int:
+    written = 0
+    cursor = start
+    while cursor < end:
+        slice_end = min(cursor + ROLLUP_SLICE, end)
+        written += _rollup_slice(
+            cursor, slice_end, charger_id=charger_id, after_pk=after_pk
+        )
+        cursor = slice_end
+    return written
+
+
+def _rollup_window(
+    start: datetime,
+    end: datetime,
+    *,
+    raw_floor: datetime,
+    rolled_pk: int | None,
+    charger_id: int | None = None,
+) -> int:
+    """Roll up ``[start, end)`` without losing buckets whose raw rows are gone.
+
+    Buckets from ``raw_floor`` on still hold all their raw readings and are
+    recomputed. Older buckets may already be purged, so readings above
+    ``rolled_pk`` are merged into their stored rollups instead.
+    """
+
+    written = 0
+    if rolled_pk is not None and start < raw_floor:
+        written += _rollup_range(
+            start, min(raw_floor, end), charger_id=charger_id, after_pk=rolled_pk
+        )
+        start = raw_floor
+    if start < end:
+        written += _rollup_range(start, end, charger_id=charger_id)
+    return written
+
+
+def _rollup_late_readings(
+    rolled_pk: int, window_start: datetime, raw_floor: datetime
+) -> int:
+    """Fold readings stored since the last run but dated before ``window_start``."""
+
+    quarter = MeterValueRollup.Resolution.QUARTER_HOUR.value
+    late = (
+        MeterValue.objects.filter(pk__gt=rolled_pk, timestamp__lt=window_start)
+        .values("charger_id")
+        .annotate(earliest=Min("timestamp"))
+        .order_by("charger_id")
+    )
+    return sum(
+        _rollup_window(
+            _floor(row["earliest"], quarter),
+            window_start,
+            raw_floor=raw_floor,
+            rolled_pk=rolled_pk,
+            charger_id=row["charger_id"],
+        )
+        for row in late
+    )
+
+
+def rollup_meter_values(
+    *,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    max_window: timedelta | None = ROLLUP_MAX_WINDOW,
+) -> tuple[int, datetime | None]:
+    """Aggregate raw meter values into 1-minute and 15-minute rollups.
+
+    The window resumes shortly before the newest 15-minute rollup, or at the
+    earliest raw reading on the first run, and stops at the last complete
+    15-minute boundary. Readings stored since the previous run but dated
+    before that window, such as buffers replayed by chargers that were
+    offline, are folded into their own buckets first. Rollups are upserted,
+    so re-running a window is safe.
+
+    At most ``max_window`` of readings is aggregated per call, starting at
+    the first reading not rolled up yet, so a large backlog such as the first run
+    after an upgrade is worked off over several runs.
+
+    Parameters:
+        start: Optional window start; aligned down to a 15-minute boundary.
+        end: Optional window end; defaults to now, aligned down likewise.
+        max_window: Longest span aggregated by this call; ``None`` for no limit.
+
+    Returns:
+        tuple[int, datetime | None]: Rollup rows written and the end of the
+        rolled-up window, or ``None`` when there was nothing to aggregate.
+    """
+
+    quarter = MeterValueRollup.Resolution.QUARTER_HOUR.value
+    now = end or timezone.now()
+    end = _floor(now, quarter)
+    rolled_pk = _rolled_up_reading_pk()
+    start = start or _rollup_window_start(end)
+    if start is None:
+        return 0, None
+    start = _floor(start, quarter)
+    raw_floor = _floor(raw_retention_cutoff(now), quarter)
+    written = 0
+    if rolled_pk is not None:
+        written += _rollup_late_readings(rolled_pk, start, raw_floor)
+    if max_window is not None:
+        # Start at the first reading not rolled up yet, so a capped window
+        # skips gaps and covered spans and always makes progress.
+        pending = MeterValue.objects.filter(timestamp__gte=start, timestamp__lt=end)
+        if rolled_pk is not None:
+            pending = pending.filter(pk__gt=rolled_pk)
+        first = pending.aggregate(first=Min("timestamp"))["first"]
+        if first is None:
+            return written, end
+        start = max(start, _floor(first, quarter))
+        end = min(end, start + max_window)
+    written += _rollup_window(start, end, raw_floor=raw_floor, rolled_pk=rolled_pk)
+    return written, end
+
+
+def delete_in_chunks(
+    queryset: models.QuerySet,
+    *,
+    chunk_size: int = DEFAULT_PURGE_CHUNK_SIZE,
+    max_seconds: float | None = None,
+    pause_seconds: float = DEFAULT_PURGE_PAUSE_SECONDS,
+) -> PurgeResult:
+    """Delete ``queryset`` rows in ascending primary-key ranges.
+
+    Each range is deleted in its own short transaction, followed by a short
+    pause so waiting writers can take the database lock, and an interrupted
+    or time-boxed run simply continues with the remaining rows next time.
+    Rows flagged as seed data are never deleted.
+    """
+
+    result = PurgeResult()
+    eligible = queryset.filter(is_seed_data=False).order_by()
+    began = time.monotonic()
+    last_pk = None
+    while True:
+        if max_seconds is not None and time.monotonic() - began >= max_seconds:
+            result.complete = False
+            break
+        pending = eligible if last_pk is None else eligible.filter(pk__gt=last_pk)
+        bounds = list(pending.order_by("pk").values_list("pk", flat=True)[:chunk_size])
+        if not bounds:
+            break
+        chunk_began = time.monotonic()
+        with transaction.atomic():
+            # Bypass Entity's per-object delete; purged rows need no signals.
+            deleted, _ = models.QuerySet.delete(
+                eligible.filter(pk__gte=bounds[0], pk__lte=bounds[-1])
+            )
+        result.max_chunk_seconds = max(
+            result.max_chunk_seconds, time.monotonic() - chunk_began
+        )
+        result.deleted += deleted
+        result.chunks += 1
+        last_pk = bounds[-1]
+        if pause_seconds:
+            time.sleep(pause_seconds)
+    result.elapsed_seconds = time.monotonic() - began
+    return result
+
+
+def purge_meter_values(
+    cutoff: datetime,
+    *,
+    chunk_size: int = DEFAULT_PURGE_CHUNK_SIZE,
+    max_seconds: float | None = None,
+    max_pk: int | None = None,
+) -> PurgeResult:
+    """Delete raw meter values older than ``cutoff``.
+
+    Values tied to transactions without a recorded meter stop are preserved so
+    ongoing or incomplete sessions retain their energy data. As with
+    ``Entity.delete``, seed rows are soft-deleted instead of removed and rows
+    that are already soft-deleted are left alone. ``max_pk`` keeps readings
+    that have not been rolled up yet.
+    """
+
+    queryset = MeterValue.objects.filter(timestamp__lt=cutoff).filter(
+        Q(transaction__isnull=True) | Q(transaction__meter_stop__isnull=False)
+    )
+    if max_pk is not None:
+        queryset = queryset.filter(pk__lte=max_pk)
+    result = delete_in_chunks(queryset, chunk_size=chunk_size, max_seconds=max_seconds)
+    if result.complete:
+        result.soft_deleted = queryset.filter(is_seed_data=True).update(is_deleted=True)
+    return result
+
+
+def enforce_meter_value_retention(
+    now: datetime | None = None,
+    *,
+    chunk_size: int = DEFAULT_PURGE_CHUNK_SIZE,
+    max_seconds: float | None = DEFAULT_PURGE_MAX_SECONDS,
+) -> dict[str, object]:
+    """Roll up pending readings, then purge expired raw values and rollups.
+
+    Raw values are only purged up to the end of the rolled-up window, and
+    never past the newest reading folded into a rollup, so no reading
+    disappears before it has been summarized. ``max_seconds`` bounds the
+    whole run: both purges share whatever the rollup step leaves of it.
+    """
+
+    now = now or timezone.now()
+    began = time.monotonic()
+
+    def remaining() -> float | None:
+        if max_seconds is None:
+            return None
+        return max(0.0, max_seconds - (time.monotonic() - began))
+
+    rollups, rolled_until = rollup_meter_values(end=now)
+    cutoff = raw_retention_cutoff(now)
+    if rolled_until is not None:
+        cutoff = min(cutoff, rolled_until)
+    raw = purge_meter_values(
+        cutoff,
+        chunk_size=chunk_size,
+        max_seconds=remaining(),
+        max_pk=_rolled_up_reading_pk() or 0,
+    )
+    expired = delete_in_chunks(
+        MeterValueRollup.all_objects.filter(
+            resolution=MeterValueRollup.Resolution.MINUTE,
+            bucket_start__lt=minute_rollup_cutoff(now),
+        ),
+        chunk_size=chunk_size,
+        max_seconds=remaining(),
+    )
+    logger.info(
+        "Meter retention: %s rollups written, %s raw values purged in %s chunks "
+        "(max %.3fs), %s minute rollups purged",
+        rollups,
+        raw.deleted,
+        raw.chunks,
+        raw.max_chunk_seconds,
+        expired.deleted,
+    )
+    return {"rollups": rollups, "raw": raw, "minute_rollups": expired}
@@ -14,12 +14,14 @@ import os
 from pathlib import Path
 import re
 from threading import RLock
+import time
 from typing import Iterable, Iterator
 
 from django.utils import timezone
 
 from utils.loggers.paths import select_log_dir
 
+from .. import metrics
 from . import state
 
 # Maximum number of recent log entries to keep in memory per identity.
@@ -116,7 +118,9 @@ def add_log(cid: str, entry: str, log_type: str = "charger") -> None:
     entry = f"{timestamp} {entry}"
 
     key = _append_memory_log(cid, entry, log_type=log_type)
+    started = time.perf_counter()
     _write_log_file(key, entry, log_type=log_type)
+    metrics.log_write_duration.labels(log_type).observe(time.perf_counter() - started)
 
 
 def _append_memory_log(cid: str, entry: str, *, log_type: str) -> str:
@@ -6,11 +6,13 @@ import asyncio
 import concurrent.futures
 import json
 import threading
+import time
 
 from django.conf import settings
 from django.core.serializers.json import DjangoJSONEncoder
 from redis.exceptions import RedisError
 
+from .. import metrics
 from . import logs, scheduler, state
 from .transactions import (
     _normalize_transaction_id,
@@ -29,6 +31,7 @@ _pending_call_events: dict[str, threading.Event] = {}
 _pending_call_results: dict[str, dict[str, object]] = {}
 _pending_call_lock = threading.Lock()
 _pending_call_handles: dict[str, asyncio.TimerHandle] = {}
+_pending_call_started: dict[str, float] = {}
 triggered_followups: dict[str, list[dict[str, object]]] = {}
 monitoring_report_requests: dict[int, dict[str, object]] = {}
 _monitoring_report_lock = threading.Lock()
@@ -113,6 +116,7 @@ def register_pending_call(message_id: str, metadata: dict[str, object]) -> None:
     copy = dict(metadata)
     with _pending_call_lock:
         pending_calls[message_id] = copy
+        _pending_call_started[message_id] = time.monotonic()
         event = threading.Event()
         _pending_call_events[message_id] = event
         _pending_call_results.pop(message_id, None)
@@ -152,10 +156,15 @@ def pop_pending_call(message_id: str) -> dict[str, object] | None:
     with _pending_call_lock:
         metadata = pending_calls.pop(message_id, None)
         handle = _pending_call_handles.pop(message_id, None)
+        started = _pending_call_started.pop(message_id, None)
     if handle:
         scheduler._cancel_timer_handle(handle)
     if metadata is None:
         metadata = _load_pending_metadata_redis(message_id)
+    elif started is not None:
+        metrics.pending_call_round_trip.labels(str(metadata.get("action") or "")).observe(
+            time.monotonic() - started
+        )
     _clear_pending_redis(message_id)
     return metadata
 
@@ -255,6 +264,7 @@ def schedule_call_timeout(
                 return
             if metadata.get("timeout_notice_sent"):
                 return
+            metrics.pending_call_timeouts.labels(str(metadata.get("action") or "")).inc()
             target_log = log_key or metadata.get("log_key")
             if not target_log:
                 metadata["timeout_notice_sent"] = True
@@ -349,6 +359,7 @@ def clear_pending_calls(serial: str) -> None:
         ]
         for key in to_remove:
             pending_calls.pop(key, None)
+            _pending_call_started.pop(key, None)
             _pending_call_events.pop(key, None)
             _pending_call_results.pop(key, None)
             handle = _pending_call_handles.pop(key, None)
@@ -8,13 +8,14 @@ from .firmware import (
     request_charge_point_firmware,
     schedule_daily_firmware_snapshot_requests,
 )
+from .fleet import pump_fleet_maintenance, run_fleet_maintenance_job
 from .forwarding import (
     push_forwarded_charge_points,
     setup_forwarders,
     sync_remote_chargers,
 )
 from .logs import request_charge_point_log
-from .maintenance import purge_meter_readings, purge_meter_values
+from .maintenance import purge_meter_readings, purge_meter_values, rollup_meter_values
 from .notifications import (
     send_daily_session_report,
     send_offline_charge_point_notifications,
@@ -24,6 +25,7 @@ from .startup import reset_cached_statuses_task
 
 __all__ = [
     "check_charge_point_configuration",
+    "pump_fleet_maintenance",
     "push_forwarded_charge_points",
     "purge_meter_readings",
     "purge_meter_values",
@@ -31,6 +33,8 @@ __all__ = [
     "request_charge_point_log",
     "request_power_projection",
     "reset_cached_statuses_task",
+    "rollup_meter_values",
+    "run_fleet_maintenance_job",
     "schedule_daily_charge_point_configuration_checks",
     "schedule_daily_firmware_snapshot_requests",
     "schedule_power_projection_requests",
@@ -8,9 +8,9 @@ from asgiref.sync import async_to_sync
 from celery import shared_task
 from django.utils import timezone
 
-from apps.celery.utils import enqueue_task
 from apps.ocpp import store
-from apps.ocpp.models import Charger
+from apps.ocpp.models import Charger, FleetMaintenanceRun
+from apps.ocpp.services import fleet_maintenance
 
 logger = logging.getLogger(__name__)
 
@@ -80,22 +80,26 @@ def check_charge_point_configuration(charger_pk: int) -> bool:
 
 @shared_task(name="apps.ocpp.tasks.schedule_daily_charge_point_configuration_checks")
 def schedule_daily_charge_point_configuration_checks() -> int:
-    """Dispatch configuration requests for eligible charge points."""
+    """Plan a jittered fleet run of configuration requests for eligible charge points."""
 
-    charger_ids = list(
+    chargers = list(
         Charger.objects.filter(
             connector_id__isnull=True,
             configuration_check_enabled=True,
-        ).values_list("pk", flat=True)
+        ).values_list("pk", "charger_id")
     )
-    if not charger_ids:
+    if not chargers:
         logger.debug("No eligible charge points available for configuration check")
         return 0
 
-    scheduled = 0
-    for charger_pk in charger_ids:
-        enqueue_task(check_charge_point_configuration, charger_pk, require_enabled=False)
-        scheduled += 1
+    run, created = fleet_maintenance.start_run(FleetMaintenanceRun.Job.CONFIGURATION, chargers)
+    if not created:
+        logger.info("Configuration check run from %s is already in progress", run.window_start)
+        return 0
 
-    logger.info("Scheduled configuration checks for %s charge point(s)", scheduled)
-    return scheduled
+    logger.info(
+        "Scheduled configuration checks for %s charge point(s) over %s s",
+        len(run.plan),
+        run.window_seconds,
+    )
+    return len(run.plan)
@@ -8,9 +8,15 @@ from asgiref.sync import async_to_sync
 from celery import shared_task
 from django.conf import settings
 
-from apps.celery.utils import enqueue_task
 from apps.ocpp import store
-from apps.ocpp.models import Charger, CPFirmware, CPFirmwareRequest, DataTransferMessage
+from apps.ocpp.models import (
+    Charger,
+    CPFirmware,
+    CPFirmwareRequest,
+    DataTransferMessage,
+    FleetMaintenanceRun,
+)
+from apps.ocpp.services import fleet_maintenance
 
 from .common import DEFAULT_FIRMWARE_VENDOR_ID
 
@@ -89,18 +95,19 @@ def request_charge_point_firmware(charger_pk: int) -> bool:
 
 @shared_task(name="apps.ocpp.tasks.schedule_daily_firmware_snapshot_requests")
 def schedule_daily_firmware_snapshot_requests() -> int:
-    """Dispatch firmware snapshot requests for eligible charge points."""
+    """Plan a jittered fleet run of firmware snapshot requests for eligible charge points."""
 
-    charger_ids = list(
+    chargers = list(
         Charger.objects.filter(
             connector_id__isnull=True,
             firmware_snapshot_enabled=True,
-        ).values_list("pk", flat=True)
+        ).values_list("pk", "charger_id")
     )
-    if not charger_ids:
+    if not chargers:
         logger.debug("No eligible charge points available for firmware snapshot")
         return 0
 
+    charger_ids = [pk for pk, _charger_id in chargers]
     recorded = set(
         CPFirmware.objects.filter(source_charger_id__in=charger_ids).values_list("source_charger_id", flat=True)
     )
@@ -109,16 +116,19 @@ def schedule_daily_firmware_snapshot_requests() -> int:
             "charger_id", flat=True
         )
     )
+    chargers = [entry for entry in chargers if entry[0] not in recorded and entry[0] not in pending]
+    if not chargers:
+        logger.debug("No firmware snapshot requests scheduled; firmware already captured")
+        return 0
 
-    scheduled = 0
-    for charger_pk in charger_ids:
-        if charger_pk in recorded or charger_pk in pending:
-            continue
-        enqueue_task(request_charge_point_firmware, charger_pk, require_enabled=False)
-        scheduled += 1
+    run, created = fleet_maintenance.start_run(FleetMaintenanceRun.Job.FIRMWARE, chargers)
+    if not created:
+        logger.info("Firmware snapshot run from %s is already in progress", run.window_start)
+        return 0
 
-    if scheduled:
-        logger.info("Scheduled firmware snapshot requests for %s charge point(s)", scheduled)
-    else:
-        logger.debug("No firmware snapshot requests scheduled; firmware already captured")
-    return scheduled
+    logger.info(
+        "Scheduled firmware snapshot requests for %s charge point(s) over %s s",
+        len(run.plan),
+        run.window_seconds,
+    )
+    return len(run.plan)
@@ -0,0 +1,53 @@
+"""Pump and per-charger wrapper tasks for jittered fleet maintenance runs."""
+
+import logging
+
+from celery import shared_task
+
+from apps.celery.utils import schedule_task
+from apps.ocpp.models import FleetMaintenanceRun
+from apps.ocpp.services import fleet_maintenance
+
+from .configuration import check_charge_point_configuration
+from .firmware import request_charge_point_firmware
+from .projection import request_power_projection
+
+logger = logging.getLogger(__name__)
+
+FLEET_JOB_TASKS = {
+    FleetMaintenanceRun.Job.CONFIGURATION: check_charge_point_configuration,
+    FleetMaintenanceRun.Job.FIRMWARE: request_charge_point_firmware,
+    FleetMaintenanceRun.Job.PROJECTION: request_power_projection,
+}
+
+
+@shared_task(name="apps.ocpp.tasks.run_fleet_maintenance_job")
+def run_fleet_maintenance_job(run_pk: int, charger_pk: int) -> bool:
+    """Run one charger's call of a fleet run and release its in-flight slot."""
+
+    run = FleetMaintenanceRun.objects.filter(pk=run_pk).only("job", "job_kwargs").first()
+    if run is None:
+        logger.warning("Fleet run %s no longer exists; skipping charger %s", run_pk, charger_pk)
+        return False
+    try:
+        return bool(FLEET_JOB_TASKS[run.job](charger_pk, **run.job_kwargs))
+    finally:
+        fleet_maintenance.record_completion(run_pk)
+
+
+def _enqueue_fleet_call(run: FleetMaintenanceRun, charger_pk: int, countdown: float) -> bool:
+    return schedule_task(
+        run_fleet_maintenance_job,
+        args=(run.pk, charger_pk),
+        countdown=countdown,
+        expires=countdown + fleet_maintenance.COMPLETION_GRACE_SECONDS,
+        require_enabled=False,
+    )
+
+
+@shared_task(name="apps.ocpp.tasks.pump_fleet_maintenance")
+def pump_fleet_maintenance() -> int:
+    """Enqueue the fleet maintenance calls that are due in open runs."""
+
+    return fleet_maintenance.pump_open_runs(_enqueue_fleet_call)
+
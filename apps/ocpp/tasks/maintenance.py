@@ -1,30 +1,48 @@
 """Maintenance tasks for OCPP data retention."""
 
 import logging
-from datetime import timedelta
 
 from celery import shared_task
-from django.db.models import Q
-from django.utils import timezone
 
-from apps.ocpp.models import MeterValue
+from apps.celery.topology import task_class_for
+from apps.ocpp.services import meter_retention
 
 logger = logging.getLogger(__name__)
 
+# Share of the task's soft time limit spent on retention work, leaving room
+# for the last chunk and the summary before the worker raises.
+RETENTION_BUDGET_FRACTION = 0.8
 
-@shared_task(name="apps.ocpp.tasks.purge_meter_values")
-def purge_meter_values() -> int:
-    """Delete meter values older than 7 days.
+
+def _retention_budget(task) -> float:
+    soft_limit = getattr(task, "soft_time_limit", None) or task_class_for(
+        task.name
+    ).soft_time_limit
+    return float(soft_limit) * RETENTION_BUDGET_FRACTION
+
+
+@shared_task(name="apps.ocpp.tasks.rollup_meter_values")
+def rollup_meter_values() -> int:
+    """Aggregate recent meter values into 1-minute and 15-minute rollups."""
+
+    written, _rolled_until = meter_retention.rollup_meter_values()
+    return written
+
+
+@shared_task(name="apps.ocpp.tasks.purge_meter_values", bind=True)
+def purge_meter_values(self) -> int:
+    """Roll up and then delete meter values older than the retention window.
 
     Values tied to transactions without a recorded meter stop are preserved so
-    ongoing or incomplete sessions retain their energy data.
+    ongoing or incomplete sessions retain their energy data. Deletion runs in
+    small primary-key chunks; rows left over when the time budget, derived
+    from the task's soft time limit, runs out are picked up by the next run.
     """
 
-    cutoff = timezone.now() - timedelta(days=7)
-    queryset = MeterValue.objects.filter(timestamp__lt=cutoff).filter(
-        Q(transaction__isnull=True) | Q(transaction__meter_stop__isnull=False)
+    summary = meter_retention.enforce_meter_value_retention(
+        max_seconds=_retention_budget(self)
     )
-    deleted, _ = queryset.delete()
+    deleted = summary["raw"].deleted
     logger.info("Purged %s meter values", deleted)
     return deleted
 
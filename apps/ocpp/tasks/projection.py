@@ -8,9 +8,9 @@ from asgiref.sync import async_to_sync
 from celery import shared_task
 from django.utils import timezone
 
-from apps.celery.utils import enqueue_task
 from apps.ocpp import store
-from apps.ocpp.models import Charger, ChargingProfile, PowerProjection
+from apps.ocpp.models import Charger, ChargingProfile, FleetMaintenanceRun, PowerProjection
+from apps.ocpp.services import fleet_maintenance
 from apps.protocols.decorators import protocol_call
 from apps.protocols.models import ProtocolCall as ProtocolCallModel
 
@@ -105,28 +105,33 @@ def schedule_power_projection_requests(
     duration_seconds: int = 3600,
     charging_rate_unit: str = ChargingProfile.RateUnit.WATT,
 ) -> int:
-    """Dispatch GetCompositeSchedule requests for each EVCS."""
+    """Plan a jittered fleet run of GetCompositeSchedule requests for each EVCS."""
 
-    charger_ids = list(
+    chargers = list(
         Charger.objects.filter(
             connector_id__isnull=True,
             power_projection_enabled=True,
-        ).values_list("pk", flat=True)
+        ).values_list("pk", "charger_id")
     )
-    if not charger_ids:
+    if not chargers:
         logger.debug("No eligible charge points available for power projection")
         return 0
 
-    scheduled = 0
-    for charger_pk in charger_ids:
-        enqueue_task(
-            request_power_projection,
-            charger_pk,
-            duration_seconds=duration_seconds,
-            charging_rate_unit=charging_rate_unit,
-            require_enabled=False,
-        )
-        scheduled += 1
+    run, created = fleet_maintenance.start_run(
+        FleetMaintenanceRun.Job.PROJECTION,
+        chargers,
+        job_kwargs={
+            "duration_seconds": duration_seconds,
+            "charging_rate_unit": charging_rate_unit,
+        },
+    )
+    if not created:
+        logger.info("Power projection run from %s is already in progress", run.window_start)
+        return 0
 
-    logger.info("Scheduled power projection requests for %s charge point(s)", scheduled)
-    return scheduled
+    logger.info(
+        "Scheduled power projection requests for %s charge point(s) over %s s",
+        len(run.plan),
+        run.window_seconds,
+    )
+    return len(run.plan)
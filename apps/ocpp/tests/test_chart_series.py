@@ -0,0 +1,156 @@
+"""Tests for downsampled, incremental charger chart series."""
+
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.ocpp.models import Charger, MeterValue, Transaction
+from apps.ocpp.services.chart_series import (
+    clamp_point_budget,
+    lttb_indices,
+    series_cache_key,
+    transaction_series,
+)
+
+
+def _session(charger_id: str, readings: int, *, stopped: bool = False) -> Transaction:
+    charger = Charger.objects.create(charger_id=charger_id, connector_id=1)
+    start = timezone.make_aware(datetime(2025, 1, 1, 10, 0, 0))
+    tx = Transaction.objects.create(
+        charger=charger,
+        start_time=start,
+        stop_time=start + timedelta(hours=6) if stopped else None,
+        meter_start=0,
+    )
+    MeterValue.objects.bulk_create(
+        MeterValue(
+            charger=charger,
+            transaction=tx,
+            connector_id=1,
+            timestamp=start + timedelta(seconds=10 * index),
+            context="Sample.Periodic",
+            energy=Decimal(index) / Decimal(100),
+        )
+        for index in range(readings)
+    )
+    return tx
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    xs = list(range(100))
+    ys = [0.0] * 100
+    ys[37] = 50.0
+
+    indices = lttb_indices(xs, ys, 10)
+
+    assert len(indices) == 10
+    assert indices[0] == 0 and indices[-1] == 99
+    assert indices == sorted(indices)
+    assert 37 in indices
+
+
+def test_lttb_returns_everything_under_budget():
+    assert lttb_indices([0, 1, 2], [1, 2, 3], 10) == [0, 1, 2]
+
+
+@pytest.mark.parametrize(("value", "expected"), [(None, 500), ("abc", 500), ("3", 10), (99999, 5000)])
+def test_clamp_point_budget(value, expected):
+    assert clamp_point_budget(value) == expected
+
+
+@pytest.mark.django_db
+def test_transaction_series_downsamples_to_budget():
+    tx = _session("CHART-LTTB", 1000)
+
+    points = transaction_series(tx, max_points=50)
+
+    assert len(points) == 50
+    assert datetime.fromisoformat(points[0][0]) == tx.start_time
+    assert points[0][1] == 0.0
+    assert points[-1][1] == pytest.approx(9.99)
+
+
+@pytest.mark.django_db
+def test_transaction_series_since_returns_only_new_readings():
+    tx = _session("CHART-SINCE", 20)
+    cursor = tx.start_time + timedelta(seconds=10 * 17)
+
+    points = transaction_series(tx, since=cursor)
+
+    assert [value for _, value in points] == pytest.approx([0.18, 0.19])
+
+
+@pytest.mark.django_db
+def test_finished_session_series_is_cached():
+    tx = _session("CHART-CACHE", 30, stopped=True)
+    cache.delete(series_cache_key(tx, 20))
+
+    first = transaction_series(tx, max_points=20)
+    MeterValue.objects.filter(transaction=tx).delete()
+    second = transaction_series(tx, max_points=20)
+
+    assert second == first
+    cache.delete(series_cache_key(tx, 20))
+
+
+@pytest.mark.django_db
+def test_chart_endpoint_supports_since_cursor_and_point_budget(client):
+    get_user_model().objects.create_user(username="chart-since", password="secret")
+    tx = _session("CHART-API", 200)
+    assert client.login(username="chart-since", password="secret")
+    url = reverse("ocpp:charger-status-chart-connector", args=["CHART-API", "1"])
+
+    full = client.get(url, {"points": "20"}).json()
+    live = client.get(url, {"since": full["cursor"]}).json()
+    MeterValue.objects.create(
+        charger=tx.charger,
+        transaction=tx,
+        connector_id=1,
+        timestamp=tx.start_time + timedelta(hours=1),
+        context="Sample.Periodic",
+        energy=Decimal("5"),
+    )
+    update = client.get(url, {"since": full["cursor"]}).json()
+
+    assert len(full["labels"]) == 20
+    assert full["series"] == [tx.pk]
+    assert live["labels"] == []
+    assert live["cursor"] == full["cursor"]
+    assert update["datasets"][0]["values"] == [5.0]
+    assert client.get(url, {"since": "not-a-date"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_benchmark_chart_payload_reports_json():
+    stdout = StringIO()
+
+    call_command(
+        "benchmark",
+        "chart-payload",
+        "--sizes",
+        "50",
+        "600",
+        "--points",
+        "100",
+        "--json",
+        stdout=stdout,
+    )
+
+    runs = {
+        (run["readings"], run["implementation"]): run
+        for run in json.loads(stdout.getvalue())["runs"]
+    }
+    assert runs[(600, "full")]["points"] == 600
+    assert runs[(600, "downsampled")]["points"] == 100
+    assert runs[(600, "cached")]["points"] == 100
+    assert runs[(600, "incremental")]["points"] == 5
+    assert runs[(50, "downsampled")]["points"] == 50
+    assert not Charger.objects.filter(charger_id__startswith="BENCH-CHART").exists()
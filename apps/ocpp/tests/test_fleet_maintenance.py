@@ -0,0 +1,207 @@
+"""Tests for jittered, rate-shaped fleet maintenance runs."""
+
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+import pytest
+from django.test.utils import override_settings
+
+from apps.ocpp.models import Charger, FleetMaintenanceRun
+from apps.ocpp.services.fleet_maintenance import (
+    PUMP_INTERVAL_SECONDS,
+    dispatch_due,
+    jitter_offset,
+    start_run,
+)
+from apps.ocpp.tasks import (
+    run_fleet_maintenance_job,
+    schedule_daily_charge_point_configuration_checks,
+)
+
+START = datetime(2025, 1, 1, 0, 0, tzinfo=dt_timezone.utc)
+CALL_SECONDS = 5.0
+FLEET_SETTINGS = {
+    "OCPP_FLEET_WINDOW_SECONDS": 1800,
+    "OCPP_FLEET_RATE_PER_SECOND": 10,
+    "OCPP_FLEET_MAX_IN_FLIGHT": 40,
+}
+
+
+class SimulatedBroker:
+    """Record when each enqueued call would reach its charger."""
+
+    def __init__(self):
+        self.clock = 0.0
+        self.sends: list[tuple[int, float]] = []
+
+    def __call__(self, run, charger_pk, countdown):
+        self.sends.append((charger_pk, self.clock + countdown))
+        return True
+
+
+def _fleet(count, *, prefix="FLEET", offline=()):
+    online_until = START + timedelta(hours=2)
+    Charger.objects.bulk_create(
+        Charger(
+            charger_id=f"{prefix}-{index:05d}",
+            configuration_check_enabled=True,
+            last_heartbeat=START - timedelta(days=1) if index in offline else online_until,
+        )
+        for index in range(count)
+    )
+    return list(
+        Charger.objects.filter(charger_id__startswith=f"{prefix}-")
+        .order_by("pk")
+        .values_list("pk", "charger_id")
+    )
+
+
+def _pump(run, broker, *, start=0, until=4 * 3600):
+    """Pump *run* every beat interval, completing each call after CALL_SECONDS."""
+
+    clock = start
+    while run.finished_at is None and clock <= until:
+        completed = sum(1 for _pk, sent in broker.sends if sent + CALL_SECONDS <= clock)
+        FleetMaintenanceRun.objects.filter(pk=run.pk).update(completed=completed)
+        run.refresh_from_db()
+        broker.clock = clock
+        dispatch_due(run, broker, now=START + timedelta(seconds=clock))
+        clock += PUMP_INTERVAL_SECONDS
+    return clock
+
+
+@pytest.mark.django_db
+@override_settings(**FLEET_SETTINGS)
+def test_ten_thousand_chargers_are_spread_and_rate_shaped():
+    chargers = _fleet(10_000)
+    run, created = start_run(FleetMaintenanceRun.Job.CONFIGURATION, chargers, now=START)
+    broker = SimulatedBroker()
+
+    _pump(run, broker)
+
+    sent = sorted(at for _pk, at in broker.sends)
+    peak_per_second = max(
+        bisect_left(sent, at + 1.0 - 1e-6) - index for index, at in enumerate(sent)
+    )
+    peak_in_flight = max(
+        bisect_left(sent, at + CALL_SECONDS - 1e-6) - index for index, at in enumerate(sent)
+    )
+    assert created
+    assert len({pk for pk, _at in broker.sends}) == len(broker.sends) == 10_000
+    assert peak_per_second <= 10
+    assert peak_in_flight <= 40
+    assert sum(1 for at in sent if at < 60) < 500
+    assert 1800 - 60 < sent[-1] < 1800 + 60
+    run.refresh_from_db()
+    assert run.finished_at is not None
+    assert (run.enqueued, run.completed, run.skipped) == (10_000, 10_000, 0)
+
+
+@pytest.mark.django_db
+@override_settings(**FLEET_SETTINGS)
+def test_restarted_pump_resumes_the_window():
+    chargers = _fleet(500)
+    run, _created = start_run(FleetMaintenanceRun.Job.FIRMWARE, chargers, now=START)
+    before = SimulatedBroker()
+    _pump(run, before, until=900)
+    halfway = FleetMaintenanceRun.objects.get(pk=run.pk)
+
+    resumed, created = start_run(
+        FleetMaintenanceRun.Job.FIRMWARE, chargers, now=START + timedelta(seconds=905)
+    )
+    after = SimulatedBroker()
+    after.sends = list(before.sends)
+    _pump(resumed, after, start=910)
+
+    sent = [pk for pk, _at in after.sends]
+    assert not created and resumed.pk == run.pk
+    assert 0 < halfway.dispatched < 500
+    assert len(sent) == len(set(sent)) == 500
+
+
+@pytest.mark.django_db
+@override_settings(**FLEET_SETTINGS)
+def test_queued_pumps_do_not_resend_entries():
+    chargers = _fleet(200)
+    run, _created = start_run(FleetMaintenanceRun.Job.FIRMWARE, chargers, now=START)
+    queued = FleetMaintenanceRun.objects.get(pk=run.pk)
+    first, second = SimulatedBroker(), SimulatedBroker()
+    now = START + timedelta(seconds=60)
+
+    dispatch_due(run, first, now=now)
+    dispatch_due(queued, second, now=now)
+
+    assert first.sends
+    assert not {pk for pk, _at in first.sends} & {pk for pk, _at in second.sends}
+    assert queued.dispatched == run.dispatched
+
+
+@pytest.mark.django_db
+@override_settings(**FLEET_SETTINGS)
+def test_offline_chargers_are_skipped_before_enqueueing():
+    offline = set(range(0, 100, 4))
+    chargers = _fleet(100, prefix="MIXED", offline=offline)
+    run, _created = start_run(FleetMaintenanceRun.Job.PROJECTION, chargers, now=START)
+    broker = SimulatedBroker()
+
+    _pump(run, broker)
+
+    offline_pks = {chargers[index][0] for index in offline}
+    run.refresh_from_db()
+    assert run.skipped == len(offline)
+    assert len(broker.sends) == 100 - len(offline)
+    assert not offline_pks & {pk for pk, _at in broker.sends}
+
+
+@pytest.mark.django_db
+@override_settings(**FLEET_SETTINGS)
+def test_nightly_scheduler_plans_one_jittered_run():
+    chargers = _fleet(20, prefix="NIGHTLY")
+
+    assert schedule_daily_charge_point_configuration_checks() == 20
+    assert schedule_daily_charge_point_configuration_checks() == 0
+
+    run = FleetMaintenanceRun.objects.get(job=FleetMaintenanceRun.Job.CONFIGURATION)
+    expected = sorted(
+        [round(jitter_offset(charger_id, "configuration", 1800), 3), pk]
+        for pk, charger_id in chargers
+    )
+    assert run.plan == expected
+    assert all(0 <= offset < 1800 for offset, _pk in run.plan)
+    assert jitter_offset("NIGHTLY-00001", "firmware", 1800) != jitter_offset(
+        "NIGHTLY-00001", "configuration", 1800
+    )
+
+
+@pytest.mark.django_db
+def test_fleet_job_releases_its_slot_when_the_charger_is_gone():
+    (charger_pk, _charger_id), = _fleet(1, prefix="GONE")
+    run, _created = start_run(
+        FleetMaintenanceRun.Job.CONFIGURATION, [(charger_pk, "GONE-00000")], now=START
+    )
+    Charger.objects.filter(pk=charger_pk).delete()
+
+    assert run_fleet_maintenance_job(run.pk, charger_pk) is False
+
+    run.refresh_from_db()
+    assert run.completed == 1
+
+
+@pytest.mark.django_db
+@override_settings(**{**FLEET_SETTINGS, "OCPP_FLEET_MAX_IN_FLIGHT": 2})
+def test_calls_that_never_report_back_do_not_stall_the_run():
+    chargers = _fleet(30, prefix="LOST")
+    run, _created = start_run(FleetMaintenanceRun.Job.CONFIGURATION, chargers, now=START)
+    broker = SimulatedBroker()
+
+    clock = 0
+    while run.finished_at is None and clock <= 4 * 3600:
+        broker.clock = clock
+        dispatch_due(run, broker, now=START + timedelta(seconds=clock))
+        clock += PUMP_INTERVAL_SECONDS
+
+    run.refresh_from_db()
+    assert len({pk for pk, _at in broker.sends}) == len(broker.sends) == 30
+    assert (run.enqueued, run.completed) == (30, 0)
+    assert run.finished_at is not None
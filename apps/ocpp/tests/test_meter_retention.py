@@ -0,0 +1,233 @@
+"""Tests for meter value rollups and chunked retention purges."""
+
+import json
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from apps.ocpp.models import Charger, MeterValue, MeterValueRollup, Transaction
+from apps.ocpp.services.meter_retention import (
+    delete_in_chunks,
+    enforce_meter_value_retention,
+    purge_meter_values,
+    rollup_meter_values,
+)
+
+START = datetime(2025, 1, 1, 10, 0, tzinfo=dt_timezone.utc)
+
+
+def _readings(charger, tx, count, *, start=START, step=timedelta(seconds=20)):
+    MeterValue.objects.bulk_create(
+        MeterValue(
+            charger=charger,
+            transaction=tx,
+            connector_id=1,
+            timestamp=start + step * index,
+            energy=Decimal(index),
+            voltage=Decimal("230") + index,
+        )
+        for index in range(count)
+    )
+
+
+@pytest.mark.django_db
+def test_rollup_aggregates_minute_and_quarter_hour_buckets():
+    charger = Charger.objects.create(charger_id="ROLLUP-1", connector_id=1)
+    _readings(charger, None, 6)
+
+    written, rolled_until = rollup_meter_values(end=START + timedelta(minutes=20))
+    rollup_meter_values(start=START, end=START + timedelta(minutes=20))
+
+    minutes = MeterValueRollup.objects.filter(
+        resolution=MeterValueRollup.Resolution.MINUTE
+    ).order_by("bucket_start")
+    quarter = MeterValueRollup.objects.get(resolution=MeterValueRollup.Resolution.QUARTER_HOUR)
+    assert written == 3
+    assert rolled_until == START + timedelta(minutes=15)
+    assert [row.sample_count for row in minutes] == [3, 3]
+    assert (minutes[1].energy_min, minutes[1].energy_max, minutes[1].energy_last) == (
+        Decimal("3.000"),
+        Decimal("5.000"),
+        Decimal("5.000"),
+    )
+    assert quarter.sample_count == 6
+    assert quarter.voltage_avg == Decimal("232.500")
+    assert quarter.current_import_avg is None
+
+
+@pytest.mark.django_db
+def test_purge_keeps_open_sessions_and_seed_rows():
+    charger = Charger.objects.create(charger_id="PURGE-1", connector_id=1)
+    closed = Transaction.objects.create(charger=charger, start_time=START, meter_stop=10)
+    open_tx = Transaction.objects.create(charger=charger, start_time=START)
+    _readings(charger, closed, 25)
+    _readings(charger, open_tx, 5)
+    _readings(charger, None, 5)
+    seed = MeterValue.objects.filter(transaction__isnull=True).order_by("pk").first()
+    MeterValue.objects.filter(pk=seed.pk).update(is_seed_data=True)
+
+    hidden = MeterValue.objects.filter(transaction__isnull=True).order_by("-pk").first()
+    MeterValue.objects.filter(pk=hidden.pk).update(is_deleted=True)
+
+    result = purge_meter_values(START + timedelta(days=1), chunk_size=7)
+
+    assert result.deleted == 28
+    assert result.soft_deleted == 1
+    assert result.chunks == 4
+    assert result.complete
+    assert MeterValue.all_objects.filter(transaction=open_tx).count() == 5
+    assert set(
+        MeterValue.all_objects.filter(transaction__isnull=True).values_list(
+            "pk", "is_deleted"
+        )
+    ) == {(seed.pk, True), (hidden.pk, True)}
+
+
+@pytest.mark.django_db
+def test_time_boxed_purge_resumes_on_next_run():
+    charger = Charger.objects.create(charger_id="PURGE-2", connector_id=1)
+    _readings(charger, None, 10)
+    queryset = MeterValue.all_objects.filter(charger=charger)
+
+    stopped = delete_in_chunks(queryset, chunk_size=3, max_seconds=0)
+    resumed = delete_in_chunks(queryset, chunk_size=3, pause_seconds=0)
+
+    assert (stopped.deleted, stopped.complete) == (0, False)
+    assert (resumed.deleted, resumed.chunks) == (10, 4)
+
+
+@pytest.mark.django_db
+def test_retention_rolls_up_before_purging(settings):
+    settings.OCPP_METER_VALUE_RETENTION_DAYS = 7
+    charger = Charger.objects.create(charger_id="RETAIN-1", connector_id=1)
+    _readings(charger, None, 30)
+
+    summary = enforce_meter_value_retention(START + timedelta(days=8))
+
+    assert summary["raw"].deleted == 30
+    assert not MeterValue.all_objects.filter(charger=charger).exists()
+    assert (
+        MeterValueRollup.objects.get(
+            charger=charger, resolution=MeterValueRollup.Resolution.QUARTER_HOUR
+        ).sample_count
+        == 30
+    )
+
+
+@pytest.mark.django_db
+def test_late_readings_are_rolled_up_before_purge(settings):
+    settings.OCPP_METER_VALUE_RETENTION_DAYS = 7
+    charger = Charger.objects.create(charger_id="LATE-1", connector_id=1)
+    _readings(charger, None, 3, start=START + timedelta(days=2))
+    _readings(charger, None, 3, start=START + timedelta(days=3))
+    enforce_meter_value_retention(START + timedelta(days=3, hours=1))
+
+    _readings(charger, None, 3, start=START + timedelta(days=2, seconds=5))
+    summary = enforce_meter_value_retention(START + timedelta(days=9, hours=6))
+
+    quarter = MeterValueRollup.objects.get(
+        charger=charger,
+        resolution=MeterValueRollup.Resolution.QUARTER_HOUR,
+        bucket_start=START + timedelta(days=2),
+    )
+    assert quarter.sample_count == 6
+    assert summary["raw"].deleted == 6
+    assert MeterValue.all_objects.filter(charger=charger).count() == 3
+
+
+@pytest.mark.django_db
+def test_late_readings_merge_into_buckets_already_purged(settings):
+    settings.OCPP_METER_VALUE_RETENTION_DAYS = 7
+    charger = Charger.objects.create(charger_id="LATE-2", connector_id=1)
+    _readings(charger, None, 3)
+    enforce_meter_value_retention(START + timedelta(days=8))
+    assert not MeterValue.all_objects.filter(charger=charger).exists()
+
+    _readings(charger, None, 2, start=START + timedelta(seconds=5))
+    summary = enforce_meter_value_retention(START + timedelta(days=8, hours=1))
+
+    quarter = MeterValueRollup.objects.get(
+        charger=charger, resolution=MeterValueRollup.Resolution.QUARTER_HOUR
+    )
+    assert quarter.sample_count == 5
+    assert (quarter.energy_min, quarter.energy_max) == (Decimal("0.000"), Decimal("2.000"))
+    assert summary["raw"].deleted == 2
+
+
+@pytest.mark.django_db
+def test_benchmark_meter_retention_reports_json(tmp_path):
+    stdout = StringIO()
+
+    call_command(
+        "benchmark",
+        "meter-retention",
+        "--rows",
+        "5000",
+        "--chargers",
+        "5",
+        "--chunk-size",
+        "500",
+        "--workdir",
+        str(tmp_path),
+        "--json",
+        stdout=stdout,
+    )
+
+    runs = {
+        (run["scenario"], run["implementation"]): run
+        for run in json.loads(stdout.getvalue())["runs"]
+    }
+    assert runs[("purge", "chunked")]["rows"] > 0
+    assert runs[("query:session-series", "indexed")]["rows"] > 0
+    assert ("query:connector-latest", "fk-only") in runs
+
+
+@pytest.mark.django_db
+def test_rollup_works_off_a_backlog_in_bounded_windows():
+    charger = Charger.objects.create(charger_id="BACKLOG-1", connector_id=1)
+    _readings(charger, None, 3)
+    _readings(charger, None, 3, start=START + timedelta(days=10))
+    now = START + timedelta(days=11)
+
+    _written, first_until = rollup_meter_values(end=now, max_window=timedelta(days=1))
+    _written, second_until = rollup_meter_values(end=now, max_window=timedelta(days=1))
+
+    assert first_until == START + timedelta(days=1)
+    assert second_until == now
+    assert MeterValueRollup.objects.filter(
+        resolution=MeterValueRollup.Resolution.QUARTER_HOUR
+    ).count() == 2
+
+
+@pytest.mark.django_db
+def test_retention_budget_covers_rollup_and_both_purges(settings, monkeypatch):
+    from apps.ocpp.services import meter_retention
+
+    settings.OCPP_METER_VALUE_RETENTION_DAYS = 7
+    charger = Charger.objects.create(charger_id="BUDGET-1", connector_id=1)
+    _readings(charger, None, 3)
+    budgets = []
+    real_delete_in_chunks = meter_retention.delete_in_chunks
+
+    def recording_delete_in_chunks(queryset, **kwargs):
+        budgets.append(kwargs["max_seconds"])
+        return real_delete_in_chunks(queryset, **kwargs)
+
+    monkeypatch.setattr(meter_retention, "delete_in_chunks", recording_delete_in_chunks)
+    enforce_meter_value_retention(START + timedelta(days=8), max_seconds=5)
+
+    assert len(budgets) == 2
+    assert 0 <= budgets[1] <= budgets[0] <= 5
+
+
+def test_purge_task_budget_follows_its_soft_time_limit():
+    from apps.celery.topology import task_class_for
+    from apps.ocpp.tasks.maintenance import _retention_budget, purge_meter_values
+
+    soft_limit = task_class_for(purge_meter_values.name).soft_time_limit
+
+    assert 0 < _retention_budget(purge_meter_values) < soft_limit
@@ -0,0 +1,54 @@
+"""Tests for OCPP runtime metrics recorded by dispatch and the store."""
+
+import json
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from apps.ocpp import metrics, store
+from apps.ocpp.consumers import CSMSConsumer
+
+
+@pytest.mark.anyio
+async def test_dispatch_records_action_latency_and_query_count():
+    consumer = CSMSConsumer(scope={}, receive=None, send=None)
+    consumer.store_key = "CP-METRICS"
+    consumer.charger_id = "CP-METRICS"
+    consumer._log_triggered_follow_up = lambda *_args, **_kwargs: None
+    consumer._assign_connector = AsyncMock()
+    consumer._forward_charge_point_message = AsyncMock()
+    consumer._handle_heartbeat_action = AsyncMock(return_value={})
+    consumer.send = AsyncMock()
+    duration = metrics.action_duration.labels("Heartbeat")
+    queries = metrics.action_queries.labels("Heartbeat")
+    before = duration.count(), queries.count(), metrics.unhandled_actions.labels().value()
+
+    for action in ("Heartbeat", "NotARealAction"):
+        msg = [2, f"msg-{action}", action, {}]
+        await consumer._handle_call_message(msg, json.dumps(msg), json.dumps(msg))
+
+    assert duration.count() == before[0] + 1
+    assert queries.count() == before[1] + 1
+    assert metrics.unhandled_actions.labels().value() == before[2] + 1
+    store.logs["charger"].pop("CP-METRICS", None)
+
+
+def test_pending_call_round_trip_and_timeouts_are_recorded():
+    round_trip = metrics.pending_call_round_trip.labels("GetConfiguration")
+    timeouts = metrics.pending_call_timeouts.labels("Reset")
+    before = round_trip.count(), timeouts.value()
+
+    store.register_pending_call("metrics-call-1", {"action": "GetConfiguration"})
+    assert store.pop_pending_call("metrics-call-1")["action"] == "GetConfiguration"
+    assert store.pop_pending_call("metrics-call-1") is None
+
+    store.register_pending_call("metrics-call-2", {"action": "Reset"})
+    store.schedule_call_timeout("metrics-call-2", timeout=0.01, action="Reset")
+    deadline = time.monotonic() + 2
+    while timeouts.value() == before[1] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    store.pop_pending_call("metrics-call-2")
+
+    assert round_trip.count() == before[0] + 1
+    assert timeouts.value() == before[1] + 1
@@ -6,6 +6,7 @@ from django.contrib.auth.decorators import login_required
 from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.utils.translation import gettext as _
 from django.views.decorators.http import require_GET, require_POST
 
@@ -13,6 +14,7 @@ from apps.docs import rendering
 from apps.features.utils import get_cached_feature_enabled, get_cached_feature_parameter
 from apps.ocpp.models.location import Location
 from apps.ocpp.services import ChargerAccessDeniedError, build_charger_chart_payload
+from apps.ocpp.services.chart_series import clamp_point_budget
 from apps.sites.utils import (
     landing,
     module_pill_link_validation,
@@ -329,11 +331,17 @@ def charger_status(request, cid, connector=None):
     session_params = request.GET.copy()
     session_params.pop("session", None)
     session_query = session_params.urlencode()
+    # Status polls pass the chart cursor so only new readings are embedded.
+    try:
+        chart_since = _parse_chart_since(request.GET.get("chart_since"))
+    except ValueError:
+        chart_since = None
     chart_data = build_charger_chart_payload(
         user=request.user,
         cid=cid,
         connector=connector_slug,
         session_id=session_id,
+        since=chart_since,
     )
     rfid_cache: dict[str, dict[str, str | None]] = {}
     overview = _connector_overview(
@@ -433,10 +441,13 @@ def charger_status(request, cid, connector=None):
             "remote_start_messages": remote_start_messages,
             "action_url": action_url,
             "show_chart": bool(
-                chart_data["datasets"]
-                and any(
-                    any(value is not None for value in dataset["values"])
-                    for dataset in chart_data["datasets"]
+                (chart_since is not None and chart_data["series"])
+                or (
+                    chart_data["datasets"]
+                    and any(
+                        any(value is not None for value in dataset["values"])
+                        for dataset in chart_data["datasets"]
+                    )
                 )
             ),
             "date_view": date_view,
@@ -458,6 +469,21 @@ def charger_status(request, cid, connector=None):
     )
 
 
+def _parse_chart_since(value: str | None):
+    """Return an aware datetime for a chart cursor, or ``None`` when blank.
+
+    Raises:
+        ValueError: If ``value`` is not an ISO 8601 timestamp.
+    """
+
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(value)
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
 @login_required
 @require_GET
 def charger_status_chart(request, cid, connector=None):
@@ -468,6 +494,11 @@ def charger_status_chart(request, cid, connector=None):
         cid: Charger identifier.
         connector: Optional connector slug from the URL.
 
+    Query parameters:
+        session: Optional historic transaction identifier.
+        since: Optional ISO timestamp; only newer readings are returned.
+        points: Optional point budget per dataset.
+
     Returns:
         JsonResponse: Chart payload matching the charger status template contract.
 
@@ -477,12 +508,18 @@ def charger_status_chart(request, cid, connector=None):
 
     not_found_detail = {"detail": _("Not found.")}
     session_id = request.GET.get("session") or None
+    try:
+        since = _parse_chart_since(request.GET.get("since"))
+    except ValueError:
+        return JsonResponse({"detail": _("Invalid since timestamp.")}, status=400)
     try:
         payload = build_charger_chart_payload(
             user=request.user,
             cid=cid,
             connector=connector,
             session_id=session_id,
+            since=since,
+            max_points=clamp_point_budget(request.GET.get("points")),
         )
     except ChargerAccessDeniedError as exc:
         logger.warning("Denied charger status chart access for cid=%s: %s", cid, exc)
@@ -30,6 +30,7 @@ from .public_query_features import (
     PUBLIC_QUERY_EXECUTION_RESTRICTION_MESSAGE,
     is_public_query_execution_secure_mode_enabled,
 )
+from .rpc import read_by_ids
 from .services import sync_odoo_deployments
 from .sync_features import (
     ODOO_SYNC_DEPLOYMENT_DISCOVERY_PARAMETER_KEY,
@@ -599,9 +600,9 @@ class OdooSaleOrderTemplateAdmin(EntityModelAdmin):
             if row.get("id")
         ]
 
-    def _find_remote_row(
-        self, profile, source_type: str, source_id: int
-    ) -> dict[str, object] | None:
+    def _find_remote_rows(
+        self, profile, source_type: str, source_ids: list[int]
+    ) -> dict[int, dict[str, object]]:
         model_map = {
             OdooTemplateSetupImportForm.SOURCE_TEMPLATES: "sale.order.template",
             OdooTemplateSetupImportForm.SOURCE_PRODUCTS: "product.product",
@@ -612,16 +613,9 @@ class OdooSaleOrderTemplateAdmin(EntityModelAdmin):
             OdooTemplateSetupImportForm.SOURCE_PRODUCTS: ["id", "name", "description_sale"],
             OdooTemplateSetupImportForm.SOURCE_EMPLOYEES: ["id", "name", "email", "login", "partner_id"],
         }
-        rows = profile.execute(
-            model_map[source_type],
-            "search_read",
-            [[("id", "=", source_id)]],
-            fields=fields_map[source_type],
-            limit=1,
+        return read_by_ids(
+            profile, model_map[source_type], source_ids, fields_map[source_type]
         )
-        if not rows:
-            return None
-        return rows[0]
 
     def _resolve_unique_username(self, base_username: str, odoo_uid: int) -> str:
         user_model = get_user_model()
@@ -785,12 +779,15 @@ class OdooSaleOrderTemplateAdmin(EntityModelAdmin):
     def _import_source_selection(self, profile, source_type: str, selected_ids: list[str]) -> tuple[int, int]:
         created = 0
         updated = 0
+        source_ids: list[int] = []
         for raw_id in selected_ids:
             try:
-                source_id = int(raw_id)
+                source_ids.append(int(raw_id))
             except (TypeError, ValueError):
                 continue
-            source_row = self._find_remote_row(profile, source_type, source_id)
+        source_rows = self._find_remote_rows(profile, source_type, source_ids)
+        for source_id in dict.fromkeys(source_ids):
+            source_row = source_rows.get(source_id)
             if not source_row:
                 continue
             if source_type == OdooTemplateSetupImportForm.SOURCE_TEMPLATES:
@@ -0,0 +1,219 @@
+"""Benchmark Odoo XML-RPC access against an in-process stand-in server."""
+
+from __future__ import annotations
+
+import json
+import statistics
+import threading
+import time
+from dataclasses import dataclass
+from socketserver import ThreadingMixIn
+from xmlrpc.server import SimpleXMLRPCRequestHandler, SimpleXMLRPCServer
+
+from django.core.management.base import CommandError
+from django.test import override_settings
+
+from apps.core.benchmarks import BenchmarkScenario
+from apps.odoo import rpc
+
+DEFAULT_CALLS = 50
+DEFAULT_RECORDS = 20
+
+
+class _KeepAliveHandler(SimpleXMLRPCRequestHandler):
+    protocol_version = "HTTP/1.1"
+    rpc_paths = (rpc.OBJECT_ENDPOINT,)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubOdoo(ThreadingMixIn, SimpleXMLRPCServer):
+    """In-process Odoo object endpoint that counts connections and calls.
+
+    ``handshake`` delays every new connection to stand in for TCP/TLS setup
+    to a remote server; ``latency`` delays every call.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, *, handshake: float = 0.0, latency: float = 0.0) -> None:
+        super().__init__(("127.0.0.1", 0), requestHandler=_KeepAliveHandler, logRequests=False)
+        self.handshake = handshake
+        self.latency = latency
+        self.connections = 0
+        self.calls = 0
+        self.register_function(self.execute_kw, "execute_kw")
+
+    def get_request(self):
+        request = super().get_request()
+        self.connections += 1
+        if self.handshake:
+            time.sleep(self.handshake)
+        return request
+
+    def execute_kw(self, database, uid, password, model, method, args, kwargs):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        domain = args[0][0] if args and args[0] else []
+        ids = next((value for field, op, value in domain if field == "id"), [])
+        if not isinstance(ids, list):
+            ids = [ids]
+        fields = kwargs.get("fields") or ["id", "name"]
+        return [
+            {field: record_id if field == "id" else f"Record {record_id}" for field in fields}
+            for record_id in ids
+        ]
+
+    @property
+    def host(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+@dataclass
+class BenchmarkRun:
+    scenario: str
+    mode: str
+    calls: int
+    connections: int
+    mean_seconds: float
+    total_seconds: float
+
+    def to_dict(self) -> dict:
+        return {
+            "scenario": self.scenario,
+            "mode": self.mode,
+            "calls": self.calls,
+            "connections": self.connections,
+            "mean_seconds": self.mean_seconds,
+            "total_seconds": self.total_seconds,
+        }
+
+
+class _Profile:
+    def __init__(self, host: str) -> None:
+        self.host = host
+
+    def execute(self, model, method, *args, **kwargs):
+        return rpc.execute_kw(self.host, "bench", 1, "secret", model, method, args, kwargs)
+
+
+class OdooRpcBenchmark(BenchmarkScenario):
+    help = (
+        "Benchmark Odoo XML-RPC access against an in-process stand-in server: "
+        "the keep-alive client with pooling disabled versus pooled, and "
+        "per-record reads versus one batched search_read."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--calls",
+            type=int,
+            default=DEFAULT_CALLS,
+            help=f"RPC calls per connection scenario (default: {DEFAULT_CALLS}).",
+        )
+        parser.add_argument(
+            "--records",
+            type=int,
+            default=DEFAULT_RECORDS,
+            help=f"Records fetched in the read scenario (default: {DEFAULT_RECORDS}).",
+        )
+        parser.add_argument(
+            "--handshake-ms",
+            type=float,
+            default=20.0,
+            help="Simulated connection setup cost in milliseconds (default: 20).",
+        )
+        parser.add_argument(
+            "--latency-ms",
+            type=float,
+            default=2.0,
+            help="Simulated per-call server time in milliseconds (default: 2).",
+        )
+        parser.add_argument("--json", action="store_true", help="Emit JSON summary output.")
+
+    def handle(self, **options):
+        if options["calls"] < 1 or options["records"] < 1:
+            raise CommandError("--calls and --records must be at least 1.")
+
+        server = StubOdoo(
+            handshake=options["handshake_ms"] / 1000,
+            latency=options["latency_ms"] / 1000,
+        )
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            results = self._run(server, options["calls"], options["records"])
+        finally:
+            rpc.reset_pool()
+            server.shutdown()
+            server.server_close()
+
+        payload = {"runs": [run.to_dict() for run in results]}
+        if options["json"]:
+            self.stdout.write(json.dumps(payload, indent=2))
+            return
+
+        self.stdout.write("Odoo RPC benchmark summary:")
+        for run in results:
+            self.stdout.write(
+                f"  {run.scenario} {run.mode}: {run.calls} calls over "
+                f"{run.connections} connections, total {run.total_seconds * 1000:.1f} ms, "
+                f"mean {run.mean_seconds * 1000:.2f} ms/call"
+            )
+
+    def _measure(self, server: StubOdoo, scenario: str, mode: str, operation) -> BenchmarkRun:
+        rpc.reset_pool()
+        calls_before, connections_before = server.calls, server.connections
+        durations = operation()
+        return BenchmarkRun(
+            scenario=scenario,
+            mode=mode,
+            calls=server.calls - calls_before,
+            connections=server.connections - connections_before,
+            mean_seconds=statistics.fmean(durations),
+            total_seconds=sum(durations),
+        )
+
+    def _run(self, server: StubOdoo, calls: int, records: int) -> list[BenchmarkRun]:
+        profile = _Profile(server.host)
+        domain = [[("id", "in", [1])]]
+
+        def unpooled():
+            with override_settings(ODOO_RPC_POOL_SIZE=0):
+                return pooled()
+
+        def pooled():
+            durations = []
+            for _ in range(calls):
+                began = time.perf_counter()
+                profile.execute("res.partner", "search_read", domain)
+                durations.append(time.perf_counter() - began)
+            return durations
+
+        def per_record():
+            durations = []
+            for record_id in range(1, records + 1):
+                began = time.perf_counter()
+                profile.execute(
+                    "res.users",
+                    "search_read",
+                    [[("id", "=", record_id)]],
+                    fields=["id", "name"],
+                    limit=1,
+                )
+                durations.append(time.perf_counter() - began)
+            return durations
+
+        def batched():
+            began = time.perf_counter()
+            rpc.read_by_ids(profile, "res.users", range(1, records + 1), ["name"])
+            return [time.perf_counter() - began]
+
+        return [
+            self._measure(server, "connections", "unpooled", unpooled),
+            self._measure(server, "connections", "pooled", pooled),
+            self._measure(server, "reads", "per_record", per_record),
+            self._measure(server, "reads", "batched", batched),
+        ]
@@ -13,6 +13,8 @@ from apps.chats.models import ChatAvatar
 from apps.users.models import Profile
 from apps.sigils.fields import SigilShortAutoField
 
+from .. import rpc
+
 
 defused_xmlrpc.monkey_patch()
 xmlrpc_client = defused_xmlrpc.xmlrpc_client
@@ -156,17 +158,15 @@ class OdooEmployee(Profile):
         """Execute an Odoo RPC call, invalidating credentials on failure."""
 
         try:
-            client = xmlrpc_client.ServerProxy(f"{self.host}/xmlrpc/2/object")
-            call_args = list(args)
-            call_kwargs = dict(kwargs)
-            return client.execute_kw(
+            return rpc.execute_kw(
+                self.host,
                 self.database,
                 self.odoo_uid,
                 self.password,
                 model,
                 method,
-                call_args,
-                call_kwargs,
+                args,
+                kwargs,
             )
         except Exception:
             logger.exception(
@@ -0,0 +1,257 @@
+"""Pooled XML-RPC access to Odoo with batched reads and cached public queries.
+
+``xmlrpc.client`` transports keep their HTTP/1.1 connection open between
+requests, but only for as long as the owning ``ServerProxy`` lives. Proxies
+are therefore pooled per ``(host, database, uid)`` and handed out to one
+caller at a time, so consecutive calls reuse a warm keep-alive connection
+instead of paying a TCP/TLS handshake each time. A proxy that raised is
+closed rather than returned to the pool.
+
+Call counts, connection counts and latency are recorded in the process
+metrics registry (see :mod:`apps.core.metrics`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from defusedxml import xmlrpc as defused_xmlrpc
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.metrics import counter, histogram
+
+defused_xmlrpc.monkey_patch()
+xmlrpc_client = defused_xmlrpc.xmlrpc_client
+
+OBJECT_ENDPOINT = "/xmlrpc/2/object"
+DEFAULT_POOL_SIZE = 4
+DEFAULT_PUBLIC_QUERY_CACHE_TTL = 60
+PUBLIC_QUERY_CACHE_PREFIX = "odoo:public-query:"
+# Methods without side effects whose results may be shared between visitors.
+CACHEABLE_METHODS = frozenset(
+    {
+        "fields_get",
+        "name_search",
+        "read",
+        "read_group",
+        "search",
+        "search_count",
+        "search_read",
+    }
+)
+
+rpc_calls = counter(
+    "odoo_rpc_calls_total",
+    "Odoo RPC calls by method and outcome (ok or error).",
+    ("method", "outcome"),
+)
+rpc_latency = histogram(
+    "odoo_rpc_latency_seconds",
+    "Round-trip time of Odoo RPC calls.",
+    ("method",),
+)
+rpc_connections = counter(
+    "odoo_rpc_connections_total",
+    "Odoo XML-RPC proxies opened because no pooled proxy was idle.",
+)
+public_query_cache = counter(
+    "odoo_public_query_cache_total",
+    "Public Odoo query cache lookups by result (hit or miss).",
+    ("result",),
+)
+
+PoolKey = tuple[str, str, int | None]
+
+_lock = threading.Lock()
+_idle: dict[PoolKey, list[Any]] = {}
+
+
+def pool_size() -> int:
+    """Return how many idle proxies are kept per ``(host, database, uid)``."""
+
+    return int(getattr(settings, "ODOO_RPC_POOL_SIZE", DEFAULT_POOL_SIZE))
+
+
+def _new_proxy(host: str):
+    rpc_connections.inc()
+    return xmlrpc_client.ServerProxy(f"{host}{OBJECT_ENDPOINT}")
+
+
+def _close(proxy) -> None:
+    try:
+        proxy("close")()
+    except Exception:  # pragma: no cover - closing a broken transport
+        pass
+
+
+@contextmanager
+def pooled_proxy(host: str, database: str, uid: int | None) -> Iterator[Any]:
+    """Yield an object endpoint proxy reserved for the caller.
+
+    The proxy goes back to the pool when the block exits normally or with an
+    Odoo fault, and is closed on any other error since the connection state
+    is then unknown.
+    """
+
+    key: PoolKey = (str(host), str(database), uid)
+    with _lock:
+        idle = _idle.get(key)
+        proxy = idle.pop() if idle else None
+    if proxy is None:
+        proxy = _new_proxy(host)
+    try:
+        yield proxy
+    except xmlrpc_client.Fault:
+        # Odoo answered with an error; the connection itself is still usable.
+        _release(key, proxy)
+        raise
+    except BaseException:
+        _close(proxy)
+        raise
+    _release(key, proxy)
+
+
+def _release(key: PoolKey, proxy) -> None:
+    with _lock:
+        idle = _idle.setdefault(key, [])
+        if len(idle) < pool_size():
+            idle.append(proxy)
+            return
+    _close(proxy)
+
+
+def execute_kw(
+    host: str,
+    database: str,
+    uid: int | None,
+    password: str,
+    model: str,
+    method: str,
+    args: Sequence[Any] = (),
+    kwargs: dict[str, Any] | None = None,
+):
+    """Run ``model.method`` through a pooled proxy and record its statistics."""
+
+    started = time.perf_counter()
+    try:
+        with pooled_proxy(host, database, uid) as proxy:
+            result = proxy.execute_kw(
+                database, uid, password, model, method, list(args), dict(kwargs or {})
+            )
+    except Exception:
+        rpc_calls.labels(method, "error").inc()
+        raise
+    finally:
+        rpc_latency.labels(method).observe(time.perf_counter() - started)
+    rpc_calls.labels(method, "ok").inc()
+    return result
+
+
+def reset_pool() -> None:
+    """Close every idle proxy (used by tests and after credential changes)."""
+
+    with _lock:
+        proxies = [proxy for idle in _idle.values() for proxy in idle]
+        _idle.clear()
+    for proxy in proxies:
+        _close(proxy)
+
+
+def read_by_ids(
+    profile,
+    model: str,
+    ids: Iterable[int],
+    fields: Sequence[str],
+) -> dict[int, dict[str, Any]]:
+    """Fetch ``fields`` for every id in one ``search_read`` call.
+
+    ``search_read`` is used instead of ``read`` so ids that no longer exist
+    are skipped rather than failing the whole batch. Returns rows keyed by id.
+    """
+
+    unique_ids = sorted({int(record_id) for record_id in ids})
+    if not unique_ids:
+        return {}
+    projected = list(fields)
+    if "id" not in projected:
+        projected.insert(0, "id")
+    rows = profile.execute(
+        model,
+        "search_read",
+        [[("id", "in", unique_ids)]],
+        fields=projected,
+        limit=len(unique_ids),
+    )
+    return {int(row["id"]): row for row in rows or [] if row.get("id")}
+
+
+def public_query_cache_ttl() -> int:
+    return int(
+        getattr(settings, "ODOO_PUBLIC_QUERY_CACHE_TTL", DEFAULT_PUBLIC_QUERY_CACHE_TTL)
+    )
+
+
+def public_query_cache_key(query, resolved: dict[str, Any]) -> str:
+    """Return the cache key for ``query`` run with the ``resolved`` kwquery."""
+
+    payload = json.dumps(
+        [
+            query.profile_id,
+            query.model_name,
+            query.method,
+            query.updated_at.isoformat() if query.updated_at else "",
+            resolved,
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{PUBLIC_QUERY_CACHE_PREFIX}{query.pk}:{digest}"
+
+
+def execute_public_query(query, values: dict[str, str] | None = None):
+    """Execute ``query`` for its public view, sharing results for a short TTL.
+
+    Only read-only methods are cached; anything else runs every time. The
+    profile checks in :meth:`OdooQuery.execute` still apply to cache hits.
+    """
+
+    ttl = public_query_cache_ttl()
+    profile = query.profile
+    if (
+        ttl <= 0
+        or query.method not in CACHEABLE_METHODS
+        or profile is None
+        or not profile.is_verified
+    ):
+        return query.execute(values)
+    key = public_query_cache_key(query, query.resolve_kwquery(values))
+    cached = cache.get(key)
+    if cached is not None:
+        public_query_cache.labels("hit").inc()
+        return cached
+    public_query_cache.labels("miss").inc()
+    results = query.execute(values)
+    cache.set(key, results, ttl)
+    return results
+
+
+__all__ = [
+    "CACHEABLE_METHODS",
+    "execute_kw",
+    "execute_public_query",
+    "pooled_proxy",
+    "public_query_cache_key",
+    "read_by_ids",
+    "reset_pool",
+    "rpc_calls",
+    "rpc_connections",
+    "rpc_latency",
+]
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import threading
+from socketserver import ThreadingMixIn
+from xmlrpc.server import SimpleXMLRPCRequestHandler, SimpleXMLRPCServer
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from apps.odoo import rpc
+from apps.odoo.models import OdooEmployee, OdooQuery
+
+
+class _KeepAliveHandler(SimpleXMLRPCRequestHandler):
+    protocol_version = "HTTP/1.1"
+    rpc_paths = (rpc.OBJECT_ENDPOINT,)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _StandInOdoo(ThreadingMixIn, SimpleXMLRPCServer):
+    """Minimal Odoo object endpoint that counts connections and calls."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), requestHandler=_KeepAliveHandler, logRequests=False)
+        self.connections = 0
+        self.calls: list[tuple[str, str, list, dict]] = []
+        self.records = {
+            record_id: {"id": record_id, "name": f"Record {record_id}", "note": "n"}
+            for record_id in range(1, 11)
+        }
+        self.register_function(self.execute_kw, "execute_kw")
+
+    def get_request(self):
+        self.connections += 1
+        return super().get_request()
+
+    def execute_kw(self, database, uid, password, model, method, args, kwargs):
+        self.calls.append((model, method, args, kwargs))
+        if method == "search_read":
+            # Callers pass the domain wrapped in the positional argument list.
+            domain = args[0][0] if args and args[0] else []
+            ids = sorted(self.records)
+            for field, operator, value in domain:
+                if field == "id" and operator == "in":
+                    ids = [record_id for record_id in ids if record_id in value]
+            fields = kwargs.get("fields") or ["id", "name", "note"]
+            return [
+                {field: self.records[record_id][field] for field in fields}
+                for record_id in ids
+            ]
+        return len(self.calls)
+
+    @property
+    def host(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+@pytest.fixture
+def odoo_server():
+    server = _StandInOdoo()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    rpc.reset_pool()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def profile(odoo_server):
+    user = get_user_model().objects.create_user(username="rpc-agent")
+    return OdooEmployee.objects.create(
+        user=user,
+        host=odoo_server.host,
+        database="odoo",
+        username="agent",
+        password="secret",
+        odoo_uid=7,
+        verified_on=timezone.now(),
+    )
+
+
+@pytest.mark.django_db
+def test_consecutive_calls_reuse_one_keep_alive_connection(odoo_server, profile):
+    opened = rpc.rpc_connections.labels().value()
+    calls = rpc.rpc_calls.labels("search_count", "ok").value()
+
+    for _ in range(5):
+        profile.execute("res.partner", "search_count", [[]])
+
+    assert odoo_server.connections == 1
+    assert len(odoo_server.calls) == 5
+    assert rpc.rpc_connections.labels().value() - opened == 1
+    assert rpc.rpc_calls.labels("search_count", "ok").value() - calls == 5
+
+
+@pytest.mark.django_db
+def test_faults_keep_the_pooled_connection(odoo_server, profile):
+    def _fail(*args):
+        raise ValueError("boom")
+
+    odoo_server.register_function(_fail, "execute_kw")
+
+    with pytest.raises(rpc.xmlrpc_client.Fault):
+        rpc.execute_kw(odoo_server.host, "odoo", 7, "secret", "res.partner", "read")
+    with pytest.raises(rpc.xmlrpc_client.Fault):
+        rpc.execute_kw(odoo_server.host, "odoo", 7, "secret", "res.partner", "read")
+
+    assert odoo_server.connections == 1
+
+
+@pytest.mark.django_db
+def test_read_by_ids_batches_records_with_field_projection(odoo_server, profile):
+    rows = rpc.read_by_ids(profile, "sale.order.template", [3, 1, 3, 42], ["name"])
+
+    assert rows == {1: {"id": 1, "name": "Record 1"}, 3: {"id": 3, "name": "Record 3"}}
+    assert len(odoo_server.calls) == 1
+    model, method, args, kwargs = odoo_server.calls[0]
+    assert (model, method) == ("sale.order.template", "search_read")
+    assert args[0] == [[["id", "in", [1, 3, 42]]]]
+    assert kwargs["fields"] == ["id", "name"]
+
+
+@pytest.mark.django_db
+def test_public_query_results_are_cached_per_resolved_kwquery(odoo_server, profile):
+    query = OdooQuery.objects.create(
+        name="Cached public query",
+        profile=profile,
+        model_name="sale.order.template",
+        method="search_read",
+        kwquery={"fields": ["name"], "limit": "[VAR.limit]"},
+        enable_public_view=True,
+        public_view_slug="cached-public-query",
+    )
+
+    first = rpc.execute_public_query(query, {"limit": "2"})
+    second = rpc.execute_public_query(query, {"limit": "2"})
+    other = rpc.execute_public_query(query, {"limit": "3"})
+
+    assert first == second == other
+    assert len(odoo_server.calls) == 2
+    assert odoo_server.connections == 1
+
+    query.method = "search_count"
+    query.save()
+    rpc.execute_public_query(query, {"limit": "2"})
+    assert len(odoo_server.calls) == 3
@@ -469,7 +469,7 @@ def test_setup_templates_step_one_employee_update_syncs_user(
         if model == "res.users":
             assert domain in (
                 [[("active", "=", True), ("share", "=", False)]],
-                [[("id", "=", 55)]],
+                [[("id", "in", [55])]],
             )
             return [
                 {
@@ -539,7 +539,7 @@ def test_setup_templates_step_one_employee_import_truncates_long_username(
         domain = args[0] if args else kwargs.get("domain")
         assert domain in (
             [[("active", "=", True), ("share", "=", False)]],
-            [[("id", "=", 75)]],
+            [[("id", "in", [75])]],
         )
         return [
             {
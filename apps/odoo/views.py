@@ -8,13 +8,14 @@ from django.utils.translation import gettext as _
 
 from .models import OdooQuery
 from .public_query_features import PUBLIC_QUERY_EXECUTION_RESTRICTION_MESSAGE
+from .rpc import execute_public_query
 
 logger = logging.getLogger(__name__)
 
 
 def query_public_view(request, slug: str):
     query = get_object_or_404(
-        OdooQuery,
+        OdooQuery.objects.select_related("profile"),
         public_view_slug=slug,
         enable_public_view=True,
     )
@@ -40,7 +41,7 @@ def query_public_view(request, slug: str):
 
     if should_run and not errors and execution_allowed:
         try:
-            results = query.execute(values)
+            results = execute_public_query(query, values)
             ran_query = True
         except RuntimeError as exc:
             logger.warning(
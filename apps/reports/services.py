@@ -12,20 +12,29 @@ from django.core.exceptions import ValidationError
 from django.template.loader import render_to_string
 from django.utils import timezone
 from django.utils.html import strip_tags
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-
-try:  # pragma: no cover - exercised through fallback behavior tests
-    from weasyprint import HTML, default_url_fetcher
-except ImportError:  # pragma: no cover - optional dependency
-    HTML = None
-    default_url_fetcher = None
 
 from .models import SQLReport, SQLReportProduct
 from .report_definitions import get_report_definition, report_catalog
 
 logger = logging.getLogger(__name__)
 
+# WeasyPrint is imported on first render; ``None`` means it is unavailable.
+_NOT_LOADED = object()
+HTML: Any = _NOT_LOADED
+default_url_fetcher: Any = _NOT_LOADED
+
+
+def _load_weasyprint() -> None:
+    global HTML, default_url_fetcher
+    try:  # pragma: no cover - exercised through fallback behavior tests
+        from weasyprint import HTML as html_class, default_url_fetcher as url_fetcher
+    except ImportError:  # pragma: no cover - optional dependency
+        html_class = url_fetcher = None
+    if HTML is _NOT_LOADED:
+        HTML = html_class
+    if default_url_fetcher is _NOT_LOADED:
+        default_url_fetcher = url_fetcher
+
 
 @dataclass(slots=True)
 class SQLExecutionResult:
@@ -266,6 +275,8 @@ def _render_pdf_bytes(
         logger.debug("Report PDF rendering disabled by %s", enabled_setting_name)
         return b""
 
+    if HTML is _NOT_LOADED:
+        _load_weasyprint()
     if HTML is None:
         logger.warning("Report PDF rendering unavailable: missing WeasyPrint dependency")
         return b""
@@ -281,6 +292,8 @@ def _safe_report_url_fetcher(url: str, *args: Any, **kwargs: Any) -> dict[str, A
     """Restrict WeasyPrint URL fetching to data URIs only."""
 
     parsed = urlparse(url)
+    if default_url_fetcher is _NOT_LOADED:
+        _load_weasyprint()
     if parsed.scheme == "data" and default_url_fetcher is not None:
         return default_url_fetcher(url, *args, **kwargs)
     raise ValueError("External resource loading is disabled for report PDF rendering")
@@ -12,6 +12,7 @@ import sys
 import time
 from collections.abc import Mapping
 from dataclasses import dataclass
+from datetime import timedelta
 from datetime import timezone as dt_timezone
 from pathlib import Path
 from typing import Any
@@ -54,6 +55,7 @@ DEFAULT_TRUSTED_ISSUE_APPROVALS = 1000
 TRUSTED_AUTHOR_ASSOCIATIONS = {"OWNER", "MEMBER", "COLLABORATOR"}
 DEFAULT_PR_APPROVAL_ACTOR = "arthexis"
 DEFAULT_PR_APPROVAL_EMOJI = "+1"
+ISSUE_FULL_SYNC_INTERVAL = timedelta(hours=1)
 REACTION_ALIASES = {
     "thumbs_up": "+1",
     "thumbsup": "+1",
@@ -819,6 +821,22 @@ def _approval_for_target(
     return _reaction_approval(task, reactions)
 
 
+def _issue_since_cursor(task: GitHubMonitorTask, *, now):
+    """Return the ``since`` cursor for an incremental issue poll, if allowed.
+
+    Reactions do not change an issue's ``updated_at``, so reaction-gated tasks
+    always poll the full open list, and every task falls back to a full poll
+    once per ``ISSUE_FULL_SYNC_INTERVAL`` to pick up approval-count changes.
+    """
+
+    if task.require_approval_reaction or task.issues_synced_through is None:
+        return None
+    full_synced_at = task.issues_full_synced_at
+    if full_synced_at is None or now - full_synced_at >= ISSUE_FULL_SYNC_INTERVAL:
+        return None
+    return task.issues_synced_through
+
+
 def sync_monitor_items(*, token: str | None = None, now=None) -> dict[str, Any]:
     now = now or timezone.now()
     token = token or github_service.get_github_issue_token()
@@ -828,6 +846,8 @@ def sync_monitor_items(*, token: str | None = None, now=None) -> dict[str, Any]:
 
     for task in tasks:
         seen_for_task: set[str] = set()
+        since = None
+        departed: set[int] = set()
         if task.target_type == GitHubMonitorTask.TargetType.PULL_REQUEST:
             for pull_request in github_service.fetch_repository_pull_requests(
                 token=token,
@@ -867,12 +887,24 @@ def sync_monitor_items(*, token: str | None = None, now=None) -> dict[str, Any]:
                 seen_for_task.add(item.fingerprint)
                 created_or_seen.append(item.pk)
         else:
+            since = _issue_since_cursor(task, now=now)
+            # Incremental polls include closed issues so queued items can be
+            # closed without re-listing every open issue.
+            fetch_options = {"state": "all", "since": since} if since else {}
+            synced_through = since
             for issue in github_service.fetch_repository_issues(
                 token=token,
                 owner=task.repository.owner,
                 name=task.repository.name,
+                **fetch_options,
             ):
-                if not _issue_matches(task, issue):
+                updated_at = _parse_github_datetime(issue.get("updated_at"))
+                if updated_at and (synced_through is None or updated_at > synced_through):
+                    synced_through = updated_at
+                is_open = str(issue.get("state") or "open").lower() == "open"
+                if not is_open or not _issue_matches(task, issue):
+                    if since is not None and isinstance(issue.get("number"), int):
+                        departed.add(issue["number"])
                     continue
                 issue_number = int(issue.get("number") or 0)
                 approval = _approval_for_target(
@@ -890,10 +922,16 @@ def sync_monitor_items(*, token: str | None = None, now=None) -> dict[str, Any]:
                 )
                 seen_for_task.add(item.fingerprint)
                 created_or_seen.append(item.pk)
+            cursor_fields = {"issues_synced_through": synced_through}
+            if since is None:
+                cursor_fields["issues_full_synced_at"] = now
+            GitHubMonitorTask.objects.filter(pk=task.pk).update(**cursor_fields)
         matched_fingerprints[task.pk] = seen_for_task
 
         stale_queued = task.items.filter(status=GitHubMonitorItem.Status.QUEUED)
-        if seen_for_task:
+        if since is not None:
+            stale_queued = stale_queued.filter(issue_number__in=departed)
+        elif seen_for_task:
             stale_queued = stale_queued.exclude(fingerprint__in=seen_for_task)
         stale_queued.update(
             status=GitHubMonitorItem.Status.CLOSED,
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.12 on 2026-10-18 21:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('repos', '0006_githubmonitoritem_approval_emoji_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='githubmonitortask',
+            name='issues_full_synced_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='githubmonitortask',
+            name='issues_synced_through',
+            field=models.DateTimeField(blank=True, help_text='Newest issue update seen; later polls request only newer changes.', null=True),
+        ),
+    ]
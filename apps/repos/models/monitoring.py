@@ -51,6 +51,12 @@ class GitHubMonitorTask(Entity):
     prompt_template = models.TextField(blank=True)
     skill_slugs = models.JSONField(default=list, blank=True)
     inactivity_timeout_minutes = models.PositiveSmallIntegerField(default=45)
+    issues_synced_through = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_("Newest issue update seen; later polls request only newer changes."),
+    )
+    issues_full_synced_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -1,6 +1,7 @@
 """Service utilities for repository integrations."""
 
 from .github import (  # noqa: F401
+    GitHubClient,
     GitHubIssue,
     GitHubRepositoryError,
     build_headers,
@@ -9,11 +10,13 @@ from .github import (  # noqa: F401
     create_repository,
     fetch_repository_issues,
     fetch_repository_pull_requests,
+    get_client,
     get_github_issue_token,
     resolve_repository_token,
 )
 
 __all__ = [
+    "GitHubClient",
     "GitHubIssue",
     "GitHubRepositoryError",
     "build_headers",
@@ -22,6 +25,7 @@ __all__ = [
     "create_repository",
     "fetch_repository_issues",
     "fetch_repository_pull_requests",
+    "get_client",
     "get_github_issue_token",
     "resolve_repository_token",
 ]
@@ -4,6 +4,9 @@ import contextlib
 import hashlib
 import logging
 import os
+import threading
+import time
+from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -11,6 +14,7 @@ from typing import TYPE_CHECKING, Any, Iterable, Iterator, Mapping, Protocol, Ty
 
 import requests
 from django.conf import settings
+from requests.adapters import HTTPAdapter
 
 if TYPE_CHECKING:
     from apps.release.models import Package
@@ -21,6 +25,14 @@ logger = logging.getLogger(__name__)
 API_ROOT = "https://api.github.com"
 REQUEST_TIMEOUT = 10
 ISSUE_LOCK_TTL = timedelta(hours=1)
+PAGE_CACHE_PREFIX = "repos:github:page"
+PAGE_CACHE_TIMEOUT = int(timedelta(days=7).total_seconds())
+SESSION_POOL_SIZE = 10
+RATE_LIMIT_RESERVE_RATIO = 0.1
+MAX_PACING_DELAY = 5.0
+MAX_RATE_LIMIT_WAIT = 60.0
+MAX_RETRIES = 3
+RETRY_BACKOFF = 1.0
 
 
 def _resolve_issue_lock_dir() -> Path:
@@ -197,6 +209,289 @@ def _safe_json(response: requests.Response) -> JSONValue:
         return {}
 
 
+def _close_response(response) -> None:
+    if response is None:
+        return
+    close = getattr(response, "close", None)
+    if callable(close):
+        with contextlib.suppress(Exception):
+            close()
+
+
+def _int_header(headers: Mapping[str, str], name: str) -> int | None:
+    try:
+        return int(str(headers.get(name)).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _token_digest(token: str) -> str:
+    return hashlib.sha256(str(token).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class RateLimitState:
+    """Most recent ``X-RateLimit-*`` headers reported for one token."""
+
+    limit: int | None = None
+    remaining: int | None = None
+    reset_at: float | None = None
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        remaining = _int_header(headers, "X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        self.remaining = remaining
+        self.limit = _int_header(headers, "X-RateLimit-Limit") or self.limit
+        self.reset_at = _int_header(headers, "X-RateLimit-Reset") or self.reset_at
+
+    def delay(self, now: float) -> float:
+        """Return seconds to wait before the next request.
+
+        Requests are paced once fewer than ``RATE_LIMIT_RESERVE_RATIO`` of the
+        budget remains so the rest of the window is spread until the reset
+        instead of being exhausted in a burst.
+        """
+
+        if self.remaining is None or self.reset_at is None:
+            return 0.0
+        until_reset = max(self.reset_at - now, 0.0)
+        if until_reset <= 0:
+            return 0.0
+        if self.remaining <= 0:
+            return until_reset
+        if self.limit and self.remaining < self.limit * RATE_LIMIT_RESERVE_RATIO:
+            return min(until_reset / self.remaining, MAX_PACING_DELAY)
+        return 0.0
+
+
+class GitHubClient:
+    """Read client for the GitHub REST API with pooled, conditional requests.
+
+    Each thread reuses one keep-alive :class:`requests.Session`. Successful
+    responses that carry an ``ETag`` or ``Last-Modified`` header are stored in
+    the Django cache per token and URL, and later requests for the same URL send
+    ``If-None-Match``/``If-Modified-Since`` so an unchanged page costs a ``304``
+    that GitHub does not charge against the rate limit.
+    """
+
+    def __init__(
+        self,
+        *,
+        cache=None,
+        sleep=time.sleep,
+        clock=time.time,
+        pool_size: int = SESSION_POOL_SIZE,
+    ):
+        self._cache = cache
+        self._sleep = sleep
+        self._clock = clock
+        self._pool_size = pool_size
+        self._local = threading.local()
+        self._sessions: list[requests.Session] = []
+        self._rate_limits: dict[str, RateLimitState] = {}
+        self._lock = threading.Lock()
+        self.stats: Counter[str] = Counter()
+
+    @property
+    def cache(self):
+        if self._cache is None:
+            from django.core.cache import cache
+
+            return cache
+        return self._cache
+
+    def session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=self._pool_size, pool_maxsize=self._pool_size
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions)
+            self._sessions.clear()
+        for session in sessions:
+            with contextlib.suppress(Exception):
+                session.close()
+        self._local = threading.local()
+
+    def rate_limit(self, token: str) -> RateLimitState:
+        with self._lock:
+            return self._rate_limits.setdefault(_token_digest(token), RateLimitState())
+
+    def get_page(
+        self,
+        url: str,
+        *,
+        token: str,
+        params: RequestParams | None = None,
+        timeout: int = REQUEST_TIMEOUT,
+    ) -> tuple[JSONValue, str | None]:
+        """Return the decoded payload of ``url`` and its ``next`` page URL."""
+
+        cache_key = self._cache_key(token, url, params)
+        cached = self.cache.get(cache_key)
+        headers = dict(build_headers(token))
+        if isinstance(cached, Mapping):
+            if cached.get("etag"):
+                headers["If-None-Match"] = str(cached["etag"])
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = str(cached["last_modified"])
+        else:
+            cached = None
+
+        response = self._send(url, token=token, headers=headers, params=params, timeout=timeout)
+        try:
+            if response.status_code == 304 and cached is not None:
+                self._count("not_modified")
+                return cached.get("data"), cached.get("next")
+            if not (200 <= response.status_code < 300):
+                raise GitHubRepositoryError(_extract_error_message(response))
+
+            data = _safe_json(response)
+            links = getattr(response, "links", {}) or {}
+            next_url = links.get("next", {}).get("url")
+            response_headers = getattr(response, "headers", None) or {}
+            etag = response_headers.get("ETag")
+            last_modified = response_headers.get("Last-Modified")
+            if etag or last_modified:
+                self.cache.set(
+                    cache_key,
+                    {
+                        "etag": etag or "",
+                        "last_modified": last_modified or "",
+                        "data": data,
+                        "next": next_url,
+                    },
+                    timeout=PAGE_CACHE_TIMEOUT,
+                )
+            return data, next_url
+        finally:
+            _close_response(response)
+
+    def paginate(
+        self,
+        endpoint: str,
+        *,
+        token: str,
+        params: RequestParams | None = None,
+        timeout: int = REQUEST_TIMEOUT,
+    ) -> Iterator[Mapping[str, object]]:
+        url: str | None = endpoint
+        query_params = params
+        while url:
+            data, url = self.get_page(url, token=token, params=query_params, timeout=timeout)
+            query_params = None
+            if isinstance(data, list):
+                for entry in data:
+                    if isinstance(entry, Mapping):
+                        yield entry
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    @staticmethod
+    def _cache_key(token: str, url: str, params: RequestParams | None) -> str:
+        prepared = requests.Request("GET", url, params=params).prepare().url or url
+        digest = hashlib.sha256(f"{_token_digest(token)}\n{prepared}".encode("utf-8"))
+        return f"{PAGE_CACHE_PREFIX}:{digest.hexdigest()}"
+
+    def _send(
+        self,
+        url: str,
+        *,
+        token: str,
+        headers: Mapping[str, str],
+        params: RequestParams | None,
+        timeout: int,
+    ):
+        rate_limit = self.rate_limit(token)
+        for attempt in range(MAX_RETRIES + 1):
+            delay = rate_limit.delay(self._clock())
+            if delay > MAX_RATE_LIMIT_WAIT:
+                raise GitHubRepositoryError(
+                    f"GitHub rate limit exhausted; resets in {int(delay)} seconds"
+                )
+            if delay > 0:
+                self._count("throttled")
+                self._sleep(delay)
+
+            try:
+                response = self.session().get(
+                    url, headers=headers, params=params, timeout=timeout
+                )
+            except requests.RequestException as exc:  # pragma: no cover - network failure
+                raise GitHubRepositoryError(str(exc)) from exc
+            self._count("requests")
+            response_headers = getattr(response, "headers", None) or {}
+            rate_limit.update(response_headers)
+
+            retry_delay = self._retry_delay(response, response_headers, attempt)
+            if retry_delay is None or attempt == MAX_RETRIES:
+                return response
+            _close_response(response)
+            self._count("retries")
+            self._sleep(retry_delay)
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def _retry_delay(
+        self, response, headers: Mapping[str, str], attempt: int
+    ) -> float | None:
+        """Return how long to back off before retrying a rate-limited response."""
+
+        if response.status_code not in {403, 429}:
+            return None
+        retry_after = _int_header(headers, "Retry-After")
+        if retry_after is not None:
+            delay = float(retry_after)
+        elif _int_header(headers, "X-RateLimit-Remaining") == 0:
+            reset_at = _int_header(headers, "X-RateLimit-Reset")
+            if reset_at is None:
+                return None
+            delay = max(reset_at - self._clock(), 0.0)
+        elif response.status_code == 429:
+            delay = RETRY_BACKOFF * (2**attempt)
+        else:
+            return None
+        if delay > MAX_RATE_LIMIT_WAIT:
+            return None
+        return delay
+
+
+_default_client: GitHubClient | None = None
+_default_client_lock = threading.Lock()
+
+
+def get_client() -> GitHubClient:
+    """Return the process-wide :class:`GitHubClient`."""
+
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = GitHubClient()
+        return _default_client
+
+
+def reset_client() -> None:
+    """Close pooled sessions and drop the process-wide client."""
+
+    global _default_client
+    with _default_client_lock:
+        client, _default_client = _default_client, None
+    if client is not None:
+        client.close()
+
+
 def create_repository(
     repository: SupportsRepositoryPayload,
     *,
@@ -284,39 +579,7 @@ def fetch_paginated_items(
     params: RequestParams,
     timeout: int = REQUEST_TIMEOUT,
 ) -> Iterator[Mapping[str, object]]:
-    headers = build_headers(token)
-    url = endpoint
-    query_params: RequestParams | None = params
-
-    while url:
-        response = None
-        try:
-            response = requests.get(
-                url,
-                headers=headers,
-                params=query_params,
-                timeout=timeout,
-            )
-            query_params = None
-
-            if not (200 <= response.status_code < 300):
-                message = _extract_error_message(response)
-                raise GitHubRepositoryError(message)
-
-            data = _safe_json(response)
-            if isinstance(data, list):
-                for entry in data:
-                    if isinstance(entry, Mapping):
-                        yield entry
-
-            links = getattr(response, "links", {}) or {}
-            url = links.get("next", {}).get("url")
-        finally:
-            if response is not None:
-                close = getattr(response, "close", None)
-                if callable(close):
-                    with contextlib.suppress(Exception):
-                        close()
+    yield from get_client().paginate(endpoint, token=token, params=params, timeout=timeout)
 
 
 def fetch_repository_issues(
@@ -325,9 +588,14 @@ def fetch_repository_issues(
     owner: str,
     name: str,
     state: str = "open",
+    since: datetime | None = None,
 ) -> Iterator[Mapping[str, object]]:
+    """Yield repository issues, limited to those updated at or after ``since``."""
+
     endpoint = f"{API_ROOT}/repos/{owner}/{name}/issues"
     params: dict[str, RequestParamValue] = {"state": state, "per_page": 100}
+    if since is not None:
+        params["since"] = since.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
     yield from fetch_paginated_items(token=token, endpoint=endpoint, params=params)
 
 
@@ -374,27 +642,10 @@ def _fetch_json_mapping(
     timeout: int,
     decode_error: str,
 ) -> Mapping[str, object]:
-    headers = build_headers(token)
-    response = None
-    try:
-        try:
-            response = requests.get(endpoint, headers=headers, timeout=timeout)
-        except requests.RequestException as exc:  # pragma: no cover - network failure
-            raise GitHubRepositoryError(str(exc)) from exc
-
-        if not (200 <= response.status_code < 300):
-            raise GitHubRepositoryError(_extract_error_message(response))
-
-        payload = _safe_json(response)
-        if isinstance(payload, Mapping):
-            return payload
-        raise GitHubRepositoryError(decode_error)
-    finally:
-        if response is not None:
-            close = getattr(response, "close", None)
-            if callable(close):
-                with contextlib.suppress(Exception):
-                    close()
+    payload, _next_url = get_client().get_page(endpoint, token=token, timeout=timeout)
+    if isinstance(payload, Mapping):
+        return payload
+    raise GitHubRepositoryError(decode_error)
 
 
 def fetch_issue_or_pull_request(
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils import timezone
+
+from apps.repos import github_monitor
+from apps.repos.models import GitHubMonitorItem, GitHubMonitorTask
+from apps.repos.services import github
+
+
+class FakeGitHubAPI:
+    """Threaded local HTTP server that mimics GitHub's list endpoints."""
+
+    def __init__(self, issues: list[dict], *, per_page: int = 2):
+        self.issues = issues
+        self.per_page = per_page
+        self.requests: list[dict] = []
+        self.connections = 0
+        self.rate_limit_headers: dict[str, str] = {}
+        self.queued_statuses: list[tuple[int, dict[str, str]]] = []
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                api.connections += 1
+                super().setup()
+
+            def log_message(self, *_args):
+                pass
+
+            def do_GET(self):
+                api.handle(self)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def root(self) -> str:
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakeGitHubAPI":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def handle(self, handler: BaseHTTPRequestHandler) -> None:
+        parts = urlsplit(handler.path)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        self.requests.append(
+            {
+                "path": parts.path,
+                "query": query,
+                "if_none_match": handler.headers.get("If-None-Match"),
+            }
+        )
+        if self.queued_statuses:
+            status, headers = self.queued_statuses.pop(0)
+            self._send(handler, status, b'{"message": "slow down"}', headers)
+            return
+
+        issues = self.issues
+        if "since" in query:
+            issues = [issue for issue in issues if issue["updated_at"] >= query["since"]]
+        page = int(query.get("page", "1"))
+        start = (page - 1) * self.per_page
+        body = json.dumps(issues[start : start + self.per_page]).encode()
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        headers = {"ETag": etag, **self.rate_limit_headers}
+        if start + self.per_page < len(issues):
+            next_query = dict(query, page=str(page + 1))
+            next_url = f"{self.root}{parts.path}?" + "&".join(
+                f"{key}={value}" for key, value in next_query.items()
+            )
+            headers["Link"] = f'<{next_url}>; rel="next"'
+        if handler.headers.get("If-None-Match") == etag:
+            self._send(handler, 304, b"", headers)
+            return
+        self._send(handler, 200, body, headers)
+
+    @staticmethod
+    def _send(handler, status: int, body: bytes, headers: dict[str, str]) -> None:
+        handler.send_response(status)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+
+def _issue(number: int, *, updated_at: str, state: str = "open") -> dict:
+    return {
+        "number": number,
+        "title": github_monitor.INSTALL_HEALTH_TITLE,
+        "body": f"{github_monitor.INSTALL_HEALTH_MARKER}\n\nFailure body",
+        "state": state,
+        "html_url": f"https://github.example/issues/{number}",
+        "user": {"login": "octo"},
+        "author_association": "OWNER",
+        "reactions": {"+1": 0},
+        "updated_at": updated_at,
+    }
+
+
+def _client(**kwargs) -> github.GitHubClient:
+    return github.GitHubClient(cache=LocMemCache(f"github-{uuid.uuid4()}", {}), **kwargs)
+
+
+def test_repeated_pagination_is_served_from_conditional_requests():
+    issues = [_issue(number, updated_at="2026-05-01T00:00:00Z") for number in range(1, 6)]
+    client = _client()
+
+    with FakeGitHubAPI(issues) as api:
+        endpoint = f"{api.root}/repos/octo/demo/issues"
+        first = list(client.paginate(endpoint, token="tok", params={"state": "open"}))
+        second = list(client.paginate(endpoint, token="tok", params={"state": "open"}))
+
+    assert [item["number"] for item in first] == [1, 2, 3, 4, 5]
+    assert second == first
+    assert len(api.requests) == 6
+    assert all(request["if_none_match"] for request in api.requests[3:])
+    assert client.stats["not_modified"] == 3
+    assert api.connections == 1
+
+
+def test_changed_pages_are_downloaded_again():
+    issues = [_issue(1, updated_at="2026-05-01T00:00:00Z")]
+    client = _client()
+
+    with FakeGitHubAPI(issues) as api:
+        endpoint = f"{api.root}/repos/octo/demo/issues"
+        list(client.paginate(endpoint, token="tok"))
+        api.issues = [*issues, _issue(2, updated_at="2026-05-02T00:00:00Z")]
+        refreshed = list(client.paginate(endpoint, token="tok"))
+
+    assert [item["number"] for item in refreshed] == [1, 2]
+    assert client.stats["not_modified"] == 0
+
+
+def test_cached_pages_are_scoped_to_the_token():
+    client = _client()
+
+    with FakeGitHubAPI([_issue(1, updated_at="2026-05-01T00:00:00Z")]) as api:
+        endpoint = f"{api.root}/repos/octo/demo/issues"
+        list(client.paginate(endpoint, token="first"))
+        list(client.paginate(endpoint, token="second"))
+
+    assert [request["if_none_match"] for request in api.requests] == [None, None]
+
+
+def test_rate_limited_responses_are_retried_after_backoff():
+    sleeps: list[float] = []
+    client = _client(sleep=sleeps.append)
+
+    with FakeGitHubAPI([_issue(1, updated_at="2026-05-01T00:00:00Z")]) as api:
+        api.queued_statuses = [(429, {"Retry-After": "2"}), (429, {})]
+        items = list(client.paginate(f"{api.root}/repos/octo/demo/issues", token="tok"))
+
+    assert [item["number"] for item in items] == [1]
+    assert sleeps == [2.0, 2.0]
+    assert client.stats["retries"] == 2
+
+
+def test_low_remaining_budget_paces_requests():
+    sleeps: list[float] = []
+    client = _client(sleep=sleeps.append, clock=lambda: 1_000.0)
+    issues = [_issue(number, updated_at="2026-05-01T00:00:00Z") for number in range(1, 5)]
+
+    with FakeGitHubAPI(issues) as api:
+        api.rate_limit_headers = {
+            "X-RateLimit-Limit": "100",
+            "X-RateLimit-Remaining": "5",
+            "X-RateLimit-Reset": "1010",
+        }
+        list(client.paginate(f"{api.root}/repos/octo/demo/issues", token="tok"))
+
+    assert sleeps == [2.0]
+    assert client.rate_limit("tok").remaining == 5
+
+
+def test_exhausted_budget_raises_instead_of_sleeping_past_limit():
+    client = _client(sleep=lambda _delay: pytest.fail("should not sleep"), clock=lambda: 0.0)
+    state = client.rate_limit("tok")
+    state.update(
+        {
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": "3600",
+        }
+    )
+
+    with pytest.raises(github.GitHubRepositoryError, match="rate limit exhausted"):
+        client.get_page("http://127.0.0.1:9/unused", token="tok")
+
+
+def test_fetch_repository_issues_sends_since_cursor(monkeypatch):
+    client = _client()
+    monkeypatch.setattr(github, "_default_client", client)
+    issues = [
+        _issue(1, updated_at="2026-05-01T00:00:00Z"),
+        _issue(2, updated_at="2026-05-03T00:00:00Z"),
+    ]
+
+    with FakeGitHubAPI(issues) as api:
+        monkeypatch.setattr(github, "API_ROOT", api.root)
+        items = list(
+            github.fetch_repository_issues(
+                token="tok",
+                owner="octo",
+                name="demo",
+                state="all",
+                since=datetime(2026, 5, 2, tzinfo=dt_timezone.utc),
+            )
+        )
+
+    assert [item["number"] for item in items] == [2]
+    assert api.requests[0]["query"]["since"] == "2026-05-02T00:00:00Z"
+    assert api.requests[0]["query"]["state"] == "all"
+
+
+@pytest.mark.django_db
+def test_sync_monitor_items_polls_issue_changes_since_cursor(monkeypatch):
+    github_monitor.configure_default_monitoring(repository="octo/demo", write=True)
+    GitHubMonitorTask.objects.exclude(name="install-health").update(enabled=False)
+    calls: list[dict] = []
+    responses = [
+        [
+            _issue(5, updated_at="2026-05-01T00:00:00Z"),
+            _issue(6, updated_at="2026-05-02T00:00:00Z"),
+        ],
+        [_issue(6, updated_at="2026-05-03T00:00:00Z", state="closed")],
+        [_issue(5, updated_at="2026-05-01T00:00:00Z")],
+    ]
+
+    def fake_fetch(**kwargs):
+        calls.append(kwargs)
+        return responses.pop(0)
+
+    monkeypatch.setattr(github_monitor.github_service, "fetch_repository_issues", fake_fetch)
+    now = timezone.now()
+
+    github_monitor.sync_monitor_items(token="tok", now=now)
+    github_monitor.sync_monitor_items(token="tok", now=now + timedelta(minutes=5))
+
+    assert "since" not in calls[0]
+    assert calls[1]["state"] == "all"
+    assert calls[1]["since"] == datetime(2026, 5, 2, tzinfo=dt_timezone.utc)
+    statuses = dict(GitHubMonitorItem.objects.values_list("issue_number", "status"))
+    assert statuses == {
+        5: GitHubMonitorItem.Status.QUEUED,
+        6: GitHubMonitorItem.Status.CLOSED,
+    }
+    task = GitHubMonitorTask.objects.get(name="install-health")
+    assert task.issues_synced_through == datetime(2026, 5, 3, tzinfo=dt_timezone.utc)
+
+    github_monitor.sync_monitor_items(
+        token="tok", now=now + github_monitor.ISSUE_FULL_SYNC_INTERVAL
+    )
+
+    assert "since" not in calls[2]
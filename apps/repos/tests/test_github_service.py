@@ -44,7 +44,9 @@ def test_fetch_repository_issues_handles_pagination(monkeypatch):
         calls.append({"url": url, "params": params, "headers": headers, "timeout": timeout})
         return responses.pop(0)
 
-    monkeypatch.setattr(github.requests, "get", fake_get)
+    monkeypatch.setattr(
+        github.requests.Session, "get", lambda self, url, **kwargs: fake_get(url, **kwargs)
+    )
 
     items = list(github.fetch_repository_issues(token="tok", owner="octo", name="demo"))
 
@@ -57,7 +59,9 @@ def test_fetch_repository_pull_requests_raises_on_error(monkeypatch):
     def fake_get(url, headers=None, params=None, timeout=None):
         return DummyResponse({"message": "Nope"}, status_code=500, links={}, text="boom")
 
-    monkeypatch.setattr(github.requests, "get", fake_get)
+    monkeypatch.setattr(
+        github.requests.Session, "get", lambda self, url, **kwargs: fake_get(url, **kwargs)
+    )
 
     with pytest.raises(github.GitHubRepositoryError):
         list(github.fetch_repository_pull_requests(token="tok", owner="octo", name="demo"))
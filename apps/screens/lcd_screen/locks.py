@@ -152,8 +152,10 @@ def _simulator_running(
     return is_running
 
 
-def _read_lock_payload(lock_file: Path, *, now: datetime) -> LockPayload | None:
-    payload = read_lcd_lock_file(lock_file)
+def _read_lock_payload(
+    lock_file: Path, *, now: datetime, reader=read_lcd_lock_file
+) -> LockPayload | None:
+    payload = reader(lock_file)
     if payload is None:
         return None
     if payload.expires_at and payload.expires_at <= now:
@@ -187,23 +189,23 @@ def _read_lock_payload(lock_file: Path, *, now: datetime) -> LockPayload | None:
 
 
 def _load_channel_payloads(
-    entries: list[tuple[int, Path, float]], *, now: datetime
+    entries: list[tuple[int, Path, float]], *, now: datetime, reader=read_lcd_lock_file
 ) -> list[LockPayload]:
     payloads: list[LockPayload] = []
     for _, path, _ in entries:
-        payload = _read_lock_payload(path, now=now)
+        payload = _read_lock_payload(path, now=now, reader=reader)
         if payload is not None:
             payloads.append(payload)
     return payloads
 
 
 def _load_low_channel_payloads(
-    entries: list[tuple[int, Path, float]], *, now: datetime
+    entries: list[tuple[int, Path, float]], *, now: datetime, reader=read_lcd_lock_file
 ) -> tuple[list[LockPayload], bool]:
     payloads: list[LockPayload] = []
     has_base_payload = False
     for num, path, _ in entries:
-        payload = _read_lock_payload(path, now=now)
+        payload = _read_lock_payload(path, now=now, reader=reader)
         if payload is None:
             continue
         if _is_routine_host_payload(payload):
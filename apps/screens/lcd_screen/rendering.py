@@ -631,3 +631,11 @@ class ScrollScheduler:
     def advance(self, interval: float) -> None:
         now = time.monotonic()
         self.next_deadline = max(self.next_deadline + interval, now + interval)
+
+    def seconds_until_ready(self) -> float:
+        return max(self.next_deadline - time.monotonic(), 0.0)
+
+    def wake(self) -> None:
+        """Make the next frame due immediately."""
+
+        self.next_deadline = time.monotonic()
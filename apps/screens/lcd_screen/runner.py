@@ -15,6 +15,7 @@ from pathlib import Path
 from apps.core.optional_hardware import is_expected_optional_hardware_absence
 from apps.screens.history import LCDHistoryRecorder
 from apps.screens.lcd import LCDUnavailableError
+from apps.screens.startup_notifications import read_lcd_lock_file
 
 from . import locks
 from .hardware import (
@@ -40,6 +41,13 @@ from .rendering import (
     _stats_payload,
     _warn_on_non_ascii_payload,
 )
+from .watcher import (
+    EVENT_LABEL,
+    ORDER_LABEL,
+    LockChanges,
+    LockDirectorySnapshot,
+    LockDirectoryWatcher,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +59,9 @@ BASE_RELIEF_LONG_EXPIRY = timedelta(
     seconds=ROTATION_SECONDS * BASE_RELIEF_BLOCKED_CYCLES
 )
 
+# Channels whose lock files feed each rotation slot besides its own.
+SLOT_EXTRA_CHANNELS = {"low": ("high",), "stats": ("uptime",)}
+
 _SHUTDOWN_REQUESTED = False
 _EVENT_INTERRUPT_REQUESTED = False
 
@@ -137,6 +148,10 @@ class LCDRunner:
     cycle_state_lock: threading.Lock = field(default_factory=threading.Lock)
     high_repeat_signature: tuple[tuple[int, float], ...] | None = None
     high_repeat_count: int = 0
+    watcher: LockDirectoryWatcher | None = None
+    lock_snapshot: LockDirectorySnapshot | None = None
+    event_locks_dirty: bool = True
+    pending_change_since: float | None = None
 
     def __post_init__(self) -> None:
         """Initialize the fallback frame writer."""
@@ -192,12 +207,30 @@ class LCDRunner:
 
         locks._clear_low_lock_file()
         self.register_signal_handlers()
+        self.start_lock_watcher()
         self.initialize_hardware()
 
+    def start_lock_watcher(self) -> None:
+        """Watch the lock directory so lock changes wake the loop."""
+
+        try:
+            self.watcher = LockDirectoryWatcher(locks.LOCK_DIR)
+        except Exception:
+            logger.exception("LCD lock watcher unavailable; rereading lock files")
+            self.watcher = None
+            return
+        self.lock_snapshot = LockDirectorySnapshot(locks.LOCK_DIR)
+        self.lock_snapshot.apply(self.watcher.take_changes())
+        logger.info("Watching LCD lock files with %s", self.watcher.backend)
+
     def shutdown(self) -> None:
         """Release background resources and clear global signal flags."""
 
         self.cycle_prefetch_executor.shutdown(wait=True, cancel_futures=True)
+        if self.watcher is not None:
+            logger.info("LCD lock watcher stats: %s", self.watcher.stats)
+            self.watcher.close()
+            self.watcher = None
         _blank_display(self.lcd)
         _reset_shutdown_flag()
         _reset_event_interrupt_flag()
@@ -240,7 +273,9 @@ class LCDRunner:
     ) -> tuple[dict[str, ChannelCycle], dict[str, bool]]:
         """Load per-channel payload cycles and visible-text metadata."""
 
-        return _load_channel_states(self.channel_states, now_dt)
+        return _load_channel_states(
+            self.channel_states, now_dt, snapshot=self.lock_snapshot
+        )
 
     def payload_for_state(
         self,
@@ -493,8 +528,12 @@ class LCDRunner:
 
         if _event_interrupt_requested():
             _reset_event_interrupt_flag()
+            self.event_locks_dirty = False
             self.load_event_from_locks(now_dt)
-        elif self.event.payload is None:
+        elif self.event.payload is None and (
+            self.watcher is None or self.event_locks_dirty
+        ):
+            self.event_locks_dirty = False
             self.load_event_from_locks(now_dt)
 
         if self.event.payload is None or self.event.deadline is None:
@@ -564,11 +603,62 @@ class LCDRunner:
         )
         self.event.refresh_deadline = 0.0
 
+    def wait_for_frame(self, labels: set[str]) -> bool:
+        """Sleep until the next frame; return True when ``labels`` changed meanwhile."""
+
+        if self.watcher is None:
+            self.scroll_scheduler.sleep_until_ready()
+            return False
+        while self.watcher.wait(self.scroll_scheduler.seconds_until_ready()):
+            if self.apply_lock_changes(self.watcher.take_changes()) & labels:
+                self.scroll_scheduler.wake()
+                return True
+        return False
+
+    def apply_lock_changes(self, changes: LockChanges) -> set[str]:
+        """Refresh cached lock payloads and invalidate state built from them."""
+
+        labels = changes.labels()
+        if not labels:
+            return labels
+        with self.cycle_state_lock:
+            if self.lock_snapshot is not None:
+                self.lock_snapshot.apply(changes)
+        if self.pending_change_since is None:
+            self.pending_change_since = changes.first_seen
+        if EVENT_LABEL in labels:
+            self.event_locks_dirty = True
+            if self.event.lock_file is not None and (
+                changes.rescan or self.event.lock_file.name in changes.names
+            ):
+                self.event.payload = None
+        if labels - {EVENT_LABEL}:
+            self.cycle_prefetch_future = None
+            self.rotation.next_display_state = None
+            if self._current_slot_channels() & labels:
+                self.rotation.display_state = None
+        return labels
+
+    def _current_slot_channels(self) -> set[str]:
+        if not self.rotation.order:
+            return {ORDER_LABEL}
+        label = self.rotation.order[self.rotation.index % len(self.rotation.order)]
+        return {label, ORDER_LABEL, *SLOT_EXTRA_CHANNELS.get(label, ())}
+
+    def record_displayed_changes(self) -> None:
+        """Record update-to-display latency once a frame reflects new lock data."""
+
+        if self.watcher is None or self.pending_change_since is None:
+            return
+        self.watcher.record_redraw(self.pending_change_since)
+        self.pending_change_since = None
+
     def render_event_frame(self) -> bool:
         """Render the current event frame and record LCD health state."""
 
         self.ensure_lcd()
-        self.scroll_scheduler.sleep_until_ready()
+        if self.wait_for_frame({EVENT_LABEL}):
+            return True
         frame_timestamp = datetime.now(datetime_timezone.utc)
         display_state = self.event.display_state
         refresh_now = time.monotonic()
@@ -596,6 +686,8 @@ class LCDRunner:
             _handle_shutdown_request(self.lcd)
             raise StopIteration
         self.record_health(write_success, "LCD write failed during event display")
+        if write_success:
+            self.record_displayed_changes()
         self.scroll_scheduler.advance(
             (self.event.display_state.scroll_sec if self.event.display_state else 0)
             or DEFAULT_FALLBACK_SCROLL_SEC
@@ -662,7 +754,8 @@ class LCDRunner:
             return
 
         self.ensure_lcd()
-        self.scroll_scheduler.sleep_until_ready()
+        if self.wait_for_frame(self._current_slot_channels() | {EVENT_LABEL}):
+            return
         frame_timestamp = datetime.now(datetime_timezone.utc)
         label = (
             self.rotation.order[self.rotation.index] if self.rotation.order else None
@@ -680,6 +773,8 @@ class LCDRunner:
             _handle_shutdown_request(self.lcd)
             raise StopIteration
         self.record_health(write_success, "LCD write failed during rotation display")
+        if write_success:
+            self.record_displayed_changes()
         self.scroll_scheduler.advance(
             (
                 self.rotation.display_state.scroll_sec
@@ -910,19 +1005,29 @@ def _disable_lcd(
 def _load_channel_states(
     current_states: dict[str, ChannelCycle],
     now_dt: datetime,
+    *,
+    snapshot: LockDirectorySnapshot | None = None,
 ) -> tuple[dict[str, ChannelCycle], dict[str, bool]]:
-    """Load channel cycles from lock files while preserving rotation indices."""
+    """Load channel cycles from lock files while preserving rotation indices.
+
+    With a ``snapshot`` the entries and payloads come from its cache instead of
+    listing and reading the lock directory.
+    """
 
     channel_info: dict[str, ChannelCycle] = {}
     channel_text: dict[str, bool] = {}
+    reader = snapshot.read if snapshot is not None else read_lcd_lock_file
     for label, base_name in locks.CHANNEL_BASE_NAMES.items():
-        entries = locks._channel_lock_entries(locks.LOCK_DIR, base_name)
+        if snapshot is not None:
+            entries = snapshot.channel_entries(base_name)
+        else:
+            entries = locks._channel_lock_entries(locks.LOCK_DIR, base_name)
         existing = current_states.get(label)
         signature = tuple((num, mtime) for num, _, mtime in entries)
         payloads: list[locks.LockPayload] = []
         if label == "low":
             payloads, _has_base_payload = locks._load_low_channel_payloads(
-                entries, now=now_dt
+                entries, now=now_dt, reader=reader
             )
             payloads.insert(
                 0,
@@ -930,7 +1035,7 @@ def _load_channel_states(
             )
             signature = ((-1, -1.0),) + signature
         else:
-            payloads = locks._load_channel_payloads(entries, now=now_dt)
+            payloads = locks._load_channel_payloads(entries, now=now_dt, reader=reader)
         if (
             existing is None
             or existing.signature != signature
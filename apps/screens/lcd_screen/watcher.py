@@ -0,0 +1,440 @@
+"""Change notifications and a parsed cache for the LCD lock directory.
+
+The LCD service used to rediscover lock files by listing and ``stat``-ing the
+whole directory and re-reading every file on each rotation and frame. The
+:class:`LockDirectoryWatcher` instead reports which file names changed, using
+inotify on Linux and a directory-snapshot poll elsewhere, and coalesces bursts
+of writes into one wakeup. :class:`LockDirectorySnapshot` keeps the parsed
+payloads and re-reads only the files named in each change set.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from apps.core.metrics import counter, histogram
+from apps.screens.startup_notifications import LcdMessage, read_lcd_lock_file
+
+from .locks import CHANNEL_BASE_NAMES, CHANNEL_ORDER_LOCK_NAME, EVENT_LOCK_PREFIX
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COALESCE_SECONDS = 0.05
+DEFAULT_POLL_INTERVAL_SECONDS = 0.5
+
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+EVENT_LABEL = "event"
+ORDER_LABEL = "order"
+
+lock_wakeups = counter(
+    "lcd_lock_watcher_wakeups_total",
+    "Times the LCD service woke up because lock files changed, by backend.",
+    ("backend",),
+)
+lock_change_events = counter(
+    "lcd_lock_change_events_total",
+    "Lock file change notifications received by the LCD service, by backend.",
+    ("backend",),
+)
+lock_update_latency = histogram(
+    "lcd_lock_update_latency_seconds",
+    "Time between a lock file change and the LCD frame that shows it.",
+)
+
+
+@dataclass(frozen=True)
+class LockChanges:
+    """Lock file names that changed since the last drain.
+
+    ``rescan`` is set when individual names are unknown (first run, inotify
+    queue overflow, or the directory itself was replaced) and every file
+    must be re-read.
+    """
+
+    names: frozenset[str] = frozenset()
+    rescan: bool = False
+    first_seen: float | None = None
+
+    def __bool__(self) -> bool:
+        return self.rescan or bool(self.names)
+
+    def labels(self) -> set[str]:
+        """Return the channel labels, ``"event"`` and ``"order"`` affected."""
+
+        if self.rescan:
+            return {*CHANNEL_BASE_NAMES, EVENT_LABEL, ORDER_LABEL}
+        labels: set[str] = set()
+        for name in self.names:
+            label = lock_label(name)
+            if label is not None:
+                labels.add(label)
+        return labels
+
+
+def lock_label(name: str) -> str | None:
+    """Return the channel label, ``"event"`` or ``"order"`` for a lock file name."""
+
+    if name.startswith(EVENT_LOCK_PREFIX):
+        return EVENT_LABEL
+    if name == CHANNEL_ORDER_LOCK_NAME:
+        return ORDER_LABEL
+    for label, base_name in CHANNEL_BASE_NAMES.items():
+        if name == base_name:
+            return label
+        if name.startswith(f"{base_name}-") and name[len(base_name) + 1 :].isdigit():
+            return label
+    return None
+
+
+@dataclass
+class WatcherStats:
+    """Counters describing how often the watcher woke the LCD loop."""
+
+    wakeups: int = 0
+    events: int = 0
+    redraws: int = 0
+    last_latency: float | None = None
+    max_latency: float = 0.0
+    total_latency: float = field(default=0.0, repr=False)
+
+    @property
+    def mean_latency(self) -> float | None:
+        if not self.redraws:
+            return None
+        return self.total_latency / self.redraws
+
+
+class _InotifyBackend:
+    name = "inotify"
+
+    def __init__(self, lock_dir: Path) -> None:
+        self.lock_dir = lock_dir
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self.fd = fd
+        try:
+            self._add_watch()
+        except OSError:
+            os.close(fd)
+            raise
+
+    def _add_watch(self) -> None:
+        wd = self._libc.inotify_add_watch(
+            self.fd, os.fsencode(self.lock_dir), _WATCH_MASK
+        )
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), str(self.lock_dir))
+
+    def wait(self, timeout: float) -> bool:
+        try:
+            readable, _, _ = select.select([self.fd], [], [], max(timeout, 0.0))
+        except (OSError, ValueError):
+            return False
+        return bool(readable)
+
+    def read(self) -> tuple[set[str], bool, int]:
+        names: set[str] = set()
+        rescan = False
+        count = 0
+        while True:
+            try:
+                buffer = os.read(self.fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            except OSError as exc:
+                if exc.errno == errno.EINTR:
+                    continue
+                raise
+            if not buffer:
+                break
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(buffer):
+                _wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                raw_name = buffer[offset : offset + length].rstrip(b"\0")
+                offset += length
+                count += 1
+                if mask & (_IN_Q_OVERFLOW | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_IGNORED):
+                    rescan = True
+                if raw_name:
+                    names.add(os.fsdecode(raw_name))
+        if rescan:
+            try:
+                self._add_watch()
+            except OSError:
+                logger.debug("Unable to re-watch LCD lock directory", exc_info=True)
+        return names, rescan, count
+
+    def close(self) -> None:
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class _PollingBackend:
+    name = "poll"
+
+    def __init__(self, lock_dir: Path, *, interval: float) -> None:
+        self.lock_dir = lock_dir
+        self.interval = interval
+        self._entries = self._scan()
+        self._pending: tuple[set[str], bool] | None = None
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        entries: dict[str, tuple[int, int]] = {}
+        try:
+            with os.scandir(self.lock_dir) as iterator:
+                for entry in iterator:
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            pass
+        return entries
+
+    def _diff(self) -> set[str]:
+        entries = self._scan()
+        previous = self._entries
+        self._entries = entries
+        return {
+            name
+            for name in previous.keys() | entries.keys()
+            if previous.get(name) != entries.get(name)
+        }
+
+    def wait(self, timeout: float) -> bool:
+        deadline = time.monotonic() + max(timeout, 0.0)
+        while True:
+            changed = self._diff()
+            if changed:
+                pending = self._pending[0] if self._pending else set()
+                self._pending = (pending | changed, False)
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.interval, remaining))
+
+    def read(self) -> tuple[set[str], bool, int]:
+        names = self._pending[0] if self._pending else set()
+        self._pending = None
+        names |= self._diff()
+        return names, False, len(names)
+
+    def close(self) -> None:
+        return None
+
+
+class LockDirectoryWatcher:
+    """Report lock file changes in ``lock_dir`` as coalesced batches.
+
+    Call :meth:`wait` instead of sleeping; it returns early when files
+    change. Writes that land within ``coalesce_seconds`` of the first one are
+    folded into the same batch so a burst of rewrites yields one redraw.
+    """
+
+    def __init__(
+        self,
+        lock_dir: Path,
+        *,
+        coalesce_seconds: float = DEFAULT_COALESCE_SECONDS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        use_inotify: bool = True,
+    ) -> None:
+        self.lock_dir = Path(lock_dir)
+        self.coalesce_seconds = coalesce_seconds
+        self.stats = WatcherStats()
+        self._names: set[str] = set()
+        self._rescan = True
+        self._first_seen: float | None = time.monotonic()
+        self._backend = self._open_backend(use_inotify, poll_interval)
+        self._wakeups = lock_wakeups.labels(self._backend.name)
+        self._events = lock_change_events.labels(self._backend.name)
+
+    def _open_backend(self, use_inotify: bool, poll_interval: float):
+        try:
+            self.lock_dir.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            logger.debug("Unable to create LCD lock directory", exc_info=True)
+        if use_inotify and sys.platform.startswith("linux"):
+            try:
+                return _InotifyBackend(self.lock_dir)
+            except (AttributeError, OSError):
+                logger.info(
+                    "inotify unavailable for %s; polling LCD lock files instead",
+                    self.lock_dir,
+                )
+        return _PollingBackend(self.lock_dir, interval=poll_interval)
+
+    @property
+    def backend(self) -> str:
+        return self._backend.name
+
+    @property
+    def pending(self) -> bool:
+        return self._rescan or bool(self._names)
+
+    def _collect(self) -> int:
+        names, rescan, count = self._backend.read()
+        if not (names or rescan):
+            return 0
+        if not self.pending:
+            self._first_seen = time.monotonic()
+        self._names |= names
+        self._rescan = self._rescan or rescan
+        self.stats.events += count
+        self._events.inc(count)
+        return count
+
+    def wait(self, timeout: float) -> bool:
+        """Block for up to ``timeout`` seconds; return whether changes are pending."""
+
+        if self.pending:
+            return True
+        if not self._backend.wait(timeout) or not self._collect():
+            return self.pending
+        if self.coalesce_seconds > 0:
+            deadline = time.monotonic() + self.coalesce_seconds
+            remaining = self.coalesce_seconds
+            while remaining > 0 and self._backend.wait(remaining):
+                self._collect()
+                remaining = deadline - time.monotonic()
+        self.stats.wakeups += 1
+        self._wakeups.inc()
+        return True
+
+    def take_changes(self) -> LockChanges:
+        """Return and clear the pending change batch."""
+
+        if self._backend.wait(0):
+            self._collect()
+        changes = LockChanges(
+            names=frozenset(self._names),
+            rescan=self._rescan,
+            first_seen=self._first_seen if self.pending else None,
+        )
+        self._names = set()
+        self._rescan = False
+        self._first_seen = None
+        return changes
+
+    def record_redraw(self, first_seen: float) -> float:
+        """Record the latency between a change batch and the frame showing it."""
+
+        latency = max(time.monotonic() - first_seen, 0.0)
+        self.stats.redraws += 1
+        self.stats.last_latency = latency
+        self.stats.max_latency = max(self.stats.max_latency, latency)
+        self.stats.total_latency += latency
+        lock_update_latency.observe(latency)
+        return latency
+
+    def close(self) -> None:
+        self._backend.close()
+
+
+class LockDirectorySnapshot:
+    """Parsed lock file contents, refreshed from :class:`LockChanges` batches."""
+
+    def __init__(self, lock_dir: Path) -> None:
+        self.lock_dir = Path(lock_dir)
+        self._mtimes: dict[str, float] = {}
+        self._messages: dict[str, LcdMessage | None] = {}
+        self.parsed = 0
+
+    def apply(self, changes: LockChanges) -> None:
+        """Re-read the files named in ``changes`` (or all files on rescan)."""
+
+        if not changes:
+            return
+        if changes.rescan:
+            self._mtimes.clear()
+            self._messages.clear()
+            try:
+                names = [path.name for path in self.lock_dir.iterdir()]
+            except OSError:
+                names = []
+        else:
+            names = changes.names
+        for name in names:
+            self._refresh(name)
+
+    def _refresh(self, name: str) -> None:
+        path = self.lock_dir / name
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            self._mtimes.pop(name, None)
+            self._messages.pop(name, None)
+            return
+        self._mtimes[name] = mtime
+        self._messages.pop(name, None)
+
+    def channel_entries(self, base_name: str) -> list[tuple[int, Path, float]]:
+        """Return ``(num, path, mtime)`` entries like ``locks._channel_lock_entries``."""
+
+        prefix = f"{base_name}-"
+        entries: list[tuple[int, Path, float]] = []
+        for name, mtime in self._mtimes.items():
+            if name == base_name:
+                num = 0
+            elif name.startswith(prefix) and name[len(prefix) :].isdigit():
+                num = int(name[len(prefix) :])
+            else:
+                continue
+            entries.append((num, self.lock_dir / name, mtime))
+        entries.sort(key=lambda item: item[0])
+        return entries
+
+    def read(self, lock_file: Path) -> LcdMessage | None:
+        """Return the parsed payload for ``lock_file``, reading it at most once per change."""
+
+        name = lock_file.name
+        if name not in self._mtimes:
+            return None
+        if name not in self._messages:
+            self._messages[name] = read_lcd_lock_file(lock_file)
+            self.parsed += 1
+        return self._messages[name]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import os
 from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import datetime
@@ -180,3 +181,30 @@ def write_lcd_message(
     payload = render_lcd_lock_file(subject=subject, body=body, expires_at=expires_at)
     lock_file.write_text(payload, encoding="utf-8")
     return lock_file
+
+
+def publish_lcd_message(
+    *,
+    lock_file: Path,
+    subject: str,
+    body: str,
+    expires_at: datetime | str | None = None,
+) -> bool:
+    """Write ``lock_file`` only when its rendered payload changes.
+
+    Periodic publishers use this so an unchanged status does not wake the LCD
+    service or reset its channel rotation. The file is replaced atomically so
+    readers never observe a partial write. Returns whether the file changed.
+    """
+
+    payload = render_lcd_lock_file(subject=subject, body=body, expires_at=expires_at)
+    try:
+        if lock_file.read_text(encoding="utf-8") == payload:
+            return False
+    except OSError:
+        pass
+    lock_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = lock_file.with_name(f".{lock_file.name}.tmp")
+    temp_file.write_text(payload, encoding="utf-8")
+    os.replace(temp_file, lock_file)
+    return True
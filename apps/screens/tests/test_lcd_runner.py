@@ -723,3 +723,11 @@ def test_summary_payload_rotates_its_own_channel() -> None:
     )
 
     assert (first.line1, second.line1) == ("SUM 1", "SUM 2")
+
+
+def test_reset_shutdown_flag_clears_requested_shutdown(monkeypatch):
+    monkeypatch.setattr(runner, "_SHUTDOWN_REQUESTED", True)
+
+    runner._reset_shutdown_flag()
+
+    assert runner._shutdown_requested() is False
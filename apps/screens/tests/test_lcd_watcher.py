@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone as datetime_timezone
+from pathlib import Path
+
+import pytest
+
+from apps.screens.lcd_screen import runner
+from apps.screens.lcd_screen.watcher import (
+    EVENT_LABEL,
+    LockChanges,
+    LockDirectorySnapshot,
+    LockDirectoryWatcher,
+)
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "poll"])
+def watcher(request, tmp_path: Path):
+    lock_watcher = LockDirectoryWatcher(
+        tmp_path, use_inotify=request.param, poll_interval=0.01
+    )
+    lock_watcher.take_changes()
+    yield lock_watcher
+    lock_watcher.close()
+
+
+def test_watcher_coalesces_burst_of_writes(watcher, tmp_path: Path) -> None:
+    watcher.coalesce_seconds = 0.2
+    for index in range(5):
+        (tmp_path / f"lcd-high-{index}").write_text(f"msg {index}\nbody\n")
+
+    assert watcher.wait(1.0) is True
+    changes = watcher.take_changes()
+
+    assert changes.names == {f"lcd-high-{index}" for index in range(5)}
+    assert changes.labels() == {"high"}
+    assert watcher.stats.wakeups == 1
+    assert watcher.wait(0.05) is False
+
+
+def test_watcher_reports_event_and_removal(watcher, tmp_path: Path) -> None:
+    event_file = tmp_path / "lcd-event-1.lck"
+    event_file.write_text("hello\nworld\n")
+    assert watcher.wait(1.0)
+    watcher.take_changes()
+
+    event_file.unlink()
+    assert watcher.wait(1.0)
+
+    assert watcher.take_changes().labels() == {EVENT_LABEL}
+
+
+def test_snapshot_reparses_only_changed_files(tmp_path: Path) -> None:
+    (tmp_path / "lcd-low").write_text("low\nbase\n")
+    (tmp_path / "lcd-low-1").write_text("low\nextra\n")
+    snapshot = LockDirectorySnapshot(tmp_path)
+    snapshot.apply(LockChanges(rescan=True))
+    now_dt = datetime.now(datetime_timezone.utc)
+
+    runner._load_channel_states({}, now_dt, snapshot=snapshot)
+    runner._load_channel_states({}, now_dt, snapshot=snapshot)
+    assert snapshot.parsed == 2
+
+    (tmp_path / "lcd-low-1").write_text("low\nupdated\n")
+    snapshot.apply(LockChanges(names=frozenset({"lcd-low-1"})))
+    info, _text = runner._load_channel_states({}, now_dt, snapshot=snapshot)
+
+    assert snapshot.parsed == 3
+    assert [payload.line2 for payload in info["low"].payloads] == ["", "base", "updated"]
+
+
+def test_runner_redraws_current_slot_and_records_latency(tmp_path: Path) -> None:
+    coordinator = runner.LCDRunner()
+    coordinator.watcher = LockDirectoryWatcher(tmp_path, use_inotify=False)
+    coordinator.lock_snapshot = LockDirectorySnapshot(tmp_path)
+    coordinator.rotation.order = ("high", "low", "stats", "clock")
+    coordinator.rotation.index = 2
+    coordinator.rotation.display_state = object()
+    coordinator.rotation.next_display_state = object()
+
+    labels = coordinator.apply_lock_changes(
+        LockChanges(names=frozenset({"uptime"}), first_seen=0.0)
+    )
+    coordinator.record_displayed_changes()
+
+    assert labels == {"uptime"}
+    assert coordinator.rotation.display_state is None
+    assert coordinator.rotation.next_display_state is None
+    assert coordinator.watcher.stats.redraws == 1
+    assert coordinator.pending_change_since is None
+    coordinator.watcher.close()
+    coordinator.cycle_prefetch_executor.shutdown()
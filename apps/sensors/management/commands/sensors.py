@@ -8,7 +8,7 @@ from django.core.management.base import BaseCommand, CommandError
 
 from apps.nodes.models import Node
 from apps.nodes.roles import node_is_control
-from apps.sensors import usb_inventory
+from apps.sensors import sampling, usb_inventory
 from apps.sensors.models import UsbPortMapping
 from apps.sensors.tasks import scan_usb_trackers
 from apps.sensors.usb_lcd import normalize_usb_lcd_label, write_usb_lcd_status
@@ -17,7 +17,10 @@ from apps.sensors.usb_lcd import normalize_usb_lcd_label, write_usb_lcd_status
 class Command(BaseCommand):
     """Provide CLI entrypoints for sensor workflows."""
 
-    help = "Sensor operations: run USB tracker scans and manage USB LCD status."
+    help = (
+        "Sensor operations: sample thermometers, run USB tracker scans and "
+        "manage USB LCD status."
+    )
 
     def add_arguments(self, parser):
         subparsers = parser.add_subparsers(dest="action")
@@ -32,6 +35,20 @@ class Command(BaseCommand):
             action="store_true",
             help="Emit machine-readable JSON output.",
         )
+        sample_parser = subparsers.add_parser(
+            "sample-thermometers",
+            help="Read due thermometers once, or keep sampling with --loop.",
+        )
+        sample_parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and sample each thermometer as it falls due.",
+        )
+        sample_parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Emit machine-readable JSON output.",
+        )
         set_parser = subparsers.add_parser(
             "set-usb-lcd-port",
             help="Configure the LCD label and local inventory source for a USB port.",
@@ -155,6 +172,8 @@ class Command(BaseCommand):
         action = options["action"]
         if action == "scan-usb-trackers":
             return self._handle_scan_usb_trackers(**options)
+        if action == "sample-thermometers":
+            return self._handle_sample_thermometers(**options)
         if action == "set-usb-lcd-port":
             return self._handle_set_usb_lcd_port(**options)
         if action == "clear-usb-lcd-port":
@@ -176,6 +195,26 @@ class Command(BaseCommand):
             f"scanned={result['scanned']} matched={result['matched']} failed={result['failed']}"
         )
 
+    def _handle_sample_thermometers(self, **options):
+        if options["loop"]:
+            try:
+                sampling.run_sampling_loop()
+            except KeyboardInterrupt:
+                self.stdout.write("Thermometer sampling stopped")
+            return
+
+        result = sampling.sample_due_thermometers().as_dict()
+        if options["json"]:
+            self.stdout.write(json.dumps(result, sort_keys=True))
+            return
+
+        self.stdout.write(
+            "Thermometer sample complete: "
+            f"sampled={result['sampled']} stored={result['stored']} "
+            f"unchanged={result['unchanged']} failed={result['failed']} "
+            f"timed_out={result['timed_out']}"
+        )
+
     def _handle_set_usb_lcd_port(self, **options):
         source_id = str(options["source_id"]).strip()
         if not source_id:
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.12 on 2026-10-19 03:43
+
+import django.core.validators
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sensors', '0003_usbportmapping_node_scope'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='thermometer',
+            name='reading_deadband',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.10'), help_text='Scheduled samples within this distance of the last stored reading only refresh its last-seen time instead of adding a history row.', max_digits=6, validators=[django.core.validators.MinValueValidator(Decimal('0'))]),
+        ),
+        migrations.AddField(
+            model_name='thermometerreading',
+            name='last_seen_at',
+            field=models.DateTimeField(blank=True, help_text='Latest sample that confirmed this reading within the deadband.', null=True),
+        ),
+    ]
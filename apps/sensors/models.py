@@ -133,6 +133,17 @@ class ThermometerManager(EntityManager):
 class Thermometer(PhysicalSensor):
     """Physical thermometer sensor readings."""
 
+    reading_deadband = models.DecimalField(
+        max_digits=6,
+        decimal_places=2,
+        default=Decimal("0.10"),
+        validators=[MinValueValidator(Decimal("0"))],
+        help_text=_(
+            "Scheduled samples within this distance of the last stored reading "
+            "only refresh its last-seen time instead of adding a history row."
+        ),
+    )
+
     objects = ThermometerManager()
 
     class Meta(PhysicalSensor.Meta):
@@ -204,6 +215,11 @@ class ThermometerReading(models.Model):
     )
     reading = models.DecimalField(max_digits=8, decimal_places=2)
     read_at = models.DateTimeField(default=timezone.now, db_index=True)
+    last_seen_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_("Latest sample that confirmed this reading within the deadband."),
+    )
 
     class Meta:
         ordering = ["-read_at"]
@@ -0,0 +1,341 @@
+"""Batched, concurrent thermometer sampling for the Celery task and local loop."""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Callable
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (
+    DateTimeField,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    IntegerField,
+    Min,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from .models import Thermometer, ThermometerReading
+from .thermometers import read_temperature
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_READ_TIMEOUT_SECONDS = 2.0
+DEFAULT_HISTORY_HEARTBEAT_SECONDS = 1800
+DEFAULT_LOOP_MAX_SLEEP_SECONDS = 30.0
+READING_QUANTUM = Decimal("0.01")
+
+
+@dataclass(frozen=True)
+class SensorRead:
+    """Paths and source needed to read one thermometer off the database thread."""
+
+    pk: int
+    slug: str
+    source: str
+    w1_paths: list[str]
+    i2c_paths: list[str] | None
+
+
+@dataclass
+class SamplingResult:
+    sampled: int = 0
+    stored: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    seconds: float = 0.0
+    failed_slugs: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "sampled": self.sampled,
+            "stored": self.stored,
+            "unchanged": self.unchanged,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "seconds": round(self.seconds, 3),
+        }
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def _next_due_expression() -> ExpressionWrapper:
+    interval = ExpressionWrapper(
+        Cast("sampling_interval_seconds", IntegerField())
+        * Value(timedelta(seconds=1), output_field=DurationField()),
+        output_field=DurationField(),
+    )
+    return ExpressionWrapper(F("last_read_at") + interval, output_field=DateTimeField())
+
+
+def due_thermometers(now: datetime | None = None) -> QuerySet[Thermometer]:
+    """Return active thermometers whose sampling interval has elapsed at ``now``.
+
+    Each row carries the pk, value and timestamps of its latest history row
+    so the deadband check needs no further queries.
+    """
+
+    now = now or timezone.now()
+    latest = ThermometerReading.objects.filter(thermometer=OuterRef("pk")).order_by(
+        "-read_at", "-pk"
+    )
+    return (
+        Thermometer.objects.filter(is_active=True, sampling_interval_seconds__gt=0)
+        .annotate(next_due_at=_next_due_expression())
+        .filter(Q(last_read_at__isnull=True) | Q(next_due_at__lte=now))
+        .annotate(
+            stored_reading_pk=Subquery(latest.values("pk")[:1]),
+            stored_reading=Subquery(latest.values("reading")[:1]),
+            stored_read_at=Subquery(latest.values("read_at")[:1]),
+        )
+        .order_by("pk")
+    )
+
+
+def seconds_until_next_due(now: datetime | None = None) -> float | None:
+    """Return how long until the next active thermometer is due, if any."""
+
+    now = now or timezone.now()
+    active = Thermometer.objects.filter(is_active=True, sampling_interval_seconds__gt=0)
+    if active.filter(last_read_at__isnull=True).exists():
+        return 0.0
+    next_due_at = active.aggregate(next_due_at=Min(_next_due_expression()))["next_due_at"]
+    if next_due_at is None:
+        return None
+    return max(0.0, (next_due_at - now).total_seconds())
+
+
+def build_sensor_reads(thermometers: list[Thermometer]) -> list[SensorRead]:
+    """Resolve sysfs paths for ``thermometers`` from settings read once per cycle."""
+
+    source = str(_setting("THERMOMETER_SOURCE", "auto")).strip().lower()
+    w1_path_template = _setting(
+        "THERMOMETER_PATH_TEMPLATE", "/sys/bus/w1/devices/{slug}/temperature"
+    )
+    i2c_path_template = str(_setting("THERMOMETER_I2C_PATH_TEMPLATE", "")).strip()
+    return [
+        SensorRead(
+            pk=thermometer.pk,
+            slug=thermometer.slug,
+            source=source,
+            w1_paths=[w1_path_template.format(slug=thermometer.slug)],
+            i2c_paths=(
+                [i2c_path_template.format(slug=thermometer.slug)]
+                if i2c_path_template
+                else None
+            ),
+        )
+        for thermometer in thermometers
+    ]
+
+
+def _read_sensor(read: SensorRead) -> Decimal | None:
+    return read_temperature(source=read.source, w1_paths=read.w1_paths, i2c_paths=read.i2c_paths)
+
+
+def read_sensors(
+    reads: list[SensorRead],
+    *,
+    max_workers: int | None = None,
+    timeout: float | None = None,
+    reader: Callable[[SensorRead], Decimal | None] = _read_sensor,
+) -> tuple[dict[int, Decimal | None], set[int]]:
+    """Read ``reads`` on a bounded thread pool.
+
+    Returns readings keyed by thermometer pk and the pks whose read ran
+    longer than ``timeout`` seconds after it started. A timed-out read keeps
+    its worker until the kernel returns, but it no longer holds up the batch.
+    """
+
+    if not reads:
+        return {}, set()
+    max_workers = max(1, int(max_workers or _setting("THERMOMETER_MAX_WORKERS", DEFAULT_MAX_WORKERS)))
+    timeout = float(
+        timeout
+        if timeout is not None
+        else _setting("THERMOMETER_READ_TIMEOUT_SECONDS", DEFAULT_READ_TIMEOUT_SECONDS)
+    )
+    started_at: dict[int, float] = {}
+
+    def run(read: SensorRead) -> Decimal | None:
+        started_at[read.pk] = time.monotonic()
+        return reader(read)
+
+    readings: dict[int, Decimal | None] = {}
+    timed_out: set[int] = set()
+    executor = ThreadPoolExecutor(
+        max_workers=min(max_workers, len(reads)), thread_name_prefix="thermometer-read"
+    )
+    try:
+        pending = {executor.submit(run, read): read for read in reads}
+        while pending:
+            now = time.monotonic()
+            expiries = [
+                started_at[read.pk] + timeout
+                for read in pending.values()
+                if read.pk in started_at
+            ]
+            wait_seconds = max(0.0, min(expiries) - now) if expiries else timeout
+            done, _running = wait(pending, timeout=wait_seconds, return_when=FIRST_COMPLETED)
+            for future in done:
+                read = pending.pop(future)
+                try:
+                    readings[read.pk] = future.result()
+                except Exception:
+                    logger.warning("Thermometer read failed for %s", read.slug, exc_info=True)
+                    readings[read.pk] = None
+            now = time.monotonic()
+            for future, read in list(pending.items()):
+                started = started_at.get(read.pk)
+                if started is not None and now - started >= timeout:
+                    pending.pop(future)
+                    timed_out.add(read.pk)
+                    logger.warning(
+                        "Thermometer read for %s exceeded %.1fs; skipping this cycle",
+                        read.slug,
+                        timeout,
+                    )
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return readings, timed_out
+
+
+def _within_deadband(thermometer: Thermometer, reading: Decimal, now: datetime) -> bool:
+    if thermometer.stored_reading_pk is None:
+        return False
+    heartbeat = _setting("THERMOMETER_HISTORY_HEARTBEAT_SECONDS", DEFAULT_HISTORY_HEARTBEAT_SECONDS)
+    if heartbeat and (now - thermometer.stored_read_at).total_seconds() >= heartbeat:
+        return False
+    delta = (reading - Decimal(thermometer.stored_reading)).copy_abs()
+    return delta <= thermometer.reading_deadband
+
+
+def store_readings(
+    thermometers: list[Thermometer],
+    readings: dict[int, Decimal | None],
+    *,
+    read_at: datetime,
+) -> tuple[int, int]:
+    """Persist one sampling cycle and return ``(stored, unchanged)`` counts.
+
+    Readings outside the deadband become history rows in one bulk insert;
+    readings inside it only move ``last_seen_at`` on the latest row. The
+    thermometers' current values are written with one bulk update.
+    """
+
+    new_rows: list[ThermometerReading] = []
+    unchanged_pks: list[int] = []
+    sampled: list[Thermometer] = []
+    for thermometer in thermometers:
+        reading = readings.get(thermometer.pk)
+        if reading is None:
+            continue
+        reading = Decimal(reading).quantize(READING_QUANTUM)
+        if _within_deadband(thermometer, reading, read_at):
+            unchanged_pks.append(thermometer.stored_reading_pk)
+        else:
+            new_rows.append(
+                ThermometerReading(thermometer=thermometer, reading=reading, read_at=read_at)
+            )
+        thermometer.last_reading = reading
+        thermometer.last_read_at = read_at
+        sampled.append(thermometer)
+
+    if not sampled:
+        return 0, 0
+    with transaction.atomic():
+        if new_rows:
+            ThermometerReading.objects.bulk_create(new_rows)
+        if unchanged_pks:
+            ThermometerReading.objects.filter(pk__in=unchanged_pks).update(last_seen_at=read_at)
+        Thermometer.objects.bulk_update(sampled, ["last_reading", "last_read_at"])
+    return len(new_rows), len(unchanged_pks)
+
+
+def sample_due_thermometers(
+    *,
+    now: datetime | None = None,
+    reader: Callable[[SensorRead], Decimal | None] = _read_sensor,
+) -> SamplingResult:
+    """Read every due thermometer concurrently and store the cycle in one batch."""
+
+    started = time.monotonic()
+    now = now or timezone.now()
+    thermometers = list(due_thermometers(now))
+    result = SamplingResult()
+    if thermometers:
+        readings, timed_out = read_sensors(build_sensor_reads(thermometers), reader=reader)
+        read_at = timezone.now()
+        result.stored, result.unchanged = store_readings(
+            thermometers, readings, read_at=read_at
+        )
+        result.sampled = result.stored + result.unchanged
+        result.timed_out = len(timed_out)
+        result.failed_slugs = [
+            thermometer.slug
+            for thermometer in thermometers
+            if readings.get(thermometer.pk) is None
+        ]
+        result.failed = len(result.failed_slugs)
+        if result.failed_slugs:
+            logger.info(
+                "Thermometer sample skipped; no reading returned for %s",
+                ", ".join(result.failed_slugs),
+            )
+    result.seconds = time.monotonic() - started
+    return result
+
+
+def run_sampling_loop(
+    *,
+    max_cycles: int | None = None,
+    max_sleep: float | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> int:
+    """Sample thermometers as they fall due until interrupted.
+
+    Sleeps until the next thermometer is due, capped at ``max_sleep`` so newly
+    added or re-enabled sensors are picked up. Returns the number of cycles run.
+    """
+
+    max_sleep = float(
+        max_sleep
+        if max_sleep is not None
+        else _setting("THERMOMETER_LOOP_MAX_SLEEP_SECONDS", DEFAULT_LOOP_MAX_SLEEP_SECONDS)
+    )
+    cycles = 0
+    while max_cycles is None or cycles < max_cycles:
+        sample_due_thermometers()
+        cycles += 1
+        delay = seconds_until_next_due()
+        sleep(max_sleep if delay is None else min(max(delay, 0.05), max_sleep))
+    return cycles
+
+
+__all__ = [
+    "SamplingResult",
+    "SensorRead",
+    "due_thermometers",
+    "read_sensors",
+    "run_sampling_loop",
+    "sample_due_thermometers",
+    "seconds_until_next_due",
+    "store_readings",
+]
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import logging
 import re
-from datetime import datetime
 from pathlib import Path
 
 from celery import shared_task
@@ -11,7 +10,7 @@ from django.utils import timezone
 
 from .constants import USB_LCD_STATUS_CELERY_TASK_NAME
 from .models import Thermometer, UsbTracker
-from .thermometers import read_temperature
+from .sampling import sample_due_thermometers
 
 logger = logging.getLogger(__name__)
 
@@ -19,25 +18,6 @@ USB_TRACKER_DEFAULT_ROOTS = ("/media", "/run/media", "/mnt")
 USB_TRACKER_MAX_BYTES = 128 * 1024
 
 
-def _thermometer_is_due(thermometer: Thermometer, now: datetime) -> bool:
-    """Return whether the thermometer should be sampled now.
-
-    Args:
-        thermometer: Thermometer instance under consideration.
-        now: Current timestamp used for interval comparison.
-
-    Returns:
-        ``True`` when the sampling interval has elapsed.
-    """
-    interval_seconds = thermometer.sampling_interval_seconds
-    if interval_seconds <= 0:
-        return False
-    last_read_at = thermometer.last_read_at
-    if last_read_at is None:
-        return True
-    return (now - last_read_at).total_seconds() >= interval_seconds
-
-
 @shared_task(name="apps.sensors.tasks.sample_thermometers")
 def sample_thermometers() -> dict[str, int]:
     """Sample all active thermometers that are due for a reading.
@@ -45,44 +25,13 @@ def sample_thermometers() -> dict[str, int]:
     Returns:
         Counters describing sampled, skipped, and failed thermometers.
     """
-    now = timezone.localtime()
-    sampled = 0
-    skipped = 0
-    failed = 0
-
-    for thermometer in Thermometer.objects.filter(is_active=True).iterator():
-        if not _thermometer_is_due(thermometer, now):
-            skipped += 1
-            continue
-
-        source = str(getattr(settings, "THERMOMETER_SOURCE", "auto")).strip().lower()
-        w1_path_template = getattr(
-            settings,
-            "THERMOMETER_PATH_TEMPLATE",
-            "/sys/bus/w1/devices/{slug}/temperature",
-        )
-        w1_paths = [w1_path_template.format(slug=thermometer.slug)]
-        i2c_path_template = str(
-            getattr(settings, "THERMOMETER_I2C_PATH_TEMPLATE", "")
-        ).strip()
-        i2c_paths = (
-            [i2c_path_template.format(slug=thermometer.slug)]
-            if i2c_path_template
-            else None
-        )
-        reading = read_temperature(source=source, w1_paths=w1_paths, i2c_paths=i2c_paths)
-        if reading is None:
-            failed += 1
-            logger.info(
-                "Thermometer sample skipped; no reading returned for %s",
-                thermometer.slug,
-            )
-            continue
-
-        thermometer.record_reading(reading, read_at=timezone.localtime())
-        sampled += 1
-
-    return {"sampled": sampled, "skipped": skipped, "failed": failed}
+    result = sample_due_thermometers()
+    active = Thermometer.objects.filter(is_active=True).count()
+    return {
+        "sampled": result.sampled,
+        "skipped": active - result.sampled - result.failed,
+        "failed": result.failed,
+    }
 
 
 def _usb_mount_roots() -> tuple[Path, ...]:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from io import StringIO
 
 import pytest
@@ -7,7 +8,7 @@ from django.core.management.base import CommandError
 from django.core.management import call_command
 
 from apps.nodes.models import Node
-from apps.sensors.models import UsbPortMapping, UsbTracker
+from apps.sensors.models import Thermometer, UsbPortMapping, UsbTracker
 
 pytestmark = pytest.mark.django_db
 
@@ -148,3 +149,18 @@ def test_sensors_set_usb_lcd_port_requires_local_node(settings, tmp_path):
             "--source-id",
             "usb-key",
         )
+
+
+def test_sensors_sample_thermometers_command_json_output(settings, tmp_path):
+    sensor_file = tmp_path / "28-0001" / "temperature"
+    sensor_file.parent.mkdir(parents=True)
+    sensor_file.write_text("21375\n", encoding="utf-8")
+    settings.THERMOMETER_SOURCE = "w1"
+    settings.THERMOMETER_PATH_TEMPLATE = str(tmp_path / "{slug}" / "temperature")
+    Thermometer.objects.create(name="Cabinet", slug="28-0001", unit="C")
+
+    output = StringIO()
+    call_command("sensors", "sample-thermometers", "--json", stdout=output)
+
+    payload = json.loads(output.getvalue())
+    assert (payload["sampled"], payload["stored"], payload["failed"]) == (1, 1, 0)
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.sensors import sampling
+from apps.sensors.models import Thermometer, ThermometerReading
+from apps.sensors.thermometers import read_w1_temperature
+
+pytestmark = pytest.mark.django_db
+
+SENSOR_LATENCY = 0.2
+
+
+@pytest.fixture
+def sysfs(settings, tmp_path: Path):
+    """Fake w1 sysfs tree whose files are read with injected latency."""
+
+    settings.THERMOMETER_SOURCE = "w1"
+    settings.THERMOMETER_PATH_TEMPLATE = str(tmp_path / "{slug}" / "temperature")
+    settings.THERMOMETER_I2C_PATH_TEMPLATE = ""
+
+    def write(slug: str, millidegrees: int) -> None:
+        path = tmp_path / slug / "temperature"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"{millidegrees}\n", encoding="utf-8")
+
+    return write
+
+
+def _slow_reader(hung: set[str] = frozenset(), release: threading.Event | None = None):
+    def reader(read: sampling.SensorRead):
+        if read.slug in hung:
+            release.wait(5)
+        time.sleep(SENSOR_LATENCY)
+        return read_w1_temperature(paths=read.w1_paths)
+
+    return reader
+
+
+def _thermometer(slug: str, **kwargs) -> Thermometer:
+    kwargs.setdefault("sampling_interval_seconds", 60)
+    return Thermometer.objects.create(name=slug, slug=slug, unit="C", **kwargs)
+
+
+def test_only_due_thermometers_are_selected() -> None:
+    now = timezone.now()
+    never_read = _thermometer("28-never")
+    overdue = _thermometer("28-overdue", last_read_at=now - timedelta(seconds=61))
+    _thermometer("28-fresh", last_read_at=now - timedelta(seconds=30))
+    _thermometer("28-off", is_active=False)
+    _thermometer("28-manual", sampling_interval_seconds=0)
+
+    due = list(sampling.due_thermometers(now))
+
+    assert [thermometer.pk for thermometer in due] == [never_read.pk, overdue.pk]
+    assert sampling.seconds_until_next_due(now) == 0.0
+
+
+def test_sensors_are_read_concurrently_and_stored_in_one_batch(settings, sysfs) -> None:
+    settings.THERMOMETER_MAX_WORKERS = 8
+    for index in range(6):
+        sysfs(f"28-{index}", 20000 + index * 1000)
+        _thermometer(f"28-{index}")
+
+    with CaptureQueriesContext(connection) as queries:
+        result = sampling.sample_due_thermometers(reader=_slow_reader())
+
+    assert (result.sampled, result.stored, result.failed) == (6, 6, 0)
+    assert result.seconds < SENSOR_LATENCY * 3
+    assert ThermometerReading.objects.count() == 6
+    assert Thermometer.objects.get(slug="28-5").last_reading == Decimal("25.00")
+    writes = [
+        query["sql"]
+        for query in queries
+        if query["sql"].startswith(("INSERT", "UPDATE"))
+    ]
+    assert len(writes) == 2
+
+
+def test_hung_sensor_times_out_without_blocking_the_batch(settings, sysfs) -> None:
+    settings.THERMOMETER_READ_TIMEOUT_SECONDS = SENSOR_LATENCY * 2
+    sysfs("28-ok", 21500)
+    sysfs("28-hung", 22000)
+    ok = _thermometer("28-ok")
+    hung = _thermometer("28-hung")
+    release = threading.Event()
+
+    try:
+        result = sampling.sample_due_thermometers(
+            reader=_slow_reader(hung={"28-hung"}, release=release)
+        )
+    finally:
+        release.set()
+
+    ok.refresh_from_db()
+    hung.refresh_from_db()
+    assert (result.sampled, result.failed, result.timed_out) == (1, 1, 1)
+    assert result.seconds < 2
+    assert ok.last_reading == Decimal("21.50")
+    assert hung.last_read_at is None
+
+
+def test_readings_within_deadband_touch_last_seen_instead_of_inserting(sysfs) -> None:
+    thermometer = _thermometer("28-steady", reading_deadband=Decimal("0.25"))
+    sysfs("28-steady", 20000)
+    sampling.sample_due_thermometers()
+    stored = ThermometerReading.objects.get()
+
+    sysfs("28-steady", 20200)
+    Thermometer.objects.filter(pk=thermometer.pk).update(last_read_at=None)
+    steady = sampling.sample_due_thermometers()
+
+    stored.refresh_from_db()
+    thermometer.refresh_from_db()
+    assert (steady.stored, steady.unchanged) == (0, 1)
+    assert ThermometerReading.objects.count() == 1
+    assert stored.last_seen_at == thermometer.last_read_at
+    assert thermometer.last_reading == Decimal("20.20")
+
+    sysfs("28-steady", 20600)
+    Thermometer.objects.filter(pk=thermometer.pk).update(last_read_at=None)
+    moved = sampling.sample_due_thermometers()
+
+    assert (moved.stored, moved.unchanged) == (1, 0)
+    assert ThermometerReading.objects.count() == 2
+
+
+def test_deadband_is_ignored_once_the_heartbeat_elapses(settings, sysfs) -> None:
+    settings.THERMOMETER_HISTORY_HEARTBEAT_SECONDS = 600
+    thermometer = _thermometer("28-heartbeat")
+    ThermometerReading.objects.create(
+        thermometer=thermometer,
+        reading=Decimal("20.00"),
+        read_at=timezone.now() - timedelta(minutes=11),
+    )
+    sysfs("28-heartbeat", 20000)
+
+    result = sampling.sample_due_thermometers()
+
+    assert (result.stored, result.unchanged) == (1, 0)
+
+
+def test_sampling_loop_sleeps_until_the_next_due_thermometer(sysfs) -> None:
+    sysfs("28-loop", 19000)
+    _thermometer("28-loop", sampling_interval_seconds=10)
+    sleeps: list[float] = []
+
+    cycles = sampling.run_sampling_loop(max_cycles=2, max_sleep=30, sleep=sleeps.append)
+
+    assert cycles == 2
+    assert ThermometerReading.objects.count() == 1
+    assert 9 < sleeps[0] <= 10
@@ -110,7 +110,7 @@ def test_sample_thermometers_prefers_i2c_source(settings, monkeypatch) -> None:
         captured["i2c_paths"] = i2c_paths
         return 23
 
-    monkeypatch.setattr("apps.sensors.tasks.read_temperature", fake_read_temperature)
+    monkeypatch.setattr("apps.sensors.sampling.read_temperature", fake_read_temperature)
 
     result = sample_thermometers()
     thermometer.refresh_from_db()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 import pytest
@@ -228,6 +229,26 @@ def test_write_usb_lcd_status_writes_lock_file(tmp_path: Path) -> None:
     assert message.body == "▖FREE   ▗FREE"
 
 
+def test_write_usb_lcd_status_skips_unchanged_rewrites(tmp_path: Path) -> None:
+    node = Node.objects.create(hostname="gway", public_endpoint="gway")
+    UsbPortMapping.objects.create(
+        node=node,
+        port_number=2,
+        label="SPARE",
+        source_type=UsbPortMapping.SourceType.USB_TRACKER,
+        source_identifier="spare",
+    )
+    lock_file = tmp_path / LCD_USB_LOCK_FILE
+
+    first = write_usb_lcd_status(lock_dir=tmp_path, node=node)
+    os.utime(lock_file, ns=(1_000_000_000, 1_000_000_000))
+    second = write_usb_lcd_status(lock_dir=tmp_path, node=node)
+
+    assert first["changed"] is True
+    assert second["changed"] is False
+    assert lock_file.stat().st_mtime_ns == 1_000_000_000
+
+
 def test_write_usb_lcd_status_removes_stale_lock_without_mappings(
     tmp_path: Path,
 ) -> None:
@@ -11,7 +11,7 @@ from pathlib import Path
 from django.conf import settings
 from django.db.utils import OperationalError, ProgrammingError
 
-from apps.screens.startup_notifications import LCD_USB_LOCK_FILE, write_lcd_message
+from apps.screens.startup_notifications import LCD_USB_LOCK_FILE, publish_lcd_message
 
 from .constants import (
     USB_LCD_EMPTY_LABEL,
@@ -191,11 +191,12 @@ def write_usb_lcd_status(
         }
 
     line1, line2 = render_usb_lcd_lines(statuses)
-    write_lcd_message(lock_file=lock_file, subject=line1, body=line2)
+    changed = publish_lcd_message(lock_file=lock_file, subject=line1, body=line2)
     return {
         "configured": configured,
         "connected": sum(1 for status in statuses if status.connected),
         "written": True,
+        "changed": changed,
         "lock_file": str(lock_file),
         "line1": line1,
         "line2": line2,
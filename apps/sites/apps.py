@@ -8,7 +8,9 @@ class PagesConfig(AppConfig):
 
     def ready(self):  # pragma: no cover - import for side effects
         from . import checks  # noqa: F401
+        from . import nav_snapshot
         from . import site_config
         from . import widgets  # noqa: F401
 
+        nav_snapshot.connect_signals()
         site_config.ready()
@@ -1,4 +1,9 @@
+import copy
+import ipaddress
 import json
+import logging
+import re
+import socket
 from http.client import HTTPException, IncompleteRead
 from pathlib import Path
 from urllib.error import URLError
@@ -7,8 +12,10 @@ from urllib.request import Request, urlopen
 
 from django.apps import apps
 from django.conf import settings
+from django.contrib.sites.models import Site
 from django.core.cache import cache
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import DisallowedHost, ObjectDoesNotExist
+from django.db.models import Prefetch
 from django.db.utils import OperationalError, ProgrammingError
 from django.shortcuts import resolve_url
 from django.urls import Resolver404, resolve
@@ -16,16 +23,21 @@ from django.utils.encoding import force_str
 from django.utils.translation import gettext as _
 
 from apps.features.utils import is_suite_feature_enabled
+from apps.groups.constants import SITE_OPERATOR_GROUP_NAME
 from apps.groups.models import SecurityGroup
 from apps.links.models import Reference
-from apps.links.reference_utils import filter_visible_references
+from apps.links.reference_utils import (
+    filter_visible_references,
+    reference_visible_to_user,
+)
 from apps.modules.models import Module
 from apps.nodes.models import Node
 from apps.nodes.utils import FeatureChecker
-from apps.sites.utils import user_in_site_operator_group
-from utils.sites import get_site
 
-from .models import SiteHighlight, SiteTemplate
+from .models import AdminBadge, Landing, SiteHighlight, SiteTemplate
+from .nav_snapshot import NavigationSnapshot, get_navigation_snapshot
+
+logger = logging.getLogger(__name__)
 
 _FAVICON_DIR = Path(settings.BASE_DIR) / "pages" / "fixtures" / "data"
 _FAVICON_FILENAMES = {
@@ -260,15 +272,108 @@ def _resolve_landing_visibility(
     return is_visible
 
 
+def resolve_request_host(request) -> str:
+    """Return the validated hostname for site and node lookups, or ``""``."""
+    try:
+        host_value = request.get_host()
+    except DisallowedHost:
+        # Never trust unvalidated Host headers for site/node resolution.
+        return ""
+
+    if host_value.startswith("["):
+        host_value = host_value.split("]", 1)[0].lstrip("[")
+    elif host_value.count(":") > 1:
+        host_or_port = host_value.rsplit(":", 1)
+        # Heuristic for non-standard bare IPv6-with-port input (e.g. ``::1:8080``):
+        # strip a trailing numeric segment only when the remaining portion also
+        # parses as IPv6. This reduces (but does not eliminate) false positives;
+        # inputs like ``fc00::1:2:3:4`` may still be transformed because
+        # ``fc00::1:2:3`` is itself valid IPv6. Proper Host syntax uses
+        # brackets (``[::1]:8080``), so this path is best-effort fallback only.
+        if (
+            len(host_or_port) == 2
+            and host_or_port[1].isdigit()
+            and not host_or_port[0].endswith(":")
+        ):
+            try:
+                ipaddress.ip_address(host_or_port[0])
+            except ValueError:
+                pass
+            else:
+                host_value = host_or_port[0]
+    else:
+        host_value = host_value.split(":", 1)[0]
+
+    if not re.fullmatch(r"[A-Za-z0-9._-]+|[0-9A-Fa-f:.]+", host_value or ""):
+        return ""
+    return host_value
+
+
+def _resolve_site_for_host(host: str):
+    """Return the ``Site`` whose domain matches ``host``, if any."""
+
+    if not host:
+        return None
+    try:
+        return (
+            Site.objects.select_related("profile", "badge")
+            .filter(domain__iexact=host)
+            .first()
+        )
+    except (OperationalError, ProgrammingError):
+        return None
+
+
+def _resolve_node_for_host(host: str):
+    """Return the local node, falling back to hostname and address matches."""
+
+    try:
+        node = Node.get_local()
+        if node:
+            return node
+        hostname = socket.gethostname()
+        try:
+            addresses = socket.gethostbyname_ex(hostname)[2]
+        except socket.gaierror:
+            addresses = []
+
+        node = Node.objects.filter(hostname__iexact=hostname).first()
+        if not node:
+            for addr in addresses:
+                node = Node.objects.filter(address=addr).first()
+                if node:
+                    break
+        if not node and host:
+            node = (
+                Node.objects.filter(hostname__iexact=host).first()
+                or Node.objects.filter(address=host).first()
+            )
+        return node
+    except Exception:
+        logger.exception("Unexpected error resolving node for host '%s'", host)
+        return None
+
+
+def navigation_snapshot(request) -> NavigationSnapshot:
+    """Return the navigation snapshot for the request host, memoized per request."""
+
+    snapshot = getattr(request, "_navigation_snapshot", None)
+    if snapshot is None:
+        snapshot = get_navigation_snapshot(
+            resolve_request_host(request), _build_navigation_snapshot
+        )
+        request._navigation_snapshot = snapshot
+    return snapshot
+
+
 def _initialize_request_badges(request):
-    """Populate request badge fields with database-safe fallbacks."""
+    """Populate request badge fields from the navigation snapshot."""
 
-    site = getattr(request, "badge_site", None) or get_site(request)
-    node = getattr(request, "badge_node", None)
+    snapshot = navigation_snapshot(request)
+    site = getattr(request, "badge_site", None) or snapshot.site
+    node = getattr(request, "badge_node", None) or snapshot.node
     role = getattr(request, "badge_role", None)
     try:
-        if node is None:
-            node = Node.get_local()
         if role is None:
             role = node.role if node else None
     except (OperationalError, ProgrammingError):
@@ -279,18 +384,25 @@ def _initialize_request_badges(request):
     return site, node, role
 
 
-def _get_user_group_membership(user) -> tuple[set[str], set[int]]:
-    """Return the user's security-group names and ids when available."""
+def get_user_group_membership(user) -> tuple[set[str], set[int]]:
+    """Return the user's security-group names and ids when available.
+
+    The result is memoized on ``user`` so every context processor shares one
+    query per request.
+    """
 
     if (
         not getattr(user, "is_authenticated", False)
         or getattr(user, "pk", None) is None
     ):
         return set(), set()
-    return (
-        set(user.groups.values_list("name", flat=True)),
-        set(user.groups.values_list("id", flat=True)),
-    )
+    membership = getattr(user, "_nav_group_membership", None)
+    if membership is None:
+        rows = list(user.groups.values_list("id", "name"))
+        membership = ({name for _, name in rows}, {pk for pk, _ in rows})
+        user._nav_group_membership = membership
+    return membership
+
 
 
 def _module_matches_navigation_access(
@@ -315,44 +427,86 @@ def _module_matches_navigation_access(
     return bool(role_matches)
 
 
-def _load_visible_modules(
-    role, user, feature_checker, user_group_ids: set[int]
-) -> list[Module]:
-    """Load modules that survive feature and access checks for navigation.
+def _landing_features_enabled(landing, feature_checker) -> bool:
+    """Return whether the landing view's ``required_features_any`` gate passes."""
+
+    try:
+        match = resolve(landing.path)
+    except Resolver404:
+        return True
+    required_features_any = getattr(match.func, "required_features_any", frozenset())
+    return not required_features_any or any(
+        feature_checker.is_enabled(slug) for slug in required_features_any
+    )
+
+
+def _load_navigation_modules(role) -> list[Module]:
+    """Load feature-gated modules for ``role`` with enabled landings attached.
 
     Parameters:
         role: Active node role used by the module manager.
-        user: Current request user.
-        feature_checker: FeatureChecker used for module feature gates.
-        user_group_ids: Current user's security group ids.
 
     Returns:
-        list[Module]: Modules eligible for further landing annotation.
+        list[Module]: Modules whose ``nav_landings`` hold the enabled landings
+        that pass their view feature gates.
     """
 
+    feature_checker = FeatureChecker()
     try:
-        modules = (
+        modules = list(
             Module.objects.for_role(role)
             .filter(is_deleted=False)
-            .select_related("application", "security_group")
-            .prefetch_related("landings", "roles", "features")
+            .select_related("application", "security_group", "favicon_media")
+            .prefetch_related(
+                Prefetch(
+                    "landings",
+                    queryset=Landing._default_manager.filter(enabled=True),
+                    to_attr="nav_landings",
+                ),
+                "roles",
+                "features",
+            )
         )
     except (OperationalError, ProgrammingError):
         return []
 
-    try:
-        candidate_modules = list(modules)
-    except (OperationalError, ProgrammingError):
-        return []
-
-    visible_modules: list[Module] = []
-    for module in candidate_modules:
+    navigation_modules: list[Module] = []
+    for module in modules:
         if not module.meets_feature_requirements(feature_checker.is_enabled):
             continue
-        if not _module_matches_navigation_access(module, role, user, user_group_ids):
-            continue
-        visible_modules.append(module)
-    return visible_modules
+        module.nav_landings = [
+            landing
+            for landing in module.nav_landings
+            if _landing_features_enabled(landing, feature_checker)
+        ]
+        navigation_modules.append(module)
+    return navigation_modules
+
+
+def _load_visible_modules(
+    role, user, snapshot: NavigationSnapshot, user_group_ids: set[int]
+) -> list[Module]:
+    """Return copies of the snapshot modules the current user may access.
+
+    Parameters:
+        role: Active node role.
+        user: Current request user.
+        snapshot: Navigation snapshot for the request host.
+        user_group_ids: Current user's security group ids.
+
+    Returns:
+        list[Module]: Modules eligible for further landing annotation.
+    """
+
+    if getattr(role, "pk", None) == getattr(snapshot.role, "pk", None):
+        modules = snapshot.modules
+    else:
+        modules = _load_navigation_modules(role)
+    return [
+        copy.copy(module)
+        for module in modules
+        if _module_matches_navigation_access(module, role, user, user_group_ids)
+    ]
 
 
 def _compute_landing_lock_state(
@@ -465,7 +619,6 @@ def _annotate_module_landings(
     module,
     request,
     *,
-    feature_checker,
     role_id: object,
     site_id: object,
     user_cache_key: object,
@@ -475,11 +628,12 @@ def _annotate_module_landings(
 
     landings = []
     seen_paths: set[str] = set()
-    for landing in module.landings.filter(enabled=True):
+    for landing in module.nav_landings:
         normalized_path = landing.path.rstrip("/") or "/"
         if normalized_path in seen_paths:
             continue
 
+        landing = copy.copy(landing)
         landing.nav_is_invalid = not landing.is_link_valid()
         landing.nav_is_locked = False
         landing.nav_lock_reason = None
@@ -492,11 +646,6 @@ def _annotate_module_landings(
             continue
 
         view_func = match.func
-        required_features_any = getattr(view_func, "required_features_any", frozenset())
-        if required_features_any and not any(
-            feature_checker.is_enabled(slug) for slug in required_features_any
-        ):
-            continue
         if not _resolve_landing_visibility(
             landing,
             view_func,
@@ -545,11 +694,16 @@ def _select_current_module(request_path: str, modules: list[Module]):
     return current_module
 
 
-def _select_favicon_url(current_module, site, node) -> str | None:
+def _select_favicon_url(current_module, snapshot: NavigationSnapshot) -> str | None:
     """Return the favicon URL or inline payload for the current request."""
 
     if current_module and current_module.favicon_url:
         return current_module.favicon_url
+    return snapshot.favicon_url
+
+
+def _site_favicon_url(site, node) -> str:
+    """Return the site badge favicon, falling back to the node role favicon."""
 
     favicon_url = None
     if site:
@@ -566,8 +720,12 @@ def _select_favicon_url(current_module, site, node) -> str | None:
     return _ROLE_FAVICONS.get(role_name, _DEFAULT_FAVICON) or _DEFAULT_FAVICON
 
 
-def _load_header_references(request, site, node):
-    """Return header references that are visible in the current request context."""
+def _load_scoped_header_references(site, node):
+    """Return header references allowed for ``site`` and ``node``.
+
+    Footer visibility is user-specific and applied per request by
+    :func:`_load_header_references`.
+    """
 
     try:
         header_refs_qs = (
@@ -577,14 +735,25 @@ def _load_header_references(request, site, node):
         )
         return filter_visible_references(
             header_refs_qs,
-            request=request,
             site=site,
             node=node,
+            respect_footer_visibility=False,
         )
     except (OperationalError, ProgrammingError):
         return []
 
 
+def _load_header_references(request, snapshot: NavigationSnapshot):
+    """Return header references that are visible in the current request context."""
+
+    user = getattr(request, "user", None)
+    return [
+        ref
+        for ref in snapshot.header_references
+        if reference_visible_to_user(ref, user)
+    ]
+
+
 def _load_latest_site_highlight():
     """Return the newest enabled site highlight, if available."""
 
@@ -618,29 +787,58 @@ def _build_chat_context(user):
     }
 
 
-def _get_user_group_site_template(user):
-    """Return the first security-group site template available to ``user``.
+def _load_group_site_templates() -> list[tuple[int, SiteTemplate]]:
+    """Return ``(group_id, template)`` pairs for groups with a site template.
+
+    Pairs are ordered by group name so the first match for a user is stable.
+    """
+
+    try:
+        return [
+            (group.pk, group.site_template)
+            for group in SecurityGroup.objects.filter(site_template__isnull=False)
+            .select_related("site_template")
+            .order_by("name")
+        ]
+    except (OperationalError, ProgrammingError):
+        return []
+
+
+def _get_user_group_site_template(snapshot: NavigationSnapshot, user_group_ids):
+    """Return the first security-group site template available to the user.
 
     Parameters:
-        user: Current request user.
+        snapshot: Navigation snapshot holding the group templates.
+        user_group_ids: Current user's security group ids.
 
     Returns:
         SiteTemplate | None: The first matching group template, if any.
     """
 
+    for group_id, site_template in snapshot.group_site_templates:
+        if group_id in user_group_ids:
+            return site_template
+    return None
+
+
+def _default_site_template(site):
+    """Return the site's profile template, or the first template by name."""
+
+    site_template = None
+    if site:
+        try:
+            site_template = getattr(getattr(site, "profile", None), "template", None)
+        except (ObjectDoesNotExist, OperationalError, ProgrammingError):
+            site_template = None
+    if site_template is not None:
+        return site_template
     try:
-        group_template = (
-            SecurityGroup.objects.filter(site_template__isnull=False, user=user)
-            .select_related("site_template")
-            .order_by("name")
-            .first()
-        )
+        return SiteTemplate.objects.order_by("name").first()
     except (OperationalError, ProgrammingError):
         return None
-    return group_template.site_template if group_template else None
 
 
-def _select_site_template(site, user):
+def _select_site_template(snapshot: NavigationSnapshot, user, user_group_ids):
     """Return the best site template for the current user and site."""
 
     site_template = None
@@ -653,27 +851,67 @@ def _select_site_template(site, user):
         except (AttributeError, ObjectDoesNotExist, OperationalError, ProgrammingError):
             site_template = None
         if site_template is None:
-            site_template = _get_user_group_site_template(user)
+            site_template = _get_user_group_site_template(snapshot, user_group_ids)
 
-    if site_template is None and site:
-        site_template = getattr(getattr(site, "profile", None), "template", None)
     if site_template is not None:
         return site_template
+    return snapshot.site_template
+
+
+def _load_admin_badges() -> list[AdminBadge]:
+    """Return enabled admin badge definitions in display order."""
+
     try:
-        return SiteTemplate.objects.order_by("name").first()
+        return list(
+            AdminBadge.objects.filter(is_enabled=True, is_deleted=False).order_by(
+                "priority", "pk"
+            )
+        )
     except (OperationalError, ProgrammingError):
-        return None
+        return []
+
+
+def _build_navigation_snapshot(host: str) -> NavigationSnapshot:
+    """Assemble the role, site and node scoped chrome for ``host``."""
+
+    site = _resolve_site_for_host(host)
+    node = _resolve_node_for_host(host)
+    try:
+        role = node.role if node else None
+    except (OperationalError, ProgrammingError):
+        role = None
+    return NavigationSnapshot(
+        host=host,
+        site=site,
+        node=node,
+        role=role,
+        modules=tuple(_load_navigation_modules(role)),
+        header_references=tuple(_load_scoped_header_references(site, node)),
+        site_highlight=_load_latest_site_highlight(),
+        site_template=_default_site_template(site),
+        group_site_templates=tuple(_load_group_site_templates()),
+        admin_badges=tuple(_load_admin_badges()),
+        favicon_url=_site_favicon_url(site, node),
+        operator_site_interface_enabled=is_suite_feature_enabled(
+            "operator-site-interface", default=True
+        ),
+        feedback_ingestion_enabled=is_suite_feature_enabled(
+            "feedback-ingestion", default=True
+        ),
+    )
 
 
 def nav_links(request):
     """Provide navigation links and related site chrome for the current request."""
 
     site, node, role = _initialize_request_badges(request)
+    snapshot = navigation_snapshot(request)
     user = getattr(request, "user", None)
     user_is_authenticated = getattr(user, "is_authenticated", False)
     user_is_staff = getattr(user, "is_staff", False)
     user_is_superuser = getattr(user, "is_superuser", False)
-    is_site_operator = user_in_site_operator_group(user)
+    user_group_names, user_group_ids = get_user_group_membership(user)
+    is_site_operator = SITE_OPERATOR_GROUP_NAME in user_group_names
     role_id = getattr(role, "id", "none")
     site_id = getattr(site, "id", "none")
     operator_interface_requested = request.GET.get("operator_interface") in {
@@ -685,18 +923,11 @@ def nav_links(request):
         operator_interface_requested
         and user_is_authenticated
         and (user_is_staff or user_is_superuser or is_site_operator)
-        and not is_suite_feature_enabled("operator-site-interface", default=True)
-    )
-    feedback_ingestion_enabled = is_suite_feature_enabled(
-        "feedback-ingestion", default=True
+        and not snapshot.operator_site_interface_enabled
     )
-    feature_checker = FeatureChecker()
-    user_group_names, user_group_ids = _get_user_group_membership(user)
     user_cache_key = getattr(user, "pk", None) if user_is_authenticated else "anonymous"
 
-    candidate_modules = _load_visible_modules(
-        role, user, feature_checker, user_group_ids
-    )
+    candidate_modules = _load_visible_modules(role, user, snapshot, user_group_ids)
     annotated_modules = [
         annotated_module
         for module in candidate_modules
@@ -704,7 +935,6 @@ def nav_links(request):
             annotated_module := _annotate_module_landings(
                 module,
                 request,
-                feature_checker=feature_checker,
                 role_id=role_id,
                 site_id=site_id,
                 user_cache_key=user_cache_key,
@@ -722,14 +952,14 @@ def nav_links(request):
     context = {
         "nav_modules": annotated_modules,
         "current_module": current_module,
-        "favicon_url": _select_favicon_url(current_module, site, node),
-        "header_references": _load_header_references(request, site, node),
-        "site_highlight": _load_latest_site_highlight(),
+        "favicon_url": _select_favicon_url(current_module, snapshot),
+        "header_references": _load_header_references(request, snapshot),
+        "site_highlight": snapshot.site_highlight,
         "funding_banner": _build_funding_banner(request),
         "login_url": resolve_url(settings.LOGIN_URL),
-        "site_template": _select_site_template(site, user),
+        "site_template": _select_site_template(snapshot, user, user_group_ids),
         "operator_interface_mode": operator_interface_mode,
-        "feedback_ingestion_enabled": feedback_ingestion_enabled,
+        "feedback_ingestion_enabled": snapshot.feedback_ingestion_enabled,
         "user_story_attachment_limit": _parse_user_story_attachment_limit(),
     }
     context.update(
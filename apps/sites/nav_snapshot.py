@@ -0,0 +1,182 @@
+"""Versioned snapshots of the role, site and node scoped page chrome.
+
+Navigation modules, header references, the site highlight, the default site
+template and admin badge definitions only change when an administrator edits
+one of the contributing models. :func:`get_navigation_snapshot` assembles that
+portion once per host into an immutable :class:`NavigationSnapshot`, keeps it in
+process memory and in the shared cache, and keys both copies by a version token.
+Saving or deleting any contributing model replaces the token, so every process
+rebuilds on its next request. User-specific filtering happens per request in
+the context processors.
+"""
+
+from __future__ import annotations
+
+import logging
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from typing import Any
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+logger = logging.getLogger(__name__)
+
+VERSION_CACHE_KEY = "sites:nav-snapshot:version"
+SNAPSHOT_CACHE_PREFIX = "sites:nav-snapshot:"
+DEFAULT_SNAPSHOT_TTL = 300
+LOCAL_SNAPSHOT_LIMIT = 32
+
+# Models whose rows feed the snapshot; any save or delete invalidates it.
+SNAPSHOT_SOURCE_MODELS = (
+    "sites.Site",
+    "pages.SiteProfile",
+    "pages.SiteBadge",
+    "pages.SiteHighlight",
+    "pages.SiteTemplate",
+    "pages.AdminBadge",
+    "pages.Landing",
+    "modules.Module",
+    "app.Application",
+    "links.Reference",
+    "groups.SecurityGroup",
+    "nodes.Node",
+    "nodes.NodeRole",
+    "nodes.NodeFeature",
+    "nodes.NodeFeatureAssignment",
+    "features.Feature",
+)
+SNAPSHOT_SOURCE_RELATIONS = (
+    ("modules.Module", "roles"),
+    ("modules.Module", "features"),
+    ("links.Reference", "roles"),
+    ("links.Reference", "features"),
+    ("links.Reference", "sites"),
+)
+
+_lock = threading.Lock()
+_local_snapshots: OrderedDict[tuple[str, str], "NavigationSnapshot"] = OrderedDict()
+
+
+@dataclass(frozen=True)
+class NavigationSnapshot:
+    """Request-independent page chrome for one host.
+
+    ``modules`` holds feature-gated modules for the node role with their
+    enabled landings in ``nav_landings``; ``header_references`` are filtered by
+    role, site and node but not by footer visibility. Model instances are
+    shared between requests and must be copied before they are annotated.
+    """
+
+    host: str
+    site: Any = None
+    node: Any = None
+    role: Any = None
+    modules: tuple = ()
+    header_references: tuple = ()
+    site_highlight: Any = None
+    site_template: Any = None
+    group_site_templates: tuple = ()
+    admin_badges: tuple = ()
+    favicon_url: str = ""
+    operator_site_interface_enabled: bool = True
+    feedback_ingestion_enabled: bool = True
+    version: str = ""
+    expires_at: float = 0.0
+
+
+def snapshot_ttl() -> int:
+    """Return how long a snapshot may be reused without a version change."""
+
+    return int(getattr(settings, "SITES_NAV_SNAPSHOT_TTL", DEFAULT_SNAPSHOT_TTL))
+
+
+def current_version() -> str:
+    """Return the shared snapshot version token, creating one when missing."""
+
+    version = cache.get(VERSION_CACHE_KEY)
+    if version:
+        return version
+    cache.add(VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+    return cache.get(VERSION_CACHE_KEY) or ""
+
+
+def invalidate_navigation_snapshots() -> None:
+    """Replace the version token and drop this process' snapshots."""
+
+    cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+    with _lock:
+        _local_snapshots.clear()
+
+
+def _source_changed(sender, **kwargs) -> None:
+    action = kwargs.get("action")
+    if action is not None and not action.startswith("post_"):
+        return
+    invalidate_navigation_snapshots()
+    # Another process may rebuild from the pre-commit rows in the meantime.
+    if transaction.get_connection(kwargs.get("using")).in_atomic_block:
+        transaction.on_commit(invalidate_navigation_snapshots, using=kwargs.get("using"))
+
+
+def get_navigation_snapshot(
+    host: str, build: Callable[[str], NavigationSnapshot]
+) -> NavigationSnapshot:
+    """Return the snapshot for ``host``, calling ``build`` when none is current."""
+
+    version = current_version()
+    key = (version, host)
+    now = time.time()
+    with _lock:
+        snapshot = _local_snapshots.get(key)
+    if snapshot is not None and snapshot.expires_at > now:
+        return snapshot
+
+    cache_key = f"{SNAPSHOT_CACHE_PREFIX}{version}:{host}"
+    try:
+        snapshot = cache.get(cache_key)
+    except Exception:  # pragma: no cover - stale pickles from older releases
+        logger.debug("Discarding unreadable navigation snapshot", exc_info=True)
+        snapshot = None
+    if not isinstance(snapshot, NavigationSnapshot) or snapshot.expires_at <= now:
+        ttl = snapshot_ttl()
+        snapshot = replace(build(host), version=version, expires_at=now + ttl)
+        try:
+            cache.set(cache_key, snapshot, timeout=ttl)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            logger.debug("Navigation snapshot for %s is not shareable", host, exc_info=True)
+
+    with _lock:
+        _local_snapshots[key] = snapshot
+        _local_snapshots.move_to_end(key)
+        while len(_local_snapshots) > LOCAL_SNAPSHOT_LIMIT:
+            _local_snapshots.popitem(last=False)
+    return snapshot
+
+
+def connect_signals() -> None:
+    """Invalidate snapshots whenever a contributing model changes."""
+
+    for label in SNAPSHOT_SOURCE_MODELS:
+        model = apps.get_model(label)
+        for action, signal in (("save", post_save), ("delete", post_delete)):
+            signal.connect(
+                _source_changed,
+                sender=model,
+                dispatch_uid=f"pages_nav_snapshot_{action}_{label}",
+            )
+    for label, field_name in SNAPSHOT_SOURCE_RELATIONS:
+        through = getattr(apps.get_model(label), field_name).through
+        m2m_changed.connect(
+            _source_changed,
+            sender=through,
+            dispatch_uid=f"pages_nav_snapshot_m2m_{label}_{field_name}",
+        )
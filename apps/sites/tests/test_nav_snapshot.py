@@ -0,0 +1,113 @@
+"""Tests for the versioned navigation snapshot behind the page chrome."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import date
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+
+from apps.links.models import Reference
+from apps.modules.models import Module
+from apps.sites import context_processors
+from apps.sites.models import Landing, SiteHighlight
+from config.context_processors import site_and_node
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def isolated_snapshot_cache(settings):
+    """Keep snapshots and their version token away from other xdist workers."""
+
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": f"nav-snapshot-{uuid.uuid4().hex}",
+        }
+    }
+
+
+def _render_chrome(rf, user):
+    request = rf.get("/")
+    request.user = user
+    context = site_and_node(request)
+    context.update(context_processors.nav_links(request))
+    return context
+
+
+@pytest.fixture
+def staff_user():
+    return get_user_model().objects.create_user(
+        username="nav-staff", password="secret", is_staff=True
+    )
+
+
+def test_page_chrome_queries_drop_to_user_overlay(
+    rf, staff_user, django_assert_num_queries, django_assert_max_num_queries
+):
+    """Before snapshots the chrome cost 22 queries anonymous and 30 for staff."""
+
+    module = Module.objects.create(path="/nav-snapshot/", menu="Snapshot")
+    Landing.objects.create(module=module, path="/", label="Home")
+
+    _render_chrome(rf, AnonymousUser())
+
+    with django_assert_num_queries(0):
+        anonymous = _render_chrome(rf, AnonymousUser())
+    # Group membership plus the chat profile lookup.
+    with django_assert_max_num_queries(3):
+        staff = _render_chrome(rf, staff_user)
+
+    for context in (anonymous, staff):
+        assert [item.menu for item in context["nav_modules"]] == ["Snapshot"]
+        assert [landing.label for landing in context["nav_modules"][0].enabled_landings] == [
+            "Home"
+        ]
+
+
+def test_model_changes_invalidate_snapshot(rf):
+    _render_chrome(rf, AnonymousUser())
+
+    highlight = SiteHighlight.objects.create(
+        title="Fresh highlight",
+        highlight_date=date(2026, 5, 1),
+        story="New story",
+        is_enabled=True,
+    )
+    module = Module.objects.create(path="/nav-fresh/", menu="Fresh")
+    Landing.objects.create(module=module, path="/", label="Fresh home")
+
+    context = _render_chrome(rf, AnonymousUser())
+
+    assert context["site_highlight"].pk == highlight.pk
+    assert "Fresh" in [item.menu for item in context["nav_modules"]]
+
+    Landing.objects.filter(module=module).update(enabled=False)
+    module.save()
+    context = _render_chrome(rf, AnonymousUser())
+    assert "Fresh" not in [item.menu for item in context["nav_modules"]]
+
+
+def test_user_overlay_does_not_leak_between_requests(rf, staff_user):
+    Reference.objects.create(
+        alt_text="Staff docs",
+        value="https://example.com/staff",
+        show_in_header=True,
+        footer_visibility=Reference.FOOTER_STAFF,
+    )
+    module = Module.objects.create(path="/nav-overlay/", menu="Overlay")
+    Landing.objects.create(module=module, path="/", label="Overlay home")
+
+    staff = _render_chrome(rf, staff_user)
+    anonymous = _render_chrome(rf, AnonymousUser())
+
+    assert [ref.alt_text for ref in staff["header_references"]] == ["Staff docs"]
+    assert anonymous["header_references"] == []
+    staff_landing = staff["nav_modules"][0].enabled_landings[0]
+    anonymous_landing = anonymous["nav_modules"][0].enabled_landings[0]
+    assert staff_landing is not anonymous_landing
+    snapshot_module = context_processors.navigation_snapshot(rf.get("/")).modules[0]
+    assert not hasattr(snapshot_module, "enabled_landings")
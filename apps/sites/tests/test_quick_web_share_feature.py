@@ -13,6 +13,7 @@ from apps.features.models import Feature
 from apps.features.utils import QUICK_WEB_SHARE_FEATURE_SLUG
 from apps.links.context_processors import share_short_url
 from apps.links.models import ShortURL
+from apps.links.services.share_links import forget_share_url
 from apps.sites.middleware import SharePreviewPublicMiddleware
 
 pytestmark = pytest.mark.django_db
@@ -27,6 +28,7 @@ def _set_quick_web_share_enabled(enabled: bool) -> None:
 def test_share_context_returns_empty_values_when_feature_disabled_by_default(
     rf: RequestFactory,
 ) -> None:
+    cache.delete("features:quick-web-share:enabled")
     request = rf.get("/public/")
 
     context = share_short_url(request)
@@ -43,12 +45,13 @@ def test_share_context_builds_short_url_when_feature_enabled(
 ) -> None:
     _set_quick_web_share_enabled(True)
     request = rf.get("/public/")
+    forget_share_url(request.build_absolute_uri())
 
     context = share_short_url(request)
 
     assert context["quick_web_share_enabled"] is True
     assert "/links/s/" in context["share_short_url"]
-    assert context["share_short_url_qr"].startswith("data:image/png;base64,")
+    assert context["share_short_url_qr"].endswith("/qr.png")
     assert ShortURL.objects.count() == 1
 
 def test_share_preview_public_middleware_requires_quick_web_share_feature(
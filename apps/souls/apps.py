@@ -6,3 +6,6 @@ class SoulsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.souls"
     verbose_name = _("Souls")
+
+    def ready(self) -> None:
+        from . import signals  # noqa: F401
@@ -0,0 +1,178 @@
+"""Benchmark indexed skill search against the full-scan scorer."""
+
+from __future__ import annotations
+
+import json
+import random
+import time
+from dataclasses import dataclass
+
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.benchmarks import BenchmarkScenario
+from apps.skills.models import Skill, SkillFile
+from apps.souls.services import rebuild_skill_index, scan_skills, search_skills
+
+DEFAULT_SKILL_COUNTS = (100, 1000, 10000)
+DEFAULT_QUERIES = (
+    "rfid reader problem",
+    "charger firmware upgrade",
+    "email inbox sync",
+    "nginx certificate renewal",
+)
+VOCABULARY = (
+    "audit backup cable camera card certificate charger connector console "
+    "diagnose email energy evidence firmware gateway inbox invoice ledger "
+    "meter network nginx node ocpp operator packet power problem reader "
+    "release renewal rfid router scanner schedule sensor service session "
+    "station status sync tariff temperature upgrade usb wallet websocket"
+).split()
+
+
+class _Rollback(Exception):
+    pass
+
+
+@dataclass
+class BenchmarkRun:
+    skill_count: int
+    implementation: str
+    query_count: int
+    duration_seconds: float
+    sql_queries: int
+
+    @property
+    def per_query_ms(self) -> float:
+        if self.query_count <= 0:
+            return 0.0
+        return self.duration_seconds * 1000.0 / self.query_count
+
+    def to_dict(self) -> dict:
+        return {
+            "skill_count": self.skill_count,
+            "implementation": self.implementation,
+            "query_count": self.query_count,
+            "duration_seconds": self.duration_seconds,
+            "per_query_ms": self.per_query_ms,
+            "sql_queries": self.sql_queries,
+        }
+
+
+class SkillSearchBenchmark(BenchmarkScenario):
+    help = "Benchmark indexed skill search against the full-scan scorer on synthetic skills."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--skills",
+            nargs="+",
+            type=int,
+            default=list(DEFAULT_SKILL_COUNTS),
+            help="Synthetic skill counts to benchmark (default: 100 1000 10000).",
+        )
+        parser.add_argument(
+            "--skip-scan",
+            action="store_true",
+            help="Skip the full-scan baseline, which is slow for large skill counts.",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for synthetic skills.")
+        parser.add_argument("--json", action="store_true", help="Emit JSON summary output.")
+
+    def handle(self, **options):
+        skill_counts = sorted(set(options["skills"]))
+        if any(value <= 0 for value in skill_counts):
+            raise CommandError("--skills values must be greater than zero.")
+
+        results: list[BenchmarkRun] = []
+        for skill_count in skill_counts:
+            results.extend(
+                self._run_size(
+                    skill_count,
+                    seed=options["seed"],
+                    include_scan=not options["skip_scan"],
+                )
+            )
+
+        payload = {"queries": list(DEFAULT_QUERIES), "runs": [run.to_dict() for run in results]}
+        if options["json"]:
+            self.stdout.write(json.dumps(payload, indent=2))
+            return
+
+        self.stdout.write("Skill search benchmark summary:")
+        for run in results:
+            if not run.query_count:
+                self.stdout.write(
+                    f"  {run.skill_count} skills {run.implementation}: {run.duration_seconds:.2f}s"
+                )
+                continue
+            self.stdout.write(
+                f"  {run.skill_count} skills {run.implementation}: "
+                f"{run.per_query_ms:.2f} ms/query, {run.sql_queries} SQL queries"
+            )
+
+    def _run_size(self, skill_count: int, *, seed: int, include_scan: bool) -> list[BenchmarkRun]:
+        results: list[BenchmarkRun] = []
+        try:
+            with transaction.atomic():
+                self._create_skills(skill_count, rng=random.Random(seed))
+                start = time.perf_counter()
+                rebuild_skill_index()
+                results.append(
+                    BenchmarkRun(
+                        skill_count=skill_count,
+                        implementation="index-build",
+                        query_count=0,
+                        duration_seconds=time.perf_counter() - start,
+                        sql_queries=0,
+                    )
+                )
+                results.append(self._time_queries(skill_count, "indexed", search_skills))
+                if include_scan:
+                    results.append(self._time_queries(skill_count, "scan", scan_skills))
+                raise _Rollback
+        except _Rollback:
+            pass
+        return results
+
+    def _create_skills(self, skill_count: int, *, rng: random.Random) -> None:
+        prefix = f"bench-{rng.randrange(1 << 30):x}"
+        skills = Skill.objects.bulk_create(
+            [
+                Skill(
+                    slug=f"{prefix}-{index}",
+                    title=" ".join(rng.sample(VOCABULARY, 3)).title(),
+                    description=" ".join(rng.choices(VOCABULARY, k=12)),
+                    markdown=" ".join(rng.choices(VOCABULARY, k=120)),
+                )
+                for index in range(skill_count)
+            ],
+            batch_size=500,
+        )
+        SkillFile.objects.bulk_create(
+            [
+                SkillFile(
+                    skill=skill,
+                    relative_path=f"references/{file_index}.md",
+                    content=" ".join(rng.choices(VOCABULARY, k=400)),
+                    included_by_default=True,
+                )
+                for skill in skills
+                for file_index in range(2)
+            ],
+            batch_size=500,
+        )
+
+    def _time_queries(self, skill_count: int, implementation: str, search) -> BenchmarkRun:
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            for query in DEFAULT_QUERIES:
+                search(query, limit=10)
+            duration = time.perf_counter() - start
+        return BenchmarkRun(
+            skill_count=skill_count,
+            implementation=implementation,
+            query_count=len(DEFAULT_QUERIES),
+            duration_seconds=duration,
+            sql_queries=len(captured.captured_queries),
+        )
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from apps.souls.models import SkillSearchDocument, SkillSearchPosting
+from apps.souls.services import ensure_skill_index, rebuild_skill_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild or top up the posting-list index used by Soul Seed skill search."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Only index skills without a search document instead of rebuilding everything.",
+        )
+        parser.add_argument("--json", action="store_true", help="Emit the index summary as JSON.")
+
+    def handle(self, *args, **options):
+        if options["missing_only"]:
+            indexed = ensure_skill_index()
+        else:
+            indexed = rebuild_skill_index()
+        summary = {
+            "indexed": indexed,
+            "documents": SkillSearchDocument.objects.count(),
+            "postings": SkillSearchPosting.objects.count(),
+        }
+        if options["json"]:
+            self.stdout.write(json.dumps(summary, indent=2))
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {summary['indexed']} skill(s); index holds "
+                f"{summary['documents']} document(s) and {summary['postings']} posting(s)."
+            )
+        )
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.12 on 2026-10-18 21:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0004_operator_framework_models'),
+        ('souls', '0003_cardsession_souls_one_active_session'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillSearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.CharField(max_length=100)),
+                ('title', models.CharField(max_length=150)),
+                ('search_text', models.TextField(blank=True, default='')),
+                ('length', models.PositiveIntegerField(default=0)),
+                ('indexed_at', models.DateTimeField(auto_now=True)),
+                ('skill', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='search_document', to='skills.skill')),
+            ],
+            options={
+                'verbose_name': 'Skill Search Document',
+                'verbose_name_plural': 'Skill Search Documents',
+                'ordering': ('slug',),
+            },
+        ),
+        migrations.CreateModel(
+            name='SkillSearchPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=100)),
+                ('frequency', models.PositiveIntegerField(default=1)),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='postings', to='souls.skillsearchdocument')),
+            ],
+            options={
+                'verbose_name': 'Skill Search Posting',
+                'verbose_name_plural': 'Skill Search Postings',
+                'ordering': ('term', 'document'),
+                'constraints': [models.UniqueConstraint(fields=('term', 'document'), name='souls_skill_search_posting_term_document')],
+            },
+        ),
+    ]
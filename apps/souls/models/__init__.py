@@ -5,6 +5,7 @@ from .seed import (
     SoulIntent,
     SoulSeedCard,
 )
+from .search import SkillSearchDocument, SkillSearchPosting
 from .soul import ShopOrderSoulAttachment, Soul, SoulRegistrationSession
 
 __all__ = [
@@ -12,6 +13,8 @@ __all__ = [
     "CardSession",
     "ShopOrderSoulAttachment",
     "SkillBundle",
+    "SkillSearchDocument",
+    "SkillSearchPosting",
     "Soul",
     "SoulIntent",
     "SoulRegistrationSession",
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class SkillSearchDocument(models.Model):
+    """Indexed search text and term statistics for one registered skill."""
+
+    skill = models.OneToOneField(
+        "skills.Skill",
+        on_delete=models.CASCADE,
+        related_name="search_document",
+    )
+    slug = models.CharField(max_length=100)
+    title = models.CharField(max_length=150)
+    search_text = models.TextField(blank=True, default="")
+    length = models.PositiveIntegerField(default=0)
+    indexed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ("slug",)
+        verbose_name = _("Skill Search Document")
+        verbose_name_plural = _("Skill Search Documents")
+
+    def __str__(self) -> str:
+        return self.slug
+
+
+class SkillSearchPosting(models.Model):
+    """Posting-list entry recording how often a term occurs in one document."""
+
+    term = models.CharField(max_length=100)
+    document = models.ForeignKey(
+        SkillSearchDocument,
+        on_delete=models.CASCADE,
+        related_name="postings",
+    )
+    frequency = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        ordering = ("term", "document")
+        verbose_name = _("Skill Search Posting")
+        verbose_name_plural = _("Skill Search Postings")
+        constraints = [
+            models.UniqueConstraint(
+                fields=("term", "document"),
+                name="souls_skill_search_posting_term_document",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.term}:{self.document_id}"
@@ -7,7 +7,8 @@ from .card_sessions import (
 )
 from .checkout import attach_soul_to_order_items
 from .package import build_soul_package
-from .skill_matching import compose_skill_bundle, search_skills
+from .skill_index import ensure_skill_index, rebuild_skill_index
+from .skill_matching import compose_skill_bundle, scan_skills, search_skills
 from .survey import digest_normalized_answers, normalize_survey_response
 
 __all__ = [
@@ -17,10 +18,13 @@ __all__ = [
     "close_card_session",
     "compose_skill_bundle",
     "digest_normalized_answers",
+    "ensure_skill_index",
     "evict_card_session",
     "evict_stale_card_sessions",
     "normalize_survey_response",
     "plan_soul_seed_card",
     "provision_soul_seed_card",
+    "rebuild_skill_index",
+    "scan_skills",
     "search_skills",
 ]
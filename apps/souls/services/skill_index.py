@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import partial
+
+from django.db import IntegrityError, transaction
+from django.db.models import Avg, BooleanField, Count, ExpressionWrapper, Q, Value
+
+from apps.skills.models import Skill
+from apps.souls.models import SkillSearchDocument, SkillSearchPosting
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9_-]{1,}", re.IGNORECASE)
+MAX_TERM_LENGTH = 100
+BM25_K1 = 1.2
+BM25_B = 0.75
+INDEX_BATCH_SIZE = 500
+
+
+@dataclass(frozen=True)
+class SkillIndexHit:
+    """Candidate skill returned by the index with the features used for scoring."""
+
+    skill_id: int
+    slug: str
+    title: str
+    phrase_match: bool
+    matched_terms: int
+    bm25: float
+
+
+def skill_search_text(skill: Skill) -> str:
+    parts = [skill.slug, skill.title, skill.description, skill.markdown]
+    package_files = skill.package_files.all()
+    for package_file in package_files:
+        if package_file.included_by_default:
+            parts.append(package_file.relative_path)
+            parts.append(package_file.content)
+    return "\n".join(parts)
+
+
+def _term_counts(search_text: str) -> Counter[str]:
+    return Counter(
+        term
+        for term in (match.group(0) for match in TOKEN_RE.finditer(search_text))
+        if len(term) <= MAX_TERM_LENGTH
+    )
+
+
+def _build_document(skill: Skill) -> tuple[SkillSearchDocument, Counter[str]]:
+    search_text = skill_search_text(skill).lower()
+    counts = _term_counts(search_text)
+    document = SkillSearchDocument(
+        skill=skill,
+        slug=skill.slug,
+        title=skill.title,
+        search_text=search_text,
+        length=sum(counts.values()),
+    )
+    return document, counts
+
+
+def _write_documents(skills: Iterable[Skill]) -> int:
+    built = [_build_document(skill) for skill in skills]
+    if not built:
+        return 0
+    documents = SkillSearchDocument.objects.bulk_create(
+        [document for document, _counts in built]
+    )
+    SkillSearchPosting.objects.bulk_create(
+        [
+            SkillSearchPosting(term=term, document=document, frequency=frequency)
+            for document, (_document, counts) in zip(documents, built)
+            for term, frequency in counts.items()
+        ],
+        batch_size=INDEX_BATCH_SIZE,
+    )
+    return len(documents)
+
+
+def index_skills(skills: Iterable[Skill]) -> int:
+    """Replace the index entries for ``skills`` and return how many were written."""
+
+    skills = list(skills)
+    if not skills:
+        return 0
+    try:
+        with transaction.atomic():
+            SkillSearchDocument.objects.filter(
+                skill_id__in=[skill.pk for skill in skills]
+            ).delete()
+            return _write_documents(skills)
+    except IntegrityError:
+        # A concurrent reindex wrote the same skills first; its entries win.
+        return 0
+
+
+def reindex_skill(skill_id: int | None) -> int:
+    """Rebuild the document for ``skill_id``, or drop it if the skill is gone.
+
+    Soft-deleted skills are not visible through ``Skill.objects``, so their
+    documents are dropped too.
+    """
+
+    if skill_id is None:
+        return 0
+    skill = Skill.objects.filter(pk=skill_id).prefetch_related("package_files").first()
+    if skill is None:
+        SkillSearchDocument.objects.filter(skill_id=skill_id).delete()
+        return 0
+    return index_skills([skill])
+
+
+def schedule_skill_reindex(skill_id: int | None) -> None:
+    """Re-index ``skill_id`` once the current transaction commits.
+
+    Package imports save the skill and then bulk-sync its files in one
+    transaction, so indexing waits until both are visible.
+    """
+
+    if skill_id is None:
+        return
+    transaction.on_commit(partial(reindex_skill, skill_id))
+
+
+def ensure_skill_index() -> int:
+    """Index skills that have no search document yet.
+
+    ``Skill.objects`` hides soft-deleted skills, so only active skills are
+    indexed. Search never calls this; it backs the ``skill_search_index``
+    command for catching up after writes that bypassed the model signals.
+    """
+
+    missing = Skill.objects.filter(search_document__isnull=True).prefetch_related(
+        "package_files"
+    )
+    indexed = 0
+    batch: list[Skill] = []
+    for skill in missing.iterator(chunk_size=INDEX_BATCH_SIZE):
+        batch.append(skill)
+        if len(batch) >= INDEX_BATCH_SIZE:
+            indexed += index_skills(batch)
+            batch = []
+    indexed += index_skills(batch)
+    return indexed
+
+
+def rebuild_skill_index() -> int:
+    """Drop every index entry and re-index all active skills."""
+
+    with transaction.atomic():
+        SkillSearchPosting.objects.all().delete()
+        SkillSearchDocument.objects.all().delete()
+        return ensure_skill_index()
+
+
+def _bm25(
+    frequencies: dict[str, int],
+    *,
+    length: int,
+    document_frequencies: dict[str, int],
+    document_count: int,
+    average_length: float,
+) -> float:
+    score = 0.0
+    length_ratio = length / average_length if average_length else 0.0
+    for term, frequency in frequencies.items():
+        document_frequency = document_frequencies[term]
+        idf = math.log(
+            1.0 + (document_count - document_frequency + 0.5) / (document_frequency + 0.5)
+        )
+        score += idf * (
+            frequency
+            * (BM25_K1 + 1.0)
+            / (frequency + BM25_K1 * (1.0 - BM25_B + BM25_B * length_ratio))
+        )
+    return score
+
+
+def query_skill_index(prompt: str, prompt_tokens: set[str]) -> list[SkillIndexHit]:
+    """Return index candidates sharing a term with, naming, or containing the prompt.
+
+    Candidates are read from the posting lists and document rows only, so the
+    cost depends on the matching postings rather than on total package size.
+    Documents whose text merely contains the prompt, such as a partial word,
+    are kept so they still earn the full scan's content-phrase score.
+    """
+
+    terms = sorted(term for term in prompt_tokens if len(term) <= MAX_TERM_LENGTH)
+    candidate_filter = Q()
+    if terms:
+        candidate_filter |= Q(
+            pk__in=SkillSearchPosting.objects.filter(term__in=terms).values("document_id")
+        )
+    if prompt:
+        candidate_filter |= (
+            Q(slug__icontains=prompt)
+            | Q(title__icontains=prompt)
+            | Q(search_text__contains=prompt)
+        )
+    if not candidate_filter:
+        return []
+
+    documents = SkillSearchDocument.objects.filter(skill__is_deleted=False).filter(
+        candidate_filter
+    )
+    phrase_match = (
+        ExpressionWrapper(Q(search_text__contains=prompt), output_field=BooleanField())
+        if prompt
+        else Value(False, output_field=BooleanField())
+    )
+    rows = list(
+        documents.annotate(phrase_match=phrase_match).values_list(
+            "pk", "skill_id", "slug", "title", "length", "phrase_match"
+        )
+    )
+    if not rows:
+        return []
+
+    frequencies_by_document: dict[int, dict[str, int]] = {}
+    document_frequencies: Counter[str] = Counter()
+    if terms:
+        for document_id, term, frequency in SkillSearchPosting.objects.filter(
+            term__in=terms
+        ).values_list("document_id", "term", "frequency"):
+            frequencies_by_document.setdefault(document_id, {})[term] = frequency
+            document_frequencies[term] += 1
+
+    statistics = SkillSearchDocument.objects.aggregate(
+        document_count=Count("pk"), average_length=Avg("length")
+    )
+    document_count = int(statistics["document_count"] or 0)
+    average_length = float(statistics["average_length"] or 0.0)
+
+    hits = []
+    for document_id, skill_id, slug, title, length, phrase_match in rows:
+        frequencies = frequencies_by_document.get(document_id, {})
+        hits.append(
+            SkillIndexHit(
+                skill_id=skill_id,
+                slug=slug,
+                title=title,
+                phrase_match=bool(phrase_match),
+                matched_terms=len(frequencies),
+                bm25=_bm25(
+                    frequencies,
+                    length=length,
+                    document_frequencies=document_frequencies,
+                    document_count=document_count,
+                    average_length=average_length,
+                ),
+            )
+        )
+    return hits
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-import re
+import heapq
 from dataclasses import asdict, dataclass
+from operator import itemgetter
 
 from django.contrib.auth import get_user_model
 from django.db import transaction
@@ -10,8 +11,12 @@ from django.utils.translation import gettext as _
 
 from apps.skills.models import Skill
 from apps.souls.models import AgentInterfaceSpec, SkillBundle, SoulIntent
+from apps.souls.services.skill_index import (
+    TOKEN_RE,
+    query_skill_index,
+    skill_search_text,
+)
 
-TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9_-]{1,}", re.IGNORECASE)
 EXACT_MATCH_THRESHOLD = 0.92
 
 
@@ -35,50 +40,59 @@ def _tokens(value: str) -> set[str]:
     return {match.group(0).lower() for match in TOKEN_RE.finditer(value or "")}
 
 
-def _skill_search_text(skill: Skill) -> str:
-    parts = [skill.slug, skill.title, skill.description, skill.markdown]
-    package_files = skill.package_files.all()
-    for package_file in package_files:
-        if package_file.included_by_default:
-            parts.append(package_file.relative_path)
-            parts.append(package_file.content)
-    return "\n".join(parts)
-
-
-def _score_skill(
-    skill: Skill, prompt: str, prompt_tokens: set[str]
+def _score_candidate(
+    *,
+    skill_id: int,
+    slug: str,
+    title: str,
+    prompt: str,
+    prompt_tokens: set[str],
+    phrase_match: bool,
+    matched_terms: int,
 ) -> SkillMatchCandidate:
-    search_text = _skill_search_text(skill).lower()
-    slug = skill.slug.lower()
-    title = skill.title.lower()
+    lowered_slug = slug.lower()
+    lowered_title = title.lower()
     reasons: list[str] = []
     score = 0.0
 
-    if prompt == slug or prompt == title:
+    if prompt == lowered_slug or prompt == lowered_title:
         score += 1.0
         reasons.append("exact slug/title")
-    elif prompt and (prompt in slug or prompt in title):
+    elif prompt and (prompt in lowered_slug or prompt in lowered_title):
         score += 0.72
         reasons.append("slug/title contains prompt")
 
-    if prompt and prompt in search_text:
+    if prompt and phrase_match:
         score += 0.35
         reasons.append("content phrase")
 
-    skill_tokens = _tokens(search_text)
     if prompt_tokens:
-        overlap = prompt_tokens & skill_tokens
-        coverage = len(overlap) / len(prompt_tokens)
+        coverage = matched_terms / len(prompt_tokens)
         if coverage:
             score += min(0.8, coverage)
-            reasons.append(f"token overlap {len(overlap)}/{len(prompt_tokens)}")
+            reasons.append(f"token overlap {matched_terms}/{len(prompt_tokens)}")
 
     return SkillMatchCandidate(
+        skill_id=skill_id,
+        slug=slug,
+        title=title,
+        score=round(min(score, 1.0), 4),
+        reasons=reasons,
+    )
+
+
+def _score_skill(
+    skill: Skill, prompt: str, prompt_tokens: set[str]
+) -> SkillMatchCandidate:
+    search_text = skill_search_text(skill).lower()
+    return _score_candidate(
         skill_id=skill.pk,
         slug=skill.slug,
         title=skill.title,
-        score=round(min(score, 1.0), 4),
-        reasons=reasons,
+        prompt=prompt,
+        prompt_tokens=prompt_tokens,
+        phrase_match=bool(prompt) and prompt in search_text,
+        matched_terms=len(prompt_tokens & _tokens(search_text)),
     )
 
 
@@ -92,7 +106,13 @@ def _validate_limit(limit: int) -> int:
     return normalized_limit
 
 
-def search_skills(prompt: str, *, limit: int = 10) -> list[SkillMatchCandidate]:
+def scan_skills(prompt: str, *, limit: int = 10) -> list[SkillMatchCandidate]:
+    """Score every registered skill directly, bypassing the search index.
+
+    This is the reference scorer the index is measured against; it rebuilds
+    each skill's text from its package files on every call.
+    """
+
     limit = _validate_limit(limit)
     normalized = normalize_intent_prompt(prompt)
     prompt_tokens = _tokens(normalized)
@@ -105,6 +125,35 @@ def search_skills(prompt: str, *, limit: int = 10) -> list[SkillMatchCandidate]:
     return matches[:limit]
 
 
+def search_skills(prompt: str, *, limit: int = 10) -> list[SkillMatchCandidate]:
+    """Return the top ``limit`` skills for ``prompt`` from the skill search index.
+
+    Scores use the same features as :func:`scan_skills`; ties are ordered by
+    BM25 relevance over the indexed terms, then by slug. Search only reads
+    the index, which skill and package file signals keep current.
+    """
+
+    limit = _validate_limit(limit)
+    if not limit:
+        return []
+    normalized = normalize_intent_prompt(prompt)
+    prompt_tokens = _tokens(normalized)
+    ranked = []
+    for hit in query_skill_index(normalized, prompt_tokens):
+        match = _score_candidate(
+            skill_id=hit.skill_id,
+            slug=hit.slug,
+            title=hit.title,
+            prompt=normalized,
+            prompt_tokens=prompt_tokens,
+            phrase_match=hit.phrase_match,
+            matched_terms=hit.matched_terms,
+        )
+        if match.score > 0:
+            ranked.append(((-match.score, -hit.bm25, match.slug), match))
+    return [match for _key, match in heapq.nsmallest(limit, ranked, key=itemgetter(0))]
+
+
 def _default_interface_schema(prompt: str, matches: list[SkillMatchCandidate]) -> dict:
     return {
         "schema_version": "soul_seed.interface.v1",
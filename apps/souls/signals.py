@@ -0,0 +1,23 @@
+"""Signals keeping the skill search index in step with skill packages."""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.skills.models import Skill, SkillFile
+
+from .services.skill_index import schedule_skill_reindex
+
+
+@receiver(post_save, sender=Skill, dispatch_uid="souls_skill_saved_reindex")
+def reindex_skill_on_save(sender, instance: Skill, **kwargs):
+    """Re-index the skill after the transaction that saved it commits."""
+
+    schedule_skill_reindex(instance.pk)
+
+
+@receiver(post_save, sender=SkillFile, dispatch_uid="souls_skill_file_saved_reindex")
+@receiver(post_delete, sender=SkillFile, dispatch_uid="souls_skill_file_deleted_reindex")
+def reindex_skill_on_file_change(sender, instance: SkillFile, **kwargs):
+    """Re-index the owning skill when one of its package files changes."""
+
+    schedule_skill_reindex(instance.skill_id)
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.skills.models import Skill, SkillFile
+from apps.skills.package_services import scan_codex_skill_directory
+from apps.souls.models import SkillSearchDocument, SkillSearchPosting
+from apps.souls.services import (
+    ensure_skill_index,
+    rebuild_skill_index,
+    scan_skills,
+    search_skills,
+)
+
+CORPUS = {
+    "rfid-triage": (
+        "RFID Triage",
+        "Diagnose RFID reader problems, scanner service health, and card events.",
+        {"references/rfid.md": "Use scan attempts, reader trust, and card UID evidence."},
+    ),
+    "charger-firmware": (
+        "Charger Firmware",
+        "Upgrade charge point firmware over OCPP and confirm the charger reboots.",
+        {"references/firmware.md": "Firmware upgrade windows, charger status, retries."},
+    ),
+    "mailbox-sync": (
+        "Mailbox Sync",
+        "Keep operator email inbox collectors synchronized.",
+        {"references/imap.md": "IMAP inbox polling, email collectors, and reader rules."},
+    ),
+    "nginx-certs": (
+        "Nginx Certs",
+        "Renew nginx certificates and reload the proxy.",
+        {"scripts/renew.sh": "certbot renew --nginx"},
+    ),
+    "reader-calibration": (
+        "Reader Calibration",
+        "Calibrate an RFID reader antenna for reliable card scans.",
+        {},
+    ),
+}
+QUERIES = (
+    "rfid reader problem",
+    "rfid-triage",
+    "charger firmware",
+    "firmware upgrade",
+    "email inbox",
+    "reader",
+    "nginx certificates",
+    "card scans",
+    "certificate",
+    "calibrat",
+    "unrelated banana",
+)
+
+
+@pytest.fixture
+def corpus(db, django_capture_on_commit_callbacks):
+    skills = {}
+    with django_capture_on_commit_callbacks(execute=True):
+        for slug, (title, markdown, files) in CORPUS.items():
+            skill = Skill.objects.create(slug=slug, title=title, markdown=markdown)
+            for relative_path, content in files.items():
+                SkillFile.objects.create(
+                    skill=skill,
+                    relative_path=relative_path,
+                    content=content,
+                    included_by_default=True,
+                )
+            skills[slug] = skill
+    return skills
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query", QUERIES)
+def test_indexed_search_preserves_full_scan_relevance(corpus, query):
+    indexed = search_skills(query, limit=50)
+    scanned = scan_skills(query, limit=50)
+
+    assert {match.slug: (match.score, match.reasons) for match in indexed} == {
+        match.slug: (match.score, match.reasons) for match in scanned
+    }
+    scores = [match.score for match in indexed]
+    assert scores == sorted(scores, reverse=True)
+
+
+@pytest.mark.django_db
+def test_indexed_search_breaks_score_ties_by_bm25(corpus):
+    matches = search_skills("reader", limit=3)
+
+    assert matches[0].slug == "reader-calibration"
+
+
+@pytest.mark.django_db
+def test_search_index_follows_package_file_changes(
+    corpus, django_capture_on_commit_callbacks
+):
+    assert not search_skills("thermistor")
+
+    package_file = corpus["nginx-certs"].package_files.get()
+    package_file.content = "Thermistor readings feed the proxy health check."
+    with django_capture_on_commit_callbacks(execute=True):
+        package_file.save()
+
+    assert [match.slug for match in search_skills("thermistor")] == ["nginx-certs"]
+
+    skill_id = corpus["nginx-certs"].pk
+    with django_capture_on_commit_callbacks(execute=True):
+        corpus["nginx-certs"].delete()
+
+    assert not search_skills("thermistor")
+    assert not SkillSearchDocument.objects.filter(skill_id=skill_id).exists()
+
+
+@pytest.mark.django_db
+def test_package_import_indexes_bulk_synced_files(tmp_path, django_capture_on_commit_callbacks):
+    skill_dir = tmp_path / "meter-audit"
+    (skill_dir / "references").mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text("Audit meter exports.", encoding="utf-8")
+    (skill_dir / "references" / "notes.md").write_text(
+        "Thermistor drift shows up in meter exports.", encoding="utf-8"
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        scan_codex_skill_directory(skill_dir, dry_run=False)
+
+    assert [match.slug for match in search_skills("thermistor")] == ["meter-audit"]
+
+
+@pytest.mark.django_db
+def test_search_does_not_write_the_index(corpus):
+    SkillSearchDocument.objects.filter(skill=corpus["rfid-triage"]).delete()
+
+    with CaptureQueriesContext(connection) as queries:
+        matches = search_skills("rfid reader problem")
+
+    assert "rfid-triage" not in [match.slug for match in matches]
+    assert all(query["sql"].lstrip().upper().startswith("SELECT") for query in queries)
+    assert not SkillSearchDocument.objects.filter(skill=corpus["rfid-triage"]).exists()
+
+
+@pytest.mark.django_db
+def test_indexed_search_query_count_does_not_grow_with_skills(corpus):
+    ensure_skill_index()
+    with CaptureQueriesContext(connection) as small:
+        search_skills("rfid reader problem")
+
+    for index in range(20):
+        Skill.objects.create(
+            slug=f"rfid-extra-{index}",
+            title=f"RFID Extra {index}",
+            markdown="Extra RFID reader notes.",
+        )
+    ensure_skill_index()
+    with CaptureQueriesContext(connection) as large:
+        search_skills("rfid reader problem")
+
+    assert len(large.captured_queries) == len(small.captured_queries)
+    assert not any('"skills_skillfile"' in query["sql"] for query in large.captured_queries)
+
+
+@pytest.mark.django_db
+def test_rebuild_skill_index_command_outputs_summary(corpus):
+    stdout = StringIO()
+    call_command("skill_search_index", "--json", stdout=stdout)
+
+    summary = json.loads(stdout.getvalue())
+    assert summary["indexed"] == len(CORPUS)
+    assert summary["documents"] == SkillSearchDocument.objects.count() == len(CORPUS)
+    assert summary["postings"] == SkillSearchPosting.objects.count()
+    assert rebuild_skill_index() == len(CORPUS)
+
+
+@pytest.mark.django_db
+def test_benchmark_skill_search_command_rolls_back_synthetic_skills():
+    stdout = StringIO()
+    call_command("benchmark", "skill-search", "--skills", "5", "--json", stdout=stdout)
+
+    payload = json.loads(stdout.getvalue())
+    assert [run["implementation"] for run in payload["runs"]] == [
+        "index-build",
+        "indexed",
+        "scan",
+    ]
+    assert not Skill.objects.filter(slug__startswith="bench-").exists()
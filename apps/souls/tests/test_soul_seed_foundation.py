@@ -53,19 +53,20 @@ def _valid_agent_card_records() -> list[str]:
 
 
 @pytest.fixture
-def skill(db):
-    skill = Skill.objects.create(
-        slug="rfid-triage",
-        title="RFID Triage",
-        markdown="Diagnose RFID reader problems, scanner service health, and card events.",
-    )
-    SkillFile.objects.create(
-        skill=skill,
-        relative_path="references/rfid.md",
-        content="Use scan attempts, reader trust, and card UID evidence.",
-        content_sha256="a" * 64,
-        included_by_default=True,
-    )
+def skill(db, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        skill = Skill.objects.create(
+            slug="rfid-triage",
+            title="RFID Triage",
+            markdown="Diagnose RFID reader problems, scanner service health, and card events.",
+        )
+        SkillFile.objects.create(
+            skill=skill,
+            relative_path="references/rfid.md",
+            content="Use scan attempts, reader trust, and card UID evidence.",
+            content_sha256="a" * 64,
+            included_by_default=True,
+        )
     return skill
 
 
@@ -392,12 +393,15 @@ def test_provision_soul_seed_card_revokes_stale_duplicate_active_cards(skill):
 
 
 @pytest.mark.django_db
-def test_provision_soul_seed_card_records_oversized_skill_note():
-    long_skill = Skill.objects.create(
-        slug="skill-" + "x" * 80,
-        title="Oversized Skill",
-        markdown="oversized card payload test",
-    )
+def test_provision_soul_seed_card_records_oversized_skill_note(
+    django_capture_on_commit_callbacks,
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        long_skill = Skill.objects.create(
+            slug="skill-" + "x" * 80,
+            title="Oversized Skill",
+            markdown="oversized card payload test",
+        )
 
     summary = provision_soul_seed_card(long_skill.slug, card_uid="AABBCCDD", dry_run=False)
     bundle = SkillBundle.objects.get(pk=summary["bundle"]["id"])
@@ -7,11 +7,30 @@ class UsersConfig(AppConfig):
     verbose_name = "Users"
 
     def ready(self):
+        from django.contrib.auth import get_user_model
         from django.core.signals import got_request_exception
+        from django.db.models.signals import m2m_changed, post_delete, post_save
 
+        from apps.cards.models import RFID
+        from apps.energy.models import CustomerAccount
+
+        from . import rfid_auth
         from .diagnostics import attach_exception_signal
 
         got_request_exception.connect(
             attach_exception_signal,
             dispatch_uid="users.diagnostics.request_exception",
         )
+
+        for model in (RFID, get_user_model(), CustomerAccount):
+            for event, signal in (("saved", post_save), ("deleted", post_delete)):
+                signal.connect(
+                    rfid_auth.invalidate_rfid_resolutions,
+                    sender=model,
+                    dispatch_uid=f"users.rfid_auth.{model._meta.label_lower}.{event}",
+                )
+        m2m_changed.connect(
+            rfid_auth.invalidate_rfid_resolutions,
+            sender=CustomerAccount.rfids.through,
+            dispatch_uid="users.rfid_auth.account_rfids",
+        )
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import contextlib
+import functools
 import ipaddress
 import logging
 import os
@@ -20,20 +21,18 @@ from apps.cards.actions import dispatch_rfid_action
 from apps.cards.models import RFID
 from apps.cards.models import RFIDAttempt
 from apps.cards.reader import read_rfid_cell_value
-from apps.energy.models import CustomerAccount
-from apps.features.utils import is_suite_feature_enabled
 from apps.totp.services import verify_any_totp
-from . import temp_passwords
+from . import rfid_auth, temp_passwords
+from .rfid_auth import RFID_AUTH_AUDIT_FEATURE_SLUG
 from .system import ensure_system_user
 
 logger = logging.getLogger(__name__)
-RFID_AUTH_AUDIT_FEATURE_SLUG = "rfid-auth-audit"
 
 
 class PasswordOrOTPBackend(ModelBackend):
     """Authenticate using a password or a registered TOTP code."""
 
-    def authenticate(self, request, username=None, password=None, **kwargs):
+    def authenticate(self, request, username=None, password=None):
         if username is None or password is None:
             return None
 
@@ -64,13 +63,12 @@ class PasswordOrOTPBackend(ModelBackend):
 
 
 class RFIDBackend:
-    """Authenticate using a user's RFID."""
+    """Authenticate using a user's RFID.
 
-    @staticmethod
-    def _audit_enabled() -> bool:
-        """Return whether RFID auth audit recording is currently enabled."""
-
-        return is_suite_feature_enabled(RFID_AUTH_AUDIT_FEATURE_SLUG, default=True)
+    ``authenticate`` accepts only the ``rfid`` credential, so Django skips this
+    backend for username/password logins and skips the password backends for
+    RFID scans.
+    """
 
     @classmethod
     def _record_auth_attempt(
@@ -80,13 +78,13 @@ class RFIDBackend:
         status: str,
         reason_code: str | None = None,
         tag: RFID | None = None,
-        account: CustomerAccount | None = None,
+        account_id: int | None = None,
         metadata: dict[str, str | int | bool | None] | None = None,
     ) -> None:
-        """Persist RFID login attempt metadata when auth auditing is enabled."""
+        """Queue RFID login attempt metadata for the deferred audit writer.
 
-        if not cls._audit_enabled():
-            return
+        The audit feature is checked when the queue is flushed, once per batch.
+        """
 
         normalized_rfid = (rfid or "").strip().upper()
         if not normalized_rfid:
@@ -104,16 +102,15 @@ class RFIDBackend:
         if metadata:
             payload.update(metadata)
 
-        try:
-            RFIDAttempt.record_attempt(
-                payload,
-                source=RFIDAttempt.Source.AUTH,
-                status=status,
-                authenticated=status == RFIDAttempt.Status.ACCEPTED,
-                account_id=account.pk if account else None,
-            )
-        except DatabaseError:
-            logger.warning("Unable to record RFID auth attempt", exc_info=True)
+        attempt = RFIDAttempt.build_attempt(
+            payload,
+            source=RFIDAttempt.Source.AUTH,
+            status=status,
+            authenticated=status == RFIDAttempt.Status.ACCEPTED,
+            account_id=account_id,
+        )
+        if attempt is not None:
+            rfid_auth.queue_auth_attempt(attempt)
 
     @classmethod
     def _reject(
@@ -122,7 +119,7 @@ class RFIDBackend:
         rfid: str,
         reason_code: str,
         tag: RFID | None = None,
-        account: CustomerAccount | None = None,
+        account_id: int | None = None,
         metadata: dict[str, str | int | bool | None] | None = None,
     ):
         """Record a rejected RFID auth attempt and return ``None``."""
@@ -132,7 +129,7 @@ class RFIDBackend:
             status=RFIDAttempt.Status.REJECTED,
             reason_code=reason_code,
             tag=tag,
-            account=account,
+            account_id=account_id,
             metadata=metadata,
         )
         return None
@@ -144,7 +141,7 @@ class RFIDBackend:
         user,
         rfid: str,
         tag: RFID,
-        account: CustomerAccount | None = None,
+        account_id: int | None = None,
         metadata: dict[str, str | int | bool | None] | None = None,
     ):
         """Record an accepted RFID auth attempt and return the resolved user."""
@@ -153,41 +150,41 @@ class RFIDBackend:
             rfid=rfid,
             status=RFIDAttempt.Status.ACCEPTED,
             tag=tag,
-            account=account,
+            account_id=account_id,
             metadata=metadata,
         )
         return user
 
-    def authenticate(self, request, rfid=None, **kwargs):
+    def authenticate(self, request, rfid=None):
         if not rfid:
             return None
         rfid_value = str(rfid).strip().upper()
         if not rfid_value:
             return None
 
-        matching_tags = RFID.matching_queryset(rfid_value)
-        tag = matching_tags.filter(allowed=True).first()
-        if not tag:
-            blocked_tag = matching_tags.first()
+        resolution = rfid_auth.resolve_rfid(rfid_value)
+        tag = resolution.tag
+        if not resolution.allowed:
             reason = (
                 RFIDAttempt.Reason.TAG_NOT_ALLOWED
-                if blocked_tag is not None
+                if tag is not None
                 else RFIDAttempt.Reason.TAG_NOT_FOUND
             )
             return self._reject(
                 rfid=rfid_value,
                 reason_code=reason,
-                tag=blocked_tag,
+                tag=tag,
             )
 
-        update_fields: list[str] = []
         if tag.adopt_rfid(rfid_value):
-            update_fields.append("rfid")
-        if update_fields:
-            tag.save(update_fields=update_fields)
+            tag.save(update_fields=["rfid"])
 
         User = get_user_model()
-        login_user = User.objects.filter(login_rfid=tag, is_active=True).first()
+        login_user = None
+        if resolution.login_user_id is not None:
+            login_user = User.objects.filter(
+                pk=resolution.login_user_id, is_active=True
+            ).first()
         if login_user:
             block = getattr(login_user, "login_rfid_block", None)
             offset = getattr(login_user, "login_rfid_offset", None)
@@ -260,14 +257,12 @@ class RFIDBackend:
                 metadata={"action_error": validation_action.error[:128]},
             )
 
-        account = (
-            CustomerAccount.objects.filter(
-                rfids__pk=tag.pk, rfids__allowed=True, user__isnull=False
-            )
-            .select_related("user")
-            .first()
-        )
-        if account:
+        account_user = None
+        if resolution.account_user_id is not None:
+            account_user = User._base_manager.filter(
+                pk=resolution.account_user_id
+            ).first()
+        if account_user:
             post_action = dispatch_rfid_action(
                 action_id=getattr(tag, "post_auth_action", ""),
                 rfid=rfid_value,
@@ -281,10 +276,10 @@ class RFIDBackend:
                     post_action.error,
                 )
             return self._accept(
-                user=account.user,
+                user=account_user,
                 rfid=rfid_value,
                 tag=tag,
-                account=account,
+                account_id=resolution.account_id,
                 metadata={"auth_path": "customer_account"},
             )
         return self._reject(
@@ -332,6 +327,53 @@ def _collect_local_ip_addresses():
     return tuple(sorted(addresses, key=str))
 
 
+@functools.cache
+def _local_ip_addresses():
+    """Return this host's addresses, resolved once per process."""
+
+    return _collect_local_ip_addresses()
+
+
+class _LocalAddresses:
+    """Class attribute that resolves the host addresses on first access.
+
+    Resolving at import time made every process that imports the backends pay
+    for hostname lookups; tests can still shadow it on an instance.
+    """
+
+    def __get__(self, instance, owner):
+        return _local_ip_addresses()
+
+
+@functools.lru_cache(maxsize=16)
+def _parse_proxy_networks(values: tuple[str, ...]):
+    networks = []
+    for value in values:
+        candidate = value.strip()
+        if not candidate:
+            continue
+        try:
+            if "/" in candidate:
+                networks.append(ipaddress.ip_network(candidate, strict=False))
+            else:
+                networks.append(ipaddress.ip_network(candidate))
+        except ValueError:
+            continue
+    return tuple(networks)
+
+
+@functools.lru_cache(maxsize=16)
+def _private_ipv4_prefixes(local_ips: tuple) -> tuple:
+    """Return the /16 networks around this host's private or loopback IPv4 addresses."""
+
+    return tuple(
+        ipaddress.ip_network(f"{local_ip}/16", strict=False)
+        for local_ip in local_ips
+        if isinstance(local_ip, ipaddress.IPv4Address)
+        and (local_ip.is_private or local_ip.is_loopback)
+    )
+
+
 def _normalize_ip_candidate(candidate: str) -> str | None:
     """Normalize a raw socket IP candidate by stripping ports, brackets, and zones."""
 
@@ -388,7 +430,7 @@ class LocalhostAdminBackend(ModelBackend):
         ipaddress.ip_network("172.18.0.0/16"),
         ipaddress.ip_network("::1/128"),
     )
-    _LOCAL_IPS = _collect_local_ip_addresses()
+    _LOCAL_IPS = _LocalAddresses()
 
     def _iter_allowed_networks(self):
         yield from self._ALLOWED_NETWORKS
@@ -402,17 +444,7 @@ class LocalhostAdminBackend(ModelBackend):
         configured = getattr(settings, "TRUSTED_PROXIES", ())
         if isinstance(configured, str):
             configured = (configured,)
-        for value in configured:
-            candidate = str(value).strip()
-            if not candidate:
-                continue
-            try:
-                if "/" in candidate:
-                    yield ipaddress.ip_network(candidate, strict=False)
-                else:
-                    yield ipaddress.ip_network(candidate)
-            except ValueError:
-                continue
+        yield from _parse_proxy_networks(tuple(str(value) for value in configured))
 
     def _is_test_environment(self, request) -> bool:
         if os.environ.get("PYTEST_CURRENT_TEST"):
@@ -433,7 +465,7 @@ class LocalhostAdminBackend(ModelBackend):
     def user_can_authenticate(self, user):
         return True
 
-    def authenticate(self, request, username=None, password=None, **kwargs):
+    def authenticate(self, request, username=None, password=None):
         if not username or not password:
             return None
 
@@ -567,8 +599,7 @@ class LocalhostAdminBackend(ModelBackend):
 class AccessPointLocalUserBackend(LocalhostAdminBackend):
     """Allow selected non-staff users to sign in from local IPv4 /16 peers."""
 
-    def authenticate(self, request, username=None, password=None, **kwargs):
-        del kwargs
+    def authenticate(self, request, username=None, password=None):
         normalized_username = str(username or "").strip()
         remote_ip = self._get_remote_ip(request) if request is not None else None
         remote_ip_text = str(remote_ip) if remote_ip is not None else "unknown"
@@ -671,20 +702,13 @@ class AccessPointLocalUserBackend(LocalhostAdminBackend):
         if ip.is_loopback:
             return True
 
-        for local_ip in self._LOCAL_IPS:
-            if not isinstance(local_ip, ipaddress.IPv4Address):
-                continue
-            if not local_ip.is_private and not local_ip.is_loopback:
-                continue
-            if ip in ipaddress.ip_network(f"{local_ip}/16", strict=False):
-                return True
-        return False
+        return any(ip in network for network in _private_ipv4_prefixes(tuple(self._LOCAL_IPS)))
 
 
 class TempPasswordBackend(ModelBackend):
     """Authenticate using a temporary password stored in a lockfile."""
 
-    def authenticate(self, request, username=None, password=None, **kwargs):
+    def authenticate(self, request, username=None, password=None):
         if not username or not password:
             return None
 
@@ -0,0 +1,16 @@
+"""Middleware that batches RFID auth audit rows per request."""
+
+from __future__ import annotations
+
+from . import rfid_auth
+
+
+class RFIDAuthAuditMiddleware:
+    """Write the RFID auth attempts of each request in one insert."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with rfid_auth.collect_auth_attempts():
+            return self.get_response(request)
@@ -0,0 +1,164 @@
+"""Cached RFID login resolution and per-request auth-attempt auditing."""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.db.models import OuterRef, Subquery
+
+from apps.cards.models import RFID, RFIDAttempt
+from apps.energy.models import CustomerAccount
+from apps.features.utils import is_suite_feature_enabled
+
+logger = logging.getLogger(__name__)
+
+RFID_AUTH_AUDIT_FEATURE_SLUG = "rfid-auth-audit"
+DEFAULT_RESOLUTION_CACHE_SECONDS = 30
+RESOLUTION_CACHE_PREFIX = "users:rfid-auth"
+RESOLUTION_GENERATION_KEY = f"{RESOLUTION_CACHE_PREFIX}:generation"
+
+_pending_attempts: ContextVar[list[RFIDAttempt] | None] = ContextVar(
+    "rfid_auth_pending_attempts", default=None
+)
+
+
+@dataclass(frozen=True)
+class RFIDResolution:
+    """Outcome of matching a scanned value to a tag and its login owners.
+
+    ``tag`` is the best allowed match, or the best blocked match when no
+    allowed tag exists, or ``None`` when nothing matches.
+    """
+
+    tag: RFID | None
+    login_user_id: int | None = None
+    account_id: int | None = None
+    account_user_id: int | None = None
+
+    @property
+    def allowed(self) -> bool:
+        return self.tag is not None and bool(self.tag.allowed)
+
+
+def _resolution_cache_seconds() -> int:
+    return int(
+        getattr(settings, "RFID_AUTH_CACHE_SECONDS", DEFAULT_RESOLUTION_CACHE_SECONDS)
+    )
+
+
+def _resolution_cache_key(rfid_value: str) -> str:
+    generation = cache.get(RESOLUTION_GENERATION_KEY, 0)
+    return f"{RESOLUTION_CACHE_PREFIX}:{generation}:{rfid_value}"
+
+
+def _query_resolution(rfid_value: str) -> RFIDResolution:
+    User = get_user_model()
+    login_users = User.objects.filter(login_rfid=OuterRef("pk"), is_active=True).order_by("pk")
+    accounts = CustomerAccount.objects.filter(
+        rfids=OuterRef("pk"), user__isnull=False
+    ).order_by("pk")
+    tag = (
+        RFID.matching_queryset(rfid_value)
+        .annotate(
+            login_user_pk=Subquery(login_users.values("pk")[:1]),
+            account_pk=Subquery(accounts.values("pk")[:1]),
+            account_user_pk=Subquery(accounts.values("user_id")[:1]),
+        )
+        .order_by("-allowed", "rfid_length", "rfid", "pk")
+        .first()
+    )
+    if tag is None:
+        return RFIDResolution(tag=None)
+    if not tag.allowed:
+        return RFIDResolution(tag=tag)
+    return RFIDResolution(
+        tag=tag,
+        login_user_id=tag.login_user_pk,
+        account_id=tag.account_pk,
+        account_user_id=tag.account_user_pk,
+    )
+
+
+def resolve_rfid(rfid_value: str) -> RFIDResolution:
+    """Return the tag, login user and account for ``rfid_value``.
+
+    Hits and misses are cached for ``RFID_AUTH_CACHE_SECONDS``. Saving or
+    deleting a tag, a user or an account bumps a shared generation number, so
+    cached answers never outlive the records they were built from. A cached
+    allowed tag is re-checked against its live row, because bulk ``update()``
+    calls revoke tags without sending signals.
+    """
+
+    timeout = _resolution_cache_seconds()
+    if timeout <= 0:
+        return _query_resolution(rfid_value)
+    cache_key = _resolution_cache_key(rfid_value)
+    resolution = cache.get(cache_key)
+    if isinstance(resolution, RFIDResolution):
+        if not resolution.allowed or RFID.objects.filter(
+            pk=resolution.tag.pk, allowed=True
+        ).exists():
+            return resolution
+    resolution = _query_resolution(rfid_value)
+    cache.set(cache_key, resolution, timeout=timeout)
+    return resolution
+
+
+def invalidate_rfid_resolutions(**kwargs) -> None:
+    """Discard cached resolutions; connected to tag, user and account changes."""
+
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    try:
+        cache.incr(RESOLUTION_GENERATION_KEY)
+    except ValueError:
+        cache.set(RESOLUTION_GENERATION_KEY, 1, timeout=None)
+
+
+def queue_auth_attempt(attempt: RFIDAttempt) -> None:
+    """Store ``attempt`` with its request's batch, or now outside a request."""
+
+    pending = _pending_attempts.get()
+    if pending is None:
+        flush_auth_attempts([attempt])
+    else:
+        pending.append(attempt)
+
+
+def flush_auth_attempts(attempts: list[RFIDAttempt]) -> int:
+    """Write ``attempts`` in one insert and return how many were stored."""
+
+    if not attempts:
+        return 0
+    try:
+        if not is_suite_feature_enabled(RFID_AUTH_AUDIT_FEATURE_SLUG, default=True):
+            return 0
+        return len(RFIDAttempt.bulk_record(attempts))
+    except DatabaseError:
+        logger.warning("Unable to record %s RFID auth attempt(s)", len(attempts), exc_info=True)
+        return 0
+
+
+@contextlib.contextmanager
+def collect_auth_attempts():
+    """Batch attempts queued in this context and write them when it exits.
+
+    The batch lives in a context variable, so concurrent requests sharing a
+    thread under ASGI each keep their own rows.
+    """
+
+    attempts: list[RFIDAttempt] = []
+    token = _pending_attempts.set(attempts)
+    try:
+        yield attempts
+    finally:
+        _pending_attempts.reset(token)
+        flush_auth_attempts(attempts)
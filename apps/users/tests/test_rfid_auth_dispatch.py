@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import contextvars
+import ipaddress
+from unittest.mock import patch
+
+from django.contrib.auth import authenticate, get_user_model
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.cards.models import RFID, RFIDAttempt
+from apps.energy.models import CustomerAccount
+from apps.users import backends, rfid_auth
+from apps.users.backends import LocalhostAdminBackend, RFIDBackend
+
+
+# The shared file cache is visible to every xdist worker, and their saves bump
+# the resolution generation under these query-count assertions.
+@override_settings(
+    RFID_AUTH_CACHE_SECONDS=30,
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "rfid-auth-tests",
+        }
+    },
+)
+class RFIDAuthDispatchTests(TestCase):
+    def setUp(self):
+        self.request = RequestFactory().post("/login/rfid/", REMOTE_ADDR="10.1.2.3")
+        rfid_auth.invalidate_rfid_resolutions()
+        self.attempts = self.enterContext(rfid_auth.collect_auth_attempts())
+
+    def _login_user(self, rfid="C0FFEE01"):
+        tag = RFID.objects.create(rfid=rfid, allowed=True)
+        user = get_user_model().objects.create_user(
+            username=f"kiosk-{rfid.lower()}", password="pw", login_rfid=tag
+        )
+        return tag, user
+
+    def test_rfid_scan_skips_network_checks_of_password_backends(self):
+        _tag, user = self._login_user()
+
+        with patch.object(LocalhostAdminBackend, "_get_remote_ip") as remote_ip:
+            authenticated = authenticate(self.request, rfid="C0FFEE01")
+
+        self.assertEqual(authenticated.pk, user.pk)
+        remote_ip.assert_not_called()
+
+    def test_password_login_does_not_resolve_rfids(self):
+        user = get_user_model().objects.create_user(username="pw-user", password="secret-pw")
+
+        with patch.object(rfid_auth, "resolve_rfid") as resolve:
+            authenticated = authenticate(self.request, username="pw-user", password="secret-pw")
+
+        self.assertEqual(authenticated.pk, user.pk)
+        resolve.assert_not_called()
+
+    def test_login_rfid_path_is_one_joined_query_then_cached(self):
+        _tag, user = self._login_user()
+        backend = RFIDBackend()
+
+        with self.assertNumQueries(2):
+            self.assertEqual(backend.authenticate(self.request, rfid="C0FFEE01").pk, user.pk)
+        with self.assertNumQueries(2):
+            self.assertEqual(backend.authenticate(self.request, rfid="C0FFEE01").pk, user.pk)
+
+    def test_account_path_is_one_joined_query_then_cached(self):
+        user = get_user_model().objects.create_user(username="account-user", password="pw")
+        tag = RFID.objects.create(rfid="0A0B0C0D", allowed=True)
+        account = CustomerAccount.objects.create(name="KIOSK", user=user)
+        account.rfids.add(tag)
+        backend = RFIDBackend()
+
+        with self.assertNumQueries(2):
+            self.assertEqual(backend.authenticate(self.request, rfid="0A0B0C0D").pk, user.pk)
+        with self.assertNumQueries(2):
+            self.assertEqual(backend.authenticate(self.request, rfid="0A0B0C0D").pk, user.pk)
+        rfid_auth.flush_auth_attempts(self.attempts)
+        attempt = RFIDAttempt.objects.filter(source=RFIDAttempt.Source.AUTH).first()
+        self.assertEqual(attempt.account_id, account.pk)
+
+    def test_unknown_and_blocked_tags_are_cached_until_tags_change(self):
+        backend = RFIDBackend()
+
+        with self.assertNumQueries(1):
+            self.assertIsNone(backend.authenticate(self.request, rfid="DEADBEEF"))
+        with self.assertNumQueries(0):
+            self.assertIsNone(backend.authenticate(self.request, rfid="DEADBEEF"))
+
+        tag, user = self._login_user(rfid="DEADBEEF")
+        self.assertEqual(backend.authenticate(self.request, rfid="DEADBEEF").pk, user.pk)
+
+        tag.allowed = False
+        tag.save()
+        self.assertIsNone(backend.authenticate(self.request, rfid="DEADBEEF"))
+
+    def test_audit_attempts_are_written_after_the_request_in_one_insert(self):
+        self._login_user()
+        backend = RFIDBackend()
+        backend.authenticate(self.request, rfid="C0FFEE01")
+        backend.authenticate(self.request, rfid="BADC0DE5")
+        self.assertFalse(RFIDAttempt.objects.filter(source=RFIDAttempt.Source.AUTH).exists())
+
+        with CaptureQueriesContext(connection) as queries:
+            rfid_auth.flush_auth_attempts(self.attempts)
+
+        inserts = [query for query in queries if query["sql"].startswith("INSERT")]
+        statuses = RFIDAttempt.objects.filter(source=RFIDAttempt.Source.AUTH).values_list(
+            "rfid", "status"
+        )
+        self.assertEqual(len(inserts), 1)
+        self.assertCountEqual(
+            statuses,
+            [
+                ("C0FFEE01", RFIDAttempt.Status.ACCEPTED),
+                ("BADC0DE5", RFIDAttempt.Status.REJECTED),
+            ],
+        )
+
+    def test_bulk_revoked_tag_stops_cached_logins(self):
+        tag, user = self._login_user()
+        backend = RFIDBackend()
+        self.assertEqual(backend.authenticate(self.request, rfid="C0FFEE01").pk, user.pk)
+
+        RFID.objects.filter(pk=tag.pk).update(allowed=False)
+
+        self.assertIsNone(backend.authenticate(self.request, rfid="C0FFEE01"))
+
+    def test_admin_toggle_allowed_revokes_cached_login(self):
+        tag, user = self._login_user()
+        backend = RFIDBackend()
+        self.assertEqual(backend.authenticate(self.request, rfid="C0FFEE01").pk, user.pk)
+        admin_user = get_user_model().objects.create_superuser(
+            username="rfid-admin", email="rfid-admin@example.com", password="pw"
+        )
+        self.client.force_login(admin_user)
+
+        response = self.client.post(
+            reverse("admin:cards_rfid_changelist"),
+            {"action": "toggle_selected_allowed", "_selected_action": [tag.pk]},
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(RFID.objects.get(pk=tag.pk).allowed)
+        self.assertIsNone(backend.authenticate(self.request, rfid="C0FFEE01"))
+
+    def test_attempts_outside_the_request_context_are_written_immediately(self):
+        backend = RFIDBackend()
+
+        contextvars.Context().run(backend.authenticate, self.request, rfid="BADC0DE5")
+
+        self.assertEqual(self.attempts, [])
+        self.assertTrue(
+            RFIDAttempt.objects.filter(
+                source=RFIDAttempt.Source.AUTH, rfid="BADC0DE5"
+            ).exists()
+        )
+
+
+def test_local_addresses_resolve_once_per_process():
+    backends._local_ip_addresses.cache_clear()
+    addresses = (ipaddress.ip_address("192.168.7.2"),)
+    try:
+        with patch.object(
+            backends, "_collect_local_ip_addresses", return_value=addresses
+        ) as collect:
+            first = LocalhostAdminBackend()._LOCAL_IPS
+            second = backends.AccessPointLocalUserBackend()._LOCAL_IPS
+
+        assert first is second is addresses
+        collect.assert_called_once()
+    finally:
+        backends._local_ip_addresses.cache_clear()
@@ -9,6 +9,7 @@ class VideoConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.video"
     verbose_name = "Video"
+    deferred_imports = ("cv2",)
 
     def ready(self):  # pragma: no cover - import for side effects
         from . import widgets  # noqa: F401
@@ -1,13 +1,12 @@
-import ipaddress
 import logging
-import re
-import socket
 
 from apps.sites import admin_badges
+from apps.sites.context_processors import (
+    get_user_group_membership,
+    navigation_snapshot,
+    resolve_request_host,
+)
 from django.conf import settings
-from django.contrib.sites.models import Site
-from django.core.exceptions import DisallowedHost
-from django.db.utils import OperationalError, ProgrammingError
 from django.http import HttpRequest
 
 DEFAULT_BADGE_COLOR = "#28a745"
@@ -22,43 +21,6 @@ ADMIN_BADGE_PROVIDER_CALLABLES = {
 logger = logging.getLogger(__name__)
 
 
-def _resolve_request_host(request: HttpRequest) -> str:
-    """Return the validated hostname for template badge lookups, or ``""``."""
-    try:
-        host_value = request.get_host()
-    except DisallowedHost:
-        # Never trust unvalidated Host headers for site/node resolution.
-        return ""
-
-    if host_value.startswith("["):
-        host_value = host_value.split("]", 1)[0].lstrip("[")
-    elif host_value.count(":") > 1:
-        host_or_port = host_value.rsplit(":", 1)
-        # Heuristic for non-standard bare IPv6-with-port input (e.g. ``::1:8080``):
-        # strip a trailing numeric segment only when the remaining portion also
-        # parses as IPv6. This reduces (but does not eliminate) false positives;
-        # inputs like ``fc00::1:2:3:4`` may still be transformed because
-        # ``fc00::1:2:3`` is itself valid IPv6. Proper Host syntax uses
-        # brackets (``[::1]:8080``), so this path is best-effort fallback only.
-        if (
-            len(host_or_port) == 2
-            and host_or_port[1].isdigit()
-            and not host_or_port[0].endswith(":")
-        ):
-            try:
-                ipaddress.ip_address(host_or_port[0])
-            except ValueError:
-                pass
-            else:
-                host_value = host_or_port[0]
-    else:
-        host_value = host_value.split(":", 1)[0]
-
-    if not re.fullmatch(r"[A-Za-z0-9._-]+|[0-9A-Fa-f:.]+", host_value or ""):
-        return ""
-    return host_value
-
-
 def site_and_node(request: HttpRequest):
     """Provide current Site, Node, and Role based on request host.
 
@@ -72,43 +34,21 @@ def site_and_node(request: HttpRequest):
     the palette color used for the corresponding badge. Badges always use green
     when the entity is known and grey when the value cannot be determined.
     """
-    host = _resolve_request_host(request)
+    host = resolve_request_host(request)
+    snapshot = navigation_snapshot(request)
 
-    site = getattr(request, "badge_site", None) or getattr(request, "site", None)
-    if site is None:
-        try:
-            site = Site.objects.filter(domain__iexact=host).first()
-        except (OperationalError, ProgrammingError):
-            site = None
+    site = (
+        getattr(request, "badge_site", None)
+        or getattr(request, "site", None)
+        or snapshot.site
+    )
     request.badge_site = site
 
-    node = getattr(request, "badge_node", None) or getattr(request, "node", None)
-    if node is None:
-        try:
-            from apps.nodes.models import Node
-
-            node = Node.get_local()
-            if not node:
-                hostname = socket.gethostname()
-                try:
-                    addresses = socket.gethostbyname_ex(hostname)[2]
-                except socket.gaierror:
-                    addresses = []
-
-                node = Node.objects.filter(hostname__iexact=hostname).first()
-                if not node:
-                    for addr in addresses:
-                        node = Node.objects.filter(address=addr).first()
-                        if node:
-                            break
-                if not node:
-                    node = (
-                        Node.objects.filter(hostname__iexact=host).first()
-                        or Node.objects.filter(address=host).first()
-                    )
-        except Exception:
-            logger.exception("Unexpected error resolving node for host '%s'", host)
-            node = None
+    node = (
+        getattr(request, "badge_node", None)
+        or getattr(request, "node", None)
+        or snapshot.node
+    )
     request.badge_node = node
 
     role = getattr(request, "badge_role", None) or getattr(node, "role", None)
@@ -119,7 +59,9 @@ def site_and_node(request: HttpRequest):
     site_color = DEFAULT_BADGE_COLOR if site else UNKNOWN_BADGE_COLOR
     node_color = DEFAULT_BADGE_COLOR if node else UNKNOWN_BADGE_COLOR
     role_color = DEFAULT_BADGE_COLOR if role else UNKNOWN_BADGE_COLOR
-    admin_badges = _build_admin_badges(request=request, site=site, node=node, role=role)
+    admin_badges = _build_admin_badges(
+        request=request, snapshot=snapshot, site=site, node=node, role=role
+    )
 
     site_name = site.name if site else ""
     node_role_name = role.name if role else ""
@@ -148,35 +90,33 @@ def _resolve_admin_badge_callable(provider_key: str):
     return ADMIN_BADGE_PROVIDER_CALLABLES[provider_key]
 
 
-def _visible_badges_for_user(*, user):
-    """Return enabled badges visible to the current staff user."""
-
-    from apps.sites.models import AdminBadge
+def _visible_badges_for_user(*, user, badges):
+    """Return the enabled ``badges`` visible to the current staff user."""
 
-    try:
-        queryset = AdminBadge.objects.filter(is_enabled=True, is_deleted=False)
-    except (OperationalError, ProgrammingError):
-        return []
     if (
         not user
         or not getattr(user, "is_authenticated", False)
         or getattr(user, "pk", None) is None
     ):
         return []
-    group_ids = list(user.groups.values_list("id", flat=True))
-    visible = (
-        queryset.filter(user__isnull=True, group__isnull=True)
-        | queryset.filter(user=user)
-        | queryset.filter(group_id__in=group_ids)
-    )
-    return list(visible.distinct().order_by("priority", "pk"))
+    _group_names, group_ids = get_user_group_membership(user)
+    return [
+        badge
+        for badge in badges
+        if (badge.user_id is None and badge.group_id is None)
+        or badge.user_id == user.pk
+        or badge.group_id in group_ids
+    ]
 
 
-def _build_admin_badges(*, request, site, node, role):
+def _build_admin_badges(*, request, snapshot, site, node, role):
     """Build configured badge payloads for admin templates."""
 
     badges = []
-    for badge in _visible_badges_for_user(user=getattr(request, "user", None)):
+    visible_badges = _visible_badges_for_user(
+        user=getattr(request, "user", None), badges=snapshot.admin_badges
+    )
+    for badge in visible_badges:
         try:
             query_callable = _resolve_admin_badge_callable(badge.provider_key)
             payload = query_callable(request=request, site=site, node=node, role=role)
@@ -1,13 +1,19 @@
 import logging
+import time
 from http import HTTPStatus
 from django.conf import settings
-from django.core.exceptions import DisallowedHost
+from django.core.exceptions import DisallowedHost, MiddlewareNotUsed
 from django.core.exceptions import ObjectDoesNotExist
 from django.http import HttpResponsePermanentRedirect
 from django.http.request import split_domain_port
 from django.urls import Resolver404, resolve
 
 from apps.core.analytics import record_request_event, usage_analytics_enabled
+from apps.core.instrumentation import (
+    http_request_duration,
+    request_view_label,
+    runtime_metrics_enabled,
+)
 from apps.core.models import UsageEvent
 from apps.nodes.models import Node
 from utils.sites import get_site
@@ -121,6 +127,27 @@ class CrossOriginOpenerPolicyMiddleware:
         return host in self.trusted_hosts
 
 
+class RuntimeMetricsMiddleware:
+    """Record view latency in the runtime metrics registry."""
+
+    def __init__(self, get_response):
+        if not runtime_metrics_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        status = "5xx"
+        try:
+            response = self.get_response(request)
+            status = f"{getattr(response, 'status_code', 500) // 100}xx"
+            return response
+        finally:
+            http_request_duration.labels(
+                request_view_label(request), request.method, status
+            ).observe(time.perf_counter() - started)
+
+
 class UsageAnalyticsMiddleware:
     """Record request-level usage events for reporting."""
 
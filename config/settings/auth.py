@@ -8,6 +8,9 @@ AUTH_USER_MODEL = "users.User"
 # or OTP authentication. AccessPointLocalUserBackend follows immediately after
 # because its localhost/local-network gate must run before credential-based
 # backends (PasswordOrOTPBackend, TempPasswordBackend, and RFIDBackend).
+# Each backend's authenticate() signature names the credentials it accepts,
+# so Django only calls RFIDBackend for ``rfid=`` scans and only the password
+# backends for ``username=``/``password=`` logins.
 AUTHENTICATION_BACKENDS = [
     "apps.users.backends.LocalhostAdminBackend",
     "apps.users.backends.AccessPointLocalUserBackend",
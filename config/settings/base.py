@@ -66,6 +66,9 @@ HAS_DEBUG_TOOLBAR = DEBUG and importlib.util.find_spec("debug_toolbar") is not N
 NET_MESSAGE_DISABLE_PROPAGATION = env_bool("NET_MESSAGE_DISABLE_PROPAGATION", False)
 NODES_ENABLE_SIBLING_IPC = env_bool("NODES_ENABLE_SIBLING_IPC", False)
 ENABLE_USAGE_ANALYTICS = env_bool("ENABLE_USAGE_ANALYTICS", False)
+RUNTIME_METRICS_ENABLED = env_bool("RUNTIME_METRICS_ENABLED", True)
+# Bearer token accepted by /core/metrics/ in addition to staff sessions.
+RUNTIME_METRICS_TOKEN = os.environ.get("RUNTIME_METRICS_TOKEN", "").strip()
 REPORTS_HTML_TO_PDF_ENABLED = env_bool("REPORTS_HTML_TO_PDF_ENABLED", True)
 DESKTOP_UI_ENABLED = env_bool("DESKTOP_UI_ENABLED", env_bool("DESKTOP_UI", False))
 # Legacy alias used by terminal-launching deployments.
@@ -5,6 +5,12 @@ from datetime import timedelta
 
 from celery.schedules import crontab
 
+from apps.celery.topology import (
+    DEFAULT_TASK_CLASS,
+    TaskClassAnnotations,
+    task_queues,
+    with_periodic_expiry,
+)
 from apps.celery.utils import resolve_celery_shutdown_timeout
 from apps.core.auto_upgrade import AUTO_UPGRADE_CADENCE_HOUR, AUTO_UPGRADE_TASK_PATH
 from apps.sensors.constants import USB_LCD_STATUS_CELERY_TASK_NAME
@@ -34,6 +40,17 @@ CELERY_WORKER_SOFT_SHUTDOWN_TIMEOUT = resolve_celery_shutdown_timeout()
 # Legacy alias retained for fixture references and admin guidance.
 CELERY_WORKER_SHUTDOWN_TIMEOUT = CELERY_WORKER_SOFT_SHUTDOWN_TIMEOUT
 
+# Task classes in apps.celery.topology route each task to a realtime, ocpp,
+# maintenance or heavy queue and set its time limits. A worker started
+# without -Q consumes every queue; dedicated workers can take one queue each
+# (see ``manage.py celery_queues``). Prefetching one message at a time keeps
+# a worker from reserving a backlog of slow tasks ahead of urgent ones.
+CELERY_TASK_QUEUES = task_queues()
+CELERY_TASK_DEFAULT_QUEUE = DEFAULT_TASK_CLASS.queue
+CELERY_TASK_ROUTES = ("apps.celery.topology.route_task",)
+CELERY_TASK_ANNOTATIONS = (TaskClassAnnotations(),)
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
 CELERY_BEAT_SCHEDULE = {
     "auto_upgrade_check": {
         "task": AUTO_UPGRADE_TASK_PATH,
@@ -63,6 +80,13 @@ CELERY_BEAT_SCHEDULE = {
         "task": "apps.ocpp.tasks.schedule_daily_firmware_snapshot_requests",
         "schedule": crontab(minute=30, hour=0),
     },
+    "ocpp_fleet_maintenance_pump": {
+        "task": "apps.ocpp.tasks.pump_fleet_maintenance",
+        "schedule": timedelta(seconds=10),
+        # A pump held up behind a long maintenance task is superseded by the
+        # next one rather than run late.
+        "options": {"expires": 10},
+    },
     "ocpp_forwarding_push": {
         "task": "apps.ocpp.tasks.setup_forwarders",
         "schedule": timedelta(minutes=5),
@@ -71,6 +95,10 @@ CELERY_BEAT_SCHEDULE = {
         "task": "apps.ocpp.tasks.send_offline_charge_point_notifications",
         "schedule": timedelta(minutes=5),
     },
+    "ocpp_meter_value_rollup": {
+        "task": "apps.ocpp.tasks.rollup_meter_values",
+        "schedule": crontab(minute="*/15"),
+    },
     "ocpp_meter_value_purge": {
         "task": "apps.ocpp.tasks.purge_meter_values",
         "schedule": crontab(minute=0, hour=3),
@@ -100,3 +128,4 @@ CELERY_BEAT_SCHEDULE = {
         "schedule": crontab(minute="*/10"),
     },
 }
+CELERY_BEAT_SCHEDULE = with_periodic_expiry(CELERY_BEAT_SCHEDULE)
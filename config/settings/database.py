@@ -6,6 +6,8 @@ from pathlib import Path
 
 from django.core.exceptions import ImproperlyConfigured
 
+from utils.env import env_bool
+
 from .apps import ARTHEXIS_EXTERNAL_APPS
 from .base import BASE_DIR
 from .external_dbs import external_app_database_alias_mapping
@@ -27,6 +29,78 @@ def build_external_sqlite_databases(external_apps: list[str]) -> dict[str, dict[
 
     return configs
 
+SQLITE_READ_ALIAS = "default_ro"
+SQLITE_TRANSACTION_MODES = {"DEFERRED", "IMMEDIATE", "EXCLUSIVE"}
+
+
+def resolve_sqlite_transaction_mode() -> str:
+    """Return the ``BEGIN`` mode used for SQLite write transactions.
+
+    ``IMMEDIATE`` takes the write lock when an atomic block opens, so two
+    connections never deadlock trying to upgrade shared read locks.
+    """
+
+    mode = os.environ.get("ARTHEXIS_SQLITE_TRANSACTION_MODE", "IMMEDIATE").strip().upper()
+    if mode not in SQLITE_TRANSACTION_MODES:
+        raise ImproperlyConfigured(
+            "ARTHEXIS_SQLITE_TRANSACTION_MODE must be one of "
+            f"{', '.join(sorted(SQLITE_TRANSACTION_MODES))}."
+        )
+    return mode
+
+
+def resolve_conn_max_age() -> int:
+    """Return the persistent connection lifetime in seconds (``0`` disables it)."""
+
+    raw_value = os.environ.get("ARTHEXIS_DB_CONN_MAX_AGE", "60").strip()
+    try:
+        max_age = int(raw_value)
+    except ValueError as exc:
+        raise ImproperlyConfigured(
+            "ARTHEXIS_DB_CONN_MAX_AGE must be an integer number of seconds."
+        ) from exc
+    if max_age < 0:
+        raise ImproperlyConfigured("ARTHEXIS_DB_CONN_MAX_AGE must be >= 0.")
+    return max_age
+
+
+def build_sqlite_databases(
+    path: Path, test_path: Path, *, read_split: bool = False
+) -> dict[str, dict[str, object]]:
+    """Return the primary SQLite entry and, optionally, its read-only twin.
+
+    The read-only alias opens the same file with ``PRAGMA query_only`` (applied by
+    ``apps.core.apps``) so routed reads never take the write lock.
+    In tests it mirrors ``default``.
+    """
+
+    conn_max_age = resolve_conn_max_age()
+    configs: dict[str, dict[str, object]] = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": path,
+            "OPTIONS": {
+                "timeout": 60,
+                "transaction_mode": resolve_sqlite_transaction_mode(),
+            },
+            "CONN_MAX_AGE": conn_max_age,
+            "CONN_HEALTH_CHECKS": conn_max_age > 0,
+            "TEST": {"NAME": test_path},
+        }
+    }
+    if read_split:
+        configs[SQLITE_READ_ALIAS] = {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": path,
+            "OPTIONS": {"timeout": 60},
+            "CONN_MAX_AGE": conn_max_age,
+            "CONN_HEALTH_CHECKS": conn_max_age > 0,
+            "READ_ONLY": True,
+            "TEST": {"MIRROR": "default"},
+        }
+    return configs
+
+
 FORCED_DB_BACKEND = os.environ.get("ARTHEXIS_DB_BACKEND", "").strip().lower()
 if FORCED_DB_BACKEND and FORCED_DB_BACKEND not in {"sqlite", "postgres"}:
     raise ImproperlyConfigured(
@@ -89,14 +163,14 @@ else:
 
     SQLITE_TEST_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
-    DATABASES = {
-        "default": {
-            "ENGINE": "django.db.backends.sqlite3",
-            "NAME": SQLITE_DB_PATH,
-            "OPTIONS": {"timeout": 60},
-            "TEST": {"NAME": SQLITE_TEST_DB_PATH},
-        }
-    }
+    DATABASES = build_sqlite_databases(
+        SQLITE_DB_PATH,
+        SQLITE_TEST_DB_PATH,
+        read_split=env_bool("ARTHEXIS_SQLITE_READ_SPLIT", False),
+    )
     DATABASES.update(build_external_sqlite_databases(list(ARTHEXIS_EXTERNAL_APPS)))
 
-DATABASE_ROUTERS = ["apps.core.dbrouters.ExternalAppDatabaseRouter"]
+DATABASE_ROUTERS = [
+    "apps.core.dbrouters.ExternalAppDatabaseRouter",
+    "apps.core.dbrouters.SQLiteReadReplicaRouter",
+]
@@ -7,6 +7,7 @@ from .base import HAS_DEBUG_TOOLBAR
 MIDDLEWARE = [
     # Must be first to run last in the response phase to strip COOP headers.
     "config.middleware.CrossOriginOpenerPolicyMiddleware",
+    "config.middleware.RuntimeMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -16,6 +17,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.users.middleware.RFIDAuthAuditMiddleware",
     "apps.sites.middleware.SharePreviewPublicMiddleware",
     "apps.ops.middleware.ActiveOperationMiddleware",
     "config.middleware.UsageAnalyticsMiddleware",
@@ -26,7 +28,7 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
-ANALYTICS_EXCLUDED_URL_PREFIXES = ("/__debug__", "/healthz", "/status")
+ANALYTICS_EXCLUDED_URL_PREFIXES = ("/__debug__", "/healthz", "/status", "/core/metrics")
 
 if HAS_DEBUG_TOOLBAR:
     MIDDLEWARE.insert(0, "debug_toolbar.middleware.DebugToolbarMiddleware")
@@ -1,8 +1,10 @@
 """Static and media asset settings."""
 
+import os
 import sys
 
 from config.whitenoise import add_headers as whitenoise_add_headers
+from utils.env import env_bool
 
 from .base import BASE_DIR, DEBUG
 
@@ -41,3 +43,12 @@ WHITENOISE_AUTOREFRESH = DEBUG
 MERMAID_USE_CDN = True
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+
+# Generated nginx configs serve STATIC_ROOT directly, including the .gz/.br
+# variants written by the manifest storage, and only proxy misses to Django.
+# MEDIA_ROOT is not public unless NGINX_SERVE_MEDIA is enabled. Brotli needs
+# the ngx_brotli module, and the anonymous page microcache is off by default.
+NGINX_SERVE_STATIC = env_bool("NGINX_SERVE_STATIC", True)
+NGINX_SERVE_MEDIA = env_bool("NGINX_SERVE_MEDIA", False)
+NGINX_BROTLI_STATIC = env_bool("NGINX_BROTLI_STATIC", False)
+NGINX_MICROCACHE_SECONDS = int(os.environ.get("NGINX_MICROCACHE_SECONDS", "0") or 0)
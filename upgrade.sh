@@ -2232,6 +2232,12 @@ if [ -n "${PYTHON_BIN:-}" ]; then
   arthexis_timing_start "reconcile_node_features_services"
   "$PYTHON_BIN" manage.py reconcile_node_features_services
   arthexis_timing_end "reconcile_node_features_services"
+
+  arthexis_timing_start "docs_build"
+  if ! "$PYTHON_BIN" manage.py docs build; then
+    echo "Documentation prebuild failed; pages will render on demand." >&2
+  fi
+  arthexis_timing_end "docs_build"
 fi
 
 if [ -n "$SERVICE_NAME" ] && [ "$SERVICE_MANAGEMENT_MODE" = "$ARTHEXIS_SERVICE_MODE_SYSTEMD" ]; then